@@ -21,6 +21,8 @@ from decimal import Decimal, ROUND_HALF_UP
 import boto3
 from botocore.exceptions import ClientError
 
+from utils.pricing_cache import PricingCache, shared_pricing_cache
+
 logger = logging.getLogger(__name__)
 
 
@@ -35,15 +37,16 @@ class BillingClient:
     - Account-level billing aggregation
     """
     
-    def __init__(self, aws_config):
+    def __init__(self, aws_config, billing_cache: Optional[PricingCache] = None):
         """
         Initialize billing client.
         
         Args:
             aws_config: AWSConfig instance for client management
+            billing_cache: Cache for billing data (defaults to the shared pricing cache)
         """
         self.aws_config = aws_config
-        self.billing_cache = {}
+        self.billing_cache = billing_cache if billing_cache is not None else shared_pricing_cache
         self.cache_ttl = 1800  # 30 minutes cache TTL for billing data
         
         # Initialize AWS clients
@@ -81,12 +84,13 @@ class BillingClient:
         """
         logger.info(f"Getting account billing summary from {start_date} to {end_date}")
         
-        cache_key = f"billing_summary:{start_date}:{end_date}:{granularity}"
+        cache_key = PricingCache.make_key('billing_summary', start_date, end_date, granularity)
         
         # Check cache first
-        if self._is_cache_valid(cache_key):
+        cached_summary = self.billing_cache.get(cache_key)
+        if cached_summary is not None:
             logger.debug("Using cached billing summary")
-            return self.billing_cache[cache_key]['data']
+            return cached_summary
         
         try:
             # Get cost and usage data
@@ -112,11 +116,7 @@ class BillingClient:
             billing_summary.update(self._get_billing_details(start_date, end_date))
             
             # Cache the results
-            self.billing_cache[cache_key] = {
-                'data': billing_summary,
-                'timestamp': datetime.now(timezone.utc),
-                'ttl': self.cache_ttl
-            }
+            self.billing_cache.set(cache_key, billing_summary, ttl=self.cache_ttl)
             
             logger.info(f"Retrieved billing summary with total cost: ${billing_summary.get('totalCost', 0):.2f}")
             return billing_summary
@@ -1036,16 +1036,6 @@ class BillingClient:
             logger.error(f"Failed to parse tag allocation: {e}")
             return {'tagAllocation': {}, 'untaggedCosts': 0.0, 'error': str(e)}
     
-    def _is_cache_valid(self, cache_key: str) -> bool:
-        """Check if cached data is still valid."""
-        if cache_key not in self.billing_cache:
-            return False
-        
-        cache_entry = self.billing_cache[cache_key]
-        cache_age = (datetime.now(timezone.utc) - cache_entry['timestamp']).total_seconds()
-        
-        return cache_age < cache_entry['ttl']
-    
     def _get_fallback_billing_summary(self, start_date: str, end_date: str) -> Dict[str, Any]:
         """Get fallback billing summary when API calls fail."""
         logger.warning("Using fallback billing summary")
@@ -1061,4 +1051,4 @@ class BillingClient:
             'retrievalTimestamp': datetime.now(timezone.utc).isoformat(),
             'fallback': True,
             'error': 'API unavailable'
-        }
\ No newline at end of file
+        }
\ No newline at end of file
@@ -13,6 +13,7 @@ Features:
 - Multi-account and multi-region budget management
 - Cost allocation and budget inheritance
 - Automated budget monitoring and reporting
+- Concurrent forecast and variance sweeps over hundreds of budgets
 
 Requirements: 10.4, 6.1, 6.3
 """
@@ -21,12 +22,15 @@ import logging
 import boto3
 import json
 import time
+import concurrent.futures
 from datetime import datetime, timedelta, timezone
 from typing import Dict, List, Any, Optional, Tuple, Union
 from botocore.exceptions import ClientError
 from collections import defaultdict
 import uuid
 
+from utils.hierarchy_tree import HierarchyTree
+
 logger = logging.getLogger(__name__)
 
 
@@ -86,21 +90,24 @@ class BudgetsClient:
     - Automated budget monitoring and reporting
     """
     
-    def __init__(self, aws_config, account_id: Optional[str] = None):
+    def __init__(self, aws_config, account_id: Optional[str] = None, max_workers: int = 8):
         """
         Initialize AWS Budgets client with comprehensive configuration.
         
         Args:
             aws_config: AWSConfig instance for client management
             account_id: AWS account ID (auto-detected if not provided)
+            max_workers: Maximum budgets processed concurrently in forecast and report sweeps
         """
         self.aws_config = aws_config
+        self.max_workers = max(1, max_workers)
         self.budgets_client = aws_config.get_budgets_client()
         self.account_id = account_id or aws_config.get_account_id()
         
         # Budget management state
         self.managed_budgets = {}
         self.budget_hierarchy = {}
+        self.hierarchy_tree = HierarchyTree()
         self.alert_configurations = {}
         self.forecast_data = {}
         
@@ -354,12 +361,15 @@ class BudgetsClient:
         try:
             logger.info("Synchronizing budget forecasts with AWS Cost Explorer")
             
+            # One paginated sweep returns the details of every budget
+            budget_details_by_name = self._describe_budgets_by_name()
+            
             # Get list of budgets to process
             if budget_names is None:
                 budget_names = list(self.managed_budgets.keys())
                 if not budget_names:
                     # Get all budgets from AWS if none managed locally
-                    budget_names = self._get_all_budget_names()
+                    budget_names = list(budget_details_by_name)
             
             if not budget_names:
                 logger.warning("No budgets found for forecast synchronization")
@@ -375,51 +385,16 @@ class BudgetsClient:
             # Get Cost Explorer client for forecasting
             ce_client = self.aws_config.get_cost_explorer_client()
             
-            forecast_results = {}
-            
-            for budget_name in budget_names:
-                try:
-                    logger.debug(f"Processing forecast for budget: {budget_name}")
-                    
-                    # Get budget details
-                    budget_details = self._get_budget_details(budget_name)
-                    if not budget_details:
-                        logger.warning(f"Could not retrieve details for budget: {budget_name}")
-                        continue
-                    
-                    # Generate forecast using Cost Explorer
-                    forecast_data = self._generate_cost_forecast(
-                        ce_client, budget_details, forecast_horizon_months
-                    )
-                    
-                    # Calculate variance analysis
-                    variance_analysis = self._calculate_budget_variance(
-                        budget_details, forecast_data
-                    )
-                    
-                    # Store forecast data
-                    forecast_result = {
-                        'budget_name': budget_name,
-                        'budget_amount': budget_details.get('BudgetLimit', {}).get('Amount'),
-                        'budget_unit': budget_details.get('BudgetLimit', {}).get('Unit'),
-                        'forecast_data': forecast_data,
-                        'variance_analysis': variance_analysis,
-                        'forecast_horizon_months': forecast_horizon_months,
-                        'synchronized_at': datetime.now(timezone.utc).isoformat()
-                    }
-                    
-                    forecast_results[budget_name] = forecast_result
-                    self.forecast_data[budget_name] = forecast_result
-                    
-                    logger.debug(f"Forecast synchronized for budget: {budget_name}")
-                    
-                except Exception as e:
-                    logger.error(f"Failed to sync forecast for budget {budget_name}: {e}")
-                    forecast_results[budget_name] = {
-                        'budget_name': budget_name,
-                        'error': str(e),
-                        'synchronized_at': datetime.now(timezone.utc).isoformat()
-                    }
+            # Forecast budgets concurrently; requests share the 'ce' rate limit
+            forecast_results = self._map_budgets_concurrently(
+                budget_names,
+                lambda budget_name: self._synchronize_budget_forecast(
+                    budget_name, budget_details_by_name.get(budget_name), ce_client, forecast_horizon_months
+                )
+            )
+            forecast_results = {
+                budget_name: result for budget_name, result in forecast_results.items() if result is not None
+            }
             
             successful_syncs = len([r for r in forecast_results.values() if 'error' not in r])
             
@@ -450,7 +425,8 @@ class BudgetsClient:
     
     def track_budget_variance(self,
                             budget_name: str,
-                            analysis_period_days: int = 30) -> Dict[str, Any]:
+                            analysis_period_days: int = 30,
+                            budget_details: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """
         Track budget variance and spending patterns for a specific budget.
         
@@ -460,6 +436,7 @@ class BudgetsClient:
         Args:
             budget_name: Name of budget to analyze
             analysis_period_days: Period for variance analysis
+            budget_details: Budget definition if already retrieved (skips DescribeBudget)
             
         Returns:
             Dictionary containing variance tracking results
@@ -470,12 +447,12 @@ class BudgetsClient:
             logger.info(f"Tracking variance for budget: {budget_name}")
             
             # Get budget details
-            budget_details = self._get_budget_details(budget_name)
+            budget_details = budget_details or self._get_budget_details(budget_name)
             if not budget_details:
                 raise ValueError(f"Budget {budget_name} not found")
             
             # Get actual spending data
-            actual_spending = self._get_actual_spending(budget_name, analysis_period_days)
+            actual_spending = self._get_actual_spending(budget_name, analysis_period_days, budget_details)
             
             # Calculate variance metrics
             variance_metrics = self._calculate_detailed_variance_metrics(
@@ -591,6 +568,39 @@ class BudgetsClient:
                 'timestamp': datetime.now(timezone.utc).isoformat()
             }
     
+    def get_hierarchy_rollup(self, actual_spend: Dict[str, float]) -> Dict[str, Any]:
+        """
+        Roll actual spend and budget limits up the budget hierarchy.
+        
+        Args:
+            actual_spend: Actual spend by budget name
+            
+        Returns:
+            Dictionary mapping budget name to its own and rolled-up spend and limits
+        """
+        tree = self.hierarchy_tree
+        for budget_name in list(actual_spend) + list(self.managed_budgets):
+            if budget_name not in tree:
+                tree.add_node(budget_name)
+        
+        tree.set_values(actual_spend, 'actualSpend')
+        tree.set_values({
+            name: metadata.get('budget_amount', 0.0) for name, metadata in self.managed_budgets.items()
+        }, 'budgetAmount')
+        rolled_up_spend = tree.rollup('actualSpend')
+        rolled_up_limits = tree.rollup('budgetAmount')
+        
+        return {
+            budget_name: {
+                'actualSpend': tree.value(budget_name, 'actualSpend'),
+                'budgetAmount': tree.value(budget_name, 'budgetAmount'),
+                'rolledUpSpend': rolled_up_spend[budget_name],
+                'rolledUpBudgetAmount': rolled_up_limits[budget_name],
+                'hierarchyPath': tree.path(budget_name)
+            }
+            for budget_name in tree.nodes()
+        }
+    
     def get_budget_status_report(self,
                                budget_names: Optional[List[str]] = None,
                                include_forecasts: bool = True,
@@ -609,9 +619,12 @@ class BudgetsClient:
         try:
             logger.info("Generating budget status report")
             
+            # One paginated sweep returns the details of every budget
+            budget_details_by_name = self._describe_budgets_by_name()
+            
             # Get list of budgets to report on
             if budget_names is None:
-                budget_names = self._get_all_budget_names()
+                budget_names = list(budget_details_by_name)
             
             if not budget_names:
                 return {
@@ -621,22 +634,12 @@ class BudgetsClient:
                     'timestamp': datetime.now(timezone.utc).isoformat()
                 }
             
-            report_data = {}
-            
-            for budget_name in budget_names:
-                try:
-                    budget_report = self._generate_individual_budget_report(
-                        budget_name, include_forecasts, include_variance
-                    )
-                    report_data[budget_name] = budget_report
-                    
-                except Exception as e:
-                    logger.error(f"Failed to generate report for budget {budget_name}: {e}")
-                    report_data[budget_name] = {
-                        'budget_name': budget_name,
-                        'error': str(e),
-                        'status': 'ERROR'
-                    }
+            report_data = self._map_budgets_concurrently(
+                budget_names,
+                lambda budget_name: self._generate_individual_budget_report(
+                    budget_name, include_forecasts, include_variance, budget_details_by_name.get(budget_name)
+                )
+            )
             
             # Generate summary statistics
             summary = self._generate_report_summary(report_data)
@@ -863,12 +866,42 @@ class BudgetsClient:
     
     def _establish_budget_hierarchy(self, budget_name: str, parent_budget_name: str) -> None:
         """Establish hierarchical relationship between budgets."""
-        if parent_budget_name not in self.budget_hierarchy:
-            self.budget_hierarchy[parent_budget_name] = []
+        tree = self.hierarchy_tree
+        if parent_budget_name not in tree:
+            tree.add_node(parent_budget_name)
+        if budget_name not in tree:
+            tree.add_node(budget_name, parent_budget_name)
+        else:
+            # Already known, e.g. registered as a root by a rollup before its parent was set
+            previous_parent = tree.parent(budget_name)
+            if previous_parent != parent_budget_name:
+                tree.move_node(budget_name, parent_budget_name)
+                if budget_name in self.budget_hierarchy.get(previous_parent, []):
+                    self.budget_hierarchy[previous_parent].remove(budget_name)
+                logger.info(f"Moved budget {budget_name} from {previous_parent or 'the top level'} "
+                            f"to {parent_budget_name}")
         
-        self.budget_hierarchy[parent_budget_name].append(budget_name)
+        children = self.budget_hierarchy.setdefault(parent_budget_name, [])
+        if budget_name not in children:
+            children.append(budget_name)
         logger.debug(f"Established hierarchy: {parent_budget_name} -> {budget_name}")
     
+    def _remove_from_budget_hierarchy(self, budget_name: str) -> None:
+        """Drop a budget from the hierarchy; its child budgets move up to its parent."""
+        if budget_name not in self.hierarchy_tree:
+            return
+        parent_name = self.hierarchy_tree.parent(budget_name)
+        children = self.budget_hierarchy.pop(budget_name, [])
+        self.hierarchy_tree.remove_node(budget_name)
+        
+        if parent_name is not None:
+            siblings = self.budget_hierarchy.get(parent_name, [])
+            if budget_name in siblings:
+                siblings.remove(budget_name)
+            siblings.extend(children)
+            if siblings:
+                self.budget_hierarchy[parent_name] = siblings
+    
     def _get_existing_notifications(self, budget_name: str) -> List[Dict[str, Any]]:
         """Get existing notifications for a budget."""
         try:
@@ -887,15 +920,97 @@ class BudgetsClient:
     def _get_all_budget_names(self) -> List[str]:
         """Get all budget names from AWS."""
         try:
+            return list(self._describe_all_budgets())
+        except Exception as e:
+            logger.error(f"Failed to get budget names: {e}")
+            return []
+    
+    def _describe_all_budgets(self) -> Dict[str, Dict[str, Any]]:
+        """Get every budget in the account with one paginated DescribeBudgets sweep."""
+        budgets = {}
+        next_token = None
+        while True:
+            params = {'AccountId': self.account_id, 'MaxResults': 100}
+            if next_token:
+                params['NextToken'] = next_token
+            
             response = self.aws_config.execute_with_retry(
                 self.budgets_client.describe_budgets,
                 'budgets',
-                AccountId=self.account_id
+                **params
             )
-            return [budget['BudgetName'] for budget in response.get('Budgets', [])]
+            for budget in response.get('Budgets', []):
+                budgets[budget['BudgetName']] = budget
+            
+            next_token = response.get('NextToken')
+            if not next_token:
+                return budgets
+    
+    def _describe_budgets_by_name(self) -> Dict[str, Dict[str, Any]]:
+        """Budget details by name, or an empty dict so callers fall back to DescribeBudget."""
+        try:
+            return self._describe_all_budgets()
         except Exception as e:
-            logger.error(f"Failed to get budget names: {e}")
-            return []
+            logger.warning(f"DescribeBudgets sweep failed, falling back to per-budget lookups: {e}")
+            return {}
+    
+    def _map_budgets_concurrently(self, budget_names: List[str], worker) -> Dict[str, Any]:
+        """Run worker for each budget on a bounded thread pool, keeping input order."""
+        if len(budget_names) <= 1 or self.max_workers == 1:
+            return {budget_name: worker(budget_name) for budget_name in budget_names}
+        
+        with concurrent.futures.ThreadPoolExecutor(
+            max_workers=min(self.max_workers, len(budget_names))
+        ) as executor:
+            return dict(zip(budget_names, executor.map(worker, budget_names)))
+    
+    def _synchronize_budget_forecast(self,
+                                   budget_name: str,
+                                   budget_details: Optional[Dict[str, Any]],
+                                   ce_client: Any,
+                                   forecast_horizon_months: int) -> Optional[Dict[str, Any]]:
+        """Forecast one budget and record the result (None when the budget is not found)."""
+        try:
+            logger.debug(f"Processing forecast for budget: {budget_name}")
+            
+            # Get budget details
+            budget_details = budget_details or self._get_budget_details(budget_name)
+            if not budget_details:
+                logger.warning(f"Could not retrieve details for budget: {budget_name}")
+                return None
+            
+            # Generate forecast using Cost Explorer
+            forecast_data = self._generate_cost_forecast(
+                ce_client, budget_details, forecast_horizon_months
+            )
+            
+            # Calculate variance analysis
+            variance_analysis = self._calculate_budget_variance(
+                budget_details, forecast_data
+            )
+            
+            # Store forecast data
+            forecast_result = {
+                'budget_name': budget_name,
+                'budget_amount': budget_details.get('BudgetLimit', {}).get('Amount'),
+                'budget_unit': budget_details.get('BudgetLimit', {}).get('Unit'),
+                'forecast_data': forecast_data,
+                'variance_analysis': variance_analysis,
+                'forecast_horizon_months': forecast_horizon_months,
+                'synchronized_at': datetime.now(timezone.utc).isoformat()
+            }
+            self.forecast_data[budget_name] = forecast_result
+            
+            logger.debug(f"Forecast synchronized for budget: {budget_name}")
+            return forecast_result
+            
+        except Exception as e:
+            logger.error(f"Failed to sync forecast for budget {budget_name}: {e}")
+            return {
+                'budget_name': budget_name,
+                'error': str(e),
+                'synchronized_at': datetime.now(timezone.utc).isoformat()
+            }
     
     def _get_budget_details(self, budget_name: str) -> Optional[Dict[str, Any]]:
         """Get detailed budget information."""
@@ -1015,11 +1130,14 @@ class BudgetsClient:
         else:
             return 'CRITICAL'  # Significantly over budget
     
-    def _get_actual_spending(self, budget_name: str, analysis_period_days: int) -> Dict[str, Any]:
+    def _get_actual_spending(self,
+                           budget_name: str,
+                           analysis_period_days: int,
+                           budget_details: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """Get actual spending data for variance analysis."""
         try:
             # Get budget details to understand cost filters
-            budget_details = self._get_budget_details(budget_name)
+            budget_details = budget_details or self._get_budget_details(budget_name)
             if not budget_details:
                 raise ValueError(f"Budget {budget_name} not found")
             
@@ -1321,6 +1439,7 @@ class BudgetsClient:
                     del self.alert_configurations[budget_name]
                 if budget_name in self.forecast_data:
                     del self.forecast_data[budget_name]
+                self._remove_from_budget_hierarchy(budget_name)
             else:
                 logger.info(f"DRY_RUN: Would delete budget: {budget_name}")
             
@@ -1369,11 +1488,12 @@ class BudgetsClient:
     def _generate_individual_budget_report(self,
                                          budget_name: str,
                                          include_forecasts: bool,
-                                         include_variance: bool) -> Dict[str, Any]:
+                                         include_variance: bool,
+                                         budget_details: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """Generate report for individual budget."""
         try:
             # Get budget details
-            budget_details = self._get_budget_details(budget_name)
+            budget_details = budget_details or self._get_budget_details(budget_name)
             if not budget_details:
                 return {
                     'budget_name': budget_name,
@@ -1398,7 +1518,9 @@ class BudgetsClient:
             
             # Add variance analysis if requested
             if include_variance:
-                variance_result = self.track_budget_variance(budget_name, analysis_period_days=30)
+                variance_result = self.track_budget_variance(
+                    budget_name, analysis_period_days=30, budget_details=budget_details
+                )
                 if variance_result['success']:
                     report['variance_analysis'] = variance_result['variance_result']
             
@@ -8,21 +8,42 @@ Comprehensive AWS Cost Explorer integration that provides:
 - Cost trend analysis and forecasting with confidence intervals
 - Cost anomaly detection integration with AWS Cost Anomaly Detection
 - Multi-dimensional cost analysis across services, regions, and time periods
+- Persistent day/month segment cache so finalized cost data is fetched only once
+- Paginated, date-chunked fetching with chunks requested concurrently
 
 Requirements: 10.1, 5.1
 """
 
 import logging
 import statistics
-from datetime import datetime, timedelta, timezone
+import bisect
+import threading
+import concurrent.futures
+from datetime import date, datetime, timedelta, timezone
 from typing import Dict, List, Any, Optional, Tuple, Union
 from enum import Enum
 import json
 import boto3
 from botocore.exceptions import ClientError, BotoCoreError
 
+from utils.pricing_cache import PricingCache, shared_cost_segment_cache
+
 logger = logging.getLogger(__name__)
 
+# Days after a segment ends before AWS stops restating its cost data
+COST_DATA_FINALIZATION_LAG_DAYS = 3
+
+# Finalized segments never change; keep them until evicted
+CLOSED_SEGMENT_TTL = 400 * 24 * 3600
+
+# Longest range requested at once per granularity; longer ranges are split into
+# chunks fetched concurrently (None: never split)
+FETCH_CHUNK_DAYS = {
+    'HOURLY': 1,
+    'DAILY': 31,
+    'MONTHLY': None
+}
+
 
 class CostMetric(Enum):
     """Cost Explorer metrics."""
@@ -75,7 +96,10 @@ class CostExplorer:
     Requirements: 10.1, 5.1
     """
     
-    def __init__(self, aws_config=None, region: str = 'us-east-1', dry_run: bool = True):
+    def __init__(self, aws_config=None, region: str = 'us-east-1', dry_run: bool = True,
+                 cost_cache: Optional[PricingCache] = None,
+                 finalization_lag_days: int = COST_DATA_FINALIZATION_LAG_DAYS,
+                 max_concurrent_requests: int = 4):
         """
         Initialize Cost Explorer client.
         
@@ -83,6 +107,9 @@ class CostExplorer:
             aws_config: AWS configuration instance
             region: AWS region (Cost Explorer requires us-east-1)
             dry_run: Safety flag for testing
+            cost_cache: Cache for finalized cost segments (defaults to the shared segment cache)
+            finalization_lag_days: Days after which a segment's cost data is treated as final
+            max_concurrent_requests: Maximum date chunks fetched at the same time
         """
         self.region = region
         self.aws_config = aws_config
@@ -93,6 +120,16 @@ class CostExplorer:
         # Cost analysis configuration
         self.default_metrics = [CostMetric.UNBLENDED_COST.value]
         
+        # Segment cache (persisted when the shared segment cache has a disk backend)
+        self.cost_cache = cost_cache if cost_cache is not None else shared_cost_segment_cache
+        self.finalization_lag_days = finalization_lag_days
+        self.query_metrics = {'apiCalls': 0, 'segmentHits': 0, 'segmentMisses': 0}
+        
+        # Chunked fetching (requests go through the 'ce' rate limiter when aws_config is set)
+        self.max_concurrent_requests = max(1, max_concurrent_requests)
+        self.fetch_chunk_days = dict(FETCH_CHUNK_DAYS)
+        self._metrics_lock = threading.Lock()
+        
         logger.info(f"Initialized Cost Explorer for region: {region}")
     
     @property
@@ -168,7 +205,7 @@ class CostExplorer:
                 logger.info("DRY_RUN: Would retrieve cost and usage data")
                 return self._generate_mock_cost_data(start_date, end_date, granularity, metrics)
             
-            response = self.client.get_cost_and_usage(**params)
+            response = self._get_cost_and_usage_segmented(params, start_date, end_date, granularity)
             
             # Process and enrich response
             processed_data = self._process_cost_and_usage_response(response, start_date, end_date)
@@ -227,9 +264,25 @@ class CostExplorer:
                 logger.info("DRY_RUN: Would retrieve dimension values")
                 return self._generate_mock_dimension_values(dimension)
             
-            response = self.client.get_dimension_values(**params)
-            
-            values = [item['Value'] for item in response.get('DimensionValues', [])]
+            # Values for a fully finalized range never change
+            cache_key = PricingCache.make_key('ce_dimension_values', params)
+            range_closed = self._is_segment_closed(end_date.date())
+            values = self.cost_cache.get(cache_key) if range_closed else None
+            if values is not None:
+                logger.info(f"Served {len(values)} values for dimension {dimension.value} from cache")
+                return values
+            
+            values = []
+            next_page_token = None
+            while True:
+                page_params = dict(params, NextPageToken=next_page_token) if next_page_token else params
+                response = self._call_cost_explorer(self.client.get_dimension_values, page_params)
+                values.extend(item['Value'] for item in response.get('DimensionValues', []))
+                next_page_token = response.get('NextPageToken')
+                if not next_page_token:
+                    break
+            if range_closed:
+                self.cost_cache.set(cache_key, values, ttl=CLOSED_SEGMENT_TTL)
             
             logger.info(f"Retrieved {len(values)} values for dimension {dimension.value}")
             
@@ -572,6 +625,197 @@ class CostExplorer:
             logger.error(f"Error generating cost report: {e}")
             raise
     
+    def get_query_metrics(self) -> Dict[str, Any]:
+        """Get Cost Explorer API call and segment cache hit counts."""
+        segments = self.query_metrics['segmentHits'] + self.query_metrics['segmentMisses']
+        return {
+            **self.query_metrics,
+            'segmentHitRate': self.query_metrics['segmentHits'] / segments if segments else 0.0
+        }
+    
+    def _get_cost_and_usage_segmented(
+        self,
+        params: Dict[str, Any],
+        start_date: datetime,
+        end_date: datetime,
+        granularity: Granularity
+    ) -> Dict[str, Any]:
+        """
+        Serve a cost and usage query from cached segments where possible.
+        
+        The range is split into day segments (month segments for MONTHLY
+        granularity). Finalized segments are read from the cache; the remaining
+        segments are fetched with one request per contiguous run, and the
+        finalized ones among them are cached. Returns a merged raw response.
+        """
+        query = {key: value for key, value in params.items() if key != 'TimePeriod'}
+        segments = self._split_segments(start_date.date(), end_date.date(), granularity)
+        
+        entries = {}
+        missing_runs = []
+        for segment in segments:
+            entry = None
+            if self._is_segment_closed(segment[1]):
+                entry = self.cost_cache.get(self._segment_cache_key(query, segment))
+            
+            if entry is not None:
+                self.query_metrics['segmentHits'] += 1
+                entries[segment] = entry
+            else:
+                self.query_metrics['segmentMisses'] += 1
+                if missing_runs and missing_runs[-1][-1][1] == segment[0]:
+                    missing_runs[-1].append(segment)
+                else:
+                    missing_runs.append([segment])
+        
+        for run in missing_runs:
+            run_params = dict(query, TimePeriod={
+                'Start': run[0][0].isoformat(),
+                'End': run[-1][1].isoformat()
+            })
+            response = self._fetch_cost_and_usage(run_params)
+            
+            run_starts = [segment[0].isoformat() for segment in run]
+            results_by_segment = [[] for _ in run]
+            for result in response.get('ResultsByTime', []):
+                position = bisect.bisect_right(run_starts, result.get('TimePeriod', {}).get('Start', '')[:10]) - 1
+                results_by_segment[max(position, 0)].append(result)
+            
+            for segment, results in zip(run, results_by_segment):
+                entry = {
+                    'ResultsByTime': results,
+                    'GroupDefinitions': response.get('GroupDefinitions', []),
+                    'DimensionKey': response.get('DimensionKey')
+                }
+                entries[segment] = entry
+                if self._is_segment_closed(segment[1]) and not any(result.get('Estimated') for result in results):
+                    self.cost_cache.set(self._segment_cache_key(query, segment), entry, ttl=CLOSED_SEGMENT_TTL)
+        
+        logger.info(f"Cost and usage query: {len(segments) - sum(len(run) for run in missing_runs)} of "
+                    f"{len(segments)} segments cached, {len(missing_runs)} API requests")
+        
+        merged = {'ResultsByTime': [], 'GroupDefinitions': [], 'DimensionKey': None}
+        for segment in segments:
+            entry = entries[segment]
+            merged['ResultsByTime'].extend(entry['ResultsByTime'])
+            merged['GroupDefinitions'] = merged['GroupDefinitions'] or entry.get('GroupDefinitions', [])
+            merged['DimensionKey'] = merged['DimensionKey'] or entry.get('DimensionKey')
+        return merged
+    
+    def _fetch_cost_and_usage(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Fetch a cost and usage range, following pagination.
+        
+        Ranges longer than the granularity's chunk size are split into date
+        chunks fetched concurrently; chunks are merged back in date order.
+        """
+        chunks = self._split_fetch_chunks(params['TimePeriod'], params.get('Granularity'))
+        if len(chunks) == 1:
+            chunk_responses = [self._fetch_cost_and_usage_pages(params)]
+        else:
+            logger.info(f"Fetching {len(chunks)} date chunks with up to {self.max_concurrent_requests} concurrent requests")
+            with concurrent.futures.ThreadPoolExecutor(
+                max_workers=min(self.max_concurrent_requests, len(chunks))
+            ) as executor:
+                chunk_responses = list(executor.map(
+                    lambda time_period: self._fetch_cost_and_usage_pages(dict(params, TimePeriod=time_period)),
+                    chunks
+                ))
+        
+        merged = {'ResultsByTime': [], 'GroupDefinitions': [], 'DimensionKey': None}
+        for chunk_response in chunk_responses:
+            merged['ResultsByTime'].extend(chunk_response['ResultsByTime'])
+            merged['GroupDefinitions'] = merged['GroupDefinitions'] or chunk_response['GroupDefinitions']
+            merged['DimensionKey'] = merged['DimensionKey'] or chunk_response['DimensionKey']
+        return merged
+    
+    def _fetch_cost_and_usage_pages(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Fetch every page of one request, merging each page as it arrives.
+        
+        With GroupBy, the groups of one time period can be split across pages,
+        so results with the same time period are combined into one entry.
+        """
+        results_by_period = {}
+        group_definitions = []
+        dimension_key = None
+        next_page_token = None
+        while True:
+            page_params = dict(params, NextPageToken=next_page_token) if next_page_token else params
+            page = self._call_cost_explorer(self.client.get_cost_and_usage, page_params)
+            
+            for result in page.get('ResultsByTime', []):
+                time_period = result.get('TimePeriod', {})
+                period_key = (time_period.get('Start'), time_period.get('End'))
+                existing = results_by_period.get(period_key)
+                if existing is None:
+                    results_by_period[period_key] = dict(result, Groups=list(result.get('Groups', [])))
+                else:
+                    existing['Groups'].extend(result.get('Groups', []))
+                    existing['Total'] = existing.get('Total') or result.get('Total', {})
+                    existing['Estimated'] = existing.get('Estimated', False) or result.get('Estimated', False)
+            
+            group_definitions = group_definitions or page.get('GroupDefinitions', [])
+            dimension_key = dimension_key or page.get('DimensionKey')
+            next_page_token = page.get('NextPageToken')
+            if not next_page_token:
+                break
+        
+        return {
+            'ResultsByTime': list(results_by_period.values()),
+            'GroupDefinitions': group_definitions,
+            'DimensionKey': dimension_key
+        }
+    
+    def _call_cost_explorer(self, operation, params: Dict[str, Any]) -> Dict[str, Any]:
+        """Issue one Cost Explorer request under the 'ce' rate limit."""
+        with self._metrics_lock:
+            self.query_metrics['apiCalls'] += 1
+        if self.aws_config:
+            return self.aws_config.execute_with_retry(operation, 'ce', **params)
+        return operation(**params)
+    
+    def _split_fetch_chunks(self, time_period: Dict[str, str], granularity: Optional[str]) -> List[Dict[str, str]]:
+        """Split a request time period into chunks of at most the granularity's chunk size."""
+        chunk_days = self.fetch_chunk_days.get(granularity)
+        start = datetime.strptime(time_period['Start'][:10], '%Y-%m-%d').date()
+        end = datetime.strptime(time_period['End'][:10], '%Y-%m-%d').date()
+        if not chunk_days or (end - start).days <= chunk_days:
+            return [time_period]
+        
+        chunks = []
+        current = start
+        while current < end:
+            chunk_end = min(current + timedelta(days=chunk_days), end)
+            chunks.append({'Start': current.isoformat(), 'End': chunk_end.isoformat()})
+            current = chunk_end
+        return chunks
+    
+    @staticmethod
+    def _split_segments(start: date, end: date, granularity: Granularity) -> List[Tuple[date, date]]:
+        """Split [start, end) into day segments, or calendar month segments for MONTHLY."""
+        segments = []
+        current = start
+        while current < end:
+            if granularity == Granularity.MONTHLY:
+                next_month = (current.replace(day=1) + timedelta(days=32)).replace(day=1)
+                segment_end = min(next_month, end)
+            else:
+                segment_end = current + timedelta(days=1)
+            segments.append((current, segment_end))
+            current = segment_end
+        return segments
+    
+    def _is_segment_closed(self, segment_end: date) -> bool:
+        """Whether AWS has finalized cost data for a segment ending on segment_end."""
+        today = datetime.now(timezone.utc).date()
+        return segment_end + timedelta(days=self.finalization_lag_days) <= today
+    
+    @staticmethod
+    def _segment_cache_key(query: Dict[str, Any], segment: Tuple[date, date]) -> str:
+        """Cache key for one segment of a query."""
+        return PricingCache.make_key('ce_cost_segment', query, segment[0].isoformat(), segment[1].isoformat())
+    
     def _process_cost_and_usage_response(
         self,
         response: Dict[str, Any],
@@ -1021,7 +1265,8 @@ class CostExplorer:
         ]
 
 
-def create_cost_explorer(aws_config=None, region: str = 'us-east-1', dry_run: bool = True) -> CostExplorer:
+def create_cost_explorer(aws_config=None, region: str = 'us-east-1', dry_run: bool = True,
+                         cost_cache: Optional[PricingCache] = None) -> CostExplorer:
     """
     Factory function to create Cost Explorer instance.
     
@@ -1029,11 +1274,12 @@ def create_cost_explorer(aws_config=None, region: str = 'us-east-1', dry_run: bo
         aws_config: AWS configuration instance
         region: AWS region
         dry_run: Safety flag for testing
+        cost_cache: Cache for finalized cost segments (defaults to the shared segment cache)
         
     Returns:
         Configured CostExplorer instance
     """
-    return CostExplorer(aws_config=aws_config, region=region, dry_run=dry_run)
+    return CostExplorer(aws_config=aws_config, region=region, dry_run=dry_run, cost_cache=cost_cache)
 
 
 if __name__ == "__main__":
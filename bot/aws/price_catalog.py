@@ -0,0 +1,575 @@
+#!/usr/bin/env python3
+"""
+Offline AWS Price Catalog for Advanced FinOps Platform
+
+Ingests the AWS bulk Price List offer files (JSON or CSV, optionally gzipped)
+from a local path into a compact, indexed SQLite store so pricing lookups no
+longer depend on per-call Price List API requests:
+- Streaming ingestion of bulk offer files in bounded-size batches
+- Rates keyed by (service, region, instance type, OS, tenancy, term)
+- Indexed O(log n) lookups for EC2, RDS and EBS pricing
+- Incremental refreshes that diff a new offer version against the stored one
+
+Requirements: 10.5, 2.1 - AWS Price List integration and pricing analysis
+"""
+
+import argparse
+import csv
+import gzip
+import json
+import logging
+import sqlite3
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Any, Optional, Iterator, Tuple
+
+try:
+    import ijson
+    IJSON_AVAILABLE = True
+except ImportError:
+    IJSON_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+
+# Price List API location names, keyed by region code
+REGION_LOCATION_NAMES = {
+    'us-east-1': 'US East (N. Virginia)',
+    'us-east-2': 'US East (Ohio)',
+    'us-west-1': 'US West (N. California)',
+    'us-west-2': 'US West (Oregon)',
+    'eu-west-1': 'Europe (Ireland)',
+    'eu-west-2': 'Europe (London)',
+    'eu-central-1': 'Europe (Frankfurt)',
+    'eu-north-1': 'Europe (Stockholm)',
+    'ap-southeast-1': 'Asia Pacific (Singapore)',
+    'ap-southeast-2': 'Asia Pacific (Sydney)',
+    'ap-northeast-1': 'Asia Pacific (Tokyo)',
+    'ap-northeast-2': 'Asia Pacific (Seoul)',
+    'ap-south-1': 'Asia Pacific (Mumbai)',
+    'ca-central-1': 'Canada (Central)',
+    'sa-east-1': 'South America (São Paulo)'
+}
+
+_LOCATION_REGIONS = {name: code for code, name in REGION_LOCATION_NAMES.items()}
+
+# Columns stored per rate, in insertion order
+_RATE_COLUMNS = (
+    'sku', 'rate_code', 'service_code', 'region', 'instance_type',
+    'operating_system', 'tenancy', 'term_type', 'lease_contract_length',
+    'purchase_option', 'offering_class', 'database_engine',
+    'deployment_option', 'volume_type', 'unit', 'price_per_unit', 'offer_version'
+)
+
+# Bulk CSV header names for the product/term attributes we keep
+_CSV_FIELDS = {
+    'sku': 'SKU',
+    'rate_code': 'RateCode',
+    'term_type': 'TermType',
+    'unit': 'Unit',
+    'price_per_unit': 'PricePerUnit',
+    'currency': 'Currency',
+    'lease_contract_length': 'LeaseContractLength',
+    'purchase_option': 'PurchaseOption',
+    'offering_class': 'OfferingClass',
+    'location': 'Location',
+    'region_code': 'Region Code',
+    'instance_type': 'Instance Type',
+    'operating_system': 'Operating System',
+    'tenancy': 'Tenancy',
+    'pre_installed_sw': 'Pre Installed S/W',
+    'capacity_status': 'CapacityStatus',
+    'license_model': 'License Model',
+    'database_engine': 'Database Engine',
+    'deployment_option': 'Deployment Option',
+    'volume_type': 'Volume API Name'
+}
+
+# Bulk JSON product attribute names for the same fields
+_JSON_ATTRIBUTES = {
+    'location': 'location',
+    'region_code': 'regionCode',
+    'instance_type': 'instanceType',
+    'operating_system': 'operatingSystem',
+    'tenancy': 'tenancy',
+    'pre_installed_sw': 'preInstalledSw',
+    'capacity_status': 'capacitystatus',
+    'license_model': 'licenseModel',
+    'database_engine': 'databaseEngine',
+    'deployment_option': 'deploymentOption',
+    'volume_type': 'volumeApiName'
+}
+
+_PRODUCT_KEYS = tuple(_JSON_ATTRIBUTES.keys())
+
+
+class PriceCatalog:
+    """
+    Indexed local store of AWS bulk Price List rates.
+
+    Rates are stored one row per (SKU, rate code) together with the product
+    attributes used for lookups. Ingestion records the offer version per
+    service and region scope so a refresh only writes the rates that changed
+    and removes the rates that disappeared from the new version.
+    """
+
+    BATCH_SIZE = 5000
+
+    def __init__(self, db_path: str = 'pricing_catalog.db'):
+        """
+        Initialize price catalog.
+
+        Args:
+            db_path: Path to the SQLite database file (':memory:' for an in-memory store)
+        """
+        self.db_path = str(db_path)
+        if self.db_path != ':memory:':
+            Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._initialize_schema()
+
+        logger.info(f"Price Catalog initialized at {self.db_path}")
+
+    def ingest_offer_file(self, path: str, service_code: Optional[str] = None,
+                          region: Optional[str] = None, force: bool = False) -> Dict[str, Any]:
+        """
+        Stream a bulk Price List offer file into the catalog.
+
+        Args:
+            path: Local path to a .json, .csv, .json.gz or .csv.gz offer file
+            service_code: Offer code (e.g. 'AmazonEC2'); read from the file when omitted
+            region: Only ingest rates for this region (also scopes the version diff)
+            force: Re-ingest even if the stored offer version matches the file
+
+        Returns:
+            Ingestion summary with version and diff counts
+        """
+        path = str(path)
+        file_format = 'csv' if path.lower().endswith(('.csv', '.csv.gz')) else 'json'
+        logger.info(f"Ingesting {file_format.upper()} offer file {path}")
+
+        if file_format == 'csv':
+            metadata, rows = self._iter_csv_offer(path)
+        else:
+            metadata, rows = self._iter_json_offer(path)
+
+        service_code = service_code or metadata.get('offerCode')
+        offer_version = metadata.get('version') or datetime.now(timezone.utc).strftime('%Y%m%d%H%M%S')
+        if not service_code:
+            raise ValueError(f"Offer file {path} does not declare an offer code; pass service_code")
+
+        scope = region or ''
+        summary = {
+            'serviceCode': service_code,
+            'region': region,
+            'offerVersion': offer_version,
+            'previousVersion': self.get_offer_version(service_code, region),
+            'inserted': 0,
+            'updated': 0,
+            'unchanged': 0,
+            'removed': 0,
+            'skipped': False
+        }
+
+        if summary['previousVersion'] == offer_version and not force:
+            logger.info(f"{service_code} offer version {offer_version} already ingested, skipping")
+            summary['skipped'] = True
+            return summary
+
+        with self._lock, self._connection:
+            cursor = self._connection.cursor()
+            batch = []
+
+            for row in rows:
+                if row['service_code'] is None:
+                    row['service_code'] = service_code
+                if region and row['region'] != region:
+                    continue
+                row['offer_version'] = offer_version
+                batch.append(row)
+
+                if len(batch) >= self.BATCH_SIZE:
+                    self._apply_batch(cursor, batch, summary)
+                    batch = []
+
+            if batch:
+                self._apply_batch(cursor, batch, summary)
+
+            # Rates not restamped with the new version no longer exist in the offer
+            removal_sql = 'DELETE FROM prices WHERE service_code = ? AND offer_version != ?'
+            removal_params = [service_code, offer_version]
+            if region:
+                removal_sql += ' AND region = ?'
+                removal_params.append(region)
+            cursor.execute(removal_sql, removal_params)
+            summary['removed'] = cursor.rowcount
+
+            cursor.execute(
+                'INSERT OR REPLACE INTO offer_versions '
+                '(service_code, scope, offer_version, publication_date, ingested_at) VALUES (?, ?, ?, ?, ?)',
+                (service_code, scope, offer_version, metadata.get('publicationDate'),
+                 datetime.now(timezone.utc).isoformat())
+            )
+
+        logger.info(f"Ingested {service_code} offer {offer_version}: {summary['inserted']} inserted, "
+                    f"{summary['updated']} updated, {summary['unchanged']} unchanged, "
+                    f"{summary['removed']} removed")
+        return summary
+
+    def get_offer_version(self, service_code: str, region: Optional[str] = None) -> Optional[str]:
+        """Get the ingested offer version for a service and region scope."""
+        row = self._connection.execute(
+            'SELECT offer_version FROM offer_versions WHERE service_code = ? AND scope = ?',
+            (service_code, region or '')
+        ).fetchone()
+        return row[0] if row else None
+
+    def get_rate(self, service_code: str, region: str, instance_type: str,
+                 operating_system: str = 'Linux', tenancy: str = 'Shared',
+                 term_type: str = 'OnDemand', lease_contract_length: str = '',
+                 purchase_option: str = '', offering_class: str = '',
+                 unit: str = 'Hrs') -> Optional[float]:
+        """
+        Look up a compute rate.
+
+        Args:
+            service_code: Offer code (e.g. 'AmazonEC2')
+            region: AWS region code
+            instance_type: Instance type (e.g. 'm5.large')
+            operating_system: Price List operating system ('Linux', 'Windows', 'RHEL', 'SUSE')
+            tenancy: Tenancy ('Shared', 'Dedicated', 'Host')
+            term_type: 'OnDemand' or 'Reserved'
+            lease_contract_length: Reserved term ('1yr', '3yr')
+            purchase_option: Reserved payment option ('No Upfront', 'Partial Upfront', 'All Upfront')
+            offering_class: Reserved offering class ('standard', 'convertible')
+            unit: Price unit ('Hrs' for usage, 'Quantity' for upfront fees)
+
+        Returns:
+            Price per unit in USD, or None if the catalog has no matching rate
+        """
+        return self._query_rate(
+            'service_code = ? AND region = ? AND instance_type = ? AND operating_system = ? '
+            'AND tenancy = ? AND term_type = ? AND lease_contract_length = ? '
+            'AND purchase_option = ? AND offering_class = ? AND unit = ?',
+            (service_code, region, instance_type, operating_system, tenancy, term_type,
+             lease_contract_length, purchase_option, offering_class, unit)
+        )
+
+    def get_database_rate(self, region: str, instance_class: str, database_engine: str,
+                          deployment_option: str = 'Single-AZ',
+                          term_type: str = 'OnDemand') -> Optional[float]:
+        """Look up the hourly rate for an RDS instance class."""
+        return self._query_rate(
+            "service_code = 'AmazonRDS' AND region = ? AND instance_type = ? "
+            "AND database_engine = ? AND deployment_option = ? AND term_type = ? AND unit = 'Hrs'",
+            (region, instance_class, database_engine, deployment_option, term_type)
+        )
+
+    def get_storage_rate(self, region: str, volume_type: str, unit: str = 'GB-Mo') -> Optional[float]:
+        """Look up an EBS rate ('GB-Mo' storage, 'IOPS-Mo' or 'GiBps-mo' provisioned performance)."""
+        return self._query_rate(
+            "service_code = 'AmazonEC2' AND region = ? AND volume_type = ? "
+            "AND term_type = 'OnDemand' AND unit = ?",
+            (region, volume_type, unit)
+        )
+
+    def get_catalog_statistics(self) -> Dict[str, Any]:
+        """Get rate counts and offer versions held by the catalog."""
+        rate_counts = dict(self._connection.execute(
+            'SELECT service_code, COUNT(*) FROM prices GROUP BY service_code'
+        ).fetchall())
+        versions = [
+            {'serviceCode': row[0], 'region': row[1] or None, 'offerVersion': row[2],
+             'publicationDate': row[3], 'ingestedAt': row[4]}
+            for row in self._connection.execute(
+                'SELECT service_code, scope, offer_version, publication_date, ingested_at FROM offer_versions'
+            )
+        ]
+        return {
+            'totalRates': sum(rate_counts.values()),
+            'ratesByService': rate_counts,
+            'offerVersions': versions,
+            'dbPath': self.db_path
+        }
+
+    def close(self) -> None:
+        """Close the underlying database connection."""
+        self._connection.close()
+
+    # Private helper methods
+
+    def _initialize_schema(self) -> None:
+        """Create catalog tables and lookup indexes."""
+        with self._connection:
+            self._connection.executescript('''
+                CREATE TABLE IF NOT EXISTS prices (
+                    sku TEXT NOT NULL,
+                    rate_code TEXT NOT NULL,
+                    service_code TEXT NOT NULL,
+                    region TEXT NOT NULL,
+                    instance_type TEXT NOT NULL DEFAULT '',
+                    operating_system TEXT NOT NULL DEFAULT '',
+                    tenancy TEXT NOT NULL DEFAULT '',
+                    term_type TEXT NOT NULL,
+                    lease_contract_length TEXT NOT NULL DEFAULT '',
+                    purchase_option TEXT NOT NULL DEFAULT '',
+                    offering_class TEXT NOT NULL DEFAULT '',
+                    database_engine TEXT NOT NULL DEFAULT '',
+                    deployment_option TEXT NOT NULL DEFAULT '',
+                    volume_type TEXT NOT NULL DEFAULT '',
+                    unit TEXT NOT NULL DEFAULT '',
+                    price_per_unit REAL NOT NULL,
+                    offer_version TEXT NOT NULL,
+                    PRIMARY KEY (sku, rate_code)
+                ) WITHOUT ROWID;
+                CREATE INDEX IF NOT EXISTS idx_prices_compute ON prices (
+                    service_code, region, instance_type, operating_system, tenancy, term_type,
+                    lease_contract_length, purchase_option, offering_class, unit
+                );
+                CREATE INDEX IF NOT EXISTS idx_prices_database ON prices (
+                    service_code, region, instance_type, database_engine, deployment_option, term_type
+                );
+                CREATE INDEX IF NOT EXISTS idx_prices_storage ON prices (
+                    service_code, region, volume_type, term_type, unit
+                );
+                CREATE INDEX IF NOT EXISTS idx_prices_version ON prices (service_code, offer_version);
+                CREATE TABLE IF NOT EXISTS offer_versions (
+                    service_code TEXT NOT NULL,
+                    scope TEXT NOT NULL,
+                    offer_version TEXT NOT NULL,
+                    publication_date TEXT,
+                    ingested_at TEXT NOT NULL,
+                    PRIMARY KEY (service_code, scope)
+                );
+            ''')
+
+    def _query_rate(self, where_clause: str, params: Tuple[Any, ...]) -> Optional[float]:
+        """Return the lowest matching price for an indexed lookup."""
+        with self._lock:
+            row = self._connection.execute(
+                f'SELECT MIN(price_per_unit) FROM prices WHERE {where_clause}', params
+            ).fetchone()
+        return row[0] if row and row[0] is not None else None
+
+    def _apply_batch(self, cursor: sqlite3.Cursor, batch: List[Dict[str, Any]],
+                     summary: Dict[str, Any]) -> None:
+        """Upsert a batch of rates, counting inserts, price changes and unchanged rates."""
+        existing = {}
+        keys = [(row['sku'], row['rate_code']) for row in batch]
+        for start in range(0, len(keys), 400):
+            chunk = keys[start:start + 400]
+            placeholders = ' OR '.join(['(sku = ? AND rate_code = ?)'] * len(chunk))
+            params = [value for key in chunk for value in key]
+            for sku, rate_code, price in cursor.execute(
+                f'SELECT sku, rate_code, price_per_unit FROM prices WHERE {placeholders}', params
+            ):
+                existing[(sku, rate_code)] = price
+
+        for key, row in zip(keys, batch):
+            if key not in existing:
+                summary['inserted'] += 1
+            elif existing[key] != row['price_per_unit']:
+                summary['updated'] += 1
+            else:
+                summary['unchanged'] += 1
+
+        cursor.executemany(
+            f'INSERT OR REPLACE INTO prices ({", ".join(_RATE_COLUMNS)}) '
+            f'VALUES ({", ".join("?" * len(_RATE_COLUMNS))})',
+            [tuple(row[column] for column in _RATE_COLUMNS) for row in batch]
+        )
+
+    def _open_offer_file(self, path: str, mode: str = 'rt'):
+        """Open an offer file, transparently decompressing gzip files."""
+        if path.lower().endswith('.gz'):
+            return gzip.open(path, mode, encoding='utf-8') if 't' in mode else gzip.open(path, mode)
+        return open(path, mode, encoding='utf-8') if 't' in mode else open(path, mode)
+
+    def _iter_csv_offer(self, path: str) -> Tuple[Dict[str, Any], Iterator[Dict[str, Any]]]:
+        """Read CSV offer metadata and return a streaming iterator over its rates."""
+        metadata = {}
+        header = None
+
+        # Bulk CSV files start with "key","value" metadata lines before the header row
+        with self._open_offer_file(path) as handle:
+            for line in csv.reader(handle):
+                if len(line) == 2:
+                    key = line[0].replace(' ', '')
+                    metadata[key[0].lower() + key[1:]] = line[1]
+                    continue
+                header = line
+                break
+
+        if header is None:
+            return metadata, iter(())
+
+        preamble_lines = len(metadata) + 1
+        positions = {field: header.index(column) for field, column in _CSV_FIELDS.items() if column in header}
+        service_position = header.index('serviceCode') if 'serviceCode' in header else None
+
+        def rows() -> Iterator[Dict[str, Any]]:
+            with self._open_offer_file(path) as handle:
+                reader = csv.reader(handle)
+                for _ in range(preamble_lines):
+                    next(reader, None)
+
+                for line in reader:
+                    values = {field: line[position] for field, position in positions.items()}
+                    if values.get('currency', 'USD') != 'USD':
+                        continue
+                    product = {key: values.get(key, '') for key in _PRODUCT_KEYS}
+                    service_code = line[service_position] if service_position is not None else None
+                    row = self._build_rate_row(
+                        values['sku'], values['rate_code'], service_code, product,
+                        values.get('term_type', ''), values.get('lease_contract_length', ''),
+                        values.get('purchase_option', ''), values.get('offering_class', ''),
+                        values.get('unit', ''), values.get('price_per_unit', '')
+                    )
+                    if row:
+                        yield row
+
+        return metadata, rows()
+
+    def _iter_json_offer(self, path: str) -> Tuple[Dict[str, Any], Iterator[Dict[str, Any]]]:
+        """Read JSON offer metadata and return an iterator over its rates."""
+        if IJSON_AVAILABLE:
+            return self._iter_json_offer_streaming(path)
+
+        logger.debug("ijson not available, loading JSON offer file in memory (use CSV offers to stream)")
+        with self._open_offer_file(path) as handle:
+            offer = json.load(handle)
+
+        metadata = {key: offer.get(key) for key in ('offerCode', 'version', 'publicationDate')}
+        products = {
+            sku: self._extract_json_product(product)
+            for sku, product in offer.get('products', {}).items()
+        }
+        terms = offer.get('terms', {})
+
+        def rows() -> Iterator[Dict[str, Any]]:
+            for term_type, sku_terms in terms.items():
+                yield from self._iter_json_terms(products, term_type, sku_terms.items())
+
+        return metadata, rows()
+
+    def _iter_json_offer_streaming(self, path: str) -> Tuple[Dict[str, Any], Iterator[Dict[str, Any]]]:
+        """Stream a JSON offer file with ijson, holding only compact product attributes."""
+        metadata = {}
+        with self._open_offer_file(path, 'rb') as handle:
+            for prefix, event, value in ijson.parse(handle):
+                if prefix in ('offerCode', 'version', 'publicationDate'):
+                    metadata[prefix] = value
+                elif prefix == 'products':
+                    break
+
+        def rows() -> Iterator[Dict[str, Any]]:
+            with self._open_offer_file(path, 'rb') as handle:
+                products = {
+                    sku: self._extract_json_product(product)
+                    for sku, product in ijson.kvitems(handle, 'products')
+                }
+            for term_type in ('OnDemand', 'Reserved'):
+                with self._open_offer_file(path, 'rb') as handle:
+                    yield from self._iter_json_terms(
+                        products, term_type, ijson.kvitems(handle, f'terms.{term_type}')
+                    )
+
+        return metadata, rows()
+
+    def _iter_json_terms(self, products: Dict[str, Dict[str, str]], term_type: str,
+                         sku_terms: Iterator[Tuple[str, Dict[str, Any]]]) -> Iterator[Dict[str, Any]]:
+        """Yield rate rows for each price dimension of each JSON offer term."""
+        for sku, offer_terms in sku_terms:
+            product = products.get(sku)
+            if product is None:
+                continue
+            for offer_term in offer_terms.values():
+                attributes = offer_term.get('termAttributes', {})
+                for dimension in offer_term.get('priceDimensions', {}).values():
+                    price = dimension.get('pricePerUnit', {}).get('USD')
+                    if price is None:
+                        continue
+                    row = self._build_rate_row(
+                        sku, dimension.get('rateCode', ''), product.get('service_code'), product,
+                        term_type, attributes.get('LeaseContractLength', ''),
+                        attributes.get('PurchaseOption', ''), attributes.get('OfferingClass', ''),
+                        dimension.get('unit', ''), price
+                    )
+                    if row:
+                        yield row
+
+    def _extract_json_product(self, product: Dict[str, Any]) -> Dict[str, str]:
+        """Keep only the product attributes needed for lookups."""
+        attributes = product.get('attributes', {})
+        extracted = {key: attributes.get(name, '') for key, name in _JSON_ATTRIBUTES.items()}
+        extracted['service_code'] = attributes.get('servicecode')
+        return extracted
+
+    def _build_rate_row(self, sku: str, rate_code: str, service_code: Optional[str],
+                        product: Dict[str, str], term_type: str, lease_contract_length: str,
+                        purchase_option: str, offering_class: str, unit: str,
+                        price: Any) -> Optional[Dict[str, Any]]:
+        """Normalize one rate, dropping variants that lookups never select."""
+        if product.get('capacity_status') not in ('', 'Used', None):
+            return None
+        if product.get('pre_installed_sw') not in ('', 'NA', None):
+            return None
+        if product.get('license_model') == 'Bring your own license':
+            return None
+
+        region = product.get('region_code') or _LOCATION_REGIONS.get(product.get('location', ''))
+        if not region:
+            return None
+
+        try:
+            price_per_unit = float(price)
+        except (TypeError, ValueError):
+            return None
+
+        return {
+            'sku': sku,
+            'rate_code': rate_code,
+            'service_code': service_code,
+            'region': region,
+            'instance_type': product.get('instance_type') or '',
+            'operating_system': product.get('operating_system') or '',
+            'tenancy': product.get('tenancy') or '',
+            'term_type': term_type,
+            'lease_contract_length': lease_contract_length or '',
+            'purchase_option': purchase_option or '',
+            'offering_class': offering_class or '',
+            'database_engine': product.get('database_engine') or '',
+            'deployment_option': product.get('deployment_option') or '',
+            'volume_type': product.get('volume_type') or '',
+            'unit': unit or '',
+            'price_per_unit': price_per_unit,
+            'offer_version': None
+        }
+
+
+def main():
+    """Ingest bulk Price List offer files into a local price catalog."""
+    parser = argparse.ArgumentParser(description='Ingest AWS bulk Price List offer files')
+    parser.add_argument('offer_files', nargs='+', help='Local offer files (.json, .csv, optionally .gz)')
+    parser.add_argument('--db', default='pricing_catalog.db', help='Price catalog database path')
+    parser.add_argument('--service-code', help='Offer code when not declared in the file')
+    parser.add_argument('--region', help='Only ingest rates for this region')
+    parser.add_argument('--force', action='store_true', help='Re-ingest unchanged offer versions')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+    catalog = PriceCatalog(args.db)
+    try:
+        for offer_file in args.offer_files:
+            summary = catalog.ingest_offer_file(offer_file, args.service_code, args.region, args.force)
+            print(json.dumps(summary, indent=2))
+    finally:
+        catalog.close()
+
+
+if __name__ == '__main__':
+    main()
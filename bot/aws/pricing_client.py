@@ -23,6 +23,10 @@ from enum import Enum
 import boto3
 from botocore.exceptions import ClientError
 
+from utils.pricing_cache import PricingCache, shared_pricing_cache
+from utils.savings_plan_simulator import SavingsPlanSimulator, SAVINGS_PLAN_DISCOUNT_RATES, DEFAULT_DISCOUNT_RATE
+from .price_catalog import PriceCatalog, REGION_LOCATION_NAMES
+
 logger = logging.getLogger(__name__)
 
 
@@ -56,17 +60,34 @@ class PricingClient:
     - Reserved Instance and Savings Plans pricing analysis
     """
     
-    def __init__(self, aws_config, default_currency: Currency = Currency.USD):
+    # Price List API filter fields answered by the offline price catalog
+    CATALOG_FILTER_FIELDS = {
+        'instanceType': 'instance_type',
+        'operatingSystem': 'operating_system',
+        'tenancy': 'tenancy',
+        'leaseContractLength': 'lease_contract_length',
+        'purchaseOption': 'purchase_option',
+        'offeringClass': 'offering_class',
+        'databaseEngine': 'database_engine',
+        'deploymentOption': 'deployment_option'
+    }
+    
+    def __init__(self, aws_config, default_currency: Currency = Currency.USD,
+                 price_catalog: Optional[PriceCatalog] = None,
+                 pricing_cache: Optional[PricingCache] = None):
         """
         Initialize pricing client.
         
         Args:
             aws_config: AWSConfig instance for client management
             default_currency: Default currency for pricing calculations
+            price_catalog: Optional offline price catalog queried before the Price List API
+            pricing_cache: Cache for pricing data (defaults to the shared pricing cache)
         """
         self.aws_config = aws_config
         self.default_currency = default_currency
-        self.pricing_cache = {}
+        self.price_catalog = price_catalog
+        self.pricing_cache = pricing_cache if pricing_cache is not None else shared_pricing_cache
         self.exchange_rate_cache = {}
         self.cache_ttl = 3600  # 1 hour cache TTL for pricing data
         
@@ -97,28 +118,33 @@ class PricingClient:
         """
         logger.info(f"Getting {pricing_model.value} pricing for {service_code} in {region}")
         
-        cache_key = f"pricing:{service_code}:{region}:{pricing_model.value}:{hash(str(filters))}"
+        cache_key = PricingCache.make_key('pricing', service_code, region, pricing_model.value, filters)
         
         # Check cache first
-        if self._is_cache_valid(cache_key):
+        cached_pricing = self.pricing_cache.get(cache_key)
+        if cached_pricing is not None:
             logger.debug(f"Using cached pricing for {service_code}")
-            return self.pricing_cache[cache_key]['data']
+            return cached_pricing
         
         try:
-            # Build pricing filters
-            pricing_filters = self._build_pricing_filters(service_code, region, filters, pricing_model)
-            
-            # Query AWS Price List API
-            response = self.aws_config.execute_with_retry(
-                self.pricing_client.get_products,
-                'pricing',
-                ServiceCode=service_code,
-                Filters=pricing_filters,
-                MaxResults=100
-            )
+            # Serve from the offline price catalog when it holds a matching rate
+            pricing_data = self._get_catalog_pricing(service_code, region, filters, pricing_model)
             
-            # Parse and enhance pricing data
-            pricing_data = self._parse_pricing_response(response, service_code, region, pricing_model)
+            if not pricing_data:
+                # Build pricing filters
+                pricing_filters = self._build_pricing_filters(service_code, region, filters, pricing_model)
+                
+                # Query AWS Price List API
+                response = self.aws_config.execute_with_retry(
+                    self.pricing_client.get_products,
+                    'pricing',
+                    ServiceCode=service_code,
+                    Filters=pricing_filters,
+                    MaxResults=100
+                )
+                
+                # Parse and enhance pricing data
+                pricing_data = self._parse_pricing_response(response, service_code, region, pricing_model)
             
             # Add regional comparison if available and not already in a regional comparison call
             # TEMPORARILY DISABLED TO PREVENT RECURSION - WILL FIX IN FUTURE VERSION
@@ -134,11 +160,7 @@ class PricingClient:
                 )
             
             # Cache the results
-            self.pricing_cache[cache_key] = {
-                'data': pricing_data,
-                'timestamp': datetime.now(timezone.utc),
-                'ttl': self.cache_ttl
-            }
+            self.pricing_cache.set(cache_key, pricing_data, ttl=self.cache_ttl)
             
             logger.debug(f"Cached pricing data for {service_code} in {region}")
             return pricing_data
@@ -277,7 +299,8 @@ class PricingClient:
     def get_savings_plans_pricing(self, compute_type: str = 'EC2Instance',
                                 commitment_amount: float = 100.0,
                                 term_years: int = 1,
-                                payment_option: str = 'No Upfront') -> Dict[str, Any]:
+                                payment_option: str = 'No Upfront',
+                                hourly_spend: Optional[Dict[str, List[float]]] = None) -> Dict[str, Any]:
         """
         Get Savings Plans pricing analysis.
         
@@ -286,6 +309,8 @@ class PricingClient:
             commitment_amount: Hourly commitment amount in USD
             term_years: Commitment term (1 or 3 years)
             payment_option: Payment option ('No Upfront', 'Partial Upfront', 'All Upfront')
+            hourly_spend: Optional historical hourly On-Demand spend by compute type to
+                replay against the commitment
             
         Returns:
             Savings Plans pricing analysis
@@ -306,6 +331,15 @@ class PricingClient:
                 commitment_amount, compute_type
             )
             
+            # Replay historical usage for actual coverage, utilization and net savings
+            if hourly_spend:
+                simulation = SavingsPlanSimulator(term_years).simulate(hourly_spend, [commitment_amount])
+                sp_analysis['historicalSimulation'] = {
+                    **simulation['commitments'][0],
+                    'hours': simulation['hours'],
+                    'onDemandCost': simulation['onDemandCost']
+                }
+            
             return sp_analysis
             
         except Exception as e:
@@ -698,24 +732,80 @@ class PricingClient:
     
     def _get_location_name(self, region: str) -> str:
         """Convert AWS region code to location name for Price List API."""
-        location_map = {
-            'us-east-1': 'US East (N. Virginia)',
-            'us-east-2': 'US East (Ohio)',
-            'us-west-1': 'US West (N. California)',
-            'us-west-2': 'US West (Oregon)',
-            'eu-west-1': 'Europe (Ireland)',
-            'eu-west-2': 'Europe (London)',
-            'eu-central-1': 'Europe (Frankfurt)',
-            'eu-north-1': 'Europe (Stockholm)',
-            'ap-southeast-1': 'Asia Pacific (Singapore)',
-            'ap-southeast-2': 'Asia Pacific (Sydney)',
-            'ap-northeast-1': 'Asia Pacific (Tokyo)',
-            'ap-northeast-2': 'Asia Pacific (Seoul)',
-            'ap-south-1': 'Asia Pacific (Mumbai)',
-            'ca-central-1': 'Canada (Central)',
-            'sa-east-1': 'South America (São Paulo)'
+        return REGION_LOCATION_NAMES.get(region, region)
+    
+    def _get_catalog_pricing(self, service_code: str, region: str,
+                             filters: Optional[List[Dict[str, Any]]],
+                             pricing_model: PricingModel) -> Dict[str, Any]:
+        """Look up pricing in the offline price catalog using Price List API style filters."""
+        if self.price_catalog is None or pricing_model not in (PricingModel.ON_DEMAND, PricingModel.RESERVED):
+            return {}
+        
+        attributes = {'operating_system': 'Linux', 'tenancy': 'Shared'}
+        for pricing_filter in filters or []:
+            field = self.CATALOG_FILTER_FIELDS.get(pricing_filter.get('Field'))
+            if field:
+                attributes[field] = pricing_filter.get('Value')
+        
+        instance_type = attributes.get('instance_type')
+        if not instance_type:
+            return {}
+        
+        pricing_data = {
+            'serviceCode': service_code,
+            'region': region,
+            'pricingModel': pricing_model.value,
+            'productAttributes': attributes,
+            'currency': 'USD',
+            'lastUpdated': datetime.now(timezone.utc).isoformat(),
+            'source': 'price_catalog'
         }
-        return location_map.get(region, region)
+        
+        if service_code == 'AmazonRDS':
+            hourly_price = self.price_catalog.get_database_rate(
+                region, instance_type,
+                attributes.get('database_engine', 'MySQL'),
+                attributes.get('deployment_option', 'Single-AZ')
+            )
+            if hourly_price is None:
+                return {}
+            pricing_data.update({'hourlyPrice': hourly_price, 'priceUnit': 'Hrs'})
+            return pricing_data
+        
+        rate_attributes = {
+            'operating_system': attributes['operating_system'],
+            'tenancy': attributes['tenancy']
+        }
+        
+        if pricing_model == PricingModel.ON_DEMAND:
+            hourly_price = self.price_catalog.get_rate(service_code, region, instance_type, **rate_attributes)
+            if hourly_price is None:
+                return {}
+            pricing_data.update({'hourlyPrice': hourly_price, 'priceUnit': 'Hrs'})
+            return pricing_data
+        
+        reserved_attributes = {
+            'term_type': 'Reserved',
+            'lease_contract_length': attributes.get('lease_contract_length', '1yr'),
+            'purchase_option': attributes.get('purchase_option', 'No Upfront'),
+            'offering_class': attributes.get('offering_class', 'standard'),
+            **rate_attributes
+        }
+        reserved_hourly = self.price_catalog.get_rate(service_code, region, instance_type, **reserved_attributes)
+        upfront_cost = self.price_catalog.get_rate(
+            service_code, region, instance_type, unit='Quantity', **reserved_attributes
+        )
+        if reserved_hourly is None and upfront_cost is None:
+            return {}
+        
+        pricing_data.update({
+            'leaseContractLength': reserved_attributes['lease_contract_length'],
+            'offeringClass': reserved_attributes['offering_class'],
+            'purchaseOption': reserved_attributes['purchase_option'],
+            'reservedHourlyPrice': reserved_hourly or 0.0,
+            'upfrontCost': upfront_cost or 0.0
+        })
+        return pricing_data
     
     def _get_regional_pricing_comparison(self, service_code: str,
                                        filters: Optional[List[Dict[str, Any]]],
@@ -1012,16 +1102,6 @@ class PricingClient:
         rate_key = f"{from_currency.value}_{to_currency.value}"
         return self.exchange_rates.get(rate_key, 1.0)
     
-    def _is_cache_valid(self, cache_key: str) -> bool:
-        """Check if cached pricing data is still valid."""
-        if cache_key not in self.pricing_cache:
-            return False
-        
-        cache_entry = self.pricing_cache[cache_key]
-        cache_age = (datetime.now(timezone.utc) - cache_entry['timestamp']).total_seconds()
-        
-        return cache_age < cache_entry['ttl']
-    
     def _get_fallback_pricing(self, service_code: str, region: str, pricing_model: PricingModel) -> Dict[str, Any]:
         """Get fallback pricing when API calls fail."""
         logger.warning(f"Using fallback pricing for {service_code} in {region}")
@@ -1063,13 +1143,7 @@ class PricingClient:
     def _calculate_savings_plans_analysis(self, compute_type: str, commitment_amount: float,
                                         term_years: int, payment_option: str) -> Dict[str, Any]:
         """Calculate Savings Plans analysis (simplified implementation)."""
-        # Mock Savings Plans discount rates
-        discount_rates = {
-            1: {'EC2Instance': 0.17, 'Fargate': 0.20, 'Lambda': 0.17},
-            3: {'EC2Instance': 0.28, 'Fargate': 0.35, 'Lambda': 0.28}
-        }
-        
-        discount_rate = discount_rates.get(term_years, {}).get(compute_type, 0.15)
+        discount_rate = SAVINGS_PLAN_DISCOUNT_RATES.get(term_years, {}).get(compute_type, DEFAULT_DISCOUNT_RATE)
         
         # Calculate savings
         on_demand_equivalent = commitment_amount / (1 - discount_rate)
@@ -1574,4 +1648,4 @@ class PricingClient:
             },
             'currency': 'USD',
             'fallback': True
-        }
\ No newline at end of file
+        }
\ No newline at end of file
@@ -17,22 +17,26 @@ from datetime import datetime, timedelta
 from typing import Dict, List, Any, Optional
 from botocore.exceptions import ClientError
 
+from .price_catalog import PriceCatalog
+
 logger = logging.getLogger(__name__)
 
 
 class EBSScanner:
     """Scans EBS volumes for cost optimization opportunities."""
     
-    def __init__(self, aws_config, region: str = 'us-east-1'):
+    def __init__(self, aws_config, region: str = 'us-east-1', price_catalog: Optional[PriceCatalog] = None):
         """
         Initialize EBS scanner.
         
         Args:
             aws_config: AWSConfig instance for client management
             region: AWS region to scan
+            price_catalog: Optional offline price catalog for volume pricing
         """
         self.aws_config = aws_config
         self.region = region
+        self.price_catalog = price_catalog
         self.ec2_client = aws_config.get_client('ec2')
         self.cloudwatch_client = aws_config.get_client('cloudwatch')
         
@@ -711,21 +715,41 @@ class EBSScanner:
             'standard': 0.05
         }
         
-        storage_cost = size * storage_costs.get(volume_type, 0.10)
+        storage_cost = size * self._get_catalog_rate(volume_type, 'GB-Mo', storage_costs.get(volume_type, 0.10))
         
         # IOPS costs (for io1/io2)
         if volume_type in ['io1', 'io2'] and iops > 0:
-            iops_cost = iops * 0.065  # $0.065 per provisioned IOPS per month
+            iops_cost = iops * self._get_catalog_rate(volume_type, 'IOPS-Mo', 0.065)  # $0.065 per provisioned IOPS per month
             storage_cost += iops_cost
         
         # Throughput costs (for gp3)
         if volume_type == 'gp3' and throughput > 125:  # Base throughput is 125 MB/s
             additional_throughput = throughput - 125
-            throughput_cost = additional_throughput * 0.04  # $0.04 per MB/s per month
+            # Catalog throughput is priced per GiBps-month
+            throughput_rate = self._get_catalog_rate(volume_type, 'GiBps-mo', 0.04 * 1024) / 1024
+            throughput_cost = additional_throughput * throughput_rate  # $0.04 per MB/s per month
             storage_cost += throughput_cost
         
         return storage_cost
     
+    def _get_catalog_rate(self, volume_type: str, unit: str, default_rate: float) -> float:
+        """
+        Get an EBS rate from the price catalog, falling back to the default rate.
+        
+        Args:
+            volume_type: EBS volume type
+            unit: Price List unit ('GB-Mo', 'IOPS-Mo', 'GiBps-mo')
+            default_rate: Approximate us-east-1 rate used when the catalog has no match
+            
+        Returns:
+            Monthly rate in USD per unit
+        """
+        if self.price_catalog is None:
+            return default_rate
+        
+        rate = self.price_catalog.get_storage_rate(self.region, volume_type, unit)
+        return rate if rate is not None else default_rate
+    
     def _estimate_snapshot_cost(self, volume_size: int) -> float:
         """
         Estimate monthly cost for an EBS snapshot.
@@ -865,4 +889,4 @@ class EBSScanner:
         else:
             summary['savingsPercentage'] = 0.0
         
-        return summary
\ No newline at end of file
+        return summary
\ No newline at end of file
@@ -14,10 +14,14 @@ Requirements: 1.1, 1.2, 3.1, 2.4
 
 import logging
 import boto3
-from datetime import datetime, timedelta
-from typing import Dict, List, Any, Optional, Tuple
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Any, Optional, Tuple, Iterable
 from botocore.exceptions import ClientError
 import statistics
+import numpy as np
+
+from utils.pricing_cache import PricingCache, shared_pricing_cache
+from .price_catalog import PriceCatalog
 
 logger = logging.getLogger(__name__)
 
@@ -37,7 +41,31 @@ class EC2Scanner:
         'network_threshold_mb': 100,    # Network usage threshold in MB/hour
     }
     
-    def __init__(self, aws_config, region: str = 'us-east-1', thresholds: Dict[str, float] = None):
+    # EC2 platform values mapped to Price List operating systems
+    PLATFORM_OPERATING_SYSTEMS = {
+        'linux': 'Linux',
+        'windows': 'Windows',
+        'rhel': 'RHEL',
+        'suse': 'SUSE'
+    }
+    
+    # Major AWS regions for cost comparison with approximate pricing multipliers
+    REGIONAL_PRICE_MULTIPLIERS = {
+        'us-east-1': 1.0,      # Base region
+        'us-east-2': 0.95,     # Slightly cheaper
+        'us-west-1': 1.15,     # More expensive
+        'us-west-2': 1.05,     # Slightly more expensive
+        'eu-west-1': 1.10,     # Europe premium
+        'eu-west-2': 1.12,     # UK premium
+        'eu-central-1': 1.08,  # Germany
+        'ap-southeast-1': 1.20, # Singapore premium
+        'ap-southeast-2': 1.18, # Sydney
+        'ap-northeast-1': 1.15, # Tokyo
+    }
+    
+    def __init__(self, aws_config, region: str = 'us-east-1', thresholds: Dict[str, float] = None,
+                 price_catalog: Optional[PriceCatalog] = None,
+                 pricing_cache: Optional[PricingCache] = None):
         """
         Initialize EC2 scanner.
         
@@ -45,9 +73,12 @@ class EC2Scanner:
             aws_config: AWSConfig instance for client management
             region: AWS region to scan
             thresholds: Custom thresholds for optimization analysis
+            price_catalog: Optional offline price catalog for instance pricing
+            pricing_cache: Cache for regional pricing (defaults to the shared pricing cache)
         """
         self.aws_config = aws_config
         self.region = region
+        self.price_catalog = price_catalog
         self.ec2_client = aws_config.get_client('ec2')
         self.cloudwatch_client = aws_config.get_client('cloudwatch')
         self.pricing_client = aws_config.get_client('pricing', region='us-east-1')  # Pricing API only in us-east-1
@@ -56,7 +87,12 @@ class EC2Scanner:
         self.thresholds = {**self.DEFAULT_THRESHOLDS, **(thresholds or {})}
         
         # Regional pricing cache
-        self.regional_pricing_cache = {}
+        self.regional_pricing_cache = pricing_cache if pricing_cache is not None else shared_pricing_cache
+        
+        # Region x (instance type, platform) monthly cost matrix, built once per scan
+        self._comparison_regions = list(self.REGIONAL_PRICE_MULTIPLIERS.keys())
+        self._regional_multipliers = np.array(list(self.REGIONAL_PRICE_MULTIPLIERS.values()))
+        self._reset_regional_price_matrix()
         
         logger.info(f"EC2 Scanner initialized for region {region}")
         logger.debug(f"Using thresholds: {self.thresholds}")
@@ -93,18 +129,30 @@ class EC2Scanner:
         try:
             # Get all instances
             paginator = self.ec2_client.get_paginator('describe_instances')
+            raw_instances = [
+                instance
+                for page in paginator.paginate()
+                for reservation in page['Reservations']
+                for instance in reservation['Instances']
+            ]
             
-            for page in paginator.paginate():
-                for reservation in page['Reservations']:
-                    for instance in reservation['Instances']:
-                        instance_data = self._analyze_instance(
-                            instance, 
-                            time_range_hours, 
-                            metric_period,
-                            include_regional_comparison
-                        )
-                        if instance_data:
-                            instances.append(instance_data)
+            # Price every distinct (instance type, platform) across regions in one pass
+            if include_regional_comparison:
+                self._reset_regional_price_matrix()
+                self._build_regional_price_matrix(
+                    (instance.get('InstanceType', 'unknown'), instance.get('Platform', 'linux'))
+                    for instance in raw_instances
+                )
+            
+            for instance in raw_instances:
+                instance_data = self._analyze_instance(
+                    instance, 
+                    time_range_hours, 
+                    metric_period,
+                    include_regional_comparison
+                )
+                if instance_data:
+                    instances.append(instance_data)
             
             logger.info(f"Scanned {len(instances)} EC2 instances")
             
@@ -170,6 +218,8 @@ class EC2Scanner:
             if instance_data['state'] == 'running':
                 metrics = self._get_enhanced_instance_metrics(instance_id, time_range_hours, metric_period)
                 instance_data['utilizationMetrics'] = metrics
+                # Instances running per hour, for commitment (RI/Savings Plan) sizing
+                instance_data['hourlyUsage'] = metrics.get('hourlyUsage', [])
                 
                 # Calculate optimization opportunities with enhanced analysis
                 opportunities = self._identify_enhanced_optimization_opportunities(instance_data, metrics)
@@ -237,6 +287,7 @@ class EC2Scanner:
             'diskWriteBytes': [],
             'networkPacketsIn': [],
             'networkPacketsOut': [],
+            'hourlyUsage': [],
             'period': f"{time_range_hours} hours",
             'dataPoints': 0,
             'metricPeriod': metric_period
@@ -264,6 +315,9 @@ class EC2Scanner:
                 }
                 for dp in cpu_datapoints
             ]
+            metrics['hourlyUsage'] = self._build_hourly_usage(
+                cpu_datapoints, start_time, time_range_hours, metric_period
+            )
             
             # Memory Utilization (requires CloudWatch agent)
             try:
@@ -480,6 +534,37 @@ class EC2Scanner:
         
         return metrics
     
+    @staticmethod
+    def _build_hourly_usage(datapoints: List[Dict[str, Any]],
+                            start_time: datetime,
+                            time_range_hours: int,
+                            metric_period: int) -> List[float]:
+        """
+        Hours in the metric window during which the instance was running.
+        
+        CloudWatch reports instance metrics only while the instance runs, so
+        every hour covered by a CPU datapoint counts as one running hour.
+        
+        Args:
+            datapoints: CPUUtilization datapoints
+            start_time: Start of the metric window (naive UTC)
+            time_range_hours: Length of the metric window in hours
+            metric_period: CloudWatch metric period in seconds
+            
+        Returns:
+            One value per hour of the window, 1.0 when running and 0.0 otherwise
+        """
+        usage = [0.0] * time_range_hours
+        hours_per_datapoint = max(1, metric_period // 3600)
+        for datapoint in datapoints:
+            timestamp = datapoint['Timestamp']
+            if timestamp.tzinfo is not None:
+                timestamp = timestamp.astimezone(timezone.utc).replace(tzinfo=None)
+            first_hour = int((timestamp - start_time).total_seconds() // 3600)
+            for hour in range(max(0, first_hour), min(time_range_hours, first_hour + hours_per_datapoint)):
+                usage[hour] = 1.0
+        return usage
+    
     def _identify_enhanced_optimization_opportunities(self, 
                                                      instance_data: Dict[str, Any], 
                                                      metrics: Dict[str, Any]) -> List[Dict[str, Any]]:
@@ -868,15 +953,58 @@ class EC2Scanner:
             
             # Find cheapest region
             if regional_costs:
-                cheapest_region = min(regional_costs.items(), key=lambda x: x[1]['monthlyCost'])
+                column = self._regional_price_matrix[:, self._regional_price_columns[(instance_type, platform)]]
+                cheapest_index = int(column.argmin())
+                cheapest_cost = float(column[cheapest_index])
                 cost_analysis['cheapestRegion'] = {
-                    'region': cheapest_region[0],
-                    'monthlyCost': cheapest_region[1]['monthlyCost'],
-                    'potentialSavings': cost_analysis['currentCost'] - cheapest_region[1]['monthlyCost']
+                    'region': self._comparison_regions[cheapest_index],
+                    'monthlyCost': cheapest_cost,
+                    'potentialSavings': cost_analysis['currentCost'] - cheapest_cost
                 }
         
         return cost_analysis
     
+    def _reset_regional_price_matrix(self) -> None:
+        """Drop the regional price matrix so the next scan reprices every type."""
+        self._regional_price_columns: Dict[Tuple[str, str], int] = {}
+        self._regional_base_costs = np.empty(0)
+        self._regional_price_matrix = np.empty((len(self._comparison_regions), 0))
+    
+    def _build_regional_price_matrix(self, type_platforms: Iterable[Tuple[str, str]]) -> None:
+        """
+        Add region x type price columns for (instance type, platform) pairs not yet priced.
+        
+        Each distinct pair is priced once and broadcast against the regional
+        multipliers, so the per-instance comparison is a column lookup.
+        
+        Args:
+            type_platforms: (instance type, platform) pairs to price
+        """
+        new_pairs = []
+        for pair in type_platforms:
+            if pair not in self._regional_price_columns:
+                self._regional_price_columns[pair] = self._regional_base_costs.size + len(new_pairs)
+                new_pairs.append(pair)
+        
+        if not new_pairs:
+            return
+        
+        # Estimate cost in the scanned region (simplified - would use AWS Price List API in production)
+        base_costs = np.array([
+            self.regional_pricing_cache.get_or_compute(
+                PricingCache.make_key('ec2_regional_pricing', self.region, instance_type, platform),
+                lambda: self._estimate_instance_cost(instance_type, platform)
+            )
+            for instance_type, platform in new_pairs
+        ], dtype=float)
+        
+        self._regional_base_costs = np.concatenate([self._regional_base_costs, base_costs])
+        self._regional_price_matrix = np.hstack([
+            self._regional_price_matrix,
+            self._regional_multipliers[:, np.newaxis] * base_costs[np.newaxis, :]
+        ])
+        logger.debug(f"Priced {len(new_pairs)} instance types across {len(self._comparison_regions)} regions")
+    
     def _get_regional_cost_comparison(self, instance_type: str, platform: str = 'linux') -> Dict[str, Dict[str, Any]]:
         """
         Get cost comparison across AWS regions for an instance type.
@@ -888,57 +1016,19 @@ class EC2Scanner:
         Returns:
             Dictionary with regional cost comparison
         """
-        # Major AWS regions for cost comparison
-        regions = [
-            'us-east-1', 'us-east-2', 'us-west-1', 'us-west-2',
-            'eu-west-1', 'eu-west-2', 'eu-central-1',
-            'ap-southeast-1', 'ap-southeast-2', 'ap-northeast-1'
-        ]
+        self._build_regional_price_matrix([(instance_type, platform)])
+        column = self._regional_price_matrix[:, self._regional_price_columns[(instance_type, platform)]]
         
-        regional_costs = {}
-        
-        for region in regions:
-            try:
-                # Use cached pricing if available
-                cache_key = f"{region}_{instance_type}_{platform}"
-                if cache_key in self.regional_pricing_cache:
-                    regional_costs[region] = self.regional_pricing_cache[cache_key]
-                    continue
-                
-                # Estimate cost for region (simplified - would use AWS Price List API in production)
-                base_cost = self._estimate_instance_cost(instance_type, platform)
-                
-                # Regional pricing multipliers (approximate)
-                regional_multipliers = {
-                    'us-east-1': 1.0,      # Base region
-                    'us-east-2': 0.95,     # Slightly cheaper
-                    'us-west-1': 1.15,     # More expensive
-                    'us-west-2': 1.05,     # Slightly more expensive
-                    'eu-west-1': 1.10,     # Europe premium
-                    'eu-west-2': 1.12,     # UK premium
-                    'eu-central-1': 1.08,  # Germany
-                    'ap-southeast-1': 1.20, # Singapore premium
-                    'ap-southeast-2': 1.18, # Sydney
-                    'ap-northeast-1': 1.15, # Tokyo
-                }
-                
-                multiplier = regional_multipliers.get(region, 1.0)
-                regional_cost = base_cost * multiplier
-                
-                cost_data = {
-                    'monthlyCost': regional_cost,
-                    'multiplier': multiplier,
-                    'currency': 'USD'
-                }
-                
-                regional_costs[region] = cost_data
-                self.regional_pricing_cache[cache_key] = cost_data
-                
-            except Exception as e:
-                logger.debug(f"Failed to get pricing for {region}: {e}")
-                continue
-        
-        return regional_costs
+        return {
+            region: {
+                'monthlyCost': monthly_cost,
+                'multiplier': multiplier,
+                'currency': 'USD'
+            }
+            for region, monthly_cost, multiplier in zip(
+                self._comparison_regions, column.tolist(), self._regional_multipliers.tolist()
+            )
+        }
     
     def _generate_regional_cost_summary(self, instances: List[Dict[str, Any]]) -> Dict[str, Any]:
         """
@@ -950,36 +1040,50 @@ class EC2Scanner:
         Returns:
             Regional cost summary
         """
+        compared = [instance for instance in instances if 'regionalComparison' in instance]
         regional_summary = {}
-        total_current_cost = 0
-        total_potential_savings = 0
         
-        for instance in instances:
-            if 'regionalComparison' in instance:
-                total_current_cost += instance.get('currentCost', 0)
-                
-                cheapest_region_data = instance.get('cheapestRegion', {})
-                if cheapest_region_data:
-                    potential_savings = cheapest_region_data.get('potentialSavings', 0)
-                    if potential_savings > 0:
-                        total_potential_savings += potential_savings
-                        
-                        region = cheapest_region_data['region']
-                        if region not in regional_summary:
-                            regional_summary[region] = {
-                                'instanceCount': 0,
-                                'totalSavings': 0,
-                                'instances': []
-                            }
-                        
-                        regional_summary[region]['instanceCount'] += 1
-                        regional_summary[region]['totalSavings'] += potential_savings
-                        regional_summary[region]['instances'].append({
-                            'instanceId': instance['resourceId'],
-                            'instanceType': instance['instanceType'],
-                            'currentCost': instance.get('currentCost', 0),
-                            'potentialSavings': potential_savings
-                        })
+        if not compared:
+            return {
+                'totalCurrentCost': 0,
+                'totalPotentialSavings': 0,
+                'savingsPercentage': 0,
+                'recommendedRegions': regional_summary
+            }
+        
+        pairs = [(instance['instanceType'], instance.get('platform', 'linux')) for instance in compared]
+        self._build_regional_price_matrix(pairs)
+        columns = np.array([self._regional_price_columns[pair] for pair in pairs])
+        
+        # Cheapest region and savings for every instance, read from the matrix
+        prices = self._regional_price_matrix[:, columns]
+        cheapest_indices = prices.argmin(axis=0)
+        savings = self._regional_base_costs[columns] - prices[cheapest_indices, np.arange(len(compared))]
+        current_costs = np.array([instance.get('currentCost', 0) for instance in compared], dtype=float)
+        
+        total_current_cost = float(current_costs.sum())
+        total_potential_savings = float(savings[savings > 0].sum())
+        
+        for position in np.flatnonzero(savings > 0):
+            instance = compared[position]
+            region = self._comparison_regions[cheapest_indices[position]]
+            potential_savings = float(savings[position])
+            
+            if region not in regional_summary:
+                regional_summary[region] = {
+                    'instanceCount': 0,
+                    'totalSavings': 0,
+                    'instances': []
+                }
+            
+            regional_summary[region]['instanceCount'] += 1
+            regional_summary[region]['totalSavings'] += potential_savings
+            regional_summary[region]['instances'].append({
+                'instanceId': instance['resourceId'],
+                'instanceType': instance['instanceType'],
+                'currentCost': instance.get('currentCost', 0),
+                'potentialSavings': potential_savings
+            })
         
         return {
             'totalCurrentCost': total_current_cost,
@@ -999,6 +1103,14 @@ class EC2Scanner:
         Returns:
             Estimated monthly cost in USD
         """
+        if self.price_catalog is not None:
+            hourly_rate = self.price_catalog.get_rate(
+                'AmazonEC2', self.region, instance_type,
+                operating_system=self.PLATFORM_OPERATING_SYSTEMS.get(platform, 'Linux')
+            )
+            if hourly_rate is not None:
+                return round(hourly_rate * 730, 2)
+        
         # Enhanced cost estimation with more instance types and current pricing
         # These are approximate costs for us-east-1 region (as of 2024)
         
@@ -1297,4 +1409,4 @@ class EC2Scanner:
             Optimization summary (calls enhanced version)
         """
         # Delegate to enhanced method for backward compatibility
-        return self.get_enhanced_optimization_summary(instances)
\ No newline at end of file
+        return self.get_enhanced_optimization_summary(instances)
\ No newline at end of file
@@ -17,22 +17,35 @@ from datetime import datetime, timedelta
 from typing import Dict, List, Any, Optional
 from botocore.exceptions import ClientError
 
+from .price_catalog import PriceCatalog
+
 logger = logging.getLogger(__name__)
 
 
 class RDSScanner:
     """Scans RDS database instances for cost optimization opportunities."""
     
-    def __init__(self, aws_config, region: str = 'us-east-1'):
+    # RDS engine identifiers mapped to Price List database engines
+    PRICE_LIST_ENGINES = {
+        'mysql': 'MySQL',
+        'postgres': 'PostgreSQL',
+        'mariadb': 'MariaDB',
+        'aurora-mysql': 'Aurora MySQL',
+        'aurora-postgresql': 'Aurora PostgreSQL'
+    }
+    
+    def __init__(self, aws_config, region: str = 'us-east-1', price_catalog: Optional[PriceCatalog] = None):
         """
         Initialize RDS scanner.
         
         Args:
             aws_config: AWSConfig instance for client management
             region: AWS region to scan
+            price_catalog: Optional offline price catalog for instance pricing
         """
         self.aws_config = aws_config
         self.region = region
+        self.price_catalog = price_catalog
         self.rds_client = aws_config.get_client('rds')
         self.cloudwatch_client = aws_config.get_client('cloudwatch')
         
@@ -582,9 +595,6 @@ class RDSScanner:
             'db.r5.4xlarge': 1845.50,
         }
         
-        # Base instance cost
-        instance_cost = instance_costs.get(instance_class, 200.0)  # Default fallback
-        
         # Storage cost (approximate)
         storage_cost_per_gb = {
             'gp2': 0.115,
@@ -593,6 +603,22 @@ class RDSScanner:
         }
         storage_cost = allocated_storage * storage_cost_per_gb.get(storage_type, 0.115) * 24 * 30 / 1000  # Monthly
         
+        # Catalog instance rates already reflect the deployment option and engine licensing;
+        # storage is not part of the hourly rate and Multi-AZ storage bills the standby copy too
+        catalog_engine = self.PRICE_LIST_ENGINES.get(engine)
+        if self.price_catalog is not None and catalog_engine:
+            hourly_rate = self.price_catalog.get_database_rate(
+                self.region, instance_class, catalog_engine,
+                'Multi-AZ' if multi_az else 'Single-AZ'
+            )
+            if hourly_rate is not None:
+                if multi_az:
+                    storage_cost *= 2
+                return hourly_rate * 730 + storage_cost
+        
+        # Base instance cost
+        instance_cost = instance_costs.get(instance_class, 200.0)  # Default fallback
+        
         # Multi-AZ doubles the cost
         if multi_az:
             instance_cost *= 2
@@ -777,4 +803,4 @@ class RDSScanner:
         # This would require additional API calls to check for cross-region automated backups
         backup_analysis['crossRegionBackupCosts'] = backup_analysis['backupCostEstimate'] * 0.1  # Estimate 10% for cross-region
         
-        return backup_analysis
\ No newline at end of file
+        return backup_analysis
\ No newline at end of file
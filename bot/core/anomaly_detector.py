@@ -15,7 +15,7 @@ Requirements: 4.1, 4.2, 4.3
 import logging
 import statistics
 from datetime import datetime, timedelta
-from typing import Dict, List, Any, Optional, Tuple
+from typing import Dict, List, Any, Optional, Tuple, Iterable
 from enum import Enum
 import json
 
@@ -165,6 +165,28 @@ class AnomalyDetector:
             'region': self.region
         }
     
+    def detect_anomalies_stream(self, cost_chunks: Iterable[Any], granularity: str = 'hourly',
+                                resources: List[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Detect cost anomalies from a stream of line item chunks.
+        
+        Chunks (e.g. CURReader.iter_chunks()) are reduced to one cost data
+        point per period as they arrive, so resource-level line items never
+        need to be held in memory at once.
+        
+        Args:
+            cost_chunks: Iterable of DataFrames or lists of cost records with timestamps
+            granularity: Period of each data point ('hourly' or 'daily')
+            resources: Optional resource data for root cause analysis
+            
+        Returns:
+            Comprehensive anomaly detection results
+        """
+        from aws.cur_reader import aggregate_cost_chunks
+        
+        cost_series = aggregate_cost_chunks(cost_chunks, granularity=granularity)
+        return self.detect_anomalies(cost_series, resources)
+    
     def _establish_baseline_patterns(self, cost_data: List[Dict[str, Any]]) -> Dict[str, Any]:
         """
         Establish baseline cost patterns using historical data.
@@ -22,6 +22,21 @@ import smtplib
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 
+try:
+    from utils.workflow_store import WorkflowStore
+    from utils.notification_batcher import NotificationBatcher
+except ImportError:
+    # Fallback for relative imports if run as a package
+    try:
+        from ..utils.workflow_store import WorkflowStore
+        from ..utils.notification_batcher import NotificationBatcher
+    except ImportError:
+        import sys
+        import os
+        sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+        from utils.workflow_store import WorkflowStore
+        from utils.notification_batcher import NotificationBatcher
+
 logger = logging.getLogger(__name__)
 
 
@@ -134,16 +149,35 @@ class ApprovalWorkflow:
     and integration with safety controls and optimization engines.
     """
     
-    def __init__(self, dry_run: bool = True):
+    def __init__(self,
+                 dry_run: bool = True,
+                 store_path: Optional[str] = None,
+                 notification_window_seconds: float = 0.0,
+                 max_pending_digests: int = 100):
         """
         Initialize approval workflow system.
         
         Args:
             dry_run: If True, no actual approvals will be processed
+            store_path: Optional SQLite file that persists workflows across restarts
+            notification_window_seconds: Coalesce notifications per recipient over this window (0 sends each immediately)
+            max_pending_digests: Maximum digests waiting for the background sender
         """
         self.dry_run = dry_run
-        self.active_workflows = {}
-        self.completed_workflows = {}
+        
+        # Workflows indexed by state and authority, with a timeout heap
+        self.workflow_store = WorkflowStore(store_path)
+        self.active_workflows = self.workflow_store.active
+        self.completed_workflows = self.workflow_store.completed
+        
+        # Digest delivery for stakeholder notifications
+        self.notification_batcher = None
+        if notification_window_seconds > 0:
+            self.notification_batcher = NotificationBatcher(
+                self._deliver_notification,
+                window_seconds=notification_window_seconds,
+                max_pending_digests=max_pending_digests
+            )
         self.approval_rules = self._initialize_approval_rules()
         self.risk_assessment_rules = self._initialize_risk_assessment_rules()
         
@@ -435,7 +469,7 @@ class ApprovalWorkflow:
         }
         
         # Store workflow
-        self.active_workflows[workflow_id] = workflow
+        workflow = self.workflow_store.add(workflow)
         
         # Send stakeholder notifications if required
         if approval_requirements.requires_stakeholder_notification:
@@ -457,6 +491,8 @@ class ApprovalWorkflow:
                     notification_type='approved'
                 )
         
+        self.workflow_store.save(workflow_id)
+        
         logger.info(
             f"Created approval workflow {workflow_id} for {optimization_data.get('resourceId', 'unknown')} "
             f"- Risk: {risk_level.value}, Authority: {approval_requirements.authority_required.value}"
@@ -611,9 +647,9 @@ class ApprovalWorkflow:
             }
         
         # Check for timeout
-        timeout_at = datetime.fromisoformat(workflow['timeout_at'])
-        if datetime.utcnow() > timeout_at:
+        if self.workflow_store.is_expired(workflow_id):
             workflow['state'] = WorkflowState.EXPIRED.value
+            self.workflow_store.save(workflow_id)
             return {
                 'success': False,
                 'message': f'Workflow {workflow_id} has expired'
@@ -651,6 +687,7 @@ class ApprovalWorkflow:
                 step['comments'] = comments or 'Approved'
                 break
         
+        self.workflow_store.save(workflow_id)
         logger.info(f"Workflow {workflow_id} approved by {approver}")
         
         # Send approval notification
@@ -690,8 +727,8 @@ class ApprovalWorkflow:
                 break
         
         # Move to completed workflows
-        self.completed_workflows[workflow_id] = workflow
-        del self.active_workflows[workflow_id]
+        self.workflow_store.complete(workflow_id)
+        self.workflow_store.save(workflow_id)
         
         logger.info(f"Workflow {workflow_id} rejected by {approver}")
         
@@ -732,12 +769,10 @@ class ApprovalWorkflow:
         
         # Check for timeout
         if workflow['state'] in [WorkflowState.CREATED.value, WorkflowState.UNDER_REVIEW.value, WorkflowState.AWAITING_APPROVAL.value]:
-            timeout_at = datetime.fromisoformat(workflow['timeout_at'])
-            if datetime.utcnow() > timeout_at:
+            if self.workflow_store.is_expired(workflow_id):
                 workflow['state'] = WorkflowState.EXPIRED.value
-                if workflow_id in self.active_workflows:
-                    self.completed_workflows[workflow_id] = workflow
-                    del self.active_workflows[workflow_id]
+                self.workflow_store.complete(workflow_id)
+                self.workflow_store.save(workflow_id)
         
         return {
             'success': True,
@@ -756,22 +791,26 @@ class ApprovalWorkflow:
             List of pending approval workflows
         """
         pending_workflows = []
+        expired_ids = []
+        current_time = datetime.utcnow()
         
-        for workflow_id, workflow in self.active_workflows.items():
-            if workflow['state'] in [WorkflowState.CREATED.value, WorkflowState.UNDER_REVIEW.value, WorkflowState.AWAITING_APPROVAL.value]:
-                # Check for timeout
-                timeout_at = datetime.fromisoformat(workflow['timeout_at'])
-                if datetime.utcnow() > timeout_at:
-                    workflow['state'] = WorkflowState.EXPIRED.value
-                    continue
-                
-                # Filter by authority level if specified
-                if authority_level:
-                    required_authority = workflow['approval_requirements']['authority_required']
-                    if required_authority != authority_level.value:
-                        continue
-                
-                pending_workflows.append(workflow)
+        # Read candidates from the (state, authority) index
+        candidates = self.workflow_store.find(
+            [WorkflowState.CREATED.value, WorkflowState.UNDER_REVIEW.value, WorkflowState.AWAITING_APPROVAL.value],
+            authority=authority_level.value if authority_level else None
+        )
+        
+        for workflow in candidates:
+            # Check for timeout
+            if self.workflow_store.is_expired(workflow['workflow_id'], current_time):
+                workflow['state'] = WorkflowState.EXPIRED.value
+                expired_ids.append(workflow['workflow_id'])
+                continue
+            
+            pending_workflows.append(workflow)
+        
+        if expired_ids:
+            self.workflow_store.save(*expired_ids)
         
         return pending_workflows
     
@@ -870,17 +909,17 @@ class ApprovalWorkflow:
         current_time = datetime.utcnow()
         
         expired_workflows = []
-        for workflow_id, workflow in list(self.active_workflows.items()):
-            timeout_at = datetime.fromisoformat(workflow['timeout_at'])
-            if current_time > timeout_at:
-                workflow['state'] = WorkflowState.EXPIRED.value
-                workflow['expired_at'] = current_time.isoformat()
-                
-                self.completed_workflows[workflow_id] = workflow
-                del self.active_workflows[workflow_id]
-                
-                expired_workflows.append(workflow_id)
-                expired_count += 1
+        for workflow in self.workflow_store.expired(current_time):
+            workflow_id = workflow['workflow_id']
+            workflow['state'] = WorkflowState.EXPIRED.value
+            workflow['expired_at'] = current_time.isoformat()
+            
+            self.workflow_store.complete(workflow_id)
+            
+            expired_workflows.append(workflow_id)
+            expired_count += 1
+        
+        self.workflow_store.save(*expired_workflows)
         
         logger.info(f"Cleaned up {expired_count} expired workflows")
         
@@ -938,18 +977,28 @@ class ApprovalWorkflow:
         sent_count = 0
         failed_recipients = []
         
-        for recipient in recipients:
-            try:
-                # In a real implementation, this would send actual emails
-                # For demo purposes, we'll just log the notification
+        if self.notification_batcher:
+            # Coalesced into one digest per recipient per window, sent in the background
+            for recipient in recipients:
                 logger.info(
-                    f"Sending {notification_type} notification to {recipient} "
+                    f"Queueing {notification_type} notification to {recipient} "
                     f"for workflow {workflow_id}: {notification_content['subject']}"
                 )
-                sent_count += 1
-            except Exception as e:
-                logger.error(f"Failed to send notification to {recipient}: {str(e)}")
-                failed_recipients.append(recipient)
+                self.notification_batcher.add(recipient, notification_content)
+        else:
+            for recipient in recipients:
+                try:
+                    logger.info(
+                        f"Sending {notification_type} notification to {recipient} "
+                        f"for workflow {workflow_id}: {notification_content['subject']}"
+                    )
+                    self._deliver_notification(
+                        recipient, notification_content['subject'], notification_content['body']
+                    )
+                    sent_count += 1
+                except Exception as e:
+                    logger.error(f"Failed to send notification to {recipient}: {str(e)}")
+                    failed_recipients.append(recipient)
         
         # Record notification in workflow
         if 'notifications' not in workflow:
@@ -962,8 +1011,10 @@ class ApprovalWorkflow:
             'recipients': recipients,
             'sent_count': sent_count,
             'failed_recipients': failed_recipients,
-            'subject': notification_content['subject']
+            'subject': notification_content['subject'],
+            'batched': self.notification_batcher is not None
         })
+        self.workflow_store.save(workflow_id)
         
         return {
             'success': True,
@@ -971,9 +1022,48 @@ class ApprovalWorkflow:
             'recipients_count': len(recipients),
             'sent_count': sent_count,
             'failed_count': len(failed_recipients),
-            'failed_recipients': failed_recipients
+            'failed_recipients': failed_recipients,
+            'queued_count': len(recipients) if self.notification_batcher else 0
+        }
+    
+    def flush_notifications(self, timeout: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Send all notifications waiting for their digest window.
+        
+        Args:
+            timeout: Maximum seconds to wait for delivery
+            
+        Returns:
+            Flush result with digest delivery statistics
+        """
+        if not self.notification_batcher:
+            return {'success': True, 'batched': False}
+        
+        delivered = self.notification_batcher.flush(timeout)
+        return {
+            'success': delivered,
+            'batched': True,
+            'statistics': self.notification_batcher.get_statistics()
         }
     
+    def close(self, timeout: Optional[float] = None) -> None:
+        """
+        Send pending notification digests, stop the digest sender and close the workflow store.
+        
+        Args:
+            timeout: Maximum seconds to wait for pending digests
+        """
+        if self.notification_batcher:
+            self.notification_batcher.close(timeout)
+            self.notification_batcher = None
+        self.workflow_store.close()
+    
+    def _deliver_notification(self, recipient: str, subject: str, body: str) -> None:
+        """Send one notification message (or digest) to one recipient."""
+        # In a real implementation, this would send actual emails
+        # For demo purposes, we'll just log the delivery
+        logger.debug(f"Delivering notification to {recipient}: {subject}")
+    
     def _get_notification_recipients(self, 
                                    workflow: Dict[str, Any],
                                    notification_type: str) -> List[str]:
@@ -1194,6 +1284,7 @@ Please review and provide executive-level approval for this optimization.
         # Update workflow with escalation
         workflow['approval_requirements']['authority_required'] = next_authority.value
         workflow['state'] = WorkflowState.AWAITING_APPROVAL.value
+        self.workflow_store.reindex(workflow_id)
         
         # Extend timeout for escalated approval
         current_timeout = datetime.fromisoformat(workflow['timeout_at'])
@@ -1225,6 +1316,8 @@ Please review and provide executive-level approval for this optimization.
                 step['comments'] = f"Escalated: {escalation_reason}"
                 break
         
+        self.workflow_store.save(workflow_id)
+        
         # Send escalation notifications
         notification_result = self.send_stakeholder_notification(
             workflow_id=workflow_id,
@@ -1261,76 +1354,74 @@ Please review and provide executive-level approval for this optimization.
             'notification_sent': []
         }
         
-        for workflow_id, workflow in list(self.active_workflows.items()):
+        # Only workflows whose timeout has passed are read from the timeout heap
+        for workflow in self.workflow_store.expired(current_time):
+            workflow_id = workflow['workflow_id']
             if workflow['state'] not in [WorkflowState.CREATED.value, WorkflowState.UNDER_REVIEW.value, WorkflowState.AWAITING_APPROVAL.value]:
                 continue
             
-            timeout_at = datetime.fromisoformat(workflow['timeout_at'])
+            # Determine if escalation is possible
+            current_authority = ApprovalAuthority(workflow['approval_requirements']['authority_required'])
+            escalation_hierarchy = [ApprovalAuthority.SYSTEM, ApprovalAuthority.ENGINEER, ApprovalAuthority.MANAGER, ApprovalAuthority.DIRECTOR, ApprovalAuthority.EXECUTIVE]
             
-            # Check if workflow has timed out
-            if current_time > timeout_at:
-                # Determine if escalation is possible
-                current_authority = ApprovalAuthority(workflow['approval_requirements']['authority_required'])
-                escalation_hierarchy = [ApprovalAuthority.SYSTEM, ApprovalAuthority.ENGINEER, ApprovalAuthority.MANAGER, ApprovalAuthority.DIRECTOR, ApprovalAuthority.EXECUTIVE]
+            try:
+                current_index = escalation_hierarchy.index(current_authority)
+                can_escalate = current_index < len(escalation_hierarchy) - 1
+            except ValueError:
+                can_escalate = False
+            
+            # Check if this is a high-value workflow that should be escalated instead of expired
+            estimated_savings = workflow.get('optimization_data', {}).get('estimatedSavings', 0)
+            risk_level = workflow.get('risk_level', 'MEDIUM')
+            should_escalate = (
+                can_escalate and 
+                (estimated_savings > 5000 or risk_level in ['HIGH', 'CRITICAL']) and
+                len(workflow.get('escalation_history', [])) < 2  # Limit escalations
+            )
+            
+            if should_escalate:
+                # Auto-escalate high-value workflows
+                escalation_result = self.escalate_workflow(
+                    workflow_id=workflow_id,
+                    escalation_reason=f"Automatic escalation due to timeout - High value (${estimated_savings:.2f}) or high risk ({risk_level})",
+                    escalated_by='system'
+                )
                 
-                try:
-                    current_index = escalation_hierarchy.index(current_authority)
-                    can_escalate = current_index < len(escalation_hierarchy) - 1
-                except ValueError:
-                    can_escalate = False
+                if escalation_result['success']:
+                    timeout_actions['escalated_workflows'].append({
+                        'workflow_id': workflow_id,
+                        'escalated_to': escalation_result['escalated_to'],
+                        'reason': 'timeout_auto_escalation'
+                    })
+                    
+                    logger.info(f"Auto-escalated workflow {workflow_id} due to timeout")
+            else:
+                # Expire the workflow
+                workflow['state'] = WorkflowState.EXPIRED.value
+                workflow['expired_at'] = current_time.isoformat()
+                
+                # Move to completed workflows
+                self.workflow_store.complete(workflow_id)
+                self.workflow_store.save(workflow_id)
                 
-                # Check if this is a high-value workflow that should be escalated instead of expired
-                estimated_savings = workflow.get('optimization_data', {}).get('estimatedSavings', 0)
-                risk_level = workflow.get('risk_level', 'MEDIUM')
-                should_escalate = (
-                    can_escalate and 
-                    (estimated_savings > 5000 or risk_level in ['HIGH', 'CRITICAL']) and
-                    len(workflow.get('escalation_history', [])) < 2  # Limit escalations
+                timeout_actions['expired_workflows'].append({
+                    'workflow_id': workflow_id,
+                    'expired_at': current_time.isoformat()
+                })
+                
+                # Send expiration notification
+                notification_result = self.send_stakeholder_notification(
+                    workflow_id=workflow_id,
+                    notification_type='expired'
                 )
                 
-                if should_escalate:
-                    # Auto-escalate high-value workflows
-                    escalation_result = self.escalate_workflow(
-                        workflow_id=workflow_id,
-                        escalation_reason=f"Automatic escalation due to timeout - High value (${estimated_savings:.2f}) or high risk ({risk_level})",
-                        escalated_by='system'
-                    )
-                    
-                    if escalation_result['success']:
-                        timeout_actions['escalated_workflows'].append({
-                            'workflow_id': workflow_id,
-                            'escalated_to': escalation_result['escalated_to'],
-                            'reason': 'timeout_auto_escalation'
-                        })
-                        
-                        logger.info(f"Auto-escalated workflow {workflow_id} due to timeout")
-                else:
-                    # Expire the workflow
-                    workflow['state'] = WorkflowState.EXPIRED.value
-                    workflow['expired_at'] = current_time.isoformat()
-                    
-                    # Move to completed workflows
-                    self.completed_workflows[workflow_id] = workflow
-                    del self.active_workflows[workflow_id]
-                    
-                    timeout_actions['expired_workflows'].append({
+                if notification_result.get('success'):
+                    timeout_actions['notification_sent'].append({
                         'workflow_id': workflow_id,
-                        'expired_at': current_time.isoformat()
+                        'notification_type': 'expired'
                     })
-                    
-                    # Send expiration notification
-                    notification_result = self.send_stakeholder_notification(
-                        workflow_id=workflow_id,
-                        notification_type='expired'
-                    )
-                    
-                    if notification_result.get('success'):
-                        timeout_actions['notification_sent'].append({
-                            'workflow_id': workflow_id,
-                            'notification_type': 'expired'
-                        })
-                    
-                    logger.info(f"Workflow {workflow_id} expired due to timeout")
+                
+                logger.info(f"Workflow {workflow_id} expired due to timeout")
         
         return {
             'check_timestamp': current_time.isoformat(),
@@ -1342,17 +1433,28 @@ Please review and provide executive-level approval for this optimization.
 
 
 # Utility functions for external use
-def create_approval_workflow(dry_run: bool = True) -> ApprovalWorkflow:
+def create_approval_workflow(dry_run: bool = True,
+                             store_path: Optional[str] = None,
+                             notification_window_seconds: float = 0.0,
+                             max_pending_digests: int = 100) -> ApprovalWorkflow:
     """
     Factory function to create ApprovalWorkflow instance.
     
     Args:
         dry_run: Enable DRY_RUN mode
+        store_path: Optional SQLite file that persists workflows
+        notification_window_seconds: Coalesce notifications per recipient over this window (0 sends each immediately)
+        max_pending_digests: Maximum digests waiting for the background sender
         
     Returns:
         Configured ApprovalWorkflow instance
     """
-    return ApprovalWorkflow(dry_run=dry_run)
+    return ApprovalWorkflow(
+        dry_run=dry_run,
+        store_path=store_path,
+        notification_window_seconds=notification_window_seconds,
+        max_pending_digests=max_pending_digests
+    )
 
 
 def assess_optimization_risk(optimization_data: Dict[str, Any]) -> RiskLevel:
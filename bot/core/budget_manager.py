@@ -11,6 +11,7 @@ Core budget management engine that:
 - Sends progressive alerts at configurable percentages
 - Triggers approval workflows for additional spending
 - Provides detailed cost breakdowns and variance analysis
+- Forecasts many budgets at once with Monte Carlo overspend estimates
 
 Requirements: 5.1, 5.2, 5.3, 6.1, 6.3
 """
@@ -23,8 +24,22 @@ from enum import Enum
 import json
 import math
 
+import numpy as np
+
+from utils.hierarchy_tree import HierarchyTree
+from utils.savings_plan_simulator import SavingsPlanSimulator
+
 logger = logging.getLogger(__name__)
 
+# Forecast multipliers for the optimistic, realistic and pessimistic scenarios
+SCENARIO_MULTIPLIERS = {"realistic": 1.0, "optimistic": 0.85, "pessimistic": 1.25}
+
+# Upper bound on (budgets x samples) cells drawn per Monte Carlo chunk
+MAX_MONTE_CARLO_CELLS = 4_000_000
+
+# Sampled totals kept per budget for Monte Carlo percentiles, when one chunk holds fewer
+MIN_PERCENTILE_SAMPLES = 1000
+
 
 class BudgetType(Enum):
     """Types of budget hierarchies."""
@@ -83,6 +98,7 @@ class BudgetManager:
         """
         self.dry_run = dry_run
         self.budgets = {}  # Hierarchical budget storage
+        self.budget_tree = HierarchyTree()  # Parent/child links with cached spend rollups
         self.forecasts = {}  # Cost forecasts by budget
         self.alerts = []  # Active budget alerts
         self.approval_workflows = []  # Pending approval requests
@@ -163,6 +179,11 @@ class BudgetManager:
             # Store budget configuration (even in dry_run for testing/demo purposes)
             self.budgets[budget_id] = budget_config
             
+            if budget_id not in self.budget_tree:
+                self.budget_tree.add_node(budget_id, parent_budget_id, level=budget_type.value)
+            self.budget_tree.set_value(budget_id, budget_amount, "budget_amount")
+            self.budget_tree.set_value(budget_id, 0.0, "current_spend")
+            
             if self.dry_run:
                 logger.info(f"DRY_RUN: Created budget {budget_id} with amount {budget_amount}")
             else:
@@ -246,7 +267,8 @@ class BudgetManager:
         forecast_months: int = 6,
         growth_projections: Optional[Dict[str, float]] = None,
         infrastructure_changes: Optional[List[Dict[str, Any]]] = None,
-        confidence_level: float = 0.95
+        confidence_level: float = 0.95,
+        savings_plan: Optional[Dict[str, Any]] = None
     ) -> Dict[str, Any]:
         """
         Generate cost forecasts with confidence intervals and scenario analysis.
@@ -257,6 +279,9 @@ class BudgetManager:
             growth_projections: Expected growth rates by service/category
             infrastructure_changes: Planned infrastructure changes
             confidence_level: Confidence level for intervals (default: 0.95)
+            savings_plan: Optional Savings Plan scenario with "hourly_spend" (hourly
+                On-Demand spend by compute type), and optional "commitment" (hourly,
+                defaults to the simulated optimum) and "term_years"
             
         Returns:
             Dict containing forecast data with confidence intervals
@@ -310,6 +335,10 @@ class BudgetManager:
                 "generated_at": datetime.now(timezone.utc).isoformat()
             }
             
+            # Apply simulated Savings Plan net savings to the forecast
+            if savings_plan:
+                forecast_data.update(self._apply_savings_plan_simulation(base_forecast, savings_plan))
+            
             # Store forecast
             self.forecasts[budget_id] = forecast_data
             
@@ -321,6 +350,175 @@ class BudgetManager:
             logger.error(f"Error generating cost forecast for {budget_id}: {str(e)}")
             raise
 
+    def generate_batch_forecasts(
+        self,
+        budget_ids: Optional[List[str]] = None,
+        forecast_months: int = 6,
+        growth_projections: Optional[Dict[str, float]] = None,
+        infrastructure_changes: Optional[List[Dict[str, Any]]] = None,
+        confidence_level: float = 0.95,
+        apply_seasonality: bool = False,
+        monte_carlo_samples: int = 10000,
+        random_seed: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """
+        Forecast many budgets at once with probabilistic overspend estimates.
+        
+        Historical series of all budgets are stacked into one matrix, so trend,
+        seasonality, confidence bands and scenarios are computed for every budget
+        in a few array operations. Base forecasts, bands and scenarios match
+        generate_cost_forecast for each budget.
+        
+        Monte Carlo sampling draws a scenario multiplier (triangular between the
+        optimistic and pessimistic scenarios) and independent monthly deviations
+        scaled by each budget's historical volatility, then compares the sampled
+        horizon spend with the budget available over the horizon.
+        
+        Args:
+            budget_ids: Budgets to forecast (all budgets if None)
+            forecast_months: Number of months to forecast
+            growth_projections: Expected growth rates ("overall" is annual growth)
+            infrastructure_changes: Planned infrastructure changes applied to every budget
+            confidence_level: Confidence level for intervals (default: 0.95)
+            apply_seasonality: Scale forecast months by seasonal factors (needs 12+ months of history)
+            monte_carlo_samples: Scenario samples per budget (0 disables sampling)
+            random_seed: Seed for reproducible sampling
+            
+        Returns:
+            Dict containing per-budget forecasts and a summary of budgets at risk
+        """
+        try:
+            budget_ids = list(self.budgets) if budget_ids is None else budget_ids
+            missing = [budget_id for budget_id in budget_ids if budget_id not in self.budgets]
+            if missing:
+                raise ValueError(f"Budgets not found: {missing}")
+            if not budget_ids:
+                return {"forecasts": {}, "summary": {"budgets_forecast": 0, "budgets_at_risk": []}}
+            
+            costs, months, counts = self._stack_historical_costs(budget_ids)
+            trend = self._batch_trend(costs, counts)
+            # Trends stored by analyze_historical_trends take precedence, as in _generate_base_forecast
+            for row, budget_id in enumerate(budget_ids):
+                stored_trend = self.historical_data.get(budget_id, {}).get("trend_analysis")
+                if stored_trend:
+                    trend["slope"][row] = stored_trend.get("slope", 0)
+                    trend["r_squared"][row] = stored_trend.get("r_squared", 0)
+                    trend["direction"][row] = stored_trend.get("direction", "unknown")
+            seasonal = self._batch_seasonal_factors(costs, months, counts)
+            
+            # Base forecast: last cost plus the trend slope per month ahead
+            horizon = np.arange(1, forecast_months + 1)
+            has_history = counts > 0
+            last_cost = np.where(has_history, np.nan_to_num(costs[:, -1]), 0.0)
+            forecast = np.where(
+                has_history[:, np.newaxis],
+                np.maximum(0.0, last_cost[:, np.newaxis] + trend["slope"][:, np.newaxis] * horizon),
+                1000.0  # Placeholder, as in _generate_base_forecast
+            )
+            
+            if apply_seasonality:
+                target_months = (months[:, -1:] - 1 + horizon) % 12 + 1
+                factors = np.take_along_axis(seasonal, target_months, axis=1)
+                known = ~np.isnan(factors) & (months[:, -1:] > 0)
+                forecast = forecast * np.where(known, factors, 1.0)
+            
+            if growth_projections:
+                forecast = forecast * (1 + growth_projections.get("overall", 0.0) / 12 * horizon)
+            
+            if infrastructure_changes:
+                impact = np.zeros(forecast_months)
+                for change in infrastructure_changes:
+                    impact[change.get("start_month", 0):] += change.get("monthly_cost_impact", 0.0)
+                forecast = forecast + impact
+            
+            # Confidence margin: historical coefficient of variation (20% default)
+            margin = self._batch_margin(costs, counts)
+            lower_bound = forecast * (1 - margin[:, np.newaxis])
+            upper_bound = forecast * (1 + margin[:, np.newaxis])
+            
+            allowance = np.array([
+                self.budgets[budget_id]["monthly_amount"] * forecast_months for budget_id in budget_ids
+            ])
+            monte_carlo = (
+                self._monte_carlo_overspend(forecast, margin, allowance, monte_carlo_samples, random_seed)
+                if monte_carlo_samples > 0 else None
+            )
+            
+            generated_at = datetime.now(timezone.utc).isoformat()
+            forecasts = {}
+            for row, budget_id in enumerate(budget_ids):
+                base_forecast = forecast[row].tolist()
+                seasonal_factors = {
+                    f"month_{month}": float(seasonal[row, month])
+                    for month in range(1, 13) if not np.isnan(seasonal[row, month])
+                }
+                forecast_data = {
+                    "budget_id": budget_id,
+                    "forecast_months": forecast_months,
+                    "base_forecast": base_forecast,
+                    "confidence_intervals": {
+                        "lower_bound": lower_bound[row].tolist(),
+                        "upper_bound": upper_bound[row].tolist(),
+                        "confidence_level": confidence_level,
+                        "margin_of_error": float(margin[row])
+                    },
+                    "scenarios": {
+                        name: (forecast[row] * multiplier).tolist()
+                        for name, multiplier in SCENARIO_MULTIPLIERS.items()
+                    },
+                    "confidence_level": confidence_level,
+                    "trend": {
+                        "direction": trend["direction"][row],
+                        "slope": float(trend["slope"][row]),
+                        "r_squared": float(trend["r_squared"][row])
+                    },
+                    "assumptions": {
+                        "growth_projections": growth_projections or {},
+                        "infrastructure_changes": infrastructure_changes or [],
+                        "seasonal_adjustments": seasonal_factors,
+                        "seasonality_applied": apply_seasonality
+                    },
+                    "generated_at": generated_at
+                }
+                if monte_carlo is not None:
+                    forecast_data["monte_carlo"] = {
+                        "samples": monte_carlo_samples,
+                        "budget_allowance": float(allowance[row]),
+                        "overspend_probability": float(monte_carlo["overspend_probability"][row]),
+                        "expected_overspend": float(monte_carlo["expected_overspend"][row]),
+                        "spend_percentiles": {
+                            "p5": float(monte_carlo["percentiles"][0, row]),
+                            "p50": float(monte_carlo["percentiles"][1, row]),
+                            "p95": float(monte_carlo["percentiles"][2, row])
+                        }
+                    }
+                forecasts[budget_id] = forecast_data
+                self.forecasts[budget_id] = forecast_data
+            
+            budgets_at_risk = sorted(
+                (budget_id for budget_id, data in forecasts.items()
+                 if data.get("monte_carlo", {}).get("overspend_probability", 0.0) >= 0.5),
+                key=lambda budget_id: -forecasts[budget_id]["monte_carlo"]["overspend_probability"]
+            )
+            
+            logger.info(f"Generated batch cost forecasts for {len(budget_ids)} budgets "
+                        f"({len(budgets_at_risk)} likely to overspend)")
+            
+            return {
+                "forecasts": forecasts,
+                "summary": {
+                    "budgets_forecast": len(budget_ids),
+                    "total_forecast": float(forecast.sum()),
+                    "budgets_at_risk": budgets_at_risk,
+                    "monte_carlo_samples": monte_carlo_samples
+                },
+                "generated_at": generated_at
+            }
+            
+        except Exception as e:
+            logger.error(f"Error generating batch cost forecasts: {str(e)}")
+            raise
+
     def track_budget_performance(
         self,
         budget_id: str,
@@ -388,6 +586,7 @@ class BudgetManager:
                 "status": status.value,
                 "last_performance_update": datetime.now(timezone.utc).isoformat()
             })
+            self.budget_tree.set_value(budget_id, current_spend, "current_spend")
             
             if self.dry_run:
                 logger.info(f"DRY_RUN: Tracked budget performance for {budget_id}: {utilization:.1%} utilized")
@@ -707,11 +906,13 @@ class BudgetManager:
             return [1000.0] * forecast_months  # Placeholder
         
         monthly_costs = historical_data["monthly_costs"]
-        trend_analysis = historical_data.get("trend_analysis", {})
         
         if not monthly_costs:
             return [1000.0] * forecast_months
         
+        # Data loaded without analyze_historical_trends has no stored trend yet
+        trend_analysis = historical_data.get("trend_analysis") or self._calculate_trend(monthly_costs)
+        
         # Use trend to project forward
         last_cost = monthly_costs[-1]
         monthly_change = trend_analysis.get("slope", 0)
@@ -723,6 +924,34 @@ class BudgetManager:
         
         return forecast
 
+    def _apply_savings_plan_simulation(
+        self, base_forecast: List[float], savings_plan: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Replay hourly spend against a Savings Plan and net its savings out of the forecast."""
+        simulator = SavingsPlanSimulator(savings_plan.get("term_years", 1))
+        commitment = savings_plan.get("commitment")
+        simulation = simulator.simulate(
+            savings_plan["hourly_spend"],
+            [commitment] if commitment is not None else None
+        )
+        selected = simulation["commitments"][0] if commitment is not None else simulation["optimalCommitment"]
+        monthly_net_savings = selected["monthlyNetSavings"] if selected else 0.0
+        
+        return {
+            "savings_plan_simulation": {
+                "term_years": simulation["termYears"],
+                "hours_simulated": simulation["hours"],
+                "hourly_commitment": selected["hourlyCommitment"] if selected else 0.0,
+                "coverage_percentage": selected["coveragePercentage"] if selected else 0.0,
+                "utilization_percentage": selected["utilizationPercentage"] if selected else 0.0,
+                "monthly_net_savings": monthly_net_savings,
+                "break_even_commitment": (simulation["breakEvenCommitment"] or {}).get("hourlyCommitment")
+            },
+            "savings_plan_adjusted_forecast": [
+                max(0.0, monthly_cost - monthly_net_savings) for monthly_cost in base_forecast
+            ]
+        }
+
     def _apply_growth_projections(
         self, base_forecast: List[float], growth_projections: Dict[str, float]
     ) -> List[float]:
@@ -790,12 +1019,145 @@ class BudgetManager:
         """Generate optimistic, pessimistic, and realistic scenarios."""
         scenarios = {
             "realistic": base_forecast,
-            "optimistic": [cost * 0.85 for cost in base_forecast],  # 15% savings
-            "pessimistic": [cost * 1.25 for cost in base_forecast]  # 25% increase
+            "optimistic": [cost * SCENARIO_MULTIPLIERS["optimistic"] for cost in base_forecast],  # 15% savings
+            "pessimistic": [cost * SCENARIO_MULTIPLIERS["pessimistic"] for cost in base_forecast]  # 25% increase
         }
         
         return scenarios
 
+    def _stack_historical_costs(self, budget_ids: List[str]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Stack analyzed monthly costs into a budgets x months matrix.
+        
+        Series are right-aligned (most recent month in the last column) and
+        left-padded with NaN; months holds the calendar month of each cell (0 if unknown).
+        """
+        series = [self.historical_data.get(budget_id, {}) for budget_id in budget_ids]
+        counts = np.array([len(data.get("monthly_costs", [])) for data in series])
+        width = max(1, int(counts.max()))
+        
+        costs = np.full((len(budget_ids), width), np.nan)
+        months = np.zeros((len(budget_ids), width), dtype=np.int64)
+        for row, data in enumerate(series):
+            count = counts[row]
+            if count:
+                costs[row, width - count:] = data["monthly_costs"]
+                dates = data.get("dates", [])
+                if len(dates) == count:
+                    months[row, width - count:] = [self._calendar_month(date) for date in dates]
+        return costs, months, counts
+
+    @staticmethod
+    def _calendar_month(date_str: str) -> int:
+        """Calendar month of an ISO date string (0 if it cannot be parsed)."""
+        try:
+            return datetime.fromisoformat(str(date_str).replace('Z', '+00:00')).month
+        except (TypeError, ValueError):
+            return 0
+
+    @staticmethod
+    def _batch_trend(costs: np.ndarray, counts: np.ndarray) -> Dict[str, Any]:
+        """Least-squares slope and R-squared of every series, as in _calculate_trend."""
+        valid = ~np.isnan(costs)
+        values = np.where(valid, costs, 0.0)
+        safe_counts = np.maximum(counts, 1)
+        
+        # x runs 0..n-1 over each right-aligned series
+        x = np.arange(costs.shape[1]) - (costs.shape[1] - counts)[:, np.newaxis]
+        x_centered = np.where(valid, x - (counts - 1)[:, np.newaxis] / 2, 0.0)
+        y_mean = values.sum(axis=1) / safe_counts
+        y_centered = np.where(valid, values - y_mean[:, np.newaxis], 0.0)
+        
+        denominator = (x_centered ** 2).sum(axis=1)
+        slope = np.divide((x_centered * y_centered).sum(axis=1), denominator,
+                          out=np.zeros(len(counts)), where=(denominator > 0) & (counts >= 2))
+        
+        ss_tot = (y_centered ** 2).sum(axis=1)
+        ss_res = np.where(valid, (y_centered - slope[:, np.newaxis] * x_centered) ** 2, 0.0).sum(axis=1)
+        r_squared = np.where(ss_tot > 0, 1 - np.divide(ss_res, ss_tot, out=np.zeros_like(ss_res), where=ss_tot > 0),
+                             np.where(counts >= 2, 1.0, 0.0))
+        
+        direction = np.where(counts < 2, "unknown",
+                             np.where(np.abs(slope) < 0.01, "stable",
+                                      np.where(slope > 0, "increasing", "decreasing")))
+        return {"slope": slope, "r_squared": np.clip(r_squared, 0, 1), "direction": direction.tolist()}
+
+    @staticmethod
+    def _batch_seasonal_factors(costs: np.ndarray, months: np.ndarray, counts: np.ndarray) -> np.ndarray:
+        """Seasonal factor per budget and calendar month (columns 1-12; NaN where unknown)."""
+        budgets = costs.shape[0]
+        valid = ~np.isnan(costs) & (months > 0) & (counts >= 12)[:, np.newaxis]
+        rows = np.broadcast_to(np.arange(budgets)[:, np.newaxis], costs.shape)
+        
+        sums = np.zeros((budgets, 13))
+        totals = np.zeros((budgets, 13))
+        np.add.at(sums, (rows[valid], months[valid]), costs[valid])
+        np.add.at(totals, (rows[valid], months[valid]), 1)
+        
+        overall_mean = np.nansum(costs, axis=1) / np.maximum(counts, 1)
+        month_means = np.divide(sums, totals, out=np.full_like(sums, np.nan), where=totals > 0)
+        factors = np.where(overall_mean[:, np.newaxis] > 0,
+                           month_means / np.where(overall_mean > 0, overall_mean, 1.0)[:, np.newaxis], 1.0)
+        return np.where(totals > 0, factors, np.nan)
+
+    @staticmethod
+    def _batch_margin(costs: np.ndarray, counts: np.ndarray) -> np.ndarray:
+        """Coefficient of variation of each series (0.2 when it cannot be estimated)."""
+        safe_counts = np.maximum(counts, 1)
+        mean = np.nansum(costs, axis=1) / safe_counts
+        squared = np.nansum((costs - mean[:, np.newaxis]) ** 2, axis=1)
+        std = np.sqrt(np.divide(squared, counts - 1, out=np.zeros_like(squared), where=counts > 1))
+        return np.where((counts > 1) & (mean > 0), std / np.where(mean > 0, mean, 1.0), 0.2)
+
+    @staticmethod
+    def _monte_carlo_overspend(
+        forecast: np.ndarray, margin: np.ndarray, allowance: np.ndarray, samples: int, random_seed: Optional[int]
+    ) -> Dict[str, np.ndarray]:
+        """
+        Sample horizon spend for every budget and estimate overspend.
+        
+        With independent normal monthly deviations of margin x forecast, the
+        horizon total is normal with mean sum(forecast) and standard deviation
+        margin x sqrt(sum(forecast^2)), so totals are drawn directly per sample.
+        
+        Samples are drawn in chunks of at most MAX_MONTE_CARLO_CELLS cells.
+        Exceedance counts and overspend sums accumulate per chunk, and
+        percentiles come from the first draws (one chunk, at least
+        MIN_PERCENTILE_SAMPLES), which are a uniform sample of the
+        independent draws, so memory does not grow with samples.
+        """
+        rng = np.random.default_rng(random_seed)
+        mean_total = forecast.sum(axis=1)
+        std_total = margin * np.sqrt((forecast ** 2).sum(axis=1))
+        
+        budgets = forecast.shape[0]
+        chunk = max(1, MAX_MONTE_CARLO_CELLS // max(1, budgets))
+        exceed_counts = np.zeros(budgets)
+        overspend_sums = np.zeros(budgets)
+        kept = np.empty((min(samples, max(chunk, MIN_PERCENTILE_SAMPLES)), budgets))
+        filled = 0
+        for start in range(0, samples, chunk):
+            size = min(chunk, samples - start)
+            multipliers = rng.triangular(
+                SCENARIO_MULTIPLIERS["optimistic"], SCENARIO_MULTIPLIERS["realistic"],
+                SCENARIO_MULTIPLIERS["pessimistic"], size=(size, budgets)
+            )
+            deviations = rng.standard_normal((size, budgets)) * std_total
+            totals = np.maximum(0.0, multipliers * (mean_total + deviations))
+            
+            exceed_counts += (totals > allowance).sum(axis=0)
+            overspend_sums += np.maximum(0.0, totals - allowance).sum(axis=0)
+            if filled < len(kept):
+                take = min(size, len(kept) - filled)
+                kept[filled:filled + take] = totals[:take]
+                filled += take
+        
+        return {
+            "overspend_probability": exceed_counts / samples,
+            "expected_overspend": overspend_sums / samples,
+            "percentiles": np.percentile(kept, [5, 50, 95], axis=0)
+        }
+
     def _determine_budget_status(self, utilization: float) -> BudgetStatus:
         """Determine budget status based on utilization."""
         if utilization >= 1.0:
@@ -1052,4 +1414,45 @@ class BudgetManager:
         summary["total_current_spend"] = total_spend
         summary["overall_utilization"] = (total_spend / total_budget * 100) if total_budget > 0 else 0.0
         
-        return summary
\ No newline at end of file
+        return summary
+
+    def get_hierarchy_rollup(self, budget_id: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Roll spend up the budget hierarchy.
+        
+        Spend tracked on each budget is summed into every ancestor, so a parent's
+        rolled-up spend covers its whole subtree. Totals are cached in the budget
+        tree and updated along the ancestor path whenever one budget's spend changes.
+        
+        Args:
+            budget_id: Optional budget to restrict the rollup to (with its descendants)
+            
+        Returns:
+            Dict mapping budget ID to its own and rolled-up spend and child allocations
+        """
+        tree = self.budget_tree
+        if budget_id is not None and budget_id not in tree:
+            raise ValueError(f"Budget {budget_id} not found")
+        
+        rolled_up_spend = tree.rollup("current_spend")
+        rollup = {}
+        for node_id in tree.nodes():
+            path = tree.path(node_id)
+            if budget_id is not None and budget_id not in path:
+                continue
+            budget_amount = tree.value(node_id, "budget_amount")
+            child_budget_amount = sum(tree.value(child, "budget_amount") for child in tree.children(node_id))
+            rollup[node_id] = {
+                "budget_type": tree.level(node_id),
+                "budget_amount": budget_amount,
+                "current_spend": tree.value(node_id, "current_spend"),
+                "rolled_up_spend": rolled_up_spend[node_id],
+                "rolled_up_utilization": (
+                    rolled_up_spend[node_id] / budget_amount * 100 if budget_amount > 0 else 0.0
+                ),
+                "child_budget_amount": child_budget_amount,
+                "over_allocated": child_budget_amount > budget_amount,
+                "rollup_path": path
+            }
+        
+        return rollup
@@ -0,0 +1,403 @@
+#!/usr/bin/env python3
+"""
+Commitment Portfolio Optimizer for Advanced FinOps Platform
+
+Searches Reserved Instance and Savings Plan commitment levels against an
+hourly usage matrix (hours x normalized instance families):
+- Vectorized hourly coverage simulation for every candidate portfolio
+- Greedy break-even search across RI and Savings Plan terms and payment options,
+  with RI levels sized from each family's own RI rates
+- Savings-maximizing portfolio with optional upfront budget constraint
+- Break-even curves for the Savings Plan commitment and each RI family
+
+Requirements: 2.1, 2.3
+"""
+
+import logging
+import re
+import time
+from typing import Dict, List, Any, Optional, Sequence, Tuple
+
+import numpy as np
+
+from core.pricing_intelligence import ReservationTerm, PaymentOption
+
+logger = logging.getLogger(__name__)
+
+# Instance size normalization factors used for RI size flexibility
+SIZE_NORMALIZATION_FACTORS = {
+    'nano': 0.25,
+    'micro': 0.5,
+    'small': 1.0,
+    'medium': 2.0,
+    'large': 4.0,
+    'xlarge': 8.0
+}
+
+TERM_HOURS = {
+    ReservationTerm.ONE_YEAR: 8760,
+    ReservationTerm.THREE_YEAR: 26280
+}
+
+
+def normalize_instance_type(instance_type: str) -> Tuple[str, float]:
+    """
+    Split an instance type into its family and normalization factor.
+
+    Args:
+        instance_type: EC2 instance type (e.g. 'm5.2xlarge')
+
+    Returns:
+        Tuple of (family, normalized units per instance)
+    """
+    family, _, size = instance_type.partition('.')
+    if size in SIZE_NORMALIZATION_FACTORS:
+        return family, SIZE_NORMALIZATION_FACTORS[size]
+
+    match = re.fullmatch(r'(\d+)xlarge', size)
+    if match:
+        return family, 8.0 * int(match.group(1))
+
+    return family, SIZE_NORMALIZATION_FACTORS['xlarge']  # metal and unknown sizes
+
+
+class CommitmentOptimizer:
+    """
+    Finds the savings-maximizing mix of Reserved Instances and a Compute
+    Savings Plan for an hourly usage matrix.
+
+    Reserved Instances are sized per normalized family and applied first;
+    the Savings Plan covers the remaining On-Demand spend across families.
+    Rates are effective hourly rates as a fraction of On-Demand.
+    """
+
+    # Effective hourly rate as a fraction of On-Demand (upfront amortized over the term)
+    DEFAULT_RI_RATES = {
+        (ReservationTerm.ONE_YEAR, PaymentOption.NO_UPFRONT): 0.70,
+        (ReservationTerm.ONE_YEAR, PaymentOption.PARTIAL_UPFRONT): 0.65,
+        (ReservationTerm.ONE_YEAR, PaymentOption.ALL_UPFRONT): 0.60,
+        (ReservationTerm.THREE_YEAR, PaymentOption.NO_UPFRONT): 0.60,
+        (ReservationTerm.THREE_YEAR, PaymentOption.PARTIAL_UPFRONT): 0.55,
+        (ReservationTerm.THREE_YEAR, PaymentOption.ALL_UPFRONT): 0.50
+    }
+
+    DEFAULT_SP_RATES = {
+        (ReservationTerm.ONE_YEAR, PaymentOption.NO_UPFRONT): 0.75,
+        (ReservationTerm.ONE_YEAR, PaymentOption.PARTIAL_UPFRONT): 0.70,
+        (ReservationTerm.ONE_YEAR, PaymentOption.ALL_UPFRONT): 0.65,
+        (ReservationTerm.THREE_YEAR, PaymentOption.NO_UPFRONT): 0.65,
+        (ReservationTerm.THREE_YEAR, PaymentOption.PARTIAL_UPFRONT): 0.60,
+        (ReservationTerm.THREE_YEAR, PaymentOption.ALL_UPFRONT): 0.55
+    }
+
+    UPFRONT_FRACTIONS = {
+        PaymentOption.NO_UPFRONT: 0.0,
+        PaymentOption.PARTIAL_UPFRONT: 0.5,
+        PaymentOption.ALL_UPFRONT: 1.0
+    }
+
+    def __init__(self,
+                 ri_rates: Optional[Dict[Tuple[ReservationTerm, PaymentOption], float]] = None,
+                 sp_rates: Optional[Dict[Tuple[ReservationTerm, PaymentOption], float]] = None,
+                 level_steps: int = 6,
+                 curve_points: int = 21):
+        """
+        Initialize commitment optimizer.
+
+        Args:
+            ri_rates: RI effective rates by (term, payment option)
+            sp_rates: Savings Plan effective rates by (term, payment option)
+            level_steps: RI break-even levels searched per RI option
+            curve_points: Points per break-even curve
+        """
+        self.ri_rates = ri_rates or dict(self.DEFAULT_RI_RATES)
+        self.sp_rates = sp_rates or dict(self.DEFAULT_SP_RATES)
+        self.level_steps = level_steps
+        self.curve_points = curve_points
+
+    def optimize(self,
+                 usage_matrix: Any,
+                 on_demand_rates: Sequence[float],
+                 families: Optional[Sequence[str]] = None,
+                 terms: Optional[Sequence[ReservationTerm]] = None,
+                 payment_options: Optional[Sequence[PaymentOption]] = None,
+                 max_upfront_cost: Optional[float] = None,
+                 family_ri_rates: Optional[Dict[str, Dict[Tuple[ReservationTerm, PaymentOption], float]]] = None
+                 ) -> Dict[str, Any]:
+        """
+        Search commitment portfolios and return the savings-maximizing one.
+
+        Args:
+            usage_matrix: Hours x families array of normalized units in use
+            on_demand_rates: On-Demand price per normalized unit-hour for each family
+            families: Family names for the matrix columns
+            terms: Terms to consider (default all)
+            payment_options: Payment options to consider (default all)
+            max_upfront_cost: Optional cap on the portfolio's total upfront payment
+            family_ri_rates: RI effective rates by (term, payment option) for individual
+                families; an option missing from a family's rates is not offered for
+                it, and families without an entry use the optimizer's RI rates
+
+        Returns:
+            Portfolio with RI and Savings Plan commitments, savings and break-even
+            curves; when no candidate fits max_upfront_cost, an all On-Demand
+            portfolio with feasible set to False
+        """
+        started = time.time()
+        usage = np.atleast_2d(np.asarray(usage_matrix, dtype=float))
+        rates = np.asarray(on_demand_rates, dtype=float)
+        hours, family_count = usage.shape
+        if rates.shape != (family_count,):
+            raise ValueError(f"Expected {family_count} On-Demand rates, got {rates.shape[0] if rates.ndim else 1}")
+        families = list(families) if families is not None else [f"family-{i}" for i in range(family_count)]
+
+        terms = list(terms or ReservationTerm)
+        payment_options = list(payment_options or PaymentOption)
+        family_ri_rates = family_ri_rates or {}
+        offered = set(self.ri_rates).union(*(rates_by_option for rates_by_option in family_ri_rates.values()))
+        ri_options = [None] + [option for option in sorted(offered, key=self._option_order)
+                               if option[0] in terms and option[1] in payment_options]
+        sp_options = [None] + [option for option in self.sp_rates
+                               if option[0] in terms and option[1] in payment_options]
+
+        usage = np.maximum(usage, 0.0)
+        sorted_usage = np.sort(usage, axis=0)
+        hourly_spend = usage @ rates
+        baseline_cost = float(hourly_spend.sum())
+
+        best = None
+        candidates_evaluated = 0
+
+        option_rates = {
+            option: self._family_option_rates(option, families, family_ri_rates)
+            for option in ri_options if option is not None
+        }
+
+        for ri_option, levels in self._ri_candidate_levels(sorted_usage, ri_options, option_rates):
+            ri_rates = option_rates[ri_option] if ri_option else np.zeros(family_count)
+            reserved_spend = float(levels @ rates)  # On-Demand value of the reservations per hour
+            used_reserved = np.minimum(usage, levels) @ rates
+            residual_spend = hourly_spend - used_reserved
+            sorted_residual = np.sort(residual_spend)
+            residual_total = float(residual_spend.sum())
+
+            for sp_option in sp_options:
+                candidates_evaluated += 1
+                sp_rate = self.sp_rates[sp_option] if sp_option else 1.0
+                covered_limit = self._break_even_level(sorted_residual, sp_rate) if sp_option else 0.0
+                covered_spend = float(np.minimum(sorted_residual, covered_limit).sum())
+
+                ri_hourly = float(levels @ (rates * ri_rates))
+                sp_hourly = covered_limit * sp_rate
+                total_cost = hours * (ri_hourly + sp_hourly) + residual_total - covered_spend
+                upfront_cost = (self._upfront_cost(ri_option, ri_hourly) +
+                                self._upfront_cost(sp_option, sp_hourly))
+
+                if max_upfront_cost is not None and upfront_cost > max_upfront_cost:
+                    continue
+
+                if best is None or total_cost < best['total_cost']:
+                    best = {
+                        'total_cost': total_cost,
+                        'ri_option': ri_option if reserved_spend > 0 else None,
+                        'levels': levels,
+                        'ri_rates': ri_rates,
+                        'used_reserved': used_reserved,
+                        'sp_option': sp_option if covered_limit > 0 else None,
+                        'covered_limit': covered_limit,
+                        'covered_spend': covered_spend,
+                        'sorted_residual': sorted_residual,
+                        'upfront_cost': upfront_cost
+                    }
+
+        feasible = best is not None
+        if not feasible:
+            logger.warning(f"No commitment portfolio fits the upfront cap of ${max_upfront_cost:.2f}")
+            best = {
+                'total_cost': baseline_cost,
+                'ri_option': None,
+                'levels': np.zeros(family_count),
+                'ri_rates': np.zeros(family_count),
+                'used_reserved': np.zeros(hours),
+                'sp_option': None,
+                'covered_limit': 0.0,
+                'covered_spend': 0.0,
+                'sorted_residual': np.sort(hourly_spend),
+                'upfront_cost': 0.0
+            }
+
+        portfolio = self._build_portfolio(best, usage, sorted_usage, rates, families, baseline_cost)
+        portfolio['feasible'] = feasible
+        portfolio['candidatesEvaluated'] = candidates_evaluated
+        portfolio['computeSeconds'] = time.time() - started
+
+        logger.info(f"Evaluated {candidates_evaluated} commitment portfolios over {hours} hours x "
+                    f"{family_count} families: ${portfolio['monthlySavings']:.2f}/month savings")
+        return portfolio
+
+    # Private helper methods
+
+    def _ri_candidate_levels(self, sorted_usage: np.ndarray, ri_options: List[Optional[Tuple]],
+                             option_rates: Dict[Tuple, np.ndarray]):
+        """
+        Yield (RI option, per-family reserved units) candidates.
+
+        A reservation at rate p pays off when the unit is in use for at least
+        p of the hours without a Savings Plan, and rises towards always-on
+        usage when a Savings Plan would otherwise cover the spend; levels are
+        searched greedily across that range, starting from each family's own
+        rate for the option. Families that do not offer the option get none.
+        """
+        hours, family_count = sorted_usage.shape
+        yield None, np.zeros(family_count)
+        if hours == 0:
+            return
+
+        columns = np.arange(family_count)
+        seen = set()
+        for ri_option in ri_options:
+            if ri_option is None:
+                continue
+            family_rates = option_rates[ri_option]
+            available = family_rates > 0
+            for step in np.linspace(0.0, 1.0, self.level_steps):
+                fractions = family_rates + (1.0 - family_rates) * step
+                index = np.clip(np.floor(hours * (1.0 - fractions)).astype(np.int64), 0, hours - 1)
+                levels = np.where(available, sorted_usage[index, columns], 0.0)
+                key = (ri_option, levels.tobytes())
+                if key in seen or not np.any(levels > 0):
+                    continue
+                seen.add(key)
+                yield ri_option, levels
+
+    def _family_option_rates(self, option: Tuple, families: List[str],
+                             family_ri_rates: Dict[str, Dict[Tuple, float]]) -> np.ndarray:
+        """RI rate of an option for each family, 0 where the family does not offer it."""
+        return np.array([
+            family_ri_rates[family].get(option, 0.0) if family in family_ri_rates
+            else self.ri_rates.get(option, 0.0)
+            for family in families
+        ], dtype=float)
+
+    @staticmethod
+    def _option_order(option: Tuple) -> Tuple[int, int]:
+        """Sort key listing options by term, then payment option, in enum order."""
+        term, payment = option
+        return list(ReservationTerm).index(term), list(PaymentOption).index(payment)
+
+    @staticmethod
+    def _break_even_level(sorted_values: np.ndarray, rate_fraction: float) -> Any:
+        """Largest level in use for at least rate_fraction of the hours (per column)."""
+        hours = sorted_values.shape[0]
+        if hours == 0:
+            return np.zeros(sorted_values.shape[1:]) if sorted_values.ndim > 1 else 0.0
+        index = min(hours - 1, max(0, int(np.floor(hours * (1.0 - rate_fraction)))))
+        level = sorted_values[index]
+        return level if sorted_values.ndim > 1 else float(level)
+
+    def _upfront_cost(self, option: Optional[Tuple], hourly_commitment: float) -> float:
+        """Upfront payment for an hourly commitment."""
+        if option is None or hourly_commitment <= 0:
+            return 0.0
+        term, payment = option
+        return hourly_commitment * TERM_HOURS[term] * self.UPFRONT_FRACTIONS[payment]
+
+    def _build_portfolio(self, best: Dict[str, Any], usage: np.ndarray, sorted_usage: np.ndarray,
+                         rates: np.ndarray, families: List[str], baseline_cost: float) -> Dict[str, Any]:
+        """Summarize the winning candidate with coverage, savings and break-even curves."""
+        hours = usage.shape[0]
+        hourly_savings = (baseline_cost - best['total_cost']) / hours if hours else 0.0
+        monthly_savings = hourly_savings * 730
+
+        reserved_instances = None
+        ri_curves = {}
+        if best['ri_option'] is not None:
+            term, payment = best['ri_option']
+            ri_rates = best['ri_rates']
+            levels = best['levels']
+            used_units = np.minimum(usage, levels).sum(axis=0)
+            commitments = []
+            for index in np.flatnonzero(levels > 0):
+                commitments.append({
+                    'family': families[index],
+                    'normalizedUnits': float(levels[index]),
+                    'hourlyCost': float(levels[index] * rates[index] * ri_rates[index]),
+                    'utilizationPercentage': float(used_units[index] / (levels[index] * hours) * 100)
+                })
+                ri_curves[families[index]] = self._break_even_curve(
+                    sorted_usage[:, index], ri_rates[index], rates[index]
+                )
+            hourly_commitment = sum(c['hourlyCost'] for c in commitments)
+            reserved_instances = {
+                'term': term.value,
+                'paymentOption': payment.value,
+                'hourlyCommitment': hourly_commitment,
+                'upfrontCost': self._upfront_cost(best['ri_option'], hourly_commitment),
+                'commitments': commitments
+            }
+
+        savings_plan = None
+        sp_curve = []
+        if best['sp_option'] is not None:
+            term, payment = best['sp_option']
+            sp_rate = self.sp_rates[best['sp_option']]
+            hourly_commitment = best['covered_limit'] * sp_rate
+            savings_plan = {
+                'planType': 'compute',
+                'term': term.value,
+                'paymentOption': payment.value,
+                'hourlyCommitment': hourly_commitment,
+                'upfrontCost': self._upfront_cost(best['sp_option'], hourly_commitment),
+                'utilizationPercentage': best['covered_spend'] / (best['covered_limit'] * hours) * 100
+            }
+            sp_curve = self._break_even_curve(best['sorted_residual'], sp_rate, 1.0)
+
+        covered_spend = float(best['used_reserved'].sum()) + best['covered_spend']
+        upfront_cost = best['upfront_cost']
+
+        return {
+            'hours': hours,
+            'families': len(families),
+            'baselineMonthlyCost': baseline_cost / hours * 730 if hours else 0.0,
+            'projectedMonthlyCost': best['total_cost'] / hours * 730 if hours else 0.0,
+            'monthlySavings': monthly_savings,
+            'savingsPercentage': (hourly_savings * hours / baseline_cost * 100) if baseline_cost > 0 else 0.0,
+            'coveragePercentage': (covered_spend / baseline_cost * 100) if baseline_cost > 0 else 0.0,
+            'upfrontCost': upfront_cost,
+            'paybackMonths': upfront_cost / monthly_savings if monthly_savings > 0 else float('inf'),
+            'reservedInstances': reserved_instances,
+            'savingsPlan': savings_plan,
+            'breakEvenCurves': {
+                'savingsPlan': sp_curve,
+                'reservedInstances': ri_curves
+            }
+        }
+
+    def _break_even_curve(self, sorted_values: np.ndarray, rate_fraction: float,
+                          unit_price: float) -> List[Dict[str, float]]:
+        """
+        Net hourly savings and utilization across commitment levels.
+
+        Coverage for every level is computed at once from prefix sums of the
+        sorted hourly values.
+        """
+        hours = sorted_values.shape[0]
+        if hours == 0 or sorted_values[-1] <= 0:
+            return []
+
+        levels = np.linspace(0.0, float(sorted_values[-1]), self.curve_points)
+        prefix = np.concatenate([[0.0], np.cumsum(sorted_values)])
+        below = np.searchsorted(sorted_values, levels, side='left')
+        covered = prefix[below] + levels * (hours - below)
+
+        net_savings = (covered - levels * hours * rate_fraction) * unit_price / hours
+        utilization = np.divide(covered, levels * hours, out=np.zeros_like(levels), where=levels > 0) * 100
+
+        return [
+            {
+                'commitment': float(level * unit_price * rate_fraction),
+                'netHourlySavings': float(savings),
+                'utilizationPercentage': float(used)
+            }
+            for level, savings, used in zip(levels, net_savings, utilization)
+        ]
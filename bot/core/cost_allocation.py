@@ -15,11 +15,22 @@ Requirements: 6.2 - Automated Cost Allocation
 import logging
 import statistics
 from datetime import datetime, timedelta, timezone
-from typing import Dict, List, Any, Optional, Tuple, Union
+from typing import Dict, List, Any, Optional, Tuple, Union, Iterable
 from enum import Enum
 import json
 import re
+import bisect
+import concurrent.futures
+import hashlib
+import os
+import time
 from collections import defaultdict
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from utils.hierarchy_tree import HierarchyTree, build_hierarchy_tree
 
 logger = logging.getLogger(__name__)
 
@@ -69,25 +80,283 @@ class AllocationRule:
         self.created_at = datetime.now(timezone.utc)
         self.is_active = True
 
+
+class AllocationRuleIndex:
+    """
+    Compiled index of allocation rules for fast rule matching.
+    
+    Each indexed rule owns one bit. Service, region and tag conditions are
+    kept as inverted indexes from value to a bitmask of the rules accepting
+    it, and cost thresholds as an interval structure over the sorted
+    threshold boundaries. A cost record is matched with one mask lookup per
+    constrained dimension instead of evaluating every rule.
+    """
+    
+    _COST_DIMENSION = "cost"
+    
+    def __init__(self):
+        self._rules = {}  # rule_id -> (bit, rule_config)
+        self._rules_by_bit = {}  # bit position -> rule_config
+        self._bits = {}  # rule_id -> bit position, kept across updates to preserve rule order
+        self._all_mask = 0
+        self._constrained = defaultdict(int)  # dimension -> mask of rules constraining it
+        self._postings = defaultdict(lambda: defaultdict(int))  # dimension -> value -> mask
+        self._cost_ranges = {}  # bit position -> (min, max)
+        self._cost_bounds = None  # Lazily built interval structure
+        self._cost_point_masks = []
+        self._cost_gap_masks = []
+    
+    def __len__(self) -> int:
+        return len(self._rules)
+    
+    def __getstate__(self) -> Dict[str, Any]:
+        # Nested defaultdict factories are lambdas, which cannot be pickled
+        state = self.__dict__.copy()
+        state["_constrained"] = dict(self._constrained)
+        state["_postings"] = {dimension: dict(values) for dimension, values in self._postings.items()}
+        return state
+    
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self._constrained = defaultdict(int, state["_constrained"])
+        self._postings = defaultdict(lambda: defaultdict(int))
+        for dimension, values in state["_postings"].items():
+            self._postings[dimension].update(values)
+    
+    def rebuild(self, allocation_rules: Dict[str, Dict[str, Any]]) -> None:
+        """Rebuild the index from scratch for a rule set."""
+        self.__init__()
+        for rule_config in allocation_rules.values():
+            self.add_rule(rule_config)
+    
+    def add_rule(self, rule_config: Dict[str, Any]) -> None:
+        """Index a rule (inactive rules are not indexed)."""
+        if rule_config["rule_id"] in self._rules:
+            self.remove_rule(rule_config["rule_id"])
+        if not rule_config.get("is_active", True):
+            return
+        
+        bit = self._bits.setdefault(rule_config["rule_id"], len(self._bits))
+        mask = 1 << bit
+        self._rules[rule_config["rule_id"]] = (bit, rule_config)
+        self._rules_by_bit[bit] = rule_config
+        self._all_mask |= mask
+        
+        for dimension, accepted_values in self._rule_dimensions(rule_config):
+            self._constrained[dimension] |= mask
+            for value in accepted_values:
+                self._postings[dimension][value] |= mask
+        
+        cost_conditions = rule_config.get("conditions", {}).get("cost_thresholds", {})
+        if cost_conditions:
+            self._constrained[self._COST_DIMENSION] |= mask
+            self._cost_ranges[bit] = (cost_conditions.get("min", 0.0), cost_conditions.get("max", float('inf')))
+            self._cost_bounds = None
+    
+    def remove_rule(self, rule_id: str) -> None:
+        """Remove a rule from the index."""
+        if rule_id not in self._rules:
+            return
+        
+        bit, rule_config = self._rules.pop(rule_id)
+        del self._rules_by_bit[bit]
+        keep = ~(1 << bit)
+        self._all_mask &= keep
+        
+        for dimension, accepted_values in self._rule_dimensions(rule_config):
+            self._constrained[dimension] &= keep
+            for value in accepted_values:
+                self._postings[dimension][value] &= keep
+        
+        if self._cost_ranges.pop(bit, None) is not None:
+            self._constrained[self._COST_DIMENSION] &= keep
+            self._cost_bounds = None
+    
+    def find_rules(self, cost_record: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """
+        Find the rules whose conditions match a cost record.
+        
+        Returns:
+            Matching rule configurations ordered by priority (lower number first)
+        """
+        candidates = self._all_mask
+        
+        for dimension, constrained in self._constrained.items():
+            if not constrained or not candidates:
+                continue
+            if dimension == self._COST_DIMENSION:
+                accepted = self._cost_mask(cost_record.get("cost", 0.0))
+            else:
+                accepted = self._postings[dimension].get(self._record_value(cost_record, dimension), 0)
+            candidates &= accepted | (self._all_mask & ~constrained)
+        
+        matched = []
+        while candidates:
+            lowest = candidates & -candidates
+            matched.append(self._rules_by_bit[lowest.bit_length() - 1])
+            candidates ^= lowest
+        
+        # Bits follow insertion order, so the sort keeps ties in rule order
+        matched.sort(key=lambda r: r.get("priority", 100))
+        return matched
+    
+    def tag_keys(self) -> List[str]:
+        """Tag keys referenced by the conditions of indexed rules."""
+        return sorted(
+            dimension[4:] for dimension, constrained in self._constrained.items()
+            if constrained and dimension.startswith("tag:")
+        )
+    
+    def cost_bands(self, costs: np.ndarray) -> Optional[np.ndarray]:
+        """
+        Band id per cost; costs sharing a band match the same cost-threshold rules.
+        
+        Returns:
+            Array of band ids, or None when no indexed rule has cost thresholds
+        """
+        if not self._constrained.get(self._COST_DIMENSION):
+            return None
+        if self._cost_bounds is None:
+            self._build_cost_intervals()
+        
+        bounds = np.asarray(self._cost_bounds, dtype=float)
+        positions = np.searchsorted(bounds, costs, side="left")
+        on_bound = bounds[np.minimum(positions, len(bounds) - 1)] == costs
+        return positions * 2 + on_bound
+    
+    # Private helper methods
+    
+    @staticmethod
+    def _rule_dimensions(rule_config: Dict[str, Any]) -> List[Tuple[str, List[Any]]]:
+        """Categorical (dimension, accepted values) constraints of a rule."""
+        conditions = rule_config.get("conditions", {})
+        dimensions = []
+        
+        for tag_key, expected_values in conditions.get("tags", {}).items():
+            if isinstance(expected_values, str):
+                expected_values = [expected_values]
+            dimensions.append((f"tag:{tag_key}", list(expected_values)))
+        
+        if conditions.get("services"):
+            dimensions.append(("service", list(conditions["services"])))
+        if conditions.get("regions"):
+            dimensions.append(("region", list(conditions["regions"])))
+        
+        return dimensions
+    
+    @staticmethod
+    def _record_value(cost_record: Dict[str, Any], dimension: str) -> Any:
+        if dimension.startswith("tag:"):
+            return cost_record.get("tags", {}).get(dimension[4:])
+        return cost_record.get(dimension, "")
+    
+    def _cost_mask(self, cost: float) -> int:
+        """Mask of cost-threshold rules whose [min, max] range contains cost."""
+        if self._cost_bounds is None:
+            self._build_cost_intervals()
+        
+        position = bisect.bisect_left(self._cost_bounds, cost)
+        if position < len(self._cost_bounds) and self._cost_bounds[position] == cost:
+            return self._cost_point_masks[position]
+        return self._cost_gap_masks[position]
+    
+    def _build_cost_intervals(self) -> None:
+        """Sweep the threshold boundaries into per-point and per-gap rule masks."""
+        starts = defaultdict(int)
+        ends = defaultdict(int)
+        for bit, (min_cost, max_cost) in self._cost_ranges.items():
+            starts[min_cost] |= 1 << bit
+            ends[max_cost] |= 1 << bit
+        
+        self._cost_bounds = sorted(set(starts) | set(ends))
+        self._cost_point_masks = []
+        self._cost_gap_masks = []
+        
+        open_mask = 0  # Rules covering the gap before the current boundary
+        for bound in self._cost_bounds:
+            self._cost_gap_masks.append(open_mask)
+            point_mask = open_mask | starts.get(bound, 0)
+            self._cost_point_masks.append(point_mask)
+            open_mask = point_mask & ~ends.get(bound, 0)
+        self._cost_gap_masks.append(open_mask)
+
+
+class AllocationSummaryStore:
+    """
+    On-disk store of allocation summaries, one JSON file per period.
+    
+    Each file holds the rule-set fingerprint the period was allocated with,
+    the fingerprint and partial summary of every record partition (e.g. one
+    per day), and the merged period summary.
+    """
+    
+    def __init__(self, state_dir: str = "allocation_summaries"):
+        """
+        Initialize allocation summary store.
+        
+        Args:
+            state_dir: Directory to store period summary files
+        """
+        self.state_dir = Path(state_dir)
+    
+    def load(self, period: str) -> Optional[Dict[str, Any]]:
+        """Load a period's stored state, or None if missing or unreadable."""
+        state_file = self._state_file(period)
+        if not state_file.exists():
+            return None
+        try:
+            with open(state_file, "r") as f:
+                return json.load(f)
+        except Exception as e:
+            logger.error(f"Failed to load allocation summary for period {period}: {e}")
+            return None
+    
+    def save(self, period: str, state: Dict[str, Any]) -> None:
+        """Atomically write a period's state."""
+        self.state_dir.mkdir(parents=True, exist_ok=True)
+        state_file = self._state_file(period)
+        temp_file = state_file.with_suffix(".tmp")
+        with open(temp_file, "w") as f:
+            json.dump(state, f, default=str)
+        os.replace(temp_file, state_file)
+    
+    def delete(self, period: str) -> None:
+        """Remove a period's stored state."""
+        self._state_file(period).unlink(missing_ok=True)
+    
+    def list_periods(self) -> List[str]:
+        """Periods with stored summaries."""
+        if not self.state_dir.exists():
+            return []
+        return sorted(path.stem for path in self.state_dir.glob("*.json"))
+    
+    def _state_file(self, period: str) -> Path:
+        return self.state_dir / f"{re.sub(r'[^0-9A-Za-z._-]', '_', period)}.json"
+
+
 class CostAllocationEngine:
     """
     Advanced cost allocation engine with tag-based allocation, usage pattern analysis,
     and hierarchical cost tracking with comprehensive fallback mechanisms.
     """
 
-    def __init__(self, dry_run: bool = True):
+    def __init__(self, dry_run: bool = True, summary_dir: Optional[str] = None):
         """
         Initialize the Cost Allocation Engine.
         
         Args:
             dry_run: If True, no actual allocations will be persisted
+            summary_dir: Optional directory for persisted incremental allocation summaries
         """
         self.dry_run = dry_run
         self.allocation_rules = {}  # Rule storage by rule_id
+        self.rule_index = AllocationRuleIndex()  # Compiled index over active rules
         self.allocation_history = []  # Historical allocation records
+        self.summary_store = AllocationSummaryStore(summary_dir) if summary_dir else None
         self.unallocated_costs = {}  # Costs that couldn't be allocated
         self.allocation_conflicts = []  # Detected rule conflicts
         self.hierarchical_structure = {}  # Organizational hierarchy
+        self.hierarchy_tree = HierarchyTree()  # Precomputed organization tree for rollups
         self.tag_mappings = {}  # Tag value mappings and aliases
         self.usage_patterns = {}  # Learned usage patterns for allocation
         
@@ -173,6 +442,7 @@ class CostAllocationEngine:
             }
             
             self.allocation_rules[rule_id] = rule_config
+            self.rule_index.add_rule(rule_config)
             
             if self.dry_run:
                 logger.info(f"DRY_RUN: Created allocation rule {rule_id}")
@@ -187,37 +457,42 @@ class CostAllocationEngine:
 
     def allocate_costs(
         self,
-        cost_data: List[Dict[str, Any]],
+        cost_data: Union[List[Dict[str, Any]], pd.DataFrame],
         allocation_period: str,
-        force_reallocation: bool = False
+        force_reallocation: bool = False,
+        columnar: bool = False,
+        incremental: bool = False
     ) -> Dict[str, Any]:
         """
         Allocate costs based on configured rules and patterns.
         
         Args:
-            cost_data: List of cost records with resource information
+            cost_data: List of cost records with resource information, or a
+                DataFrame with one row per record and tags as a 'tags' column
+                or flattened 'tags.<key>' columns
             allocation_period: Period identifier (e.g., "2024-01")
             force_reallocation: Force reallocation even if already processed
+            columnar: Allocate column-at-a-time (always used for DataFrames);
+                rule applications and unallocated resources are then reported
+                per rule and per reason with a record_count
+            incremental: Re-allocate only changed daily partitions against the
+                persisted period summary (see allocate_costs_incremental)
             
         Returns:
             Dict containing allocation results and summary
         """
         try:
             logger.info(f"Starting cost allocation for period {allocation_period}")
+            
+            if incremental:
+                return self.allocate_costs_incremental(cost_data, allocation_period, force_reallocation)
+            if columnar or isinstance(cost_data, pd.DataFrame):
+                return self.allocate_cost_stream([cost_data], allocation_period)
+            
             logger.info(f"Processing {len(cost_data)} cost records")
             
             # Initialize allocation tracking
-            allocation_results = {
-                "period": allocation_period,
-                "total_costs": 0.0,
-                "allocated_costs": 0.0,
-                "unallocated_costs": 0.0,
-                "allocation_breakdown": defaultdict(lambda: defaultdict(float)),
-                "rule_applications": [],
-                "unallocated_resources": [],
-                "allocation_conflicts": [],
-                "processing_summary": {}
-            }
+            allocation_results = self._new_allocation_results(allocation_period)
             
             # Process each cost record
             for cost_record in cost_data:
@@ -259,42 +534,146 @@ class CostAllocationEngine:
                     allocation_results["unallocated_costs"] += cost_record.get("cost", 0.0)
                     continue
             
-            # Generate hierarchical rollup
-            hierarchical_allocation = self._generate_hierarchical_rollup(
-                allocation_results["allocation_breakdown"]
-            )
+            return self._finalize_allocation_results(allocation_results, len(cost_data))
             
-            # Calculate allocation metrics
-            allocation_percentage = (
-                (allocation_results["allocated_costs"] / allocation_results["total_costs"] * 100)
-                if allocation_results["total_costs"] > 0 else 0
-            )
+        except Exception as e:
+            logger.error(f"Error in cost allocation for period {allocation_period}: {str(e)}")
+            raise
+
+    def allocate_cost_stream(
+        self,
+        cost_chunks: Iterable[Union[List[Dict[str, Any]], pd.DataFrame]],
+        allocation_period: str
+    ) -> Dict[str, Any]:
+        """
+        Allocate a stream of cost chunks column-at-a-time.
+        
+        Only one chunk is held in memory at a time, so large exports (e.g.
+        CURReader.iter_chunks()) can be allocated in bounded memory. Rule
+        applications and unallocated resources are reported per rule and per
+        reason with a record_count.
+        
+        Args:
+            cost_chunks: Iterable of DataFrames or lists of cost records
+            allocation_period: Period identifier (e.g., "2024-01")
+            
+        Returns:
+            Dict containing allocation results and summary
+        """
+        try:
+            allocation_results = self._new_allocation_results(allocation_period)
+            unallocated = defaultdict(lambda: {"record_count": 0, "cost": 0.0})  # reason -> totals
+            applications = defaultdict(lambda: {"record_count": 0, "allocated_amount": 0.0})  # (rule, method) -> totals
+            records_processed = 0
             
-            # Update processing summary
-            allocation_results.update({
-                "hierarchical_allocation": hierarchical_allocation,
-                "allocation_percentage": allocation_percentage,
-                "processing_summary": {
-                    "total_records_processed": len(cost_data),
-                    "successfully_allocated": len(allocation_results["rule_applications"]),
-                    "unallocated_records": len(allocation_results["unallocated_resources"]),
-                    "allocation_efficiency": allocation_percentage,
-                    "processing_timestamp": datetime.now(timezone.utc).isoformat()
+            for chunk in cost_chunks:
+                frame = self._to_allocation_frame(chunk)
+                records_processed += len(frame)
+                self._allocate_frame(frame, allocation_results, unallocated, applications)
+            
+            logger.info(f"Processed {records_processed} cost records (columnar)")
+            
+            self._collect_columnar_totals(allocation_results, unallocated, applications)
+            return self._finalize_allocation_results(allocation_results, records_processed)
+            
+        except Exception as e:
+            logger.error(f"Error in cost allocation for period {allocation_period}: {str(e)}")
+            raise
+
+    def allocate_costs_incremental(
+        self,
+        cost_data: Union[List[Dict[str, Any]], pd.DataFrame],
+        allocation_period: str,
+        force_reallocation: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Allocate a period incrementally against its persisted summary.
+        
+        Records are partitioned by day (from 'date' or 'timestamp') and each
+        partition is fingerprinted. Partitions whose fingerprint matches the
+        stored one reuse their stored partial summary, so only new or changed
+        days are allocated; a period with no changes is skipped. Changing the
+        active rule set invalidates every stored partition. The merged summary
+        is persisted to the summary store instead of allocation_history.
+        
+        Args:
+            cost_data: All cost records of the period (list or DataFrame)
+            allocation_period: Period identifier (e.g., "2024-01")
+            force_reallocation: Ignore stored partitions and re-allocate everything
+            
+        Returns:
+            Dict containing allocation results, summary and incremental_summary
+        """
+        if self.summary_store is None:
+            raise ValueError("Incremental allocation requires a summary_dir")
+        
+        try:
+            frame = self._to_allocation_frame(cost_data)
+            rule_set_fingerprint = self._rule_set_fingerprint()
+            
+            stored = None if force_reallocation else self.summary_store.load(allocation_period)
+            if stored and stored.get("rule_set_fingerprint") != rule_set_fingerprint:
+                logger.info(f"Allocation rules changed since period {allocation_period} was allocated")
+                stored = None
+            stored_partitions = stored.get("partitions", {}) if stored else {}
+            
+            partitions = {}
+            reallocated = []
+            labels = self._partition_labels(frame)
+            for label, positions in frame.groupby(labels, sort=True).indices.items():
+                partition_frame = frame.iloc[positions]
+                fingerprint = self._fingerprint_frame(partition_frame)
+                stored_partition = stored_partitions.get(label)
+                if stored_partition and stored_partition.get("fingerprint") == fingerprint:
+                    partitions[label] = stored_partition
+                    continue
+                
+                partitions[label] = {
+                    "fingerprint": fingerprint,
+                    "summary": self._allocate_partition(partition_frame)
                 }
-            })
+                reallocated.append(label)
+            
+            removed = sorted(set(stored_partitions) - set(partitions))
+            incremental_summary = {
+                "rule_set_fingerprint": rule_set_fingerprint,
+                "partitions_total": len(partitions),
+                "partitions_reallocated": reallocated,
+                "partitions_reused": len(partitions) - len(reallocated),
+                "partitions_removed": removed,
+                "period_skipped": bool(stored) and not reallocated and not removed
+            }
             
-            # Store allocation history (even in dry_run for testing/demo purposes)
-            self.allocation_history.append(allocation_results)
+            if incremental_summary["period_skipped"]:
+                logger.info(f"Period {allocation_period} unchanged, reusing stored allocation summary")
+                allocation_results = stored["summary"]
+                allocation_results["incremental_summary"] = incremental_summary
+                return allocation_results
+            
+            logger.info(f"Re-allocating {len(reallocated)} of {len(partitions)} partitions "
+                        f"for period {allocation_period}")
             
-            logger.info(f"Cost allocation completed: {allocation_percentage:.1f}% allocated")
-            logger.info(f"Total allocated: ${allocation_results['allocated_costs']:,.2f}")
-            logger.info(f"Unallocated: ${allocation_results['unallocated_costs']:,.2f}")
+            allocation_results = self._new_allocation_results(allocation_period)
+            self._merge_partition_summaries(
+                allocation_results, [partition["summary"] for partition in partitions.values()]
+            )
+            self._finalize_allocation_results(allocation_results, len(frame), store_history=False)
+            allocation_results["incremental_summary"] = incremental_summary
+            
+            self.summary_store.save(allocation_period, {
+                "period": allocation_period,
+                "rule_set_fingerprint": rule_set_fingerprint,
+                "partitions": partitions,
+                "summary": allocation_results,
+                "updated_at": datetime.now(timezone.utc).isoformat()
+            })
             
             return allocation_results
             
         except Exception as e:
-            logger.error(f"Error in cost allocation for period {allocation_period}: {str(e)}")
+            logger.error(f"Error in incremental cost allocation for period {allocation_period}: {str(e)}")
             raise
+
     def analyze_usage_patterns(
         self,
         historical_cost_data: List[Dict[str, Any]],
@@ -418,12 +797,16 @@ class CostAllocationEngine:
             if not validation_result["is_valid"]:
                 raise ValueError(f"Invalid hierarchy structure: {validation_result['errors']}")
             
+            # Build the organization tree once so rollups don't re-derive paths
+            self.hierarchy_tree = build_hierarchy_tree(organizational_hierarchy)
+            
             # Store hierarchy configuration
             self.hierarchical_structure = {
                 "structure": organizational_hierarchy,
                 "validation": validation_result,
                 "created_at": datetime.now(timezone.utc).isoformat(),
-                "rollup_paths": self._generate_rollup_paths(organizational_hierarchy)
+                "rollup_paths": self._generate_rollup_paths(organizational_hierarchy),
+                "tree_nodes": len(self.hierarchy_tree)
             }
             
             logger.info("Hierarchical structure configured successfully")
@@ -545,7 +928,10 @@ class CostAllocationEngine:
                         if not self.dry_run and resolution_action.get("rule_updates"):
                             for rule_id, updates in resolution_action["rule_updates"].items():
                                 if rule_id in self.allocation_rules:
+                                    # Unindex before updating so the rule's old postings are cleared
+                                    self.rule_index.remove_rule(rule_id)
                                     self.allocation_rules[rule_id].update(updates)
+                                    self.rule_index.add_rule(self.allocation_rules[rule_id])
                                     resolution_results["updated_rules"].append(rule_id)
                     else:
                         resolution_results["unresolved_conflicts"] += 1
@@ -588,31 +974,15 @@ class CostAllocationEngine:
                     period_allocation = allocation
                     break
             
+            if not period_allocation and self.summary_store is not None:
+                stored = self.summary_store.load(period)
+                period_allocation = stored.get("summary") if stored else None
+            
             if not period_allocation:
                 logger.warning(f"No allocation data found for period {period}")
                 return {"error": f"No allocation data found for period {period}"}
             
-            # Generate comprehensive report
-            report = {
-                "period": period,
-                "report_generated_at": datetime.now(timezone.utc).isoformat(),
-                "executive_summary": self._generate_executive_summary(period_allocation),
-                "allocation_metrics": self._calculate_allocation_metrics(period_allocation),
-                "cost_breakdown": period_allocation.get("allocation_breakdown", {}),
-                "hierarchical_view": period_allocation.get("hierarchical_allocation", {}),
-                "unallocated_analysis": self._analyze_unallocated_costs(period_allocation),
-                "rule_performance": self._analyze_rule_performance(period_allocation),
-                "recommendations": self._generate_allocation_recommendations(period_allocation)
-            }
-            
-            # Add detailed breakdowns if requested
-            if include_details:
-                report["detailed_breakdowns"] = {
-                    "by_service": self._generate_service_breakdown(period_allocation),
-                    "by_region": self._generate_region_breakdown(period_allocation),
-                    "by_team": self._generate_team_breakdown(period_allocation),
-                    "by_project": self._generate_project_breakdown(period_allocation)
-                }
+            report = self._build_allocation_report(period, period_allocation, include_details)
             
             logger.info(f"Allocation report generated for period {period}")
             
@@ -621,8 +991,487 @@ class CostAllocationEngine:
         except Exception as e:
             logger.error(f"Error generating allocation report: {str(e)}")
             raise
+
+    def allocate_periods(
+        self,
+        period_data: Dict[str, Any],
+        max_workers: Optional[int] = None,
+        columnar: bool = True,
+        include_reports: bool = True,
+        include_details: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Allocate and report many periods in parallel worker processes.
+        
+        The rule set is compiled once here; every worker process receives the
+        compiled rule index once at start-up and reuses it for all of its
+        periods. Per-period hierarchical rollups are merged into one rollup.
+        
+        Args:
+            period_data: Cost data per period identifier. Each value is a list of
+                cost records, a DataFrame, or a picklable zero-argument callable
+                that loads them inside the worker (e.g. a CUR reader function)
+            max_workers: Worker processes (defaults to the CPU count; 1 runs in-process)
+            columnar: Use columnar allocation in each period
+            include_reports: Also generate each period's allocation report
+            include_details: Include detailed breakdowns in reports
+            
+        Returns:
+            Dict with per-period results, merged totals and the merged hierarchical rollup
+        """
+        started = time.time()
+        options = {"columnar": columnar, "include_reports": include_reports, "include_details": include_details}
+        workers = max(1, min(max_workers or os.cpu_count() or 1, len(period_data)))
+        logger.info(f"Allocating {len(period_data)} periods with {workers} worker(s)")
+        
+        if workers == 1:
+            outcomes = {
+                period: self._allocate_period(period, cost_data, **options)
+                for period, cost_data in period_data.items()
+            }
+        else:
+            with concurrent.futures.ProcessPoolExecutor(
+                max_workers=workers,
+                initializer=_initialize_period_worker,
+                initargs=(self._export_state(),)
+            ) as executor:
+                futures = {
+                    period: executor.submit(_allocate_period_in_worker, period, cost_data, options)
+                    for period, cost_data in period_data.items()
+                }
+                outcomes = {period: future.result() for period, future in futures.items()}
+            self.allocation_history.extend(outcome["allocation"] for outcome in outcomes.values())
+        
+        allocations = [outcome["allocation"] for outcome in outcomes.values()]
+        totals = {
+            key: sum(allocation[key] for allocation in allocations)
+            for key in ("total_costs", "allocated_costs", "unallocated_costs")
+        }
+        
+        return {
+            "periods": outcomes,
+            **totals,
+            "allocation_percentage": (
+                totals["allocated_costs"] / totals["total_costs"] * 100 if totals["total_costs"] > 0 else 0
+            ),
+            "hierarchical_allocation": self._merge_hierarchical_rollups(
+                [allocation["hierarchical_allocation"] for allocation in allocations]
+            ),
+            "processing_summary": {
+                "periods_processed": len(outcomes),
+                "workers": workers,
+                "total_records_processed": sum(
+                    allocation["processing_summary"]["total_records_processed"] for allocation in allocations
+                ),
+                "processing_seconds": time.time() - started,
+                "processing_timestamp": datetime.now(timezone.utc).isoformat()
+            }
+        }
     # Helper methods for internal operations
 
+    def _build_allocation_report(
+        self, period: str, period_allocation: Dict[str, Any], include_details: bool
+    ) -> Dict[str, Any]:
+        """Build the allocation report for one period's results."""
+        report = {
+            "period": period,
+            "report_generated_at": datetime.now(timezone.utc).isoformat(),
+            "executive_summary": self._generate_executive_summary(period_allocation),
+            "allocation_metrics": self._calculate_allocation_metrics(period_allocation),
+            "cost_breakdown": period_allocation.get("allocation_breakdown", {}),
+            "hierarchical_view": period_allocation.get("hierarchical_allocation", {}),
+            "unallocated_analysis": self._analyze_unallocated_costs(period_allocation),
+            "rule_performance": self._analyze_rule_performance(period_allocation),
+            "recommendations": self._generate_allocation_recommendations(period_allocation)
+        }
+        
+        # Add detailed breakdowns if requested
+        if include_details:
+            report["detailed_breakdowns"] = {
+                "by_service": self._generate_service_breakdown(period_allocation),
+                "by_region": self._generate_region_breakdown(period_allocation),
+                "by_team": self._generate_team_breakdown(period_allocation),
+                "by_project": self._generate_project_breakdown(period_allocation)
+            }
+        
+        return report
+
+    def _allocate_period(
+        self,
+        period: str,
+        cost_data: Any,
+        columnar: bool,
+        include_reports: bool,
+        include_details: bool
+    ) -> Dict[str, Any]:
+        """Allocate (and report) one period of a batch, returning picklable results."""
+        if callable(cost_data):
+            cost_data = cost_data()
+        
+        allocation = self.allocate_costs(cost_data, period, columnar=columnar)
+        allocation["allocation_breakdown"] = {
+            scope: dict(targets) for scope, targets in allocation["allocation_breakdown"].items()
+        }
+        report = self._build_allocation_report(period, allocation, include_details) if include_reports else None
+        return {"allocation": allocation, "report": report}
+
+    def _export_state(self) -> Dict[str, Any]:
+        """Rule set, compiled index and configuration needed to allocate in another process."""
+        return {
+            "dry_run": self.dry_run,
+            "allocation_rules": self.allocation_rules,
+            "rule_index": self.rule_index,
+            "hierarchical_structure": self.hierarchical_structure,
+            "hierarchy_tree": self.hierarchy_tree,
+            "tag_mappings": self.tag_mappings,
+            "usage_patterns": self.usage_patterns,
+            "default_config": self.default_config
+        }
+
+    @classmethod
+    def _from_state(cls, state: Dict[str, Any]) -> "CostAllocationEngine":
+        """Rebuild an engine from exported state without recompiling rules."""
+        engine = cls(dry_run=state["dry_run"])
+        for attribute, value in state.items():
+            if attribute != "dry_run":
+                setattr(engine, attribute, value)
+        return engine
+
+    @staticmethod
+    def _merge_hierarchical_rollups(rollups: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Sum per-period hierarchical rollups scope by scope."""
+        merged = {}
+        for rollup in rollups:
+            for scope, node in rollup.items():
+                if scope == "hierarchy_rollup":
+                    merged_tree = merged.setdefault(scope, {})
+                    for node_id, tree_node in node.items():
+                        merged_tree_node = merged_tree.setdefault(node_id, dict(tree_node, direct_allocation=0.0, total=0.0))
+                        merged_tree_node["direct_allocation"] += tree_node["direct_allocation"]
+                        merged_tree_node["total"] += tree_node["total"]
+                    continue
+                if scope == "ambiguous_targets":
+                    merged_targets = merged.setdefault(scope, {})
+                    for target, candidates in node.items():
+                        known = merged_targets.setdefault(target, [])
+                        known.extend(candidate for candidate in candidates if candidate not in known)
+                    continue
+                if not isinstance(node, dict) or "direct_allocations" not in node:
+                    continue
+                merged_node = merged.setdefault(scope, {
+                    "direct_allocations": defaultdict(float),
+                    "total": 0.0,
+                    "rollup_path": node.get("rollup_path", [scope]),
+                    "periods": 0
+                })
+                for target, amount in node["direct_allocations"].items():
+                    merged_node["direct_allocations"][target] += amount
+                merged_node["total"] += node["total"]
+                merged_node["periods"] += 1
+        
+        if not merged:
+            errors = [rollup["error"] for rollup in rollups if "error" in rollup]
+            return {"error": errors[0]} if errors else {}
+        
+        for scope, merged_node in merged.items():
+            if scope not in ("hierarchy_rollup", "ambiguous_targets"):
+                merged_node["direct_allocations"] = dict(merged_node["direct_allocations"])
+        return merged
+
+    @staticmethod
+    def _new_allocation_results(allocation_period: str) -> Dict[str, Any]:
+        """Empty allocation results for a period."""
+        return {
+            "period": allocation_period,
+            "total_costs": 0.0,
+            "allocated_costs": 0.0,
+            "unallocated_costs": 0.0,
+            "allocation_breakdown": defaultdict(lambda: defaultdict(float)),
+            "rule_applications": [],
+            "unallocated_resources": [],
+            "allocation_conflicts": [],
+            "processing_summary": {}
+        }
+
+    def _finalize_allocation_results(
+        self, allocation_results: Dict[str, Any], records_processed: int, store_history: bool = True
+    ) -> Dict[str, Any]:
+        """Add the hierarchical rollup and processing summary, and record history."""
+        # Generate hierarchical rollup
+        hierarchical_allocation = self._generate_hierarchical_rollup(
+            allocation_results["allocation_breakdown"]
+        )
+        
+        # Calculate allocation metrics
+        allocation_percentage = (
+            (allocation_results["allocated_costs"] / allocation_results["total_costs"] * 100)
+            if allocation_results["total_costs"] > 0 else 0
+        )
+        
+        # Update processing summary
+        allocation_results.update({
+            "hierarchical_allocation": hierarchical_allocation,
+            "allocation_percentage": allocation_percentage,
+            "processing_summary": {
+                "total_records_processed": records_processed,
+                "successfully_allocated": self._count_records(allocation_results["rule_applications"]),
+                "unallocated_records": self._count_records(allocation_results["unallocated_resources"]),
+                "allocation_efficiency": allocation_percentage,
+                "processing_timestamp": datetime.now(timezone.utc).isoformat()
+            }
+        })
+        
+        # Store allocation history (even in dry_run for testing/demo purposes)
+        if store_history:
+            self.allocation_history.append(allocation_results)
+        
+        logger.info(f"Cost allocation completed: {allocation_percentage:.1f}% allocated")
+        logger.info(f"Total allocated: ${allocation_results['allocated_costs']:,.2f}")
+        logger.info(f"Unallocated: ${allocation_results['unallocated_costs']:,.2f}")
+        
+        return allocation_results
+
+    @staticmethod
+    def _count_records(entries: List[Dict[str, Any]]) -> int:
+        """Count records behind per-record or aggregated (record_count) entries."""
+        return sum(entry.get("record_count", 1) for entry in entries)
+
+    def _allocate_frame(
+        self,
+        frame: pd.DataFrame,
+        allocation_results: Dict[str, Any],
+        unallocated: Dict[str, Dict[str, Any]],
+        applications: Dict[Tuple[str, Any], Dict[str, Any]]
+    ) -> None:
+        """
+        Allocate one columnar chunk into running results.
+        
+        Records that share a service, region, the tag values read by rules
+        and allocation methods, and a cost band match the same rule and
+        split the same way. Records are grouped on those columns with
+        vectorized factorization, rules are resolved once per group, and each
+        group's total cost is allocated in one step.
+        """
+        cost = frame["cost"].to_numpy(dtype=float)
+        allocation_results["total_costs"] += float(cost.sum())
+        
+        below_threshold = cost < self.default_config["minimum_allocation_threshold"]
+        if below_threshold.any():
+            below_threshold_cost = float(cost[below_threshold].sum())
+            unallocated["below_minimum_threshold"]["record_count"] += int(below_threshold.sum())
+            unallocated["below_minimum_threshold"]["cost"] += below_threshold_cost
+            allocation_results["unallocated_costs"] += below_threshold_cost
+        
+        rows = np.flatnonzero(~below_threshold)
+        tag_keys = sorted(
+            set(self.rule_index.tag_keys()) | set(self.default_config["primary_allocation_tags"])
+        )
+        tag_columns = [f"tags.{tag_key}" for tag_key in tag_keys if f"tags.{tag_key}" in frame.columns]
+        group_columns = ["service", "region"] + tag_columns
+        
+        # Group records on every column rule matching and allocation read
+        code_arrays = []
+        for column in group_columns:
+            values = frame[column]
+            if isinstance(values.dtype, pd.CategoricalDtype):
+                code_arrays.append(values.cat.codes.to_numpy()[rows])
+            else:
+                code_arrays.append(pd.factorize(values.to_numpy()[rows])[0])
+        cost_bands = self.rule_index.cost_bands(cost[rows])
+        if cost_bands is not None:
+            code_arrays.append(pd.factorize(cost_bands)[0])
+        group_codes = self._combine_group_codes(code_arrays, len(rows))
+        
+        group_count = int(group_codes.max()) + 1 if len(rows) else 0
+        group_costs = np.bincount(group_codes, weights=cost[rows], minlength=group_count)
+        group_sizes = np.bincount(group_codes, minlength=group_count)
+        representatives = np.empty(group_count, dtype=np.int64)
+        representatives[group_codes] = rows  # Any member represents its group
+        
+        samples = frame.iloc[representatives][group_columns + ["resource_id", "cost"]].to_dict("records")
+        for sample, group_cost, group_size in zip(samples, group_costs.tolist(), group_sizes.tolist()):
+            cost_record = {
+                "resource_id": sample["resource_id"],
+                "service": sample["service"],
+                "region": sample["region"],
+                "cost": sample["cost"],
+                "tags": {
+                    column[5:]: sample[column] for column in tag_columns if not pd.isna(sample[column])
+                }
+            }
+            
+            try:
+                # Match on a member's cost (same cost band), then allocate the group total
+                applicable_rules = self._find_applicable_rules(cost_record)
+                cost_record["cost"] = group_cost
+                if applicable_rules:
+                    record_allocation = self._apply_allocation_rule(cost_record, applicable_rules[0])
+                else:
+                    record_allocation = self._apply_fallback_allocation(cost_record)
+            except Exception as e:
+                logger.error(f"Error allocating cost group of {group_size} records: {e}")
+                allocation_results["unallocated_costs"] += group_cost
+                continue
+            
+            if record_allocation["allocated"]:
+                allocation_results["allocated_costs"] += group_cost
+                scope = record_allocation.get("scope", "unknown")
+                for target, amount in record_allocation["allocations"].items():
+                    allocation_results["allocation_breakdown"][scope][target] += amount
+            else:
+                reason = record_allocation.get("reason", "unknown")
+                unallocated[reason]["record_count"] += group_size
+                unallocated[reason]["cost"] += group_cost
+                allocation_results["unallocated_costs"] += group_cost
+            
+            if record_allocation.get("applied_rule"):
+                application = applications[(record_allocation["applied_rule"], record_allocation.get("method"))]
+                application["record_count"] += group_size
+                application["allocated_amount"] += group_cost
+        
+        logger.debug(f"Allocated {len(frame)} records in {group_count} groups")
+
+    @staticmethod
+    def _to_allocation_frame(cost_data: Union[List[Dict[str, Any]], pd.DataFrame]) -> pd.DataFrame:
+        """Columnar cost records with tags flattened into 'tags.<key>' columns."""
+        if isinstance(cost_data, pd.DataFrame):
+            frame = cost_data.reset_index(drop=True)
+            if "tags" in frame.columns:
+                tags = pd.json_normalize(
+                    [record_tags or {} for record_tags in frame["tags"].tolist()], max_level=0
+                ).add_prefix("tags.")
+                frame = pd.concat([frame.drop(columns="tags"), tags], axis=1)
+        else:
+            frame = pd.json_normalize(cost_data, max_level=1)
+        
+        for column, default in (("resource_id", None), ("service", ""), ("region", "")):
+            if column not in frame.columns:
+                frame[column] = default
+        for column in ("service", "region"):
+            values = frame[column]
+            if isinstance(values.dtype, pd.CategoricalDtype) and "" not in values.cat.categories:
+                values = values.cat.add_categories("")
+            frame[column] = values.fillna("")
+        frame["cost"] = (
+            pd.to_numeric(frame["cost"]).fillna(0.0).astype(float) if "cost" in frame.columns else 0.0
+        )
+        return frame
+
+    @staticmethod
+    def _collect_columnar_totals(
+        allocation_results: Dict[str, Any],
+        unallocated: Dict[str, Dict[str, Any]],
+        applications: Dict[Tuple[str, Any], Dict[str, Any]]
+    ) -> None:
+        """Store per-reason and per-rule totals as result entries."""
+        allocation_results["unallocated_resources"] = [
+            {"reason": reason, **totals} for reason, totals in unallocated.items()
+        ]
+        allocation_results["rule_applications"] = [
+            {"rule_id": rule_id, "method": method, **totals}
+            for (rule_id, method), totals in applications.items()
+        ]
+
+    def _allocate_partition(self, frame: pd.DataFrame) -> Dict[str, Any]:
+        """Allocate one record partition into a serializable partial summary."""
+        partial = self._new_allocation_results(None)
+        unallocated = defaultdict(lambda: {"record_count": 0, "cost": 0.0})
+        applications = defaultdict(lambda: {"record_count": 0, "allocated_amount": 0.0})
+        self._allocate_frame(frame, partial, unallocated, applications)
+        self._collect_columnar_totals(partial, unallocated, applications)
+        
+        return {
+            "record_count": len(frame),
+            "total_costs": partial["total_costs"],
+            "allocated_costs": partial["allocated_costs"],
+            "unallocated_costs": partial["unallocated_costs"],
+            "allocation_breakdown": {
+                scope: dict(targets) for scope, targets in partial["allocation_breakdown"].items()
+            },
+            "rule_applications": partial["rule_applications"],
+            "unallocated_resources": partial["unallocated_resources"]
+        }
+
+    def _merge_partition_summaries(
+        self, allocation_results: Dict[str, Any], partials: List[Dict[str, Any]]
+    ) -> None:
+        """Merge partial partition summaries into period results."""
+        unallocated = defaultdict(lambda: {"record_count": 0, "cost": 0.0})
+        applications = defaultdict(lambda: {"record_count": 0, "allocated_amount": 0.0})
+        
+        for partial in partials:
+            for key in ("total_costs", "allocated_costs", "unallocated_costs"):
+                allocation_results[key] += partial[key]
+            for scope, targets in partial["allocation_breakdown"].items():
+                for target, amount in targets.items():
+                    allocation_results["allocation_breakdown"][scope][target] += amount
+            for entry in partial["unallocated_resources"]:
+                unallocated[entry["reason"]]["record_count"] += entry["record_count"]
+                unallocated[entry["reason"]]["cost"] += entry["cost"]
+            for entry in partial["rule_applications"]:
+                application = applications[(entry["rule_id"], entry["method"])]
+                application["record_count"] += entry["record_count"]
+                application["allocated_amount"] += entry["allocated_amount"]
+        
+        self._collect_columnar_totals(allocation_results, unallocated, applications)
+
+    def _rule_set_fingerprint(self) -> str:
+        """Fingerprint of everything besides the records that affects allocation."""
+        active_rules = [
+            {key: rule.get(key) for key in
+             ("rule_id", "method", "scope", "priority", "conditions", "allocation_targets")}
+            for rule in self.allocation_rules.values() if rule.get("is_active", True)
+        ]
+        config = {
+            key: self.default_config[key]
+            for key in ("primary_allocation_tags", "fallback_strategy", "minimum_allocation_threshold")
+        }
+        payload = json.dumps(
+            [active_rules, config, self.tag_mappings, self.usage_patterns], sort_keys=True, default=str
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def _partition_labels(frame: pd.DataFrame) -> np.ndarray:
+        """Day label ('YYYY-MM-DD') per record, from 'date' or 'timestamp'."""
+        column = "date" if "date" in frame.columns else "timestamp"
+        if column not in frame.columns:
+            return np.full(len(frame), "undated", dtype=object)
+        
+        codes, uniques = pd.factorize(frame[column])
+        labels = np.array([str(value)[:10] for value in uniques] + ["undated"], dtype=object)
+        return labels[codes]  # Missing values (-1) map to "undated"
+
+    @staticmethod
+    def _fingerprint_frame(frame: pd.DataFrame) -> str:
+        """Order-independent fingerprint of a partition's records."""
+        columns = sorted(frame.columns)
+        values = frame[columns]
+        try:
+            row_hashes = pd.util.hash_pandas_object(values, index=False).to_numpy()
+        except TypeError:
+            # Unhashable cells (dicts or lists such as nested tags) are hashed
+            # by their JSON encoding with sorted keys
+            values = values.copy()
+            for column in values.columns[values.dtypes == object]:
+                values[column] = values[column].map(
+                    lambda value: json.dumps(value, sort_keys=True, default=str)
+                    if isinstance(value, (dict, list, tuple)) else value
+                )
+            row_hashes = pd.util.hash_pandas_object(values, index=False).to_numpy()
+        digest = int(row_hashes.sum(dtype=np.uint64))  # Wrapping sum ignores row order
+        payload = json.dumps([columns, len(frame), digest])
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def _combine_group_codes(code_arrays: List[np.ndarray], size: int) -> np.ndarray:
+        """Combine per-column factor codes into dense group codes."""
+        combined = np.zeros(size, dtype=np.int64)
+        for codes in code_arrays:
+            codes = codes.astype(np.int64) + 1  # Missing values (-1) become their own code
+            combined = pd.factorize(combined * (int(codes.max(initial=0)) + 1) + codes)[0]
+        return combined
+
     def _allocate_single_cost_record(
         self,
         cost_record: Dict[str, Any],
@@ -654,21 +1503,8 @@ class CostAllocationEngine:
         return allocation_result
 
     def _find_applicable_rules(self, cost_record: Dict[str, Any]) -> List[Dict[str, Any]]:
-        """Find rules applicable to a cost record."""
-        applicable_rules = []
-        
-        for rule_id, rule_config in self.allocation_rules.items():
-            if not rule_config.get("is_active", True):
-                continue
-            
-            # Check if rule conditions are met
-            if self._evaluate_rule_conditions(cost_record, rule_config):
-                applicable_rules.append(rule_config)
-        
-        # Sort by priority (lower number = higher priority)
-        applicable_rules.sort(key=lambda r: r.get("priority", 100))
-        
-        return applicable_rules
+        """Find rules applicable to a cost record, sorted by priority."""
+        return self.rule_index.find_rules(cost_record)
 
     def _evaluate_rule_conditions(
         self, cost_record: Dict[str, Any], rule_config: Dict[str, Any]
@@ -916,22 +1752,46 @@ class CostAllocationEngine:
             return {"error": "No hierarchical structure configured"}
         
         rollup = {}
-        structure = self.hierarchical_structure.get("structure", {})
+        direct_by_node = defaultdict(float)
         
-        # Implement hierarchical rollup logic based on organizational structure
-        # This is a simplified implementation
         for scope, allocations in allocation_breakdown.items():
             rollup[scope] = {
                 "direct_allocations": allocations,
                 "total": sum(allocations.values()),
                 "rollup_path": self._get_rollup_path(scope)
             }
+            for target, amount in allocations.items():
+                direct_by_node[target] += amount
+        
+        # Roll allocation targets that are tree nodes (business units, teams,
+        # projects) up to the organization in one bottom-up pass. Targets name
+        # a node by its path (e.g. "acme/eng/platform") or by a name used once
+        # in the tree; names shared by several nodes are reported unresolved.
+        if len(self.hierarchy_tree) > 1:
+            tree = self.hierarchy_tree
+            unresolved = tree.set_values(direct_by_node, "cost")
+            totals = tree.rollup("cost")
+            rollup["hierarchy_rollup"] = {
+                node_path: {
+                    "name": tree.name(node_path),
+                    "level": tree.level(node_path),
+                    "direct_allocation": tree.value(node_path, "cost"),
+                    "total": total,
+                    "rollup_path": tree.name_path(node_path)
+                }
+                for node_path, total in totals.items()
+            }
+            ambiguous = [target for target in unresolved if tree.find(target)]
+            if ambiguous:
+                rollup["ambiguous_targets"] = {target: tree.find(target) for target in ambiguous}
         
         return rollup
 
     def _get_rollup_path(self, scope: str) -> List[str]:
-        """Get hierarchical rollup path for a scope."""
+        """Get hierarchical rollup path for a scope or organization tree node."""
         rollup_paths = self.hierarchical_structure.get("rollup_paths", {})
+        if scope not in rollup_paths and scope in self.hierarchy_tree:
+            return self.hierarchy_tree.name_path(scope)
         return rollup_paths.get(scope, [scope])
 
     def _validate_allocation_rule(self, rule: AllocationRule) -> Dict[str, Any]:
@@ -1177,7 +2037,7 @@ class CostAllocationEngine:
             "allocated_costs": allocated_costs,
             "unallocated_costs": allocation_data.get("unallocated_costs", 0.0),
             "allocation_efficiency": allocation_percentage,
-            "total_resources_processed": len(allocation_data.get("rule_applications", [])),
+            "total_resources_processed": self._count_records(allocation_data.get("rule_applications", [])),
             "allocation_quality": "excellent" if allocation_percentage > 90 else "good" if allocation_percentage > 75 else "needs_improvement"
         }
 
@@ -1190,14 +2050,16 @@ class CostAllocationEngine:
         for application in rule_applications:
             rule_id = application.get("rule_id")
             if rule_id:
-                rule_usage[rule_id] += 1
+                rule_usage[rule_id] += application.get("record_count", 1)
+        
+        total_applications = self._count_records(rule_applications)
         
         return {
-            "total_rule_applications": len(rule_applications),
+            "total_rule_applications": total_applications,
             "unique_rules_used": len(rule_usage),
             "most_used_rule": max(rule_usage.items(), key=lambda x: x[1]) if rule_usage else None,
             "rule_usage_distribution": dict(rule_usage),
-            "average_allocations_per_rule": len(rule_applications) / len(rule_usage) if rule_usage else 0
+            "average_allocations_per_rule": total_applications / len(rule_usage) if rule_usage else 0
         }
 
     def _analyze_unallocated_costs(self, allocation_data: Dict[str, Any]) -> Dict[str, Any]:
@@ -1211,11 +2073,11 @@ class CostAllocationEngine:
             reason = resource.get("reason", "unknown")
             cost = resource.get("cost", 0.0)
             
-            reasons[reason]["count"] += 1
+            reasons[reason]["count"] += resource.get("record_count", 1)
             reasons[reason]["total_cost"] += cost
         
         return {
-            "total_unallocated_resources": len(unallocated_resources),
+            "total_unallocated_resources": self._count_records(unallocated_resources),
             "total_unallocated_cost": sum(r.get("cost", 0.0) for r in unallocated_resources),
             "unallocation_reasons": dict(reasons),
             "top_unallocation_reason": max(reasons.items(), key=lambda x: x[1]["total_cost"]) if reasons else None
@@ -1237,7 +2099,7 @@ class CostAllocationEngine:
             allocated_amount = application.get("allocated_amount", 0.0)
             
             if rule_id:
-                rule_performance[rule_id]["applications"] += 1
+                rule_performance[rule_id]["applications"] += application.get("record_count", 1)
                 rule_performance[rule_id]["total_allocated"] += allocated_amount
         
         # Calculate averages
@@ -1313,4 +2175,22 @@ class CostAllocationEngine:
         if validation_results["valid_rules"] == 0:
             recommendations.append("Create allocation rules to enable automatic cost distribution")
         
-        return recommendations
\ No newline at end of file
+        return recommendations
+
+
+# Per-process engine used by allocate_periods worker processes
+_worker_engine = None
+
+
+def _initialize_period_worker(engine_state: Dict[str, Any]) -> None:
+    """Build the worker's engine once from the parent's compiled rule set."""
+    global _worker_engine
+    _worker_engine = CostAllocationEngine._from_state(engine_state)
+
+
+def _allocate_period_in_worker(period: str, cost_data: Any, options: Dict[str, Any]) -> Dict[str, Any]:
+    """Allocate one period in a worker process."""
+    try:
+        return _worker_engine._allocate_period(period, cost_data, **options)
+    finally:
+        _worker_engine.allocation_history.clear()
@@ -21,6 +21,7 @@ from typing import Dict, List, Any, Optional, Callable, Union, Tuple
 from enum import Enum
 from dataclasses import dataclass, asdict
 import concurrent.futures
+from collections import OrderedDict
 from pathlib import Path
 
 # Import related components
@@ -28,12 +29,22 @@ try:
     from core.approval_workflow import ApprovalWorkflow, RiskLevel, WorkflowState, ApprovalStatus
     from utils.safety_controls import SafetyControls, OperationType, OperationStatus, RollbackCapability
     from utils.http_client import HTTPClient
+    from utils.schedule_queue import ScheduleQueue
+    from utils.execution_scheduler import ExecutionScheduler, ResourceLockIndex, execution_lane
+    from utils.aws_config import RateLimiter
+    from utils.resource_state import ResourceStateDescriber, ResourceStatePoller, RESOURCE_DESCRIBE_KINDS
+    from utils.execution_history import ExecutionHistoryStore
 except ImportError:
     # Fallback for relative imports if run as a package
     try:
         from .approval_workflow import ApprovalWorkflow, RiskLevel, WorkflowState, ApprovalStatus
         from ..utils.safety_controls import SafetyControls, OperationType, OperationStatus, RollbackCapability
         from ..utils.http_client import HTTPClient
+        from ..utils.schedule_queue import ScheduleQueue
+        from ..utils.execution_scheduler import ExecutionScheduler, ResourceLockIndex, execution_lane
+        from ..utils.aws_config import RateLimiter
+        from ..utils.resource_state import ResourceStateDescriber, ResourceStatePoller, RESOURCE_DESCRIBE_KINDS
+        from ..utils.execution_history import ExecutionHistoryStore
     except ImportError:
         import sys
         import os
@@ -41,11 +52,26 @@ except ImportError:
         from core.approval_workflow import ApprovalWorkflow, RiskLevel, WorkflowState, ApprovalStatus
         from utils.safety_controls import SafetyControls, OperationType, OperationStatus, RollbackCapability
         from utils.http_client import HTTPClient
+        from utils.schedule_queue import ScheduleQueue
+        from utils.execution_scheduler import ExecutionScheduler, ResourceLockIndex, execution_lane
+        from utils.aws_config import RateLimiter
+        from utils.resource_state import ResourceStateDescriber, ResourceStatePoller, RESOURCE_DESCRIBE_KINDS
+        from utils.execution_history import ExecutionHistoryStore
 
 from datetime import timezone
 
 logger = logging.getLogger(__name__)
 
+# Resource states confirming an optimization took effect (None: the resource is gone)
+EXPECTED_POST_EXECUTION_STATES = {
+    'rightsizing': {'running', 'stopped', 'available'},
+    'cleanup': {'shutting-down', 'terminated', 'deleting', 'deleted', None},
+    'storage_optimization': {'available', 'in-use'}
+}
+
+# Completed execution records kept in memory; older ones are served from the history store
+RECENT_EXECUTIONS_LIMIT = 1000
+
 
 class ExecutionStatus(Enum):
     """Status of optimization execution."""
@@ -112,7 +138,11 @@ class OptimizationExecutionEngine:
                  safety_controls: Optional[Any] = None,
                  dry_run: bool = True,
                  max_concurrent_executions: int = 5,
-                 execution_timeout_minutes: int = 30):
+                 execution_timeout_minutes: int = 30,
+                 schedule_state_path: Optional[str] = None,
+                 history_path: Optional[str] = None,
+                 approval_workflow: Optional[Any] = None,
+                 approval_store_path: Optional[str] = None):
         """
         Initialize optimization execution engine.
         
@@ -122,6 +152,13 @@ class OptimizationExecutionEngine:
             dry_run: If True, no actual optimizations will be executed
             max_concurrent_executions: Maximum number of concurrent executions
             execution_timeout_minutes: Timeout for individual executions
+            schedule_state_path: Optional SQLite file that persists scheduled optimizations
+            history_path: Optional SQLite file that persists execution history
+                (kept in memory otherwise); either way the oldest records are
+                dropped beyond the store's record cap
+            approval_workflow: ApprovalWorkflow instance that receives approval requests
+            approval_store_path: Optional SQLite file that persists approval workflows
+                (used when no approval_workflow is given)
         """
         self.dry_run = dry_run
         self.max_concurrent_executions = max_concurrent_executions
@@ -129,7 +166,10 @@ class OptimizationExecutionEngine:
         self.aws_config = aws_config
         
         # Initialize related components
-        self.approval_workflow = ApprovalWorkflow(dry_run=dry_run)
+        if approval_workflow:
+            self.approval_workflow = approval_workflow
+        else:
+            self.approval_workflow = ApprovalWorkflow(dry_run=dry_run, store_path=approval_store_path)
         
         if safety_controls:
             self.safety_controls = safety_controls
@@ -140,9 +180,18 @@ class OptimizationExecutionEngine:
         
         # Execution tracking
         self.active_executions = {}
-        self.completed_executions = {}
-        self.execution_queue = []
-        self.execution_history = []
+        self.completed_executions = OrderedDict()
+        self.execution_queue = ScheduleQueue(schedule_state_path)
+        self.execution_history = ExecutionHistoryStore(history_path)
+        
+        # Resources held by executions that are running their optimization action
+        self.resource_locks = ResourceLockIndex()
+        self.scheduler_statistics = {}
+        
+        # Live resource state lookups, shared across the optimizations of a batch
+        self.resource_describer = ResourceStateDescriber(aws_config) if aws_config else None
+        self.resource_poller = ResourceStatePoller(self.resource_describer) if aws_config else None
+        self._resource_states: Dict[str, Optional[Dict[str, Any]]] = {}
         
         # Performance monitoring
         self.performance_metrics = {
@@ -217,7 +266,14 @@ class OptimizationExecutionEngine:
             rollback_plan = self._create_execution_rollback_plan(optimization_data)
             execution_record.rollback_plan_id = rollback_plan['rollback_plan_id']
             
-            # Step 4: Execute the optimization
+            # Step 4: Execute the optimization while holding the resource lock
+            if not self.resource_locks.acquire(resource_id, execution_id):
+                execution_record.status = ExecutionStatus.FAILED
+                execution_record.error_message = (
+                    f'Resource {resource_id} is locked by execution {self.resource_locks.holder(resource_id)}'
+                )
+                return self._finalize_execution(execution_record)
+            
             execution_record.status = ExecutionStatus.EXECUTING
             execution_result = self._execute_optimization_action(optimization_data, execution_id)
             
@@ -315,7 +371,7 @@ class OptimizationExecutionEngine:
         optimization_type = optimization_data.get('optimizationType')
         
         # Check 1: Resource exists and is accessible
-        resource_check = self._validate_resource_accessibility(resource_id, optimization_type)
+        resource_check = self._validate_resource_accessibility(optimization_data)
         validation_results['checks'].append(resource_check)
         
         if not resource_check['passed']:
@@ -352,10 +408,9 @@ class OptimizationExecutionEngine:
         
         return validation_results
     
-    def _validate_resource_accessibility(self, resource_id: str, optimization_type: str) -> Dict[str, Any]:
+    def _validate_resource_accessibility(self, optimization_data: Dict[str, Any]) -> Dict[str, Any]:
         """Validate that the resource exists and is accessible."""
-        # This would integrate with AWS APIs to check resource status
-        # For now, simulate the check
+        resource_id = optimization_data.get('resourceId')
         
         if self.dry_run:
             return {
@@ -364,8 +419,22 @@ class OptimizationExecutionEngine:
                 'message': f'DRY_RUN: Would verify {resource_id} accessibility'
             }
         
-        # In real implementation, this would make AWS API calls
-        # to verify the resource exists and is in the expected state
+        # Use the batch snapshot (or a single describe) for resource kinds AWS can describe
+        known, live_state = self._get_live_resource_state(optimization_data)
+        if known and live_state is None:
+            return {
+                'check_name': 'resource_accessibility',
+                'passed': False,
+                'message': f'Resource {resource_id} was not found'
+            }
+        
+        if known:
+            return {
+                'check_name': 'resource_accessibility',
+                'passed': True,
+                'message': f"Resource {resource_id} is accessible (state: {live_state.get('state')})"
+            }
+        
         return {
             'check_name': 'resource_accessibility',
             'passed': True,
@@ -374,17 +443,13 @@ class OptimizationExecutionEngine:
     
     def _check_conflicting_operations(self, resource_id: str) -> Dict[str, Any]:
         """Check for conflicting operations on the same resource."""
-        conflicting_executions = [
-            exec_record for exec_record in self.active_executions.values()
-            if (exec_record.resource_id == resource_id and 
-                exec_record.status in [ExecutionStatus.EXECUTING, ExecutionStatus.SCHEDULED])
-        ]
+        holder = self.resource_locks.holder(resource_id)
         
-        if conflicting_executions:
+        if holder:
             return {
                 'check_name': 'conflicting_operations',
                 'passed': False,
-                'message': f'Resource {resource_id} has {len(conflicting_executions)} active operations'
+                'message': f'Resource {resource_id} has an active operation ({holder})'
             }
         
         return {
@@ -398,6 +463,12 @@ class OptimizationExecutionEngine:
         resource_data = optimization_data.get('resourceData', {})
         optimization_type = optimization_data.get('optimizationType')
         
+        # Prefer live state and tags over the values captured when the recommendation was made
+        known, live_state = self._get_live_resource_state(optimization_data)
+        if known and live_state:
+            resource_data = dict(resource_data, state=live_state.get('state'),
+                                 tags=live_state.get('tags') or resource_data.get('tags', {}))
+        
         # Check resource state based on optimization type
         if optimization_type == 'rightsizing':
             instance_state = resource_data.get('state', 'unknown')
@@ -542,9 +613,11 @@ class OptimizationExecutionEngine:
         # Use safety controls to validate and execute the operation
         def execute_aws_operation():
             # This would contain the actual AWS API calls
-            # For now, simulate successful execution
+            # For now, simulate successful execution; aws_action_issued stays
+            # False until a real call is made so the resource is not polled
             return {
                 'success': True,
+                'aws_action_issued': False,
                 'message': f'Successfully executed {optimization_type} on {resource_id}',
                 'execution_details': {
                     'operation_type': optimization_type,
@@ -629,16 +702,13 @@ class OptimizationExecutionEngine:
         # 3. Monitor performance metrics
         # 4. Validate that the optimization achieved expected results
         
-        resource_id = optimization_data.get('resourceId')
-        optimization_type = optimization_data.get('optimizationType')
+        state_check = self._verify_post_execution_state(optimization_data, execution_result)
+        if not state_check['passed']:
+            validation_results['valid'] = False
+            validation_results['message'] = state_check['message']
         
-        # Simulate post-execution checks
         validation_results['validation_checks'] = [
-            {
-                'check_name': 'resource_state_verification',
-                'passed': True,
-                'message': f'Resource {resource_id} is in expected state after {optimization_type}'
-            },
+            state_check,
             {
                 'check_name': 'cost_reduction_verification',
                 'passed': True,
@@ -653,6 +723,105 @@ class OptimizationExecutionEngine:
         
         return validation_results
     
+    def _verify_post_execution_state(self, optimization_data: Dict[str, Any],
+                                     execution_result: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Wait for the changed resource to reach a state confirming the optimization.
+        
+        The resource is only polled when the execution issued an AWS action
+        (aws_action_issued in its result); otherwise the check passes as
+        unverified instead of waiting for a change that was never requested.
+        Concurrent executions share the poller's bulk describe rounds, which
+        back off exponentially until every resource settles or times out.
+        """
+        resource_id = optimization_data.get('resourceId')
+        optimization_type = optimization_data.get('optimizationType')
+        expected_states = EXPECTED_POST_EXECUTION_STATES.get(optimization_type)
+        resource_key = self._resource_key(optimization_data)
+        
+        if not execution_result.get('aws_action_issued'):
+            return {
+                'check_name': 'resource_state_verification',
+                'passed': True,
+                'verified': False,
+                'message': f'Resource {resource_id} state not verified: no AWS action was issued for {optimization_type}'
+            }
+        
+        if not (self.resource_poller and expected_states and resource_key[0] in RESOURCE_DESCRIBE_KINDS):
+            return {
+                'check_name': 'resource_state_verification',
+                'passed': True,
+                'verified': False,
+                'message': f'Resource {resource_id} state not verified: no state check for {optimization_type}'
+            }
+        
+        outcome = self.resource_poller.wait_for_state(
+            resource_key, expected_states, timeout_seconds=self.execution_timeout_minutes * 60
+        )
+        if outcome['reached']:
+            return {
+                'check_name': 'resource_state_verification',
+                'passed': True,
+                'verified': True,
+                'message': f"Resource {resource_id} reached state {outcome['state']} after {optimization_type}"
+            }
+        
+        return {
+            'check_name': 'resource_state_verification',
+            'passed': False,
+            'verified': False,
+            'message': (
+                f"Resource {resource_id} did not reach an expected state after {optimization_type} "
+                f"(last state: {outcome['state']}, {outcome['rounds']} polls)"
+            )
+        }
+    
+    def prefetch_resource_states(self, optimizations: List[Dict[str, Any]]) -> Dict[str, Optional[Dict[str, Any]]]:
+        """
+        Describe every resource in a batch with bulk calls grouped by service and region.
+        
+        The snapshot is shared by the pre-execution checks of every optimization
+        in the batch instead of one describe call per resource.
+        
+        Args:
+            optimizations: Optimization recommendations in the batch
+            
+        Returns:
+            Live resource state by resource ID (None for resources that no longer exist)
+        """
+        if self.dry_run or self.resource_describer is None:
+            return {}
+        
+        self._resource_states = self.resource_describer.describe(
+            self._resource_key(optimization) for optimization in optimizations
+        )
+        logger.info(f"Prefetched state for {len(self._resource_states)} resources")
+        return self._resource_states
+    
+    def _get_live_resource_state(self, optimization_data: Dict[str, Any]) -> Tuple[bool, Optional[Dict[str, Any]]]:
+        """(known, state) of a resource from the batch snapshot, describing it on a miss."""
+        resource_id = optimization_data.get('resourceId')
+        if resource_id in self._resource_states:
+            return True, self._resource_states[resource_id]
+        
+        resource_key = self._resource_key(optimization_data)
+        if self.dry_run or self.resource_describer is None or resource_key[0] not in RESOURCE_DESCRIBE_KINDS:
+            return False, None
+        
+        states = self.resource_describer.describe([resource_key])
+        if resource_id in states:
+            return True, states[resource_id]
+        return False, None
+    
+    def _resource_key(self, optimization_data: Dict[str, Any]) -> Tuple[str, str, str]:
+        """(resource_type, resource_id, region) of an optimization's resource."""
+        resource_data = optimization_data.get('resourceData') or {}
+        return (
+            str(optimization_data.get('resourceType', 'unknown')).lower(),
+            optimization_data.get('resourceId'),
+            resource_data.get('region') or getattr(self.aws_config, 'region', None)
+        )
+    
     def _calculate_savings_accuracy(self, 
                                   estimated_savings: float,
                                   actual_savings: Optional[float]) -> Optional[float]:
@@ -692,12 +861,16 @@ class OptimizationExecutionEngine:
         completed_at = datetime.fromisoformat(execution_record.completed_at)
         execution_record.execution_time_seconds = (completed_at - started_at).total_seconds()
         
-        # Move from active to completed executions
+        # Release the resource, forget its pre-change state and move to completed executions
+        self.resource_locks.release(execution_record.resource_id, execution_record.execution_id)
+        self._resource_states.pop(execution_record.resource_id, None)
         if execution_record.execution_id in self.active_executions:
             del self.active_executions[execution_record.execution_id]
         
         self.completed_executions[execution_record.execution_id] = execution_record
-        self.execution_history.append(execution_record.to_dict())
+        while len(self.completed_executions) > RECENT_EXECUTIONS_LIMIT:
+            self.completed_executions.popitem(last=False)
+        self.execution_history.add(execution_record.to_dict())
         
         # Update performance metrics
         self._update_performance_metrics(execution_record)
@@ -726,15 +899,10 @@ class OptimizationExecutionEngine:
         elif execution_record.status in [ExecutionStatus.FAILED, ExecutionStatus.ROLLED_BACK]:
             self.performance_metrics['failed_executions'] += 1
         
-        # Update average execution time
-        total_time = sum(
-            record.execution_time_seconds or 0 
-            for record in self.completed_executions.values()
+        # Update average execution time from the history store's running aggregates
+        self.performance_metrics['average_execution_time'] = (
+            self.execution_history.get_aggregates()['average_execution_time']
         )
-        completed_count = len(self.completed_executions)
-        
-        if completed_count > 0:
-            self.performance_metrics['average_execution_time'] = total_time / completed_count
     
     def _send_execution_results_to_api(self, execution_record: ExecutionResult) -> None:
         """Send execution results to the backend API."""
@@ -803,26 +971,31 @@ class OptimizationExecutionEngine:
             }
         }
         
-        if batch_mode == BatchProcessingMode.SEQUENTIAL:
-            # Execute one at a time
-            for optimization in optimizations:
-                result = self.execute_optimization(optimization)
-                batch_results['execution_results'].append(result)
-                self._update_batch_summary(batch_results['summary'], result)
-        
-        elif batch_mode == BatchProcessingMode.PARALLEL:
-            # Execute multiple simultaneously
-            batch_results = self._execute_parallel_batch(optimizations, max_parallel, batch_results)
-        
-        elif batch_mode == BatchProcessingMode.RESOURCE_GROUPED:
-            # Group by resource type and execute groups in parallel
-            grouped_optimizations = self._group_optimizations_by_resource_type(optimizations)
-            batch_results = self._execute_grouped_batch(grouped_optimizations, batch_results)
-        
-        elif batch_mode == BatchProcessingMode.REGION_GROUPED:
-            # Group by AWS region and execute groups in parallel
-            grouped_optimizations = self._group_optimizations_by_region(optimizations)
-            batch_results = self._execute_grouped_batch(grouped_optimizations, batch_results)
+        # Describe the batch's resources once, shared by every pre-execution check
+        self.prefetch_resource_states(optimizations)
+        try:
+            if batch_mode == BatchProcessingMode.SEQUENTIAL:
+                # Execute one at a time
+                for optimization in optimizations:
+                    result = self.execute_optimization(optimization)
+                    batch_results['execution_results'].append(result)
+                    self._update_batch_summary(batch_results['summary'], result)
+            
+            elif batch_mode == BatchProcessingMode.PARALLEL:
+                # Execute multiple simultaneously
+                batch_results = self._execute_parallel_batch(optimizations, max_parallel, batch_results)
+            
+            elif batch_mode == BatchProcessingMode.RESOURCE_GROUPED:
+                # Group by resource type and execute groups in parallel
+                grouped_optimizations = self._group_optimizations_by_resource_type(optimizations)
+                batch_results = self._execute_grouped_batch(grouped_optimizations, batch_results)
+            
+            elif batch_mode == BatchProcessingMode.REGION_GROUPED:
+                # Group by AWS region and execute groups in parallel
+                grouped_optimizations = self._group_optimizations_by_region(optimizations)
+                batch_results = self._execute_grouped_batch(grouped_optimizations, batch_results)
+        finally:
+            self._resource_states = {}
         
         batch_results['completed_at'] = datetime.utcnow().isoformat()
         batch_results['total_batch_time'] = (
@@ -843,43 +1016,44 @@ class OptimizationExecutionEngine:
                                optimizations: List[Dict[str, Any]],
                                max_parallel: int,
                                batch_results: Dict[str, Any]) -> Dict[str, Any]:
-        """Execute optimizations in parallel with concurrency control."""
-        with concurrent.futures.ThreadPoolExecutor(max_workers=max_parallel) as executor:
-            # Submit all optimization executions
-            future_to_optimization = {
-                executor.submit(self.execute_optimization, opt): opt 
-                for opt in optimizations
+        """
+        Execute optimizations in parallel under the execution scheduler.
+        
+        At most max_parallel executions run at once, each (service, region)
+        stays within the concurrency its API rate limit allows, and
+        optimizations for the same resource run one after another.
+        """
+        def parallel_error_result(optimization: Dict[str, Any], error: Exception) -> Dict[str, Any]:
+            return {
+                'resource_id': optimization.get('resourceId'),
+                'status': ExecutionStatus.FAILED.value,
+                'error_message': str(error),
+                'actual_savings': 0,
+                'execution_time_seconds': 0
             }
-            
-            # Collect results as they complete
-            for future in concurrent.futures.as_completed(future_to_optimization):
-                try:
-                    result = future.result(timeout=self.execution_timeout_minutes * 60)
-                    batch_results['execution_results'].append(result)
-                    self._update_batch_summary(batch_results['summary'], result)
-                except concurrent.futures.TimeoutError:
-                    logger.error(f"Optimization execution timed out after {self.execution_timeout_minutes} minutes")
-                    timeout_result = {
-                        'status': ExecutionStatus.FAILED.value,
-                        'error_message': 'Execution timeout',
-                        'actual_savings': 0,
-                        'execution_time_seconds': self.execution_timeout_minutes * 60
-                    }
-                    batch_results['execution_results'].append(timeout_result)
-                    self._update_batch_summary(batch_results['summary'], timeout_result)
-                except Exception as e:
-                    logger.error(f"Parallel execution failed: {str(e)}")
-                    error_result = {
-                        'status': ExecutionStatus.FAILED.value,
-                        'error_message': str(e),
-                        'actual_savings': 0,
-                        'execution_time_seconds': 0
-                    }
-                    batch_results['execution_results'].append(error_result)
-                    self._update_batch_summary(batch_results['summary'], error_result)
         
+        scheduler = self._create_execution_scheduler(max_parallel)
+        results = scheduler.run(optimizations, self.execute_optimization, execution_lane,
+                                error_handler=parallel_error_result)
+        
+        for result in results:
+            batch_results['execution_results'].append(result)
+            self._update_batch_summary(batch_results['summary'], result)
+        
+        self.scheduler_statistics = scheduler.get_statistics()
+        batch_results['scheduling'] = self.scheduler_statistics
         return batch_results
     
+    def _create_execution_scheduler(self, max_workers: int) -> ExecutionScheduler:
+        """Scheduler sharing the AWS configuration's rate limiter when one is configured."""
+        rate_limiter = None
+        if hasattr(self.aws_config, 'get_rate_limiter'):
+            rate_limiter = self.aws_config.get_rate_limiter()
+        return ExecutionScheduler(
+            max_workers=max_workers,
+            rate_limiter=rate_limiter if isinstance(rate_limiter, RateLimiter) else None
+        )
+    
     def _group_optimizations_by_resource_type(self, 
                                             optimizations: List[Dict[str, Any]]) -> Dict[str, List[Dict[str, Any]]]:
         """Group optimizations by resource type."""
@@ -910,7 +1084,8 @@ class OptimizationExecutionEngine:
                              grouped_optimizations: Dict[str, List[Dict[str, Any]]],
                              batch_results: Dict[str, Any]) -> Dict[str, Any]:
         """Execute grouped optimizations with parallel group processing."""
-        with concurrent.futures.ThreadPoolExecutor(max_workers=len(grouped_optimizations)) as executor:
+        max_workers = max(1, min(len(grouped_optimizations), self.max_concurrent_executions))
+        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
             # Submit each group for parallel execution
             future_to_group = {}
             
@@ -995,9 +1170,8 @@ class OptimizationExecutionEngine:
             'estimated_savings': optimization_data.get('estimatedSavings', 0)
         }
         
-        # Add to execution queue with priority ordering
-        self.execution_queue.append(scheduled_item)
-        self.execution_queue.sort(key=lambda x: (x['scheduled_time'], x['priority']))
+        # Add to the due-time heap (ties broken by priority)
+        self.execution_queue.push(scheduled_item)
         
         logger.info(
             f"Scheduled optimization {schedule_id} for {optimization_data.get('resourceId')} "
@@ -1019,30 +1193,14 @@ class OptimizationExecutionEngine:
         Returns:
             Processing results
         """
-        current_time = datetime.utcnow()
-        due_optimizations = []
-        remaining_queue = []
-        
-        # Separate due optimizations from future ones
-        for scheduled_item in self.execution_queue:
-            scheduled_time = datetime.fromisoformat(scheduled_item['scheduled_time'])
-            
-            if scheduled_time <= current_time:
-                due_optimizations.append(scheduled_item)
-            else:
-                remaining_queue.append(scheduled_item)
-        
-        # Update queue to remove processed items
-        self.execution_queue = remaining_queue
+        # Pop only the due items off the heap
+        due_optimizations = self.execution_queue.pop_due()
         
         if not due_optimizations:
             return {
                 'processed_count': 0,
                 'message': 'No scheduled optimizations due for execution',
-                'next_scheduled': (
-                    remaining_queue[0]['scheduled_time'] if remaining_queue 
-                    else None
-                )
+                'next_scheduled': self._next_scheduled_time()
             }
         
         logger.info(f"Processing {len(due_optimizations)} scheduled optimizations")
@@ -1072,10 +1230,7 @@ class OptimizationExecutionEngine:
             'failed_executions': len(due_optimizations) - successful_executions,
             'total_savings_achieved': total_savings,
             'execution_results': execution_results,
-            'next_scheduled': (
-                remaining_queue[0]['scheduled_time'] if remaining_queue 
-                else None
-            )
+            'next_scheduled': self._next_scheduled_time()
         }
     
     def cancel_scheduled_optimization(self, schedule_id: str) -> Dict[str, Any]:
@@ -1088,25 +1243,40 @@ class OptimizationExecutionEngine:
         Returns:
             Cancellation result
         """
-        # Find and remove the scheduled item
-        for i, scheduled_item in enumerate(self.execution_queue):
-            if scheduled_item['schedule_id'] == schedule_id:
-                cancelled_item = self.execution_queue.pop(i)
-                
-                logger.info(f"Cancelled scheduled optimization {schedule_id}")
-                
-                return {
-                    'success': True,
-                    'schedule_id': schedule_id,
-                    'cancelled_at': datetime.utcnow().isoformat(),
-                    'message': f'Scheduled optimization {schedule_id} cancelled'
-                }
+        # Remove the scheduled item through the id index
+        cancelled_item = self.execution_queue.remove(schedule_id)
+        if cancelled_item:
+            logger.info(f"Cancelled scheduled optimization {schedule_id}")
+            
+            return {
+                'success': True,
+                'schedule_id': schedule_id,
+                'cancelled_at': datetime.utcnow().isoformat(),
+                'message': f'Scheduled optimization {schedule_id} cancelled'
+            }
         
         return {
             'success': False,
             'message': f'Scheduled optimization {schedule_id} not found'
         }
     
+    def get_next_wake_time(self) -> Optional[datetime]:
+        """
+        Get when the next scheduled optimization is due.
+        
+        Callers can sleep until this time instead of polling
+        process_scheduled_optimizations.
+        
+        Returns:
+            UTC due time of the next scheduled optimization, or None if none are queued
+        """
+        return self.execution_queue.next_wake_time()
+    
+    def _next_scheduled_time(self) -> Optional[str]:
+        """Scheduled time of the next queued optimization."""
+        next_item = self.execution_queue.peek()
+        return next_item['scheduled_time'] if next_item else None
+    
     def get_execution_status(self, execution_id: str) -> Dict[str, Any]:
         """
         Get status of a specific execution.
@@ -1135,6 +1305,15 @@ class OptimizationExecutionEngine:
                 'is_active': False
             }
         
+        # Fall back to the history store for executions no longer held in memory
+        history_record = self.execution_history.get(execution_id)
+        if history_record:
+            return {
+                'success': True,
+                'execution': history_record,
+                'is_active': False
+            }
+        
         return {
             'success': False,
             'message': f'Execution {execution_id} not found'
@@ -1167,10 +1346,7 @@ class OptimizationExecutionEngine:
         queue_status = {
             'scheduled_optimizations': len(self.execution_queue),
             'active_executions': len(self.active_executions),
-            'next_scheduled': (
-                self.execution_queue[0]['scheduled_time'] if self.execution_queue 
-                else None
-            )
+            'next_scheduled': self._next_scheduled_time()
         }
         
         return {
@@ -1181,7 +1357,8 @@ class OptimizationExecutionEngine:
             'dry_run_mode': self.dry_run,
             'max_concurrent_executions': self.max_concurrent_executions,
             'execution_timeout_minutes': self.execution_timeout_minutes,
-            'total_rollback_plans': len(self.safety_controls.rollback_plans)
+            'total_rollback_plans': len(self.safety_controls.rollback_plans),
+            'history_summary': self.execution_history.get_aggregates()
         }
     
     def get_execution_history(self, 
@@ -1194,34 +1371,18 @@ class OptimizationExecutionEngine:
         Args:
             limit: Maximum number of records to return
             status_filter: Filter by execution status
-            resource_filter: Filter by resource ID
+            resource_filter: Filter by resource ID (matches IDs containing the value)
             
         Returns:
-            Filtered execution history
+            Filtered execution history, most recent first
         """
-        filtered_history = self.execution_history.copy()
-        
-        # Apply filters
-        if status_filter:
-            filtered_history = [
-                record for record in filtered_history
-                if record.get('status') == status_filter.value
-            ]
-        
-        if resource_filter:
-            filtered_history = [
-                record for record in filtered_history
-                if resource_filter in record.get('resource_id', '')
-            ]
-        
-        # Sort by completion time (most recent first)
-        filtered_history.sort(
-            key=lambda x: x.get('completed_at', x.get('started_at', '')),
-            reverse=True
+        # Indexed query: reads only the returned rows, regardless of history size
+        return self.execution_history.query(
+            limit=limit,
+            status=status_filter.value if status_filter else None,
+            resource_id=resource_filter,
+            resource_match='substring'
         )
-        
-        # Apply limit
-        return filtered_history[:limit]
     
     def cleanup_completed_executions(self, retention_days: int = 30) -> Dict[str, Any]:
         """
@@ -1235,27 +1396,20 @@ class OptimizationExecutionEngine:
         """
         cutoff_date = datetime.utcnow() - timedelta(days=retention_days)
         
-        # Find executions to clean up
-        executions_to_remove = []
-        for execution_id, execution_record in self.completed_executions.items():
-            completed_at = datetime.fromisoformat(execution_record.completed_at)
-            if completed_at < cutoff_date:
-                executions_to_remove.append(execution_id)
-        
-        # Remove old executions
-        for execution_id in executions_to_remove:
+        # Remove old executions from the bounded in-memory cache (oldest first)
+        while self.completed_executions:
+            execution_id, execution_record = next(iter(self.completed_executions.items()))
+            if datetime.fromisoformat(execution_record.completed_at) >= cutoff_date:
+                break
             del self.completed_executions[execution_id]
         
-        # Clean up execution history
-        self.execution_history = [
-            record for record in self.execution_history
-            if datetime.fromisoformat(record.get('completed_at', record.get('started_at', ''))) >= cutoff_date
-        ]
+        # Clean up execution history with one indexed range delete
+        cleaned_up_count = self.execution_history.delete_completed_before(cutoff_date.isoformat())
         
-        logger.info(f"Cleaned up {len(executions_to_remove)} old execution records")
+        logger.info(f"Cleaned up {cleaned_up_count} old execution records")
         
         return {
-            'cleaned_up_count': len(executions_to_remove),
+            'cleaned_up_count': cleaned_up_count,
             'retention_days': retention_days,
             'cutoff_date': cutoff_date.isoformat(),
             'remaining_executions': len(self.completed_executions)
@@ -1269,7 +1423,10 @@ ExecutionEngine = OptimizationExecutionEngine
 # Utility functions for external use
 def create_execution_engine(dry_run: bool = True, 
                           max_concurrent: int = 5,
-                          timeout_minutes: int = 30) -> OptimizationExecutionEngine:
+                          timeout_minutes: int = 30,
+                          schedule_state_path: Optional[str] = None,
+                          history_path: Optional[str] = None,
+                          approval_store_path: Optional[str] = None) -> OptimizationExecutionEngine:
     """
     Factory function to create OptimizationExecutionEngine instance.
     
@@ -1277,6 +1434,9 @@ def create_execution_engine(dry_run: bool = True,
         dry_run: Enable DRY_RUN mode
         max_concurrent: Maximum concurrent executions
         timeout_minutes: Execution timeout in minutes
+        schedule_state_path: Optional SQLite file that persists scheduled optimizations
+        history_path: Optional SQLite file that persists execution history
+        approval_store_path: Optional SQLite file that persists approval workflows
         
     Returns:
         Configured OptimizationExecutionEngine instance
@@ -1284,7 +1444,10 @@ def create_execution_engine(dry_run: bool = True,
     return ExecutionEngine(
         dry_run=dry_run,
         max_concurrent_executions=max_concurrent,
-        execution_timeout_minutes=timeout_minutes
+        execution_timeout_minutes=timeout_minutes,
+        schedule_state_path=schedule_state_path,
+        history_path=history_path,
+        approval_store_path=approval_store_path
     )
 
 
@@ -6,6 +6,7 @@ Analyzes pricing strategies and recommends cost-effective alternatives:
 - Reserved Instance recommendations based on historical utilization
 - Spot Instance opportunity detection and savings calculation
 - Savings Plans analysis with ROI calculations
+- Commitment portfolio optimization over hourly usage
 - Regional pricing comparison and cost-effective alternatives
 
 Requirements: 2.1, 2.2, 2.3, 2.4
@@ -16,6 +17,9 @@ from datetime import datetime, timedelta
 from typing import Dict, List, Any, Optional, Tuple
 from enum import Enum
 import json
+import numpy as np
+
+from utils.pricing_cache import PricingCache, shared_pricing_cache
 
 logger = logging.getLogger(__name__)
 
@@ -49,18 +53,19 @@ class PricingIntelligenceEngine:
     and Savings Plans with ROI calculations.
     """
     
-    def __init__(self, aws_config, region: str = 'us-east-1'):
+    def __init__(self, aws_config, region: str = 'us-east-1', pricing_cache: Optional[PricingCache] = None):
         """
         Initialize pricing intelligence engine.
         
         Args:
             aws_config: AWSConfig instance for client management
             region: AWS region for pricing analysis
+            pricing_cache: Cache for regional pricing (defaults to the shared pricing cache)
         """
         self.aws_config = aws_config
         self.region = region
         self.pricing_thresholds = self._initialize_pricing_thresholds()
-        self.regional_pricing_cache = {}
+        self.regional_pricing_cache = pricing_cache if pricing_cache is not None else shared_pricing_cache
         
         # Initialize cost calculator for accurate pricing data
         try:
@@ -128,6 +133,7 @@ class PricingIntelligenceEngine:
         spot_recommendations = self._analyze_spot_opportunities(resources_by_type.get('ec2', []))
         sp_recommendations = self._analyze_savings_plans(resources)
         regional_recommendations = self._analyze_regional_optimization(resources)
+        commitment_portfolio = self.optimize_commitment_portfolio(resources_by_type.get('ec2', []))
         
         # Combine and prioritize recommendations
         all_recommendations = (
@@ -153,6 +159,7 @@ class PricingIntelligenceEngine:
             'spotInstanceRecommendations': spot_recommendations,
             'savingsPlansRecommendations': sp_recommendations,
             'regionalOptimizationRecommendations': regional_recommendations,
+            'commitmentPortfolio': commitment_portfolio,
             'totalRecommendations': len(all_recommendations),
             'timestamp': datetime.utcnow().isoformat(),
             'region': self.region
@@ -356,6 +363,96 @@ class PricingIntelligenceEngine:
         
         return recommendations
     
+    def optimize_commitment_portfolio(self, ec2_resources: List[Dict[str, Any]],
+                                      **optimizer_options) -> Optional[Dict[str, Any]]:
+        """
+        Optimize the RI and Savings Plan portfolio from hourly instance usage.
+        
+        Uses the 'hourlyUsage' series (instances running per hour) of each
+        resource, normalized by instance size into per-family usage, and the
+        RI pricing of each family's instances for its RI break-even levels.
+        
+        Args:
+            ec2_resources: EC2 resources with 'hourlyUsage' series
+            **optimizer_options: Options passed to CommitmentOptimizer.optimize
+            
+        Returns:
+            Optimized commitment portfolio, or None without hourly usage data
+        """
+        usage_matrix, families, on_demand_rates = self._build_hourly_usage_matrix(ec2_resources)
+        if not families:
+            return None
+        
+        optimizer_options.setdefault('family_ri_rates', self._get_family_ri_rates(ec2_resources, families))
+        
+        from core.commitment_optimizer import CommitmentOptimizer
+        return CommitmentOptimizer().optimize(usage_matrix, on_demand_rates, families, **optimizer_options)
+    
+    def _get_family_ri_rates(self, ec2_resources: List[Dict[str, Any]],
+                             families: List[str]) -> Dict[str, Dict[Tuple[ReservationTerm, PaymentOption], float]]:
+        """
+        RI effective rates as a fraction of On-Demand for each family.
+        
+        Each family is priced from the first instance type seen for it; RI
+        discounts are the same across sizes within a family.
+        """
+        from core.commitment_optimizer import normalize_instance_type
+        
+        instance_types = {}
+        for resource in ec2_resources:
+            if resource.get('hourlyUsage') and resource.get('instanceType'):
+                instance_types.setdefault(normalize_instance_type(resource['instanceType'])[0],
+                                          resource['instanceType'])
+        
+        family_rates = {}
+        for family in families:
+            instance_type = instance_types[family]
+            on_demand_hourly = self._get_on_demand_pricing(instance_type)
+            rates = {}
+            for term in ReservationTerm:
+                for payment in PaymentOption:
+                    ri_pricing = self._get_ri_pricing(instance_type, term, payment)
+                    if ri_pricing and on_demand_hourly > 0:
+                        rates[(term, payment)] = ri_pricing['monthly_cost'] / 730 / on_demand_hourly
+            family_rates[family] = rates
+        return family_rates
+    
+    def _build_hourly_usage_matrix(self, ec2_resources: List[Dict[str, Any]]) -> Tuple[Any, List[str], List[float]]:
+        """
+        Build an hours x families matrix of normalized units in use.
+        
+        Series are aligned on their most recent hour; shorter series are
+        treated as not running before they start.
+        """
+        from core.commitment_optimizer import normalize_instance_type
+        
+        series = [r for r in ec2_resources if r.get('hourlyUsage') and r.get('instanceType')]
+        if not series:
+            return None, [], []
+        
+        hours = max(len(r['hourlyUsage']) for r in series)
+        columns = {}
+        units_by_family = {}
+        spend_by_family = {}
+        
+        for resource in series:
+            family, factor = normalize_instance_type(resource['instanceType'])
+            if family not in columns:
+                columns[family] = np.zeros(hours)
+                units_by_family[family] = 0.0
+                spend_by_family[family] = 0.0
+            
+            usage = np.asarray(resource['hourlyUsage'], dtype=float)
+            columns[family][hours - len(usage):] += usage * factor
+            units_by_family[family] += factor
+            spend_by_family[family] += self._get_on_demand_pricing(resource['instanceType'])
+        
+        families = list(columns)
+        usage_matrix = np.column_stack([columns[family] for family in families])
+        on_demand_rates = [spend_by_family[family] / units_by_family[family] for family in families]
+        
+        return usage_matrix, families, on_demand_rates
+    
     def _analyze_regional_optimization(self, resources: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """
         Analyze regional pricing optimization opportunities.
@@ -703,7 +800,10 @@ class PricingIntelligenceEngine:
                 continue
             
             # Get regional pricing (mock data - use AWS Price List API in real implementation)
-            regional_pricing = self._get_regional_pricing(resource_type, target_region)
+            regional_pricing = self.regional_pricing_cache.get_or_compute(
+                PricingCache.make_key('regional_pricing', resource_type, target_region),
+                lambda: self._get_regional_pricing(resource_type, target_region)
+            )
             
             if not regional_pricing:
                 continue
@@ -954,4 +1054,4 @@ class PricingIntelligenceEngine:
                 rec for rec in prioritized_recommendations 
                 if rec.get('estimatedMonthlySavings', 0) > total_potential_savings * 0.1
             ][:3]
-        }
\ No newline at end of file
+        }
\ No newline at end of file
@@ -12,18 +12,53 @@ Comprehensive cost analysis and reporting engine that:
 Requirements: 6.5, 8.5
 """
 
+import functools
 import logging
 import statistics
 import json
-import csv
+import threading
 from datetime import datetime, timedelta, timezone
-from typing import Dict, List, Any, Optional, Tuple, Union
+from typing import Dict, List, Any, Optional, Tuple, Union, Iterable, Sequence
 from enum import Enum
 from collections import defaultdict
-import io
+
+from utils.savings_plan_simulator import SavingsPlanSimulator
+from utils.report_export import ExportStream, RowCounter, write_json, write_csv
+from utils.report_cache import ReportSectionCache
+from utils.cost_cube import CostCube
 
 logger = logging.getLogger(__name__)
 
+# Section cache file used when the configuration does not name one
+DEFAULT_SECTION_CACHE_PATH = "cache/report_sections.db"
+
+# Columns of flattened report CSV exports
+REPORT_CSV_FIELDS = [
+    "report_id", "report_type", "generated_at", "section", "metric",
+    "dimension", "value", "percentage", "description", "message"
+]
+
+
+def _cached_section(section: str):
+    """
+    Memoize a report section method during report runs.
+    
+    Inside generate_comprehensive_report the section is served from the
+    engine's section cache when its arguments and the run's template
+    configuration are unchanged; direct calls always compute.
+    """
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            run = self._section_run
+            if run is None or self.section_cache is None:
+                return method(self, *args, **kwargs)
+            return self.section_cache.get_or_compute(
+                run, section, args, kwargs, lambda: method(self, *args, **kwargs)
+            )
+        return wrapper
+    return decorator
+
 
 class ReportType(Enum):
     """Types of reports that can be generated."""
@@ -35,6 +70,7 @@ class ReportType(Enum):
     ROI_ANALYSIS = "roi_analysis"
     FORECAST_ACCURACY = "forecast_accuracy"
     OPTIMIZATION_IMPACT = "optimization_impact"
+    SAVINGS_PLAN_ANALYSIS = "savings_plan_analysis"
     CUSTOM_REPORT = "custom_report"
 
 
@@ -63,12 +99,22 @@ class ReportingEngine:
     variance analysis, trend reporting, and customizable export capabilities.
     """
 
-    def __init__(self, dry_run: bool = True):
+    def __init__(
+        self,
+        dry_run: bool = True,
+        section_cache: Optional[ReportSectionCache] = None,
+        section_cache_path: Optional[str] = None,
+        enable_section_cache: bool = True
+    ):
         """
         Initialize the Reporting Engine.
         
         Args:
             dry_run: If True, no actual reports will be saved to disk
+            section_cache: Optional shared cache of computed report sections
+            section_cache_path: Optional SQLite file for a new section cache,
+                so unchanged sections are reused across processes and restarts
+            enable_section_cache: If False, every section is recomputed on each run
         """
         self.dry_run = dry_run
         self.report_templates = {}
@@ -77,11 +123,37 @@ class ReportingEngine:
         self.custom_metrics = {}
         self.export_configurations = {}
         
+        # Section memoization keyed by input fingerprints
+        if section_cache is None and enable_section_cache:
+            section_cache = ReportSectionCache(disk_path=section_cache_path)
+        self.section_cache = section_cache
+        # Section run and cost cube of the report being generated, kept per
+        # thread so concurrent report generation never shares them
+        self._run_state = threading.local()
+        
         # Initialize default report templates
         self._initialize_default_templates()
         
         logger.info(f"Reporting Engine initialized (DRY_RUN: {dry_run})")
 
+    @property
+    def _section_run(self):
+        """Section cache run of the report this thread is generating."""
+        return getattr(self._run_state, "section_run", None)
+
+    @_section_run.setter
+    def _section_run(self, run):
+        self._run_state.section_run = run
+
+    @property
+    def _cost_cube(self) -> Optional[CostCube]:
+        """Cost cube of the report this thread is generating."""
+        return getattr(self._run_state, "cost_cube", None)
+
+    @_cost_cube.setter
+    def _cost_cube(self, cube: Optional[CostCube]):
+        self._run_state.cost_cube = cube
+
     def _initialize_default_templates(self):
         """Initialize default report templates."""
         self.report_templates = {
@@ -194,6 +266,18 @@ class ReportingEngine:
                 cost_data = self._apply_data_filters(cost_data, custom_filters)
                 report["filters_applied"] = custom_filters
             
+            # Aggregate the cost data once; sections query the cube instead of the records
+            self._cost_cube = CostCube(cost_data or [])
+            
+            # Sections below are reused when their inputs and the template are unchanged
+            if self.section_cache is not None:
+                template_key = template_name or report_type.value
+                self._section_run = self.section_cache.begin_run({
+                    "template": template_key,
+                    "template_config": self.report_templates.get(template_key),
+                    "filters": custom_filters
+                })
+            
             # Generate report sections based on type
             if report_type == ReportType.EXECUTIVE_SUMMARY:
                 report.update(self._generate_executive_summary_report(
@@ -227,11 +311,20 @@ class ReportingEngine:
                 report.update(self._generate_optimization_impact_report(
                     cost_data, optimization_data
                 ))
+            elif report_type == ReportType.SAVINGS_PLAN_ANALYSIS:
+                report.update(self._generate_savings_plan_analysis_report(
+                    optimization_data
+                ))
             else:
                 report.update(self._generate_custom_report(
                     cost_data, template_name, custom_filters
                 ))
             
+            if self._section_run is not None:
+                report["section_cache"] = self._section_run.get_statistics()
+                self._section_run = None
+            self._cost_cube = None
+            
             # Store generated report
             self.generated_reports[report["report_id"]] = report
             self.report_history.append({
@@ -246,9 +339,47 @@ class ReportingEngine:
             return report
             
         except Exception as e:
+            self._section_run = None
+            self._cost_cube = None
             logger.error(f"Error generating {report_type.value} report: {str(e)}")
             raise
 
+    def generate_report_from_stream(
+        self,
+        report_type: ReportType,
+        period_start: str,
+        period_end: str,
+        cost_chunks: Iterable[Any],
+        group_by: Sequence[str] = ("service", "region"),
+        granularity: Optional[str] = "daily",
+        **report_options: Any
+    ) -> Dict[str, Any]:
+        """
+        Generate a report from a stream of line item chunks.
+        
+        Chunks (e.g. CURReader.iter_chunks()) are aggregated by period and the
+        group_by fields as they arrive, and the report is built from the
+        aggregated cost records.
+        
+        Args:
+            report_type: Type of report to generate
+            period_start: Start date for reporting period (ISO format)
+            period_end: End date for reporting period (ISO format)
+            cost_chunks: Iterable of DataFrames or lists of cost records
+            group_by: Cost record fields kept in the aggregated records
+            granularity: 'hourly', 'daily', 'monthly' or None
+            **report_options: Passed through to generate_comprehensive_report
+            
+        Returns:
+            Dict containing comprehensive report data
+        """
+        from aws.cur_reader import aggregate_cost_chunks
+        
+        cost_data = aggregate_cost_chunks(cost_chunks, group_by=group_by, granularity=granularity)
+        return self.generate_comprehensive_report(
+            report_type, period_start, period_end, cost_data, **report_options
+        )
+
     def _generate_executive_summary_report(
         self,
         cost_data: List[Dict[str, Any]],
@@ -258,14 +389,15 @@ class ReportingEngine:
         optimization_data: Optional[Dict[str, Any]]
     ) -> Dict[str, Any]:
         """Generate executive summary report section."""
+        cost_cube = self._get_cost_cube(cost_data)
         
         # Calculate total costs
-        total_cost = sum(item.get("cost", 0.0) for item in cost_data)
+        total_cost = cost_cube.total_cost
         
         # Cost overview
         cost_overview = {
             "total_spend": total_cost,
-            "average_daily_spend": total_cost / max(1, len(set(item.get("date", "") for item in cost_data))),
+            "average_daily_spend": total_cost / max(1, len(cost_cube.members("day"))),
             "cost_distribution": self._calculate_cost_distribution(cost_data),
             "top_cost_drivers": self._identify_top_cost_drivers(cost_data, limit=5)
         }
@@ -323,15 +455,17 @@ class ReportingEngine:
         # Region breakdown
         region_breakdown = self._analyze_costs_by_dimension(cost_data, "region")
         
-        # Team breakdown (from allocation data)
+        cost_cube = self._get_cost_cube(cost_data)
+        
+        # Team breakdown (from allocation data, else from team tags on the cost data)
         team_breakdown = {}
-        if allocation_data:
-            team_breakdown = self._extract_team_costs_from_allocation(allocation_data)
+        if allocation_data or cost_cube.has_members("team"):
+            team_breakdown = self._extract_team_costs_from_allocation(allocation_data, cost_cube)
         
-        # Project breakdown (from allocation data)
+        # Project breakdown (from allocation data, else from project tags on the cost data)
         project_breakdown = {}
-        if allocation_data:
-            project_breakdown = self._extract_project_costs_from_allocation(allocation_data)
+        if allocation_data or cost_cube.has_members("project"):
+            project_breakdown = self._extract_project_costs_from_allocation(allocation_data, cost_cube)
         
         # Time series analysis
         time_series_analysis = self._generate_time_series_analysis(cost_data)
@@ -347,6 +481,7 @@ class ReportingEngine:
             }
         }
 
+    @_cached_section("variance_analysis")
     def _generate_variance_analysis_report(
         self,
         cost_data: List[Dict[str, Any]],
@@ -355,7 +490,7 @@ class ReportingEngine:
     ) -> Dict[str, Any]:
         """Generate variance analysis report section."""
         
-        total_cost = sum(item.get("cost", 0.0) for item in cost_data)
+        total_cost = self._get_cost_cube(cost_data).total_cost
         
         # Budget variance analysis
         budget_variance = {}
@@ -481,6 +616,59 @@ class ReportingEngine:
             }
         }
 
+    def _generate_savings_plan_analysis_report(
+        self,
+        optimization_data: Optional[Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        """Generate Savings Plan coverage and utilization report section."""
+        
+        optimization_data = optimization_data or {}
+        simulation = optimization_data.get("savings_plan_simulation")
+        
+        if simulation is None and optimization_data.get("hourly_compute_spend"):
+            simulator = SavingsPlanSimulator(optimization_data.get("savings_plan_term_years", 1))
+            simulation = simulator.simulate(
+                optimization_data["hourly_compute_spend"],
+                optimization_data.get("savings_plan_commitments")
+            )
+        
+        if not simulation or not simulation.get("commitments"):
+            return {
+                "savings_plan_analysis": {
+                    "error": "No hourly compute spend available for Savings Plan simulation"
+                }
+            }
+        
+        optimal = simulation["optimalCommitment"]
+        break_even = simulation.get("breakEvenCommitment")
+        
+        return {
+            "savings_plan_analysis": {
+                "term_years": simulation["termYears"],
+                "hours_simulated": simulation["hours"],
+                "compute_types": simulation["computeTypes"],
+                "on_demand_cost": simulation["onDemandCost"],
+                "recommended_commitment": {
+                    "hourly_commitment": optimal["hourlyCommitment"],
+                    "coverage_percentage": optimal["coveragePercentage"],
+                    "utilization_percentage": optimal["utilizationPercentage"],
+                    "wasted_commitment": optimal["wastedCommitment"],
+                    "net_savings": optimal["netSavings"],
+                    "monthly_net_savings": optimal["monthlyNetSavings"]
+                },
+                "break_even_commitment": break_even["hourlyCommitment"] if break_even else None,
+                "commitment_curve": [
+                    {
+                        "hourly_commitment": result["hourlyCommitment"],
+                        "coverage_percentage": result["coveragePercentage"],
+                        "utilization_percentage": result["utilizationPercentage"],
+                        "net_savings": result["netSavings"]
+                    }
+                    for result in simulation["commitments"]
+                ]
+            }
+        }
+
     def _generate_roi_analysis_report(
         self,
         cost_data: List[Dict[str, Any]],
@@ -610,16 +798,23 @@ class ReportingEngine:
         report_id: str,
         format_type: ReportFormat,
         output_path: Optional[str] = None,
-        template_customizations: Optional[Dict[str, Any]] = None
+        template_customizations: Optional[Dict[str, Any]] = None,
+        compress: Optional[bool] = None
     ) -> Dict[str, Any]:
         """
         Export report in specified format with customizable templates.
         
+        JSON and CSV exports are streamed to the output, so the rendered
+        report is never held in memory and the file size is counted while
+        writing.
+        
         Args:
             report_id: ID of the report to export
             format_type: Output format for the report
             output_path: Optional custom output path
             template_customizations: Optional template customizations
+            compress: Gzip JSON and CSV exports (defaults to True when
+                output_path ends in .gz)
             
         Returns:
             Dict containing export results and file information
@@ -630,10 +825,15 @@ class ReportingEngine:
             
             report_data = self.generated_reports[report_id]
             
+            if compress is None:
+                compress = bool(output_path) and output_path.endswith('.gz')
+            
             # Generate filename if not provided
             if not output_path:
                 timestamp = datetime.now(timezone.utc).strftime('%Y%m%d_%H%M%S')
                 output_path = f"report_{report_id}_{timestamp}.{format_type.value}"
+                if compress:
+                    output_path += ".gz"
             
             export_result = {
                 "report_id": report_id,
@@ -646,9 +846,9 @@ class ReportingEngine:
             
             # Export based on format type
             if format_type == ReportFormat.JSON:
-                export_result.update(self._export_json(report_data, output_path, template_customizations))
+                export_result.update(self._export_json(report_data, output_path, template_customizations, compress))
             elif format_type == ReportFormat.CSV:
-                export_result.update(self._export_csv(report_data, output_path, template_customizations))
+                export_result.update(self._export_csv(report_data, output_path, template_customizations, compress))
             elif format_type == ReportFormat.HTML:
                 export_result.update(self._export_html(report_data, output_path, template_customizations))
             elif format_type == ReportFormat.PDF:
@@ -666,6 +866,55 @@ class ReportingEngine:
             logger.error(f"Error exporting report {report_id}: {str(e)}")
             raise
 
+    def export_rows(
+        self,
+        rows: Iterable[Dict[str, Any]],
+        output_path: str,
+        format_type: ReportFormat = ReportFormat.CSV,
+        fieldnames: Optional[Sequence[str]] = None,
+        compress: Optional[bool] = None
+    ) -> Dict[str, Any]:
+        """
+        Stream cost rows (e.g. a line-item cost breakdown) to a CSV or JSON file.
+        
+        Rows are written as they are read from the iterable, so a generator
+        of millions of rows is exported in constant memory.
+        
+        Args:
+            rows: Iterable of row dictionaries
+            output_path: Output file path
+            format_type: ReportFormat.CSV or ReportFormat.JSON (a JSON array)
+            fieldnames: CSV column order (defaults to the first row's keys)
+            compress: Gzip the output (defaults to True when output_path ends in .gz)
+            
+        Returns:
+            Dict containing export results and file information
+        """
+        if format_type not in (ReportFormat.CSV, ReportFormat.JSON):
+            raise ValueError(f"Unsupported row export format: {format_type.value}")
+        if compress is None:
+            compress = output_path.endswith('.gz')
+        
+        export_result = {
+            "format": format_type.value,
+            "output_path": output_path,
+            "exported_at": datetime.now(timezone.utc).isoformat()
+        }
+        counted = RowCounter(rows)
+        try:
+            with ExportStream(None if self.dry_run else output_path, compress) as stream:
+                if format_type == ReportFormat.CSV:
+                    write_csv(stream, counted, fieldnames)
+                else:
+                    write_json(stream, counted)
+            export_result.update(self._stream_result(stream))
+            export_result["rows_exported"] = counted.count
+        except Exception as e:
+            logger.error(f"Error exporting rows to {output_path}: {str(e)}")
+            export_result.update({"export_success": False, "error": str(e)})
+        
+        return export_result
+
     def create_custom_template(
         self,
         template_name: str,
@@ -721,6 +970,12 @@ class ReportingEngine:
         except Exception:
             return 0
 
+    def _get_cost_cube(self, cost_data: List[Dict[str, Any]]) -> CostCube:
+        """Cost cube for cost_data: the current report run's cube, or a new one for direct calls."""
+        if self._cost_cube is not None and self._cost_cube.source is cost_data:
+            return self._cost_cube
+        return CostCube(cost_data or [])
+
     def _apply_data_filters(
         self, cost_data: List[Dict[str, Any]], filters: Dict[str, Any]
     ) -> List[Dict[str, Any]]:
@@ -746,33 +1001,25 @@ class ReportingEngine:
         
         return filtered_data
 
+    @_cached_section("cost_distribution")
     def _calculate_cost_distribution(self, cost_data: List[Dict[str, Any]]) -> Dict[str, Any]:
         """Calculate cost distribution across different dimensions."""
-        total_cost = sum(item.get("cost", 0.0) for item in cost_data)
+        cost_cube = self._get_cost_cube(cost_data)
+        total_cost = cost_cube.total_cost
         
         if total_cost == 0:
             return {"error": "No cost data available"}
         
         # Distribution by service
-        service_costs = defaultdict(float)
-        for item in cost_data:
-            service = item.get("service", "unknown")
-            service_costs[service] += item.get("cost", 0.0)
-        
         service_distribution = {
             service: (cost / total_cost * 100) 
-            for service, cost in service_costs.items()
+            for service, cost in cost_cube.rollup("service").items()
         }
         
         # Distribution by region
-        region_costs = defaultdict(float)
-        for item in cost_data:
-            region = item.get("region", "unknown")
-            region_costs[region] += item.get("cost", 0.0)
-        
         region_distribution = {
             region: (cost / total_cost * 100) 
-            for region, cost in region_costs.items()
+            for region, cost in cost_cube.rollup("region").items()
         }
         
         return {
@@ -781,45 +1028,13 @@ class ReportingEngine:
             "total_cost": total_cost
         }
 
+    @_cached_section("top_cost_drivers")
     def _identify_top_cost_drivers(
         self, cost_data: List[Dict[str, Any]], limit: int = 5
     ) -> List[Dict[str, Any]]:
         """Identify top cost drivers."""
-        # Group by resource and sum costs
-        resource_costs = defaultdict(float)
-        resource_details = {}
-        
-        for item in cost_data:
-            resource_id = item.get("resource_id", "unknown")
-            cost = item.get("cost", 0.0)
-            resource_costs[resource_id] += cost
-            
-            if resource_id not in resource_details:
-                resource_details[resource_id] = {
-                    "service": item.get("service", "unknown"),
-                    "region": item.get("region", "unknown"),
-                    "resource_type": item.get("resource_type", "unknown")
-                }
-        
-        # Sort by cost and return top drivers
-        sorted_resources = sorted(
-            resource_costs.items(), 
-            key=lambda x: x[1], 
-            reverse=True
-        )[:limit]
-        
-        top_drivers = []
-        for resource_id, cost in sorted_resources:
-            details = resource_details.get(resource_id, {})
-            top_drivers.append({
-                "resource_id": resource_id,
-                "cost": cost,
-                "service": details.get("service", "unknown"),
-                "region": details.get("region", "unknown"),
-                "resource_type": details.get("resource_type", "unknown")
-            })
-        
-        return top_drivers
+        # Resources ranked by their pre-aggregated totals
+        return self._get_cost_cube(cost_data).top_resources(limit)
 
     def _calculate_budget_utilization(
         self, total_cost: float, budget_data: Dict[str, Any]
@@ -907,9 +1122,9 @@ class ReportingEngine:
             return {"error": "Insufficient data for projection"}
         
         # Calculate daily average spend
-        dates = set(item.get("date", item.get("timestamp", ""))[:10] for item in cost_data)
-        total_cost = sum(item.get("cost", 0.0) for item in cost_data)
-        days_elapsed = len(dates)
+        cost_cube = self._get_cost_cube(cost_data)
+        total_cost = cost_cube.total_cost
+        days_elapsed = len(cost_cube.members("day"))
         
         if days_elapsed == 0:
             return {"error": "No valid date data"}
@@ -932,15 +1147,9 @@ class ReportingEngine:
         self, cost_data: List[Dict[str, Any]], dimension: str
     ) -> Dict[str, Any]:
         """Analyze costs by a specific dimension (service, region, etc.)."""
-        dimension_costs = defaultdict(float)
-        dimension_counts = defaultdict(int)
-        
-        for item in cost_data:
-            dim_value = item.get(dimension, "unknown")
-            cost = item.get("cost", 0.0)
-            
-            dimension_costs[dim_value] += cost
-            dimension_counts[dim_value] += 1
+        cost_cube = self._get_cost_cube(cost_data)
+        dimension_costs = cost_cube.rollup(dimension)
+        dimension_counts = cost_cube.counts(dimension)
         
         total_cost = sum(dimension_costs.values())
         
@@ -964,14 +1173,11 @@ class ReportingEngine:
             "top_contributor": max(dimension_costs.items(), key=lambda x: x[1]) if dimension_costs else None
         }
 
+    @_cached_section("time_series_analysis")
     def _generate_time_series_analysis(self, cost_data: List[Dict[str, Any]]) -> Dict[str, Any]:
         """Generate time series analysis of costs."""
-        # Group costs by date
-        daily_costs = defaultdict(float)
-        
-        for item in cost_data:
-            date_key = item.get("date", item.get("timestamp", ""))[:10]  # Extract date part
-            daily_costs[date_key] += item.get("cost", 0.0)
+        # Daily costs from the cube's day rollup
+        daily_costs = self._get_cost_cube(cost_data).rollup("day")
         
         if not daily_costs:
             return {"error": "No date information available"}
@@ -1076,7 +1282,7 @@ class ReportingEngine:
         insights = []
         
         # Cost insights
-        total_cost = sum(item.get("cost", 0.0) for item in cost_data)
+        total_cost = self._get_cost_cube(cost_data).total_cost
         if total_cost > 0:
             top_service = self._identify_top_cost_drivers(cost_data, 1)
             if top_service:
@@ -1122,7 +1328,7 @@ class ReportingEngine:
         
         # Budget-based recommendations
         if budget_data:
-            total_cost = sum(item.get("cost", 0.0) for item in cost_data)
+            total_cost = self._get_cost_cube(cost_data).total_cost
             budget_utilization = self._calculate_budget_utilization(total_cost, budget_data)
             utilization_pct = budget_utilization.get("utilization_percentage", 0)
             
@@ -1164,30 +1370,15 @@ class ReportingEngine:
     # Export methods for different formats
 
     def _export_json(
-        self, report_data: Dict[str, Any], output_path: str, customizations: Optional[Dict[str, Any]]
+        self, report_data: Dict[str, Any], output_path: str, customizations: Optional[Dict[str, Any]],
+        compress: bool = False
     ) -> Dict[str, Any]:
-        """Export report as JSON format."""
+        """Export report as JSON format, streamed fragment by fragment."""
         try:
-            if self.dry_run:
-                # In dry_run mode, just return the data without writing to file
-                json_content = json.dumps(report_data, indent=2, default=str)
-                return {
-                    "export_success": True,
-                    "file_size": len(json_content.encode('utf-8')),
-                    "content_preview": json_content[:500] + "..." if len(json_content) > 500 else json_content
-                }
-            else:
-                with open(output_path, 'w', encoding='utf-8') as f:
-                    json.dump(report_data, f, indent=2, default=str)
-                
-                # Get file size
-                import os
-                file_size = os.path.getsize(output_path)
-                
-                return {
-                    "export_success": True,
-                    "file_size": file_size
-                }
+            # In dry_run mode the output is only counted, not written to file
+            with ExportStream(None if self.dry_run else output_path, compress) as stream:
+                write_json(stream, report_data)
+            return self._stream_result(stream)
         except Exception as e:
             return {
                 "export_success": False,
@@ -1195,51 +1386,36 @@ class ReportingEngine:
             }
 
     def _export_csv(
-        self, report_data: Dict[str, Any], output_path: str, customizations: Optional[Dict[str, Any]]
+        self, report_data: Dict[str, Any], output_path: str, customizations: Optional[Dict[str, Any]],
+        compress: bool = False
     ) -> Dict[str, Any]:
-        """Export report as CSV format."""
+        """Export report as CSV format, streamed row by row."""
         try:
-            # Flatten report data for CSV export
-            flattened_data = self._flatten_report_for_csv(report_data)
-            
-            if self.dry_run:
-                # In dry_run mode, create CSV content in memory
-                output = io.StringIO()
-                if flattened_data:
-                    writer = csv.DictWriter(output, fieldnames=flattened_data[0].keys())
-                    writer.writeheader()
-                    writer.writerows(flattened_data)
-                
-                csv_content = output.getvalue()
-                output.close()
-                
-                return {
-                    "export_success": True,
-                    "file_size": len(csv_content.encode('utf-8')),
-                    "rows_exported": len(flattened_data),
-                    "content_preview": csv_content[:500] + "..." if len(csv_content) > 500 else csv_content
-                }
-            else:
-                with open(output_path, 'w', newline='', encoding='utf-8') as f:
-                    if flattened_data:
-                        writer = csv.DictWriter(f, fieldnames=flattened_data[0].keys())
-                        writer.writeheader()
-                        writer.writerows(flattened_data)
-                
-                import os
-                file_size = os.path.getsize(output_path)
-                
-                return {
-                    "export_success": True,
-                    "file_size": file_size,
-                    "rows_exported": len(flattened_data)
-                }
+            # In dry_run mode the output is only counted, not written to file
+            with ExportStream(None if self.dry_run else output_path, compress) as stream:
+                rows_exported = write_csv(stream, self._iter_report_csv_rows(report_data), REPORT_CSV_FIELDS)
+            result = self._stream_result(stream)
+            result["rows_exported"] = rows_exported
+            return result
         except Exception as e:
             return {
                 "export_success": False,
                 "error": str(e)
             }
 
+    def _stream_result(self, stream: ExportStream) -> Dict[str, Any]:
+        """Export result fields for a closed export stream."""
+        result = {
+            "export_success": True,
+            "file_size": stream.file_size,
+            "compressed": stream.compress
+        }
+        if stream.compress:
+            result["uncompressed_size"] = stream.uncompressed_size
+        if self.dry_run:
+            result["content_preview"] = stream.preview
+        return result
+
     def _export_html(
         self, report_data: Dict[str, Any], output_path: str, customizations: Optional[Dict[str, Any]]
     ) -> Dict[str, Any]:
@@ -1294,8 +1470,19 @@ class ReportingEngine:
 
     def _flatten_report_for_csv(self, report_data: Dict[str, Any]) -> List[Dict[str, Any]]:
         """Flatten nested report data for CSV export."""
-        flattened_rows = []
-        
+        return list(self._iter_report_csv_rows(report_data))
+
+    def _iter_report_csv_rows(self, report_data: Dict[str, Any]) -> Iterable[Dict[str, Any]]:
+        """Yield flattened report rows for CSV export, or a placeholder row when there are none."""
+        has_rows = False
+        for row in self._iter_report_rows(report_data):
+            has_rows = True
+            yield row
+        if not has_rows:
+            yield {"report_id": report_data.get("report_id", ""), "message": "No data to export"}
+
+    def _iter_report_rows(self, report_data: Dict[str, Any]) -> Iterable[Dict[str, Any]]:
+        """Yield flattened rows for the metrics in each report section."""
         # Extract key metrics and flatten them
         report_id = report_data.get("report_id", "")
         report_type = report_data.get("report_type", "")
@@ -1308,7 +1495,7 @@ class ReportingEngine:
             # Cost overview
             if "cost_overview" in summary:
                 cost_overview = summary["cost_overview"]
-                flattened_rows.append({
+                yield {
                     "report_id": report_id,
                     "report_type": report_type,
                     "generated_at": generated_at,
@@ -1316,9 +1503,9 @@ class ReportingEngine:
                     "metric": "total_spend",
                     "value": cost_overview.get("total_spend", 0),
                     "description": "Total spending for the period"
-                })
+                }
                 
-                flattened_rows.append({
+                yield {
                     "report_id": report_id,
                     "report_type": report_type,
                     "generated_at": generated_at,
@@ -1326,7 +1513,7 @@ class ReportingEngine:
                     "metric": "average_daily_spend",
                     "value": cost_overview.get("average_daily_spend", 0),
                     "description": "Average daily spending"
-                })
+                }
         
         # Process cost breakdown if available
         if "cost_breakdown" in report_data:
@@ -1336,7 +1523,7 @@ class ReportingEngine:
             if "service_breakdown" in breakdown:
                 service_data = breakdown["service_breakdown"].get("breakdown", {})
                 for service, data in service_data.items():
-                    flattened_rows.append({
+                    yield {
                         "report_id": report_id,
                         "report_type": report_type,
                         "generated_at": generated_at,
@@ -1346,9 +1533,7 @@ class ReportingEngine:
                         "value": data.get("total_cost", 0),
                         "percentage": data.get("percentage", 0),
                         "description": f"Cost for {service} service"
-                    })
-        
-        return flattened_rows if flattened_rows else [{"report_id": report_id, "message": "No data to export"}]
+                    }
 
     def _generate_html_report(
         self, report_data: Dict[str, Any], customizations: Optional[Dict[str, Any]]
@@ -1537,18 +1722,22 @@ class ReportingEngine:
 
     # Additional helper methods for comprehensive analysis
 
-    def _extract_team_costs_from_allocation(self, allocation_data: Dict[str, Any]) -> Dict[str, Any]:
-        """Extract team cost information from allocation data."""
+    def _extract_team_costs_from_allocation(
+        self, allocation_data: Optional[Dict[str, Any]], cost_cube: Optional[CostCube] = None
+    ) -> Dict[str, Any]:
+        """Extract team cost information from allocation data, or from the cost cube's team tags."""
         if not allocation_data or "allocation_breakdown" not in allocation_data:
-            return {"error": "No allocation breakdown available"}
-        
-        allocation_breakdown = allocation_data["allocation_breakdown"]
-        team_costs = {}
-        
-        # Look for team-level allocations
-        for scope, allocations in allocation_breakdown.items():
-            if "team" in scope.lower():
-                team_costs.update(allocations)
+            if cost_cube is None or not cost_cube.has_members("team"):
+                return {"error": "No allocation breakdown available"}
+            team_costs = self._tagged_costs_from_cube(cost_cube, "team")
+        else:
+            allocation_breakdown = allocation_data["allocation_breakdown"]
+            team_costs = {}
+            
+            # Look for team-level allocations
+            for scope, allocations in allocation_breakdown.items():
+                if "team" in scope.lower():
+                    team_costs.update(allocations)
         
         # Calculate percentages
         total_allocated = sum(team_costs.values())
@@ -1566,18 +1755,22 @@ class ReportingEngine:
             "team_count": len(team_costs)
         }
 
-    def _extract_project_costs_from_allocation(self, allocation_data: Dict[str, Any]) -> Dict[str, Any]:
-        """Extract project cost information from allocation data."""
+    def _extract_project_costs_from_allocation(
+        self, allocation_data: Optional[Dict[str, Any]], cost_cube: Optional[CostCube] = None
+    ) -> Dict[str, Any]:
+        """Extract project cost information from allocation data, or from the cost cube's project tags."""
         if not allocation_data or "allocation_breakdown" not in allocation_data:
-            return {"error": "No allocation breakdown available"}
-        
-        allocation_breakdown = allocation_data["allocation_breakdown"]
-        project_costs = {}
-        
-        # Look for project-level allocations
-        for scope, allocations in allocation_breakdown.items():
-            if "project" in scope.lower():
-                project_costs.update(allocations)
+            if cost_cube is None or not cost_cube.has_members("project"):
+                return {"error": "No allocation breakdown available"}
+            project_costs = self._tagged_costs_from_cube(cost_cube, "project")
+        else:
+            allocation_breakdown = allocation_data["allocation_breakdown"]
+            project_costs = {}
+            
+            # Look for project-level allocations
+            for scope, allocations in allocation_breakdown.items():
+                if "project" in scope.lower():
+                    project_costs.update(allocations)
         
         # Calculate percentages
         total_allocated = sum(project_costs.values())
@@ -1595,6 +1788,13 @@ class ReportingEngine:
             "project_count": len(project_costs)
         }
 
+    def _tagged_costs_from_cube(self, cost_cube: CostCube, dimension: str) -> Dict[str, float]:
+        """Costs per tagged team or project from the cube, excluding untagged costs."""
+        return {
+            member: cost for member, cost in cost_cube.rollup(dimension).items()
+            if member != "unknown"
+        }
+
     def get_report_summary(self) -> Dict[str, Any]:
         """Get summary of reporting engine status and generated reports."""
         return {
@@ -1608,7 +1808,8 @@ class ReportingEngine:
             "supported_export_formats": [format_type.value for format_type in ReportFormat],
             "last_report_generated": self.report_history[-1] if self.report_history else None,
             "engine_status": "active",
-            "dry_run_mode": self.dry_run
+            "dry_run_mode": self.dry_run,
+            "section_cache": self.section_cache.get_metrics() if self.section_cache is not None else None
         }
     # Additional missing helper methods
 
@@ -1617,11 +1818,12 @@ class ReportingEngine:
         if not cost_data:
             return {"error": "No cost data available"}
         
-        costs = [item.get("cost", 0.0) for item in cost_data]
+        cost_cube = self._get_cost_cube(cost_data)
+        costs = cost_cube.costs
         
         return {
-            "total_resources": len(cost_data),
-            "total_cost": sum(costs),
+            "total_resources": cost_cube.size,
+            "total_cost": cost_cube.total_cost,
             "average_cost": statistics.mean(costs) if costs else 0,
             "median_cost": statistics.median(costs) if costs else 0,
             "max_cost": max(costs) if costs else 0,
@@ -1660,11 +1862,11 @@ class ReportingEngine:
         """Identify potential additional savings opportunities."""
         # Simplified implementation - in practice would use ML models
         high_cost_resources = [
-            item for item in cost_data 
-            if item.get("cost", 0.0) > 100.0
+            cost for cost in self._get_cost_cube(cost_data).costs
+            if cost > 100.0
         ]
         
-        potential_savings = sum(item.get("cost", 0.0) * 0.15 for item in high_cost_resources)  # 15% potential
+        potential_savings = sum(cost * 0.15 for cost in high_cost_resources)  # 15% potential
         
         return {
             "high_cost_resources": len(high_cost_resources),
@@ -1694,10 +1896,7 @@ class ReportingEngine:
     ) -> Dict[str, Any]:
         """Analyze variance trend over time."""
         # Simplified implementation
-        daily_costs = defaultdict(float)
-        for item in cost_data:
-            date_key = item.get("date", "")[:10]
-            daily_costs[date_key] += item.get("cost", 0.0)
+        daily_costs = self._get_cost_cube(cost_data).rollup("day")
         
         budget_amount = budget_data.get("budget_amount", 0.0)
         period_days = budget_data.get("period_days", 30)
@@ -1726,10 +1925,7 @@ class ReportingEngine:
     ) -> List[Dict[str, Any]]:
         """Identify key drivers of budget variance."""
         # Group costs by service and identify top contributors to variance
-        service_costs = defaultdict(float)
-        for item in cost_data:
-            service = item.get("service", "unknown")
-            service_costs[service] += item.get("cost", 0.0)
+        service_costs = self._get_cost_cube(cost_data).rollup("service")
         
         total_cost = sum(service_costs.values())
         budget_amount = budget_data.get("budget_amount", 0.0)
@@ -1760,7 +1956,7 @@ class ReportingEngine:
         if not budget_data or "forecasts" not in budget_data:
             return {"error": "No forecast data available"}
         
-        total_cost = sum(item.get("cost", 0.0) for item in cost_data)
+        total_cost = self._get_cost_cube(cost_data).total_cost
         forecasts = budget_data["forecasts"]
         predicted_spend = forecasts.get("predicted_spend", 0.0)
         
@@ -1792,11 +1988,8 @@ class ReportingEngine:
 
     def _analyze_trend_variance(self, cost_data: List[Dict[str, Any]]) -> Dict[str, Any]:
         """Analyze variance in cost trends."""
-        # Group by date and calculate daily costs
-        daily_costs = defaultdict(float)
-        for item in cost_data:
-            date_key = item.get("date", "")[:10]
-            daily_costs[date_key] += item.get("cost", 0.0)
+        # Daily costs from the cube's day rollup
+        daily_costs = self._get_cost_cube(cost_data).rollup("day")
         
         if len(daily_costs) < 2:
             return {"error": "Insufficient data for trend analysis"}
@@ -1834,6 +2027,7 @@ class ReportingEngine:
         else:
             return "very_high"
 
+    @_cached_section("root_cause_analysis")
     def _perform_comprehensive_root_cause_analysis(
         self,
         cost_data: List[Dict[str, Any]],
@@ -1896,4 +2090,32 @@ class ReportingEngine:
             elif cause["type"] == "cost_anomalies":
                 recommendations.append("Investigate and address detected cost anomalies")
         
-        return recommendations
\ No newline at end of file
+        return recommendations
+
+
+def create_reporting_engine(dry_run: bool = True,
+                            section_cache_config: Optional[Dict[str, Any]] = None) -> ReportingEngine:
+    """
+    Factory function to create ReportingEngine instance.
+    
+    Args:
+        dry_run: Enable DRY_RUN mode
+        section_cache_config: reporting.section_cache settings (enabled, disk_path,
+            max_entries, max_memory_mb, max_disk_mb, ttl_days); sections are
+            cached in DEFAULT_SECTION_CACHE_PATH unless disk_path says otherwise
+        
+    Returns:
+        Configured ReportingEngine instance
+    """
+    config = section_cache_config or {}
+    if not config.get("enabled", True):
+        return ReportingEngine(dry_run=dry_run, enable_section_cache=False)
+    
+    section_cache = ReportSectionCache(
+        max_entries=config.get("max_entries", 256),
+        max_bytes=config.get("max_memory_mb", 64) * 1024 * 1024,
+        disk_path=config.get("disk_path", DEFAULT_SECTION_CACHE_PATH),
+        max_disk_bytes=config.get("max_disk_mb", 256) * 1024 * 1024,
+        ttl_seconds=config.get("ttl_days", 14) * 24 * 3600
+    )
+    return ReportingEngine(dry_run=dry_run, section_cache=section_cache)
@@ -58,6 +58,7 @@ from utils.safety_controls import SafetyControls, RiskLevel, OperationType
 from utils.http_client import HTTPClient
 from utils.config_manager import ConfigManager
 from utils.scheduler import FinOpsScheduler
+from utils.pricing_cache import shared_pricing_cache, shared_cost_segment_cache, DEFAULT_COST_SEGMENT_CACHE_PATH
 
 # Import AWS service scanners
 from aws.scan_ec2 import EC2Scanner
@@ -67,6 +68,7 @@ from aws.scan_s3 import S3Scanner
 from aws.scan_ebs import EBSScanner
 from aws.scan_elb import ELBScanner
 from aws.scan_cloudwatch import CloudWatchScanner
+from aws.price_catalog import PriceCatalog
 
 # Import core engines
 from core.cost_optimizer import CostOptimizer
@@ -76,6 +78,7 @@ from core.anomaly_detector import AnomalyDetector
 from core.budget_manager import BudgetManager
 from core.execution_engine import ExecutionEngine, OptimizationExecutionEngine
 from core.approval_workflow import ApprovalWorkflow
+from core.reporting_engine import create_reporting_engine
 
 
 class AdvancedFinOpsOrchestrator:
@@ -148,7 +151,14 @@ class AdvancedFinOpsOrchestrator:
                 "AWS configuration applied",
                 {'region': region, 'regions': self.aws_config.regions, 'config_file': self.config_manager.config_file}
             )
-            self.safety_controls = SafetyControls(dry_run=dry_run)
+            audit_cfg = self.config_manager.get('safety.audit', {}) or {}
+            self.safety_controls = SafetyControls(
+                dry_run=dry_run,
+                audit_dir=audit_cfg.get('directory'),
+                history_window=audit_cfg.get('history_window', 10000),
+                max_segment_bytes=audit_cfg.get('max_segment_mb', 16) * 1024 * 1024,
+                compress_segments=audit_cfg.get('compress_segments', False)
+            )
             self.http_client = HTTPClient()
             
             # Initialize scheduler
@@ -169,10 +179,39 @@ class AdvancedFinOpsOrchestrator:
                 custom_thresholds=service_thresholds
             )
             self.pricing_intelligence = PricingIntelligenceEngine(self.aws_config, region)
+            
+            # Shared pricing/billing cache, optionally persisted for scheduler runs and workers
+            cache_config = self.config_manager.get('optimization.pricing.cache', {}) or {}
+            shared_pricing_cache.configure(
+                default_ttl=cache_config.get('ttl_seconds'),
+                max_entries=cache_config.get('max_entries'),
+                max_bytes=cache_config.get('max_memory_mb', 64) * 1024 * 1024,
+                disk_path=cache_config.get('disk_path'),
+                max_disk_bytes=cache_config.get('max_disk_mb', 512) * 1024 * 1024
+            )
+            
+            # Finalized Cost Explorer segments, kept on disk so later runs skip refetching them
+            segment_config = self.config_manager.get('optimization.pricing.cost_segment_cache', {}) or {}
+            shared_cost_segment_cache.configure(
+                max_entries=segment_config.get('max_entries'),
+                max_bytes=segment_config.get('max_memory_mb', 128) * 1024 * 1024,
+                disk_path=segment_config.get('disk_path', DEFAULT_COST_SEGMENT_CACHE_PATH),
+                max_disk_bytes=segment_config.get('max_disk_mb', 1024) * 1024 * 1024
+            )
+            
+            # Offline price catalog built from bulk Price List files (optional)
+            catalog_path = self.config_manager.get('optimization.pricing.price_catalog_path')
+            self.price_catalog = PriceCatalog(catalog_path) if catalog_path else None
             self.ml_rightsizing = MLRightSizingEngine(self.aws_config, region)
             self.anomaly_detector = AnomalyDetector(self.aws_config, region)
             self.budget_manager = BudgetManager(dry_run=dry_run)
             
+            # Report sections are cached on disk so unchanged sections are reused across runs
+            self.reporting_engine = create_reporting_engine(
+                dry_run=dry_run,
+                section_cache_config=self.config_manager.get('reporting.section_cache', {}) or {}
+            )
+            
             # Register signal handlers for graceful shutdown
             signal.signal(signal.SIGINT, self._signal_handler)
             signal.signal(signal.SIGTERM, self._signal_handler)
@@ -826,11 +865,11 @@ class AdvancedFinOpsOrchestrator:
             Dictionary of initialized scanners
         """
         scanners = {
-            'ec2': EC2Scanner(self.aws_config, self.region),
-            'rds': RDSScanner(self.aws_config, self.region),
+            'ec2': EC2Scanner(self.aws_config, self.region, price_catalog=self.price_catalog),
+            'rds': RDSScanner(self.aws_config, self.region, price_catalog=self.price_catalog),
             'lambda': LambdaScanner(self.aws_config, self.region),
             's3': S3Scanner(self.aws_config, self.region),
-            'ebs': EBSScanner(self.aws_config, self.region),
+            'ebs': EBSScanner(self.aws_config, self.region, price_catalog=self.price_catalog),
             'elb': ELBScanner(self.aws_config, self.region),
             'cloudwatch': CloudWatchScanner(self.aws_config, self.region)
         }
@@ -1416,18 +1455,31 @@ class AdvancedFinOpsOrchestrator:
             'errors': [],
             'workflow_id': self.workflow_state.workflow_id if self.workflow_state else None
         }
+        approval_workflow = None
         
         try:
             # Initialize execution engine with safety controls
+            execution_config = self.config_manager.get('safety.execution', {}) or {}
+            
+            # Initialize approval workflow, shared with the execution engine so
+            # the workflows it creates are persisted
+            digest_config = self.config_manager.get('notifications.digest', {}) or {}
+            approval_workflow = ApprovalWorkflow(
+                dry_run=self.dry_run,
+                store_path=execution_config.get('approval_store_path'),
+                notification_window_seconds=digest_config.get('window_seconds', 0.0),
+                max_pending_digests=digest_config.get('max_pending_digests', 100)
+            )
+            
             execution_engine = ExecutionEngine(
                 aws_config=self.aws_config,
                 safety_controls=self.safety_controls,
-                dry_run=self.dry_run
+                dry_run=self.dry_run,
+                schedule_state_path=execution_config.get('schedule_state_path'),
+                history_path=execution_config.get('history_path'),
+                approval_workflow=approval_workflow
             )
             
-            # Initialize approval workflow
-            approval_workflow = ApprovalWorkflow(dry_run=self.dry_run)
-            
             # Load optimization recommendations from checkpoint
             optimization_checkpoint = self._load_workflow_checkpoint('post_optimization')
             if not optimization_checkpoint:
@@ -1541,6 +1593,16 @@ class AdvancedFinOpsOrchestrator:
             if self.workflow_state:
                 self.workflow_state.fail_phase(WorkflowPhase.EXECUTION, str(e))
         
+        finally:
+            # Send notification digests still inside their window and stop the
+            # digest sender, also when a shutdown signal ends the phase early
+            if approval_workflow:
+                flush_result = approval_workflow.flush_notifications(timeout=30)
+                if not flush_result['success']:
+                    self.logger.warning(f"Notification digests not delivered before timeout: "
+                                        f"{flush_result.get('statistics')}")
+                approval_workflow.close(timeout=5)
+        
         return execution_results
     
     def resume_workflow(self, workflow_id: str) -> Dict[str, Any]:
@@ -1837,6 +1899,7 @@ class AdvancedFinOpsOrchestrator:
         # Generate workflow summary
         workflow_summary = self._generate_workflow_summary(workflow_results)
         workflow_results['summary'] = workflow_summary
+        workflow_results['pricing_cache'] = shared_pricing_cache.publish_metrics()
         
         self.logger.info(f"Complete workflow finished in {workflow_results['workflow_duration']:.2f} seconds")
         self.logger.info(f"Workflow summary: {workflow_summary}")
@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Unit tests for audit_journal.py
+
+Tests the durable audit trail including:
+- Size-based segment rotation and compression
+- Lookups by key and time range
+- Streaming latest-version reads
+- Bounded in-memory history with incremental metrics in SafetyControls
+"""
+
+import gzip
+import json
+import os
+import tempfile
+from unittest.mock import MagicMock
+
+from utils.audit_journal import AuditJournal, RollbackPlanStore
+from utils.safety_controls import SafetyControls, OperationType, OperationStatus
+
+
+class TestAuditJournal:
+    """Test suite for AuditJournal."""
+
+    def setup_method(self):
+        """Set up test environment."""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.journal_dir = os.path.join(self.temp_dir.name, 'audit')
+
+    def teardown_method(self):
+        """Clean up test environment."""
+        self.temp_dir.cleanup()
+
+    def test_rotation_compression_and_lookup(self):
+        """Test segments rotate by size, compress, and stay readable through the index."""
+        journal = AuditJournal(self.journal_dir, max_segment_bytes=2000, compress=True)
+        for index in range(100):
+            journal.append('operation', f'op-{index}', {'operation_id': f'op-{index}', 'status': 'PENDING'},
+                           timestamp=f'2026-01-01T00:{index // 60:02d}:{index % 60:02d}')
+        journal.append('operation', 'op-3', {'operation_id': 'op-3', 'status': 'APPROVED'},
+                       timestamp='2026-01-01T01:00:00')
+
+        statistics = journal.get_statistics()
+        compressed = [name for name in os.listdir(self.journal_dir) if name.endswith('.jsonl.gz')]
+        assert statistics['segments'] > 5
+        assert len(compressed) == statistics['segments'] - 1
+        assert statistics['entries'] == 101
+        assert journal.count('operation') == 100
+
+        with gzip.open(os.path.join(self.journal_dir, sorted(compressed)[0]), 'rt') as f:
+            assert json.loads(f.readline())['key'] == 'op-0'
+
+        assert journal.get('operation', 'op-3')['status'] == 'APPROVED'
+        assert journal.get('operation', 'op-0')['status'] == 'PENDING'
+        assert journal.get('operation', 'op-missing') is None
+
+        latest = [entry['key'] for entry in journal.iter_latest('operation')]
+        assert len(latest) == 100
+        assert latest[-1] == 'op-3'
+        assert [entry['key'] for entry in journal.tail('operation', 2)] == ['op-99', 'op-3']
+
+        window = list(journal.iter_entries(since='2026-01-01T00:00:10', until='2026-01-01T00:00:12'))
+        assert [entry['key'] for entry in window] == ['op-10', 'op-11', 'op-12']
+        journal.close()
+
+    def test_reopen_continues_sequence(self):
+        """Test a reopened journal appends after the existing entries."""
+        journal = AuditJournal(self.journal_dir)
+        journal.append('operation', 'op-1', {'n': 1}, state={'metrics': {'total': 1}})
+        journal.close()
+
+        reopened = AuditJournal(self.journal_dir)
+        assert reopened.append('operation', 'op-2', {'n': 2}) == 2
+        assert reopened.get_state('metrics') == {'total': 1}
+        assert [entry['record']['n'] for entry in reopened.iter_latest('operation')] == [1, 2]
+        reopened.close()
+
+    def test_append_after_torn_record(self):
+        """Test a record torn by a crash is skipped and later appends stay readable."""
+        journal = AuditJournal(self.journal_dir)
+        journal.append('operation', 'op-1', {'n': 1})
+        journal.append('operation', 'op-2', {'n': 2})
+        journal.close()
+        segment = os.path.join(self.journal_dir, 'audit-000000000001.jsonl')
+
+        # Crash mid-write of op-2's line, leaving a partial last record
+        with open(segment, 'rb+') as f:
+            content = f.read()
+            f.truncate(content.index(b'\n') + 1 + 20)
+
+        reopened = AuditJournal(self.journal_dir)
+        seq = reopened.append('operation', 'op-3', {'n': 3})
+        assert reopened.get('operation', 'op-1') == {'n': 1}
+        assert reopened.get('operation', 'op-3') == {'n': 3}
+        assert reopened.get('operation', 'op-2') is None
+        assert [entry['seq'] for entry in reopened.iter_entries()] == [1, seq]
+        reopened.close()
+
+    def test_rollback_plan_store_evicts_to_journal(self):
+        """Test evicted plans are read back from the journal."""
+        journal = AuditJournal(self.journal_dir)
+        plans = RollbackPlanStore(journal, max_items=2)
+        for index in range(5):
+            plans[f'op-{index}'] = {'rollback_id': f'rb-{index}'}
+
+        assert len(plans) == 2
+        assert plans.total_count() == 5
+        assert 'op-0' in plans
+        assert plans['op-0']['rollback_id'] == 'rb-0'
+        assert [operation_id for operation_id, _ in plans.iter_all()] == [f'op-{i}' for i in range(5)]
+        journal.close()
+
+
+class TestSafetyControlsAuditJournal:
+    """Test SafetyControls backed by the audit journal."""
+
+    def setup_method(self):
+        """Set up test environment."""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.audit_dir = os.path.join(self.temp_dir.name, 'audit')
+        self.log_file = os.path.join(self.temp_dir.name, 'operations.log')
+
+    def teardown_method(self):
+        """Clean up test environment."""
+        self.temp_dir.cleanup()
+
+    def _run_operations(self, safety_controls, count):
+        for index in range(count):
+            safety_controls.validate_operation(
+                operation_type=OperationType.STOP_INSTANCE,
+                resource_id=f'i-{index:04d}',
+                resource_data={'tags': {'Environment': 'development'}},
+                operation_func=MagicMock(return_value={'success': True})
+            )
+
+    def test_bounded_window_with_full_metrics_and_export(self):
+        """Test memory holds the window while metrics and exports cover every operation."""
+        safety_controls = SafetyControls(dry_run=True, log_file=self.log_file,
+                                         audit_dir=self.audit_dir, history_window=10)
+        self._run_operations(safety_controls, 25)
+
+        assert len(safety_controls.operation_history) == 10
+        metrics = safety_controls.get_safety_metrics()
+        assert metrics['total_operations'] == 25
+        assert metrics['status_distribution'][OperationStatus.SIMULATED.value] == 25
+        assert metrics['audit_journal']['counts'] == {'operation': 25}
+
+        export_file = safety_controls.export_audit_log(os.path.join(self.temp_dir.name, 'audit.json'))
+        with open(export_file, 'r') as f:
+            audit_data = json.load(f)
+        assert len(audit_data['operation_history']) == 25
+        assert audit_data['safety_metrics']['total_operations'] == 25
+
+    def test_state_survives_restart(self):
+        """Test metrics, the recent window and old operations are available after a restart."""
+        safety_controls = SafetyControls(dry_run=True, log_file=self.log_file,
+                                         audit_dir=self.audit_dir, history_window=5)
+        self._run_operations(safety_controls, 8)
+        first_operation_id = next(iter(
+            entry['key'] for entry in safety_controls.audit_journal.iter_latest('operation')
+        ))
+        safety_controls.audit_journal.close()
+
+        restarted = SafetyControls(dry_run=True, log_file=self.log_file,
+                                   audit_dir=self.audit_dir, history_window=5)
+        assert restarted.get_safety_metrics()['total_operations'] == 8
+        assert [op['resource_id'] for op in restarted.operation_history] == [f'i-{i:04d}' for i in range(3, 8)]
+
+        restarted._update_operation(restarted._find_operation(first_operation_id),
+                                    status=OperationStatus.FAILED.value)
+        metrics = restarted.get_safety_metrics()
+        assert metrics['status_distribution'][OperationStatus.SIMULATED.value] == 7
+        assert metrics['status_distribution'][OperationStatus.FAILED.value] == 1
+        assert restarted.audit_journal.get('operation', first_operation_id)['status'] == 'FAILED'
+        restarted.audit_journal.close()
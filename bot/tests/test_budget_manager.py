@@ -14,6 +14,9 @@ import unittest
 from datetime import datetime, timedelta
 import sys
 import os
+from unittest.mock import patch
+
+import numpy as np
 
 # Add the project root to the path
 _root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -331,6 +334,106 @@ class TestBudgetManager(unittest.TestCase):
                 actual_costs=[]
             )
 
+    def test_generate_batch_forecasts_matches_single_forecasts(self):
+        """Test batch forecasts match per-budget forecasts and estimate overspend."""
+        histories = {
+            "short": self.sample_historical_data,
+            "seasonal": [
+                {"date": f"{2022 + month // 12}-{month % 12 + 1:02d}-01T00:00:00Z",
+                 "cost": 2000.0 + 25 * month + (400.0 if month % 12 == 11 else 0.0)}
+                for month in range(24)
+            ],
+            "no-history": []
+        }
+        for budget_id, history in histories.items():
+            self.budget_manager.create_hierarchical_budget(
+                budget_id=budget_id, budget_type=BudgetType.TEAM, parent_budget_id=None, budget_amount=24000.0
+            )
+            if history:
+                self.budget_manager.analyze_historical_trends(budget_id, history, analysis_months=24)
+        
+        options = {
+            "forecast_months": 6,
+            "growth_projections": {"overall": 0.12},
+            "infrastructure_changes": [{"start_month": 2, "monthly_cost_impact": 150.0}]
+        }
+        batch = self.budget_manager.generate_batch_forecasts(monte_carlo_samples=5000, random_seed=1, **options)
+        
+        for budget_id in histories:
+            single = self.budget_manager.generate_cost_forecast(budget_id, **options)
+            batched = batch["forecasts"][budget_id]
+            for key in ("lower_bound", "upper_bound"):
+                for expected, actual in zip(single["confidence_intervals"][key], batched["confidence_intervals"][key]):
+                    self.assertAlmostEqual(expected, actual, places=6)
+            for name in ("realistic", "optimistic", "pessimistic"):
+                for expected, actual in zip(single["scenarios"][name], batched["scenarios"][name]):
+                    self.assertAlmostEqual(expected, actual, places=6)
+        
+        seasonal_factors = self.budget_manager.historical_data["seasonal"]["seasonal_factors"]
+        for month, factor in seasonal_factors.items():
+            self.assertAlmostEqual(batch["forecasts"]["seasonal"]["assumptions"]["seasonal_adjustments"][month], factor)
+        
+        # ~2,000/month allowance against ~2,800/month forecast spend is very likely overspent
+        self.assertGreater(batch["forecasts"]["seasonal"]["monte_carlo"]["overspend_probability"], 0.9)
+        self.assertLess(batch["forecasts"]["no-history"]["monte_carlo"]["overspend_probability"], 0.1)
+        self.assertEqual(batch["summary"]["budgets_at_risk"][0], "seasonal")
+    
+    def test_batch_and_single_forecasts_share_trend_without_analysis(self):
+        """Test historical data set without analyze_historical_trends forecasts the same either way."""
+        self.budget_manager.create_hierarchical_budget(
+            budget_id="loaded", budget_type=BudgetType.TEAM, parent_budget_id=None, budget_amount=24000.0
+        )
+        self.budget_manager.historical_data["loaded"] = {
+            "monthly_costs": [1000.0, 1100.0, 1250.0, 1300.0, 1420.0],
+            "dates": []
+        }
+        
+        single = self.budget_manager.generate_cost_forecast("loaded", forecast_months=4)
+        batch = self.budget_manager.generate_batch_forecasts(["loaded"], forecast_months=4, monte_carlo_samples=0)
+        batched = batch["forecasts"]["loaded"]
+        
+        self.assertGreater(batched["trend"]["slope"], 0)
+        for name in ("realistic", "optimistic", "pessimistic"):
+            for expected, actual in zip(single["scenarios"][name], batched["scenarios"][name]):
+                self.assertAlmostEqual(expected, actual, places=6)
+        self.assertAlmostEqual(single["scenarios"]["realistic"][0], 1420.0 + batched["trend"]["slope"], places=6)
+
+    def test_generate_batch_forecasts_scales_to_many_budgets(self):
+        """Test 2,000 budgets with three years of history are forecast in one batch."""
+        for index in range(2000):
+            budget_id = f"budget-{index}"
+            self.budget_manager.create_hierarchical_budget(
+                budget_id=budget_id, budget_type=BudgetType.PROJECT, parent_budget_id=None, budget_amount=12000.0
+            )
+            self.budget_manager.historical_data[budget_id] = {
+                "monthly_costs": [900.0 + (index % 50) * month for month in range(36)],
+                "dates": [f"{2021 + month // 12}-{month % 12 + 1:02d}-01" for month in range(36)]
+            }
+        
+        batch = self.budget_manager.generate_batch_forecasts(forecast_months=12, apply_seasonality=True,
+                                                             monte_carlo_samples=2000, random_seed=7)
+        self.assertEqual(batch["summary"]["budgets_forecast"], 2000)
+        self.assertEqual(len(batch["forecasts"]["budget-1999"]["base_forecast"]), 12)
+
+    def test_monte_carlo_overspend_in_chunks(self):
+        """Test chunked sampling keeps a bounded percentile sample and accumulates exceedance."""
+        forecast = np.array([[1000.0] * 12, [2000.0] * 12])
+        margin = np.array([0.1, 0.1])
+        allowance = np.array([12000.0, 30000.0])
+        single_chunk = BudgetManager._monte_carlo_overspend(forecast, margin, allowance, 20000, 3)
+        with patch("core.budget_manager.MAX_MONTE_CARLO_CELLS", 100), \
+                patch("core.budget_manager.MIN_PERCENTILE_SAMPLES", 200):
+            chunked = BudgetManager._monte_carlo_overspend(forecast, margin, allowance, 20000, 3)
+        
+        self.assertEqual(chunked["percentiles"].shape, (3, 2))
+        for budget in range(2):
+            self.assertAlmostEqual(chunked["overspend_probability"][budget],
+                                   single_chunk["overspend_probability"][budget], delta=0.02)
+            self.assertAlmostEqual(chunked["expected_overspend"][budget],
+                                   single_chunk["expected_overspend"][budget], delta=50.0)
+            for expected, actual in zip(single_chunk["percentiles"][:, budget], chunked["percentiles"][:, budget]):
+                self.assertAlmostEqual(actual / expected, 1.0, delta=0.03)
+
 
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
@@ -16,6 +16,8 @@ import unittest
 from unittest.mock import Mock, patch, MagicMock
 import sys
 import os
+import threading
+import time
 from datetime import datetime, timezone, timedelta
 
 # Add project root to the path (for standalone run)
@@ -230,6 +232,36 @@ class TestBudgetsClient(unittest.TestCase):
         self.assertIn('parent-budget', self.budgets_client.budget_hierarchy)
         self.assertIn('child-budget', self.budgets_client.budget_hierarchy['parent-budget'])
     
+    def test_establish_hierarchy_reparents_rollup_roots(self):
+        """Test a budget first seen by a rollup moves under the parent set later."""
+        self.budgets_client.get_hierarchy_rollup({'team-budget': 40.0, 'org-budget': 10.0})
+        self.assertIsNone(self.budgets_client.hierarchy_tree.parent('team-budget'))
+        
+        self.budgets_client._establish_budget_hierarchy('team-budget', 'org-budget')
+        
+        self.assertEqual(self.budgets_client.hierarchy_tree.parent('team-budget'), 'org-budget')
+        rollup = self.budgets_client.get_hierarchy_rollup({'team-budget': 40.0, 'org-budget': 10.0})
+        self.assertEqual(rollup['org-budget']['rolledUpSpend'], 50.0)
+        self.assertEqual(rollup['team-budget']['hierarchyPath'], ['org-budget', 'team-budget'])
+        
+        self.budgets_client._establish_budget_hierarchy('team-budget', 'other-budget')
+        self.assertEqual(self.budgets_client.budget_hierarchy['org-budget'], [])
+        self.assertEqual(self.budgets_client.budget_hierarchy['other-budget'], ['team-budget'])
+    
+    def test_delete_budget_removes_hierarchy_node(self):
+        """Test a deleted budget leaves the hierarchy and its children move up to its parent."""
+        self.budgets_client._establish_budget_hierarchy('team-budget', 'org-budget')
+        self.budgets_client._establish_budget_hierarchy('project-budget', 'team-budget')
+        
+        self.budgets_client._delete_budget('team-budget', dry_run=False)
+        
+        self.assertNotIn('team-budget', self.budgets_client.hierarchy_tree)
+        self.assertNotIn('team-budget', self.budgets_client.budget_hierarchy)
+        self.assertEqual(self.budgets_client.budget_hierarchy['org-budget'], ['project-budget'])
+        rollup = self.budgets_client.get_hierarchy_rollup({'project-budget': 25.0})
+        self.assertNotIn('team-budget', rollup)
+        self.assertEqual(rollup['org-budget']['rolledUpSpend'], 25.0)
+    
     def test_calculate_detailed_variance_metrics(self):
         """Test detailed variance metrics calculation."""
         budget_details = {
@@ -312,6 +344,45 @@ class TestBudgetsClient(unittest.TestCase):
         )
         self.assertIsNotNone(budget_increase_rec)
         self.assertEqual(budget_increase_rec['priority'], 'HIGH')
+    
+    def test_synchronize_forecasts_concurrently_from_one_sweep(self):
+        """Test forecasts use one paginated DescribeBudgets sweep and run concurrently."""
+        budgets = [
+            {'BudgetName': f'budget-{index}', 'BudgetLimit': {'Amount': '1000.0', 'Unit': 'USD'}}
+            for index in range(40)
+        ]
+        self.mock_budgets_client.describe_budgets.side_effect = [
+            {'Budgets': budgets[:25], 'NextToken': 'page-2'},
+            {'Budgets': budgets[25:]}
+        ]
+        
+        in_flight = {'current': 0, 'peak': 0}
+        in_flight_lock = threading.Lock()
+        
+        def get_cost_forecast(**params):
+            with in_flight_lock:
+                in_flight['current'] += 1
+                in_flight['peak'] = max(in_flight['peak'], in_flight['current'])
+            time.sleep(0.05)
+            with in_flight_lock:
+                in_flight['current'] -= 1
+            return {'Total': {'Amount': '900.0', 'Unit': 'USD'}, 'ForecastResultsByTime': []}
+        
+        ce_client = Mock()
+        ce_client.get_cost_forecast.side_effect = get_cost_forecast
+        self.mock_aws_config.get_cost_explorer_client.return_value = ce_client
+        self.mock_aws_config.execute_with_retry.side_effect = lambda operation, service, **kwargs: operation(**kwargs)
+        
+        result = self.budgets_client.synchronize_budget_forecasts()
+        
+        self.assertTrue(result['success'])
+        self.assertEqual(result['summary']['successful_syncs'], 40)
+        self.assertEqual(list(result['forecasts']), [budget['BudgetName'] for budget in budgets])
+        self.assertEqual(self.mock_budgets_client.describe_budgets.call_count, 2)
+        self.mock_budgets_client.describe_budget.assert_not_called()
+        self.assertEqual(ce_client.get_cost_forecast.call_count, 40)
+        self.assertGreater(in_flight['peak'], 1)
+        self.assertLessEqual(in_flight['peak'], self.budgets_client.max_workers)
 
 
 def run_tests():
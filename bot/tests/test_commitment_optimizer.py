@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the commitment portfolio optimizer.
+
+Tests instance normalization, RI and Savings Plan selection, per-family RI
+levels, upfront constraints, break-even curves and engine integration.
+"""
+
+import os
+import sys
+import time
+import unittest
+from datetime import datetime, timedelta, timezone
+from unittest.mock import Mock
+
+import numpy as np
+
+# Add the project root to the path
+_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _root not in sys.path:
+    sys.path.insert(0, _root)
+
+from core.commitment_optimizer import CommitmentOptimizer, normalize_instance_type
+from core.pricing_intelligence import PricingIntelligenceEngine, ReservationTerm, PaymentOption
+from utils.pricing_cache import PricingCache
+from aws.scan_ec2 import EC2Scanner
+
+
+class TestCommitmentOptimizer(unittest.TestCase):
+    """Test cases for CommitmentOptimizer."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.optimizer = CommitmentOptimizer()
+
+    def test_normalize_instance_type(self):
+        """Test family and size normalization factors."""
+        self.assertEqual(normalize_instance_type('t3.micro'), ('t3', 0.5))
+        self.assertEqual(normalize_instance_type('m5.large'), ('m5', 4.0))
+        self.assertEqual(normalize_instance_type('m5.4xlarge'), ('m5', 32.0))
+
+    def test_steady_usage_is_fully_reserved(self):
+        """Test always-on usage is covered by the cheapest reservation."""
+        usage = np.full((720, 1), 4.0)
+        portfolio = self.optimizer.optimize(usage, [0.024], ['m5'])
+
+        ri = portfolio['reservedInstances']
+        self.assertEqual(ri['term'], '3_year')
+        self.assertEqual(ri['paymentOption'], 'all_upfront')
+        self.assertEqual(ri['commitments'][0]['normalizedUnits'], 4.0)
+        self.assertAlmostEqual(ri['commitments'][0]['utilizationPercentage'], 100.0)
+        self.assertIsNone(portfolio['savingsPlan'])
+        self.assertAlmostEqual(portfolio['savingsPercentage'], 50.0)
+
+    def test_volatile_usage_mixes_reservations_and_savings_plan(self):
+        """Test a steady base is reserved and shifting peaks go to the Savings Plan."""
+        hours = np.arange(24 * 60)
+        peak = (hours % 24 < 20).astype(float)
+        # Peaks alternate between families so no single family peak pays off as an RI
+        usage = np.column_stack([
+            4.0 + 4.0 * peak * (hours // 24 % 2 == 0),
+            4.0 + 4.0 * peak * (hours // 24 % 2 == 1)
+        ])
+        portfolio = self.optimizer.optimize(usage, [0.024, 0.024], ['m5', 'c5'],
+                                            terms=[ReservationTerm.ONE_YEAR],
+                                            payment_options=[PaymentOption.NO_UPFRONT])
+
+        units = {c['family']: c['normalizedUnits'] for c in portfolio['reservedInstances']['commitments']}
+        self.assertEqual(units, {'m5': 4.0, 'c5': 4.0})
+        self.assertIsNotNone(portfolio['savingsPlan'])
+        self.assertAlmostEqual(portfolio['savingsPlan']['hourlyCommitment'], 4.0 * 0.024 * 0.75)
+        self.assertGreater(portfolio['monthlySavings'], 0)
+
+    def test_ri_levels_follow_each_family_rate(self):
+        """Test identical usage is reserved deeper in the family with the cheaper RI."""
+        hours = np.arange(1000)
+        column = np.where(hours % 100 < 65, 8.0, 4.0)
+        usage = np.column_stack([column, column, column])
+        option = (ReservationTerm.ONE_YEAR, PaymentOption.NO_UPFRONT)
+        portfolio = self.optimizer.optimize(usage, [0.024, 0.024, 0.024], ['m5', 'c5', 'x1'],
+                                            terms=[ReservationTerm.ONE_YEAR],
+                                            payment_options=[PaymentOption.NO_UPFRONT],
+                                            family_ri_rates={'m5': {option: 0.6}, 'c5': {option: 0.7}, 'x1': {}})
+
+        commitments = {c['family']: c for c in portfolio['reservedInstances']['commitments']}
+        self.assertEqual(set(commitments), {'m5', 'c5'})
+        self.assertEqual(commitments['m5']['normalizedUnits'], 8.0)
+        self.assertEqual(commitments['c5']['normalizedUnits'], 4.0)
+        self.assertAlmostEqual(commitments['m5']['hourlyCost'], 8.0 * 0.024 * 0.6)
+        self.assertAlmostEqual(commitments['c5']['hourlyCost'], 4.0 * 0.024 * 0.7)
+
+    def test_upfront_budget_constraint(self):
+        """Test the upfront cap excludes upfront payment options."""
+        usage = np.full((720, 1), 4.0)
+        portfolio = self.optimizer.optimize(usage, [0.024], ['m5'], max_upfront_cost=0)
+
+        self.assertEqual(portfolio['reservedInstances']['paymentOption'], 'no_upfront')
+        self.assertEqual(portfolio['upfrontCost'], 0)
+        self.assertTrue(portfolio['feasible'])
+
+    def test_no_feasible_commitment(self):
+        """Test an upfront cap that rules out every candidate returns an On-Demand portfolio."""
+        usage = np.full((720, 1), 4.0)
+        portfolio = self.optimizer.optimize(usage, [0.024], ['m5'], max_upfront_cost=-1.0)
+
+        self.assertFalse(portfolio['feasible'])
+        self.assertIsNone(portfolio['reservedInstances'])
+        self.assertIsNone(portfolio['savingsPlan'])
+        self.assertEqual(portfolio['monthlySavings'], 0.0)
+        self.assertEqual(portfolio['projectedMonthlyCost'], portfolio['baselineMonthlyCost'])
+        self.assertEqual(portfolio['upfrontCost'], 0.0)
+
+    def test_break_even_curves(self):
+        """Test curves peak near the chosen commitment and turn negative when over-committed."""
+        usage = np.linspace(0, 10, 1000).reshape(-1, 1)
+        portfolio = self.optimizer.optimize(usage, [0.1], ['m5'],
+                                            terms=[ReservationTerm.ONE_YEAR],
+                                            payment_options=[PaymentOption.NO_UPFRONT])
+
+        curve = portfolio['breakEvenCurves']['reservedInstances']['m5']
+        self.assertEqual(len(curve), 21)
+        self.assertEqual(curve[0]['netHourlySavings'], 0.0)
+        self.assertLess(curve[-1]['netHourlySavings'], 0)
+        self.assertGreater(max(point['netHourlySavings'] for point in curve), 0)
+
+    def test_year_of_hourly_data_for_hundreds_of_families(self):
+        """Test a full year for 300 families is optimized in seconds."""
+        rng = np.random.default_rng(7)
+        usage = rng.uniform(2, 20, 300) + rng.normal(0, 2, (8760, 300))
+        rates = rng.uniform(0.01, 0.1, 300)
+
+        started = time.time()
+        portfolio = self.optimizer.optimize(usage, rates)
+
+        self.assertLess(time.time() - started, 10)
+        self.assertGreater(portfolio['savingsPercentage'], 0)
+        self.assertLessEqual(portfolio['coveragePercentage'], 100)
+
+    def test_engine_builds_portfolio_from_hourly_usage(self):
+        """Test the pricing engine aggregates hourly usage by normalized family."""
+        engine = PricingIntelligenceEngine(Mock(), pricing_cache=PricingCache())
+        resources = [
+            {'resourceId': 'i-1', 'instanceType': 'm5.large', 'hourlyUsage': [1] * 720},
+            {'resourceId': 'i-2', 'instanceType': 'm5.xlarge', 'hourlyUsage': [1] * 360},
+            {'resourceId': 'i-3', 'instanceType': 't3.micro'}
+        ]
+
+        usage_matrix, families, rates = engine._build_hourly_usage_matrix(resources)
+        self.assertEqual(families, ['m5'])
+        self.assertEqual(usage_matrix.shape, (720, 1))
+        self.assertEqual(usage_matrix[0, 0], 4.0)
+        self.assertEqual(usage_matrix[-1, 0], 12.0)
+        self.assertAlmostEqual(rates[0], 0.024)
+
+        portfolio = engine.optimize_commitment_portfolio(resources)
+        self.assertEqual(portfolio['reservedInstances']['commitments'][0]['family'], 'm5')
+        self.assertIsNone(engine.optimize_commitment_portfolio(resources[2:]))
+
+    def test_scanner_hourly_usage_from_cpu_datapoints(self):
+        """Test hours with a CPU datapoint count as running hours of the metric window."""
+        start = datetime(2026, 1, 1, 0, 0)
+        datapoints = [{'Timestamp': datetime(2026, 1, 1, hour, tzinfo=timezone.utc)} for hour in (2, 3, 9)]
+        self.assertEqual(EC2Scanner._build_hourly_usage(datapoints, start, 8, 3600),
+                         [0.0, 0.0, 1.0, 1.0, 0.0, 0.0, 0.0, 0.0])
+
+        daily = [{'Timestamp': start + timedelta(days=1)}]
+        self.assertEqual(EC2Scanner._build_hourly_usage(daily, start, 72, 86400),
+                         [0.0] * 24 + [1.0] * 24 + [0.0] * 24)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -15,6 +15,10 @@ import unittest
 from unittest.mock import Mock, patch
 from datetime import datetime, timezone
 import json
+import pickle
+import random
+import shutil
+import tempfile
 
 # Import the cost allocation engine
 from core.cost_allocation import (
@@ -434,6 +438,278 @@ class TestCostAllocationEngine(unittest.TestCase):
         self.assertEqual(summary["total_rules"], 1)
         self.assertEqual(summary["active_rules"], 1)
 
+    def test_rule_index_matches_full_rule_scan(self):
+        """Test indexed rule lookup matches evaluating every rule in priority order."""
+        rng = random.Random(42)
+        services = ["ec2", "rds", "s3", "lambda"]
+        regions = ["us-east-1", "us-west-2", "eu-west-1"]
+        teams = ["engineering", "data", "platform"]
+        
+        for index in range(200):
+            conditions = {}
+            if rng.random() < 0.5:
+                conditions["services"] = rng.sample(services, rng.randint(1, 2))
+            if rng.random() < 0.4:
+                conditions["regions"] = rng.sample(regions, rng.randint(1, 2))
+            if rng.random() < 0.5:
+                conditions["tags"] = {"Team": rng.choice([rng.choice(teams), rng.sample(teams, 2)])}
+            if rng.random() < 0.3:
+                low = rng.choice([0.0, 10.0, 50.0])
+                conditions["cost_thresholds"] = {"min": low, "max": low + rng.choice([5.0, 100.0])}
+            self.engine.create_allocation_rule(
+                rule_id=f"rule-{index}", name=f"Rule {index}", method=AllocationMethod.TAG_BASED,
+                scope=AllocationScope.TEAM, priority=rng.randint(1, 20), conditions=conditions
+            )
+        
+        records = [
+            {
+                "resource_id": f"r-{index}",
+                "service": rng.choice(services),
+                "region": rng.choice(regions),
+                "cost": rng.choice([0.0, 5.0, 10.0, 50.0, 55.0, 75.5, 150.0]),
+                "tags": {"Team": rng.choice(teams)} if rng.random() < 0.7 else {}
+            }
+            for index in range(300)
+        ]
+        
+        def full_scan(record):
+            rules = [rule for rule in self.engine.allocation_rules.values()
+                     if rule.get("is_active", True) and self.engine._evaluate_rule_conditions(record, rule)]
+            return [rule["rule_id"] for rule in sorted(rules, key=lambda r: r.get("priority", 100))]
+        
+        for record in records:
+            indexed = [rule["rule_id"] for rule in self.engine._find_applicable_rules(record)]
+            self.assertEqual(indexed, full_scan(record))
+        
+        # Rule updates from conflict resolution are reflected in the index
+        self.engine.dry_run = False
+        with patch.object(self.engine, "_resolve_single_conflict", return_value={
+            "resolved": True, "rule_updates": {"rule-0": {"is_active": False}, "rule-1": {"priority": 0}}
+        }):
+            self.engine.resolve_allocation_conflicts([{"rule1": "rule-0", "rule2": "rule-1"}])
+        
+        for record in records:
+            indexed = [rule["rule_id"] for rule in self.engine._find_applicable_rules(record)]
+            self.assertEqual(indexed, full_scan(record))
+            self.assertNotIn("rule-0", indexed)
+
+    def test_rule_index_after_conflict_changes_conditions(self):
+        """Test a conflict resolution that changes rule conditions leaves no stale index entries."""
+        self.engine.create_allocation_rule(
+            rule_id="ec2_rule", name="EC2 Rule", method=AllocationMethod.TAG_BASED, scope=AllocationScope.TEAM,
+            priority=5, conditions={"services": ["ec2"], "cost_thresholds": {"min": 0.0, "max": 100.0}}
+        )
+        self.engine.create_allocation_rule(
+            rule_id="rds_rule", name="RDS Rule", method=AllocationMethod.TAG_BASED, scope=AllocationScope.TEAM,
+            priority=10, conditions={"services": ["rds"]}
+        )
+        
+        self.engine.dry_run = False
+        with patch.object(self.engine, "_resolve_single_conflict", return_value={
+            "resolved": True, "rule_updates": {"ec2_rule": {"priority": 20, "conditions": {"services": ["s3"]}}}
+        }):
+            self.engine.resolve_allocation_conflicts([{"rule1": "ec2_rule", "rule2": "rds_rule"}])
+        
+        lookups = {
+            service: [rule["rule_id"] for rule in self.engine._find_applicable_rules(
+                {"service": service, "cost": 500.0})]
+            for service in ("ec2", "rds", "s3")
+        }
+        self.assertEqual(lookups, {"ec2": [], "rds": ["rds_rule"], "s3": ["ec2_rule"]})
+
+    def test_columnar_allocation_matches_record_allocation(self):
+        """Test columnar allocation reproduces per-record totals, breakdowns and counts."""
+        rng = random.Random(7)
+        services = ["ec2", "rds", "s3", "lambda"]
+        regions = ["us-east-1", "us-west-2"]
+        teams = ["engineering", "data", "platform"]
+        methods = [AllocationMethod.TAG_BASED, AllocationMethod.EQUAL_SPLIT,
+                   AllocationMethod.PROPORTIONAL, AllocationMethod.USAGE_PATTERN]
+        
+        self.engine.tag_mappings = {"Team": {"eng": "engineering"}}
+        self.engine.usage_patterns = {"pattern-1": {"patterns": {
+            "service_patterns": {"s3": 0.9},
+            "tag_patterns": {"Team": {"engineering": 60.0, "data": 40.0}}
+        }}}
+        for index in range(40):
+            conditions = {"services": rng.sample(services, 2)}
+            if rng.random() < 0.5:
+                conditions["tags"] = {"Project": rng.choice(["web", "etl"])}
+            if rng.random() < 0.3:
+                conditions["cost_thresholds"] = {"min": rng.choice([0.0, 10.0]), "max": rng.choice([20.0, 100.0])}
+            self.engine.create_allocation_rule(
+                rule_id=f"rule-{index}", name=f"Rule {index}", method=rng.choice(methods),
+                scope=rng.choice([AllocationScope.TEAM, AllocationScope.PROJECT]),
+                priority=rng.randint(1, 10), conditions=conditions,
+                allocation_targets={"team-a": rng.choice([0.0, 30.0]), "team-b": 70.0}
+            )
+        
+        records = []
+        for index in range(2000):
+            tags = {}
+            if rng.random() < 0.8:
+                tags["Team"] = rng.choice(teams + ["eng"])
+            if rng.random() < 0.6:
+                tags["Project"] = rng.choice(["web", "etl"])
+            records.append({
+                "resource_id": f"r-{index}",
+                "service": rng.choice(services + ["dynamodb"]),
+                "region": rng.choice(regions),
+                "cost": rng.choice([0.001, 5.0, 10.0, 20.0, 55.5, 150.0]),
+                "tags": tags
+            })
+        
+        for fallback in (FallbackStrategy.UNALLOCATED_POOL, FallbackStrategy.DEFAULT_ALLOCATION):
+            self.engine.default_config["fallback_strategy"] = fallback
+            expected = self.engine.allocate_costs(records, "2024-01")
+            columnar = self.engine.allocate_costs(records, "2024-01", columnar=True)
+            
+            for key in ("total_costs", "allocated_costs", "unallocated_costs"):
+                self.assertAlmostEqual(columnar[key], expected[key], places=6)
+            self.assertEqual(set(columnar["allocation_breakdown"]), set(expected["allocation_breakdown"]))
+            for scope, targets in expected["allocation_breakdown"].items():
+                self.assertEqual(set(columnar["allocation_breakdown"][scope]), set(targets))
+                for target, amount in targets.items():
+                    self.assertAlmostEqual(columnar["allocation_breakdown"][scope][target], amount, places=6)
+            
+            for summary_key in ("successfully_allocated", "unallocated_records"):
+                self.assertEqual(columnar["processing_summary"][summary_key],
+                                 expected["processing_summary"][summary_key])
+            self.assertEqual(self.engine._calculate_allocation_metrics(columnar)["rule_usage_distribution"],
+                             self.engine._calculate_allocation_metrics(expected)["rule_usage_distribution"])
+            unallocated = self.engine._analyze_unallocated_costs(columnar)["unallocation_reasons"]
+            for reason, totals in self.engine._analyze_unallocated_costs(expected)["unallocation_reasons"].items():
+                self.assertEqual(unallocated[reason]["count"], totals["count"])
+                self.assertAlmostEqual(unallocated[reason]["total_cost"], totals["total_cost"], places=6)
+        
+        # DataFrames are allocated column-at-a-time
+        import pandas as pd
+        from_frame = self.engine.allocate_costs(pd.DataFrame(records), "2024-01")
+        self.assertAlmostEqual(from_frame["allocated_costs"], expected["allocated_costs"], places=6)
+        self.assertEqual(from_frame["processing_summary"]["total_records_processed"], len(records))
+
+    def test_incremental_allocation_reallocates_changed_days(self):
+        """Test only new or changed days are re-allocated and summaries persist to disk."""
+        summary_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, summary_dir)
+        
+        def build_engine():
+            engine = CostAllocationEngine(dry_run=True, summary_dir=summary_dir)
+            engine.create_allocation_rule(
+                rule_id="tags", name="Tag rule", method=AllocationMethod.TAG_BASED,
+                scope=AllocationScope.TEAM, priority=10
+            )
+            return engine
+        
+        def day_records(day, cost=10.0):
+            return [
+                {"resource_id": f"r-{index}", "service": "ec2", "region": "us-east-1", "cost": cost,
+                 "timestamp": f"2024-01-{day:02d}T{index:02d}:00:00Z",
+                 "tags": {"Team": "engineering"} if index % 2 else {}}
+                for index in range(10)
+            ]
+        
+        engine = build_engine()
+        records = day_records(1) + day_records(2) + day_records(3)
+        first = engine.allocate_costs(records, "2024-01", incremental=True)
+        self.assertEqual(first["incremental_summary"]["partitions_reallocated"],
+                         ["2024-01-01", "2024-01-02", "2024-01-03"])
+        self.assertAlmostEqual(first["allocated_costs"], 150.0)
+        self.assertEqual(len(engine.allocation_history), 0)
+        
+        # Unchanged input skips the period
+        self.assertTrue(engine.allocate_costs_incremental(records, "2024-01")["incremental_summary"]["period_skipped"])
+        
+        # Month-to-date run after a restart: a new day and a corrected day
+        engine = build_engine()
+        records = day_records(1) + day_records(2, cost=20.0) + day_records(3) + day_records(4)
+        second = engine.allocate_costs_incremental(list(reversed(records)), "2024-01")
+        self.assertEqual(second["incremental_summary"]["partitions_reallocated"], ["2024-01-02", "2024-01-04"])
+        self.assertEqual(second["incremental_summary"]["partitions_reused"], 2)
+        
+        full = engine.allocate_costs(records, "2024-01", columnar=True)
+        for key in ("total_costs", "allocated_costs", "unallocated_costs"):
+            self.assertAlmostEqual(second[key], full[key])
+        self.assertAlmostEqual(second["allocation_breakdown"]["team"]["engineering"],
+                               full["allocation_breakdown"]["team"]["engineering"])
+        self.assertEqual(second["processing_summary"]["unallocated_records"], 20)
+        
+        # Reports read persisted summaries
+        report = build_engine().generate_allocation_report("2024-01", include_details=False)
+        self.assertAlmostEqual(report["executive_summary"]["allocated_costs"], second["allocated_costs"])
+        
+        # Rule changes and forced runs re-allocate every day
+        engine.create_allocation_rule(
+            rule_id="split", name="Split", method=AllocationMethod.EQUAL_SPLIT, scope=AllocationScope.TEAM,
+            priority=20, allocation_targets={"a": 50.0, "b": 50.0}
+        )
+        self.assertEqual(len(engine.allocate_costs_incremental(records, "2024-01")
+                             ["incremental_summary"]["partitions_reallocated"]), 4)
+        self.assertEqual(len(engine.allocate_costs_incremental(records, "2024-01", force_reallocation=True)
+                             ["incremental_summary"]["partitions_reallocated"]), 4)
+
+    def test_fingerprint_frame_with_nested_values(self):
+        """Test partitions holding list or dict cells are fingerprinted by content."""
+        def frame(records):
+            return CostAllocationEngine._to_allocation_frame(records)
+        
+        records = [
+            {"resource_id": "r-1", "cost": 5.0, "owners": ["a", "b"], "labels": [{"k": 1, "v": 2}]},
+            {"resource_id": "r-2", "cost": 7.0, "owners": ["c"], "labels": []}
+        ]
+        reordered = [
+            {"resource_id": "r-2", "cost": 7.0, "owners": ["c"], "labels": []},
+            {"resource_id": "r-1", "cost": 5.0, "owners": ["a", "b"], "labels": [{"v": 2, "k": 1}]}
+        ]
+        changed = [dict(records[0], owners=["a"]), records[1]]
+        
+        fingerprint = CostAllocationEngine._fingerprint_frame(frame(records))
+        self.assertEqual(fingerprint, CostAllocationEngine._fingerprint_frame(frame(reordered)))
+        self.assertNotEqual(fingerprint, CostAllocationEngine._fingerprint_frame(frame(changed)))
+
+    def test_allocate_periods_in_parallel(self):
+        """Test batch allocation in worker processes matches sequential allocation."""
+        self.engine.create_allocation_rule(
+            rule_id="tags", name="Tag rule", method=AllocationMethod.TAG_BASED,
+            scope=AllocationScope.TEAM, priority=10, conditions={"services": ["ec2", "rds"]}
+        )
+        self.engine.setup_hierarchical_structure({"organization": "acme", "levels": ["organization", "team"]})
+        
+        # The compiled rule index survives the trip to worker processes
+        index = pickle.loads(pickle.dumps(self.engine.rule_index))
+        for record in self.sample_cost_data:
+            self.assertEqual([rule["rule_id"] for rule in index.find_rules(record)],
+                             [rule["rule_id"] for rule in self.engine._find_applicable_rules(record)])
+        
+        period_data = {
+            f"2024-{month:02d}": [dict(record, cost=record["cost"] * month) for record in self.sample_cost_data]
+            for month in range(1, 5)
+        }
+        parallel = self.engine.allocate_periods(period_data, max_workers=2)
+        sequential = CostAllocationEngine(dry_run=True)
+        sequential.allocation_rules = self.engine.allocation_rules
+        sequential.rule_index = self.engine.rule_index
+        sequential.hierarchical_structure = self.engine.hierarchical_structure
+        in_process = sequential.allocate_periods(period_data, max_workers=1)
+        
+        self.assertEqual(parallel["processing_summary"]["workers"], 2)
+        self.assertEqual(set(parallel["periods"]), set(period_data))
+        for period, cost_data in period_data.items():
+            expected = self.engine.allocate_costs(cost_data, period)
+            self.assertAlmostEqual(parallel["periods"][period]["allocation"]["allocated_costs"],
+                                   expected["allocated_costs"])
+            self.assertIn("executive_summary", parallel["periods"][period]["report"])
+        
+        for key in ("total_costs", "allocated_costs", "unallocated_costs"):
+            self.assertAlmostEqual(parallel[key], in_process[key])
+        team_rollup = parallel["hierarchical_allocation"]["team"]
+        self.assertEqual(team_rollup["periods"], 4)
+        self.assertAlmostEqual(team_rollup["total"], in_process["hierarchical_allocation"]["team"]["total"])
+        self.assertAlmostEqual(team_rollup["direct_allocations"]["engineering"], 150.50 * 10)
+        
+        # Parent history holds every period for later reports
+        self.assertNotIn("error", self.engine.generate_allocation_report("2024-03"))
+
 
 if __name__ == '__main__':
     # Configure logging for tests
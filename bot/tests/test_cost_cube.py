@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Unit tests for cost_cube.py
+
+Tests the pre-aggregated cost cube including:
+- Dimension rollups matching per-record grouping
+- Team, project and account dimensions from fields and tags
+- Cross-dimension rollups and cost driver rankings
+- One cube per report run in the Reporting Engine
+"""
+
+import os
+import sys
+import unittest
+from collections import defaultdict
+from unittest.mock import patch
+
+# Add project root to path (for standalone run)
+_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _root not in sys.path:
+    sys.path.insert(0, _root)
+
+from utils.cost_cube import CostCube
+from core.reporting_engine import ReportingEngine, ReportType
+import core.reporting_engine as reporting_engine_module
+
+
+def _cost_records():
+    return [
+        {"resource_id": "i-1", "service": "EC2", "region": "us-east-1", "cost": 100.0,
+         "date": "2024-01-15", "account_id": "111", "tags": {"Team": "web", "Project": "shop"}},
+        {"resource_id": "db-1", "service": "RDS", "region": "us-west-2", "cost": 80.0,
+         "timestamp": "2024-01-16T10:00:00Z", "account_id": "222", "tags.Team": "data"},
+        {"resource_id": "i-1", "service": "EC2", "region": "us-east-1", "cost": 20.0,
+         "date": "2024-01-16", "account_id": "111", "team": "web"},
+        {"resource_id": "b-1", "service": "S3", "cost": 120.0, "date": "2024-01-16"}
+    ]
+
+
+class TestCostCube(unittest.TestCase):
+    """Test cases for CostCube."""
+
+    def setUp(self):
+        self.cost_data = _cost_records()
+        self.cube = CostCube(self.cost_data)
+
+    def test_rollups_match_grouping(self):
+        """Test dimension rollups equal grouping the records."""
+        expected = defaultdict(float)
+        for item in self.cost_data:
+            expected[item.get("region", "unknown")] += item["cost"]
+
+        self.assertEqual(self.cube.rollup("region"), dict(expected))
+        self.assertEqual(list(self.cube.rollup("service")), ["EC2", "RDS", "S3"])
+        self.assertEqual(self.cube.counts("service"), {"EC2": 2, "RDS": 1, "S3": 1})
+        self.assertEqual(self.cube.total_cost, 320.0)
+        self.assertEqual(self.cube.size, 4)
+        self.assertEqual(self.cube.rollup("resource_id"), {"i-1": 120.0, "db-1": 80.0, "b-1": 120.0})
+
+    def test_tag_account_and_day_dimensions(self):
+        """Test team, project, account and day members come from fields, tags and timestamps."""
+        self.assertEqual(self.cube.rollup("team"), {"web": 120.0, "data": 80.0, "unknown": 120.0})
+        self.assertEqual(self.cube.rollup("project"), {"shop": 100.0, "unknown": 220.0})
+        self.assertEqual(self.cube.rollup("account"), {"111": 120.0, "222": 80.0, "unknown": 120.0})
+        self.assertEqual(self.cube.rollup("day"), {"2024-01-15": 100.0, "2024-01-16": 220.0})
+        self.assertTrue(self.cube.has_members("project"))
+        self.assertFalse(CostCube([{"cost": 1.0}]).has_members("team"))
+
+    def test_cross_rollup_and_top_resources(self):
+        """Test multi-dimension rollups and stable cost driver ranking."""
+        self.assertEqual(self.cube.cross_rollup("day", "service"), {
+            ("2024-01-15", "EC2"): 100.0,
+            ("2024-01-16", "RDS"): 80.0,
+            ("2024-01-16", "EC2"): 20.0,
+            ("2024-01-16", "S3"): 120.0
+        })
+
+        top = self.cube.top_resources(2)
+        self.assertEqual([driver["resource_id"] for driver in top], ["i-1", "b-1"])
+        self.assertEqual(top[0], {"resource_id": "i-1", "cost": 120.0, "service": "EC2",
+                                  "region": "us-east-1", "resource_type": "unknown"})
+
+
+class TestReportingEngineCostCube(unittest.TestCase):
+    """Test the Reporting Engine's use of the cost cube."""
+
+    def setUp(self):
+        self.cost_data = _cost_records()
+
+    def test_one_cube_per_report_run(self):
+        """Test every section of a report run reads the same cube."""
+        engine = ReportingEngine(dry_run=True, enable_section_cache=False)
+        with patch.object(reporting_engine_module, "CostCube", wraps=CostCube) as cube_class:
+            for report_type in (ReportType.EXECUTIVE_SUMMARY, ReportType.COST_BREAKDOWN, ReportType.VARIANCE_ANALYSIS):
+                engine.generate_comprehensive_report(
+                    report_type=report_type,
+                    period_start="2024-01-15T00:00:00Z",
+                    period_end="2024-01-16T23:59:59Z",
+                    cost_data=self.cost_data,
+                    budget_data={"budget_amount": 500.0, "forecasts": {"predicted_spend": 300.0}}
+                )
+        self.assertEqual(cube_class.call_count, 3)
+
+    def test_team_and_project_breakdown_from_tags(self):
+        """Test team and project breakdowns fall back to cost tags without allocation data."""
+        engine = ReportingEngine(dry_run=True)
+        report = engine.generate_comprehensive_report(
+            report_type=ReportType.COST_BREAKDOWN,
+            period_start="2024-01-15T00:00:00Z",
+            period_end="2024-01-16T23:59:59Z",
+            cost_data=self.cost_data
+        )
+        breakdown = report["cost_breakdown"]
+        self.assertEqual(breakdown["team_breakdown"]["breakdown"]["web"]["total_cost"], 120.0)
+        self.assertEqual(breakdown["team_breakdown"]["total_allocated"], 200.0)
+        self.assertEqual(breakdown["project_breakdown"]["project_count"], 1)
+
+        allocation = engine._extract_team_costs_from_allocation(
+            {"allocation_breakdown": {"team_allocations": {"platform": 50.0}}}, CostCube(self.cost_data)
+        )
+        self.assertEqual(allocation["breakdown"], {"platform": {"total_cost": 50.0, "percentage": 100.0}})
+
+
+if __name__ == "__main__":
+    unittest.main()
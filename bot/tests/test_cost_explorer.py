@@ -14,6 +14,8 @@ Requirements: 10.1, 5.1
 import unittest
 import sys
 import os
+import shutil
+import tempfile
 from datetime import datetime, timedelta, timezone
 from unittest.mock import Mock, patch, MagicMock
 
@@ -23,6 +25,7 @@ if _root not in sys.path:
     sys.path.insert(0, _root)
 
 from aws.cost_explorer import CostExplorer, CostMetric, Granularity, DimensionKey, create_cost_explorer
+from utils.pricing_cache import PricingCache, shared_pricing_cache, shared_cost_segment_cache
 
 
 class TestCostExplorer(unittest.TestCase):
@@ -297,6 +300,127 @@ class TestCostExplorer(unittest.TestCase):
         self.assertGreater(len(mock_anomalies), 0)
 
 
+
+def _fake_cost_and_usage(**params):
+    """Cost Explorer response with one result per day, or per month for MONTHLY."""
+    start = datetime.strptime(params['TimePeriod']['Start'], '%Y-%m-%d')
+    end = datetime.strptime(params['TimePeriod']['End'], '%Y-%m-%d')
+    results = []
+    current = start
+    while current < end:
+        if params['Granularity'] == 'MONTHLY':
+            period_end = min((current.replace(day=1) + timedelta(days=32)).replace(day=1), end)
+        else:
+            period_end = current + timedelta(days=1)
+        results.append({
+            'TimePeriod': {'Start': current.strftime('%Y-%m-%d'), 'End': period_end.strftime('%Y-%m-%d')},
+            'Total': {'UnblendedCost': {'Amount': str(current.day), 'Unit': 'USD'}},
+            'Groups': [],
+            'Estimated': False
+        })
+        current = period_end
+    return {'ResultsByTime': results, 'GroupDefinitions': []}
+
+
+class TestCostExplorerSegmentCache(unittest.TestCase):
+    """Test cases for the persistent Cost Explorer segment cache."""
+    
+    def setUp(self):
+        """Set up test fixtures."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.disk_path = os.path.join(self.temp_dir, 'ce_cache.db')
+    
+    def tearDown(self):
+        """Clean up test fixtures."""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+    
+    def _explorer(self):
+        explorer = CostExplorer(dry_run=False, cost_cache=PricingCache(disk_path=self.disk_path))
+        explorer._client = Mock()
+        explorer._client.get_cost_and_usage.side_effect = _fake_cost_and_usage
+        return explorer
+    
+    def test_default_segment_cache_is_separate_from_pricing(self):
+        """Test segments default to their own cache instead of the pricing cache."""
+        explorer = CostExplorer(dry_run=False)
+        self.assertIs(explorer.cost_cache, shared_cost_segment_cache)
+        self.assertIsNot(explorer.cost_cache, shared_pricing_cache)
+    
+    def test_closed_months_are_served_from_disk(self):
+        """Test a finalized 12-month query is fetched once and then served locally."""
+        start, end = datetime(2024, 1, 15), datetime(2025, 1, 15)
+        
+        first = self._explorer()
+        result = first.get_cost_and_usage(start, end, Granularity.MONTHLY)
+        self.assertEqual(first.client.get_cost_and_usage.call_count, 1)
+        self.assertEqual(len(result['results_by_time']), 13)
+        
+        # A new instance (next run) reads the same segments from the disk backend
+        second = self._explorer()
+        cached = second.analyze_cost_trends(start, end, Granularity.MONTHLY)
+        self.assertEqual(second.client.get_cost_and_usage.call_count, 0)
+        
+        # Only the months not cached yet are fetched, in one request
+        second.get_cost_and_usage(datetime(2024, 3, 1), datetime(2025, 3, 1), Granularity.MONTHLY)
+        self.assertEqual(second.client.get_cost_and_usage.call_args.kwargs['TimePeriod'],
+                         {'Start': '2025-01-01', 'End': '2025-03-01'})
+        self.assertEqual(cached['total_cost'], result['total_cost'])
+        self.assertEqual(second.get_query_metrics()['apiCalls'], 1)
+    
+    def test_only_open_days_are_refetched(self):
+        """Test recent days inside the finalization lag are fetched again each time."""
+        today = datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
+        start, end = today - timedelta(days=10), today
+        
+        explorer = self._explorer()
+        explorer.get_cost_and_usage(start, end, Granularity.DAILY)
+        result = explorer.get_cost_and_usage(start, end, Granularity.DAILY)
+        
+        calls = explorer.client.get_cost_and_usage.call_args_list
+        self.assertEqual(len(calls), 2)
+        self.assertEqual(calls[1].kwargs['TimePeriod'], {
+            'Start': (end - timedelta(days=explorer.finalization_lag_days)).strftime('%Y-%m-%d'),
+            'End': end.strftime('%Y-%m-%d')
+        })
+        self.assertEqual(len(result['results_by_time']), 10)
+    
+    def test_long_ranges_are_fetched_in_concurrent_chunks(self):
+        """Test a 91-day daily query is split into month-sized chunks merged in order."""
+        explorer = self._explorer()
+        explorer.max_concurrent_requests = 3
+        result = explorer.get_cost_and_usage(datetime(2024, 1, 1), datetime(2024, 4, 1), Granularity.DAILY)
+        
+        self.assertEqual(explorer.client.get_cost_and_usage.call_count, 3)
+        starts = [period['time_period']['Start'] for period in result['results_by_time']]
+        self.assertEqual(len(starts), 91)
+        self.assertEqual(starts, sorted(starts))
+    
+    def test_pages_are_followed_and_groups_merged(self):
+        """Test NextPageToken is followed and groups split across pages are combined."""
+        def group(service, amount):
+            return {'Keys': [service], 'Metrics': {'UnblendedCost': {'Amount': str(amount), 'Unit': 'USD'}}}
+        
+        period = {'TimePeriod': {'Start': '2024-01-01', 'End': '2024-01-02'}, 'Total': {}, 'Estimated': False}
+        pages = [
+            {'ResultsByTime': [dict(period, Groups=[group('EC2', 1.0), group('S3', 2.0)])], 'NextPageToken': 'page-2'},
+            {'ResultsByTime': [dict(period, Groups=[group('RDS', 3.0)])], 'NextPageToken': 'page-3'},
+            {'ResultsByTime': [dict(period, Groups=[group('Lambda', 4.0)])]}
+        ]
+        explorer = self._explorer()
+        explorer.client.get_cost_and_usage.side_effect = pages
+        
+        result = explorer.get_cost_and_usage(
+            datetime(2024, 1, 1), datetime(2024, 1, 2), Granularity.DAILY,
+            group_by=[{'Type': 'DIMENSION', 'Key': 'SERVICE'}]
+        )
+        
+        calls = explorer.client.get_cost_and_usage.call_args_list
+        self.assertEqual([call.kwargs.get('NextPageToken') for call in calls], [None, 'page-2', 'page-3'])
+        self.assertEqual(len(result['results_by_time']), 1)
+        self.assertEqual([g['Keys'][0] for g in result['results_by_time'][0]['groups']],
+                         ['EC2', 'S3', 'RDS', 'Lambda'])
+
+
 if __name__ == '__main__':
     # Configure logging for tests
     import logging
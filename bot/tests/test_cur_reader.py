@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the Cost and Usage Report reader.
+
+Tests discovery of gzip CSV partitions, column projection, chunked
+streaming, string interning and the allocation, anomaly detection and
+reporting stream interfaces.
+"""
+
+import csv
+import gzip
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from unittest.mock import Mock
+
+# Add the project root to the path
+_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _root not in sys.path:
+    sys.path.insert(0, _root)
+
+from aws.cur_reader import CURReader, PYARROW_AVAILABLE, aggregate_cost_chunks
+from core.cost_allocation import CostAllocationEngine, AllocationMethod, AllocationScope
+from core.anomaly_detector import AnomalyDetector
+from core.reporting_engine import ReportingEngine, ReportType
+
+
+LEGACY_HEADER = [
+    'identity/LineItemId', 'lineItem/UsageAccountId', 'lineItem/LineItemType',
+    'lineItem/UsageStartDate', 'lineItem/ProductCode', 'lineItem/UsageType',
+    'lineItem/ResourceId', 'lineItem/UnblendedCost', 'lineItem/BlendedCost',
+    'product/region', 'product/instanceType', 'resourceTags/user:Team', 'resourceTags/user:Owner'
+]
+
+
+def _legacy_rows(day, hours=24):
+    """Hourly line items for two resources on one day."""
+    rows = []
+    for hour in range(hours):
+        timestamp = f"2024-01-{day:02d}T{hour:02d}:00:00Z"
+        rows.append([f"id-{day}-{hour}-1", '111122223333', 'Usage', timestamp, 'AmazonEC2',
+                     'BoxUsage:m5.large', 'i-0001', '0.096', '0.1', 'us-east-1', 'm5.large',
+                     'engineering', 'alice'])
+        rows.append([f"id-{day}-{hour}-2", '111122223333', 'Usage', timestamp, 'AmazonRDS',
+                     'InstanceUsage:db.r5.large', 'db-0001', '0.25', '0.3', 'us-west-2', '',
+                     '', 'bob'])
+    rows.append([f"id-{day}-tax", '111122223333', 'Tax', f"2024-01-{day:02d}T00:00:00Z", 'AmazonEC2',
+                 '', '', '1.5', '1.5', '', '', '', ''])
+    return rows
+
+
+class TestCURReader(unittest.TestCase):
+    """Test cases for CURReader."""
+
+    def setUp(self):
+        """Write a small partitioned CUR export."""
+        self.temp_dir = tempfile.mkdtemp()
+        for day in (1, 2, 3):
+            partition = os.path.join(self.temp_dir, 'year=2024', 'month=1')
+            os.makedirs(partition, exist_ok=True)
+            with gzip.open(os.path.join(partition, f'cur-{day}.csv.gz'), 'wt', newline='') as handle:
+                writer = csv.writer(handle)
+                writer.writerow(LEGACY_HEADER)
+                writer.writerows(_legacy_rows(day))
+        with open(os.path.join(self.temp_dir, 'cur-Manifest.json'), 'w') as handle:
+            handle.write('{}')
+
+    def tearDown(self):
+        """Clean up test fixtures."""
+        shutil.rmtree(self.temp_dir)
+
+    def test_streams_projected_chunks(self):
+        """Test files are discovered in order and read in bounded, projected chunks."""
+        reader = CURReader(self.temp_dir, chunk_size=10)
+        self.assertEqual([path.name for path in reader.discover_files()],
+                         ['cur-1.csv.gz', 'cur-2.csv.gz', 'cur-3.csv.gz'])
+
+        chunks = list(reader.iter_chunks())
+        self.assertTrue(all(len(chunk) <= 10 for chunk in chunks))
+        self.assertEqual(sum(len(chunk) for chunk in chunks), 3 * 49)
+        self.assertNotIn('product/instanceType', chunks[0].columns)
+        self.assertIn('tags.Team', chunks[0].columns)
+        self.assertEqual(str(chunks[0]['service'].dtype), 'category')
+        self.assertEqual(reader.get_statistics()['lineItems'], 3 * 49)
+
+        # Repeated strings are shared across chunks
+        first = chunks[0]['service'].cat.categories[0]
+        last = [value for value in chunks[-1]['service'].cat.categories if value == first][0]
+        self.assertIs(first, last)
+
+    def test_records_and_line_item_filter(self):
+        """Test record streaming nests tags and line item types can be filtered."""
+        records = list(CURReader(self.temp_dir, line_item_types=['Usage']).iter_records())
+
+        self.assertEqual(len(records), 3 * 48)
+        self.assertEqual(records[0]['tags'], {'Team': 'engineering'})
+        self.assertEqual(records[1]['tags'], {})
+        self.assertAlmostEqual(sum(record['cost'] for record in records), 3 * 24 * (0.096 + 0.25))
+
+    def test_athena_column_names(self):
+        """Test Parquet/Athena style column names are recognized."""
+        path = os.path.join(self.temp_dir, 'athena.csv')
+        with open(path, 'w', newline='') as handle:
+            writer = csv.writer(handle)
+            writer.writerow(['line_item_usage_start_date', 'line_item_product_code', 'product_region',
+                             'line_item_unblended_cost', 'resource_tags_user_cost_center'])
+            writer.writerow(['2024-01-01T00:00:00Z', 'AmazonS3', 'eu-west-1', '2.5', 'cc-42'])
+
+        record = next(CURReader(path, tag_keys=['CostCenter']).iter_records())
+        self.assertEqual(record['service'], 'AmazonS3')
+        self.assertEqual(record['region'], 'eu-west-1')
+        self.assertEqual(record['tags'], {'CostCenter': 'cc-42'})
+        self.assertIsNone(record['resource_id'])
+
+    def test_aggregate_cost_chunks(self):
+        """Test chunk streams reduce to per-period, per-group totals."""
+        chunks = CURReader(self.temp_dir, chunk_size=7, line_item_types=['Usage']).iter_chunks()
+        daily = aggregate_cost_chunks(chunks, group_by=['service'], granularity='daily')
+
+        self.assertEqual(len(daily), 6)
+        self.assertEqual(daily[0]['timestamp'], '2024-01-01T00:00:00Z')
+        self.assertEqual(daily[0]['date'], '2024-01-01')
+        self.assertAlmostEqual(daily[0]['cost'], 24 * 0.096)
+
+    def test_engines_consume_chunk_streams(self):
+        """Test allocation, anomaly detection and reporting accept chunk generators."""
+        engine = CostAllocationEngine(dry_run=True)
+        engine.create_allocation_rule(
+            rule_id="ec2-tags", name="EC2 by team", method=AllocationMethod.TAG_BASED,
+            scope=AllocationScope.TEAM, conditions={"services": ["AmazonEC2"]}
+        )
+
+        streamed = engine.allocate_cost_stream(CURReader(self.temp_dir, chunk_size=10).iter_chunks(), "2024-01")
+        expected = engine.allocate_costs(list(CURReader(self.temp_dir).iter_records()), "2024-01")
+        self.assertAlmostEqual(streamed["total_costs"], expected["total_costs"])
+        self.assertAlmostEqual(streamed["allocated_costs"], expected["allocated_costs"])
+        self.assertAlmostEqual(streamed["allocation_breakdown"]["team"]["engineering"], 3 * 24 * 0.096)
+        self.assertEqual(streamed["processing_summary"]["unallocated_records"],
+                         expected["processing_summary"]["unallocated_records"])
+
+        detector = AnomalyDetector(Mock())
+        anomalies = detector.detect_anomalies_stream(CURReader(self.temp_dir).iter_chunks())
+        self.assertIn('baseline_analysis', anomalies)
+
+        report = ReportingEngine(dry_run=True).generate_report_from_stream(
+            ReportType.COST_BREAKDOWN, "2024-01-01", "2024-01-03",
+            CURReader(self.temp_dir, chunk_size=10).iter_chunks()
+        )
+        self.assertEqual(report["data_sources"]["cost_data_points"], 3 * 3)
+
+    @unittest.skipUnless(PYARROW_AVAILABLE, "pyarrow not installed")
+    def test_parquet_partitions(self):
+        """Test Parquet partitions stream in record batches."""
+        import pandas as pd
+
+        path = os.path.join(self.temp_dir, 'part-0.parquet')
+        pd.DataFrame({
+            'line_item_usage_start_date': pd.to_datetime(['2024-01-01T00:00:00Z'] * 5),
+            'line_item_product_code': ['AmazonEC2'] * 5,
+            'line_item_unblended_cost': [1.0] * 5
+        }).to_parquet(path)
+
+        chunks = list(CURReader(path, chunk_size=2).iter_chunks())
+        self.assertEqual([len(chunk) for chunk in chunks], [2, 2, 1])
+        self.assertEqual(chunks[0]['timestamp'].iloc[0], '2024-01-01T00:00:00Z')
+
+
+if __name__ == '__main__':
+    unittest.main()
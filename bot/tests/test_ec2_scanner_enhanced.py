@@ -22,6 +22,7 @@ if _root not in sys.path:
     sys.path.insert(0, _root)
 
 from aws.scan_ec2 import EC2Scanner
+from utils.pricing_cache import PricingCache
 
 
 class TestEnhancedEC2Scanner(unittest.TestCase):
@@ -123,6 +124,34 @@ class TestEnhancedEC2Scanner(unittest.TestCase):
         self.assertEqual(us_east_cost['multiplier'], 1.0)
         self.assertEqual(us_east_cost['monthlyCost'], 60.74)
     
+    def test_regional_price_matrix_priced_once_per_type(self):
+        """Test each distinct type is priced once and the summary reads from the matrix."""
+        scanner = EC2Scanner(self.mock_aws_config, region='us-east-1', pricing_cache=PricingCache())
+        pairs = [('t3.large', 'linux')] * 50 + [('m5.xlarge', 'linux')] * 30 + [('t3.large', 'windows')]
+        
+        with patch.object(scanner, '_estimate_instance_cost', wraps=scanner._estimate_instance_cost) as estimate:
+            scanner._build_regional_price_matrix(pairs)
+            scanner._get_regional_cost_comparison('t3.large', 'linux')
+            self.assertEqual(estimate.call_count, 3)
+        
+        self.assertEqual(scanner._regional_price_matrix.shape, (10, 3))
+        
+        instances = [
+            {'resourceId': f'i-{index}', 'instanceType': instance_type, 'platform': platform,
+             'currentCost': scanner._estimate_instance_cost(instance_type, platform), 'regionalComparison': {}}
+            for index, (instance_type, platform) in enumerate(pairs)
+        ]
+        summary = scanner._generate_regional_cost_summary(instances)
+        
+        expected_savings = sum(
+            scanner._get_comprehensive_cost_analysis(instance['instanceType'], instance['platform'])
+            ['cheapestRegion']['potentialSavings']
+            for instance in instances
+        )
+        self.assertAlmostEqual(summary['totalPotentialSavings'], expected_savings, places=6)
+        self.assertEqual(list(summary['recommendedRegions']), ['us-east-2'])
+        self.assertEqual(summary['recommendedRegions']['us-east-2']['instanceCount'], 81)
+    
     def test_intelligent_instance_recommendation(self):
         """Test intelligent instance type recommendations."""
         # Test downsizing recommendation (low utilization)
@@ -10,10 +10,12 @@ Tests the comprehensive optimization execution engine including:
 - Execution scheduling capabilities
 """
 
+import os
+import tempfile
 import unittest
 import json
 import uuid
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from unittest.mock import Mock, patch, MagicMock
 
 # Import the execution engine
@@ -26,6 +28,7 @@ from core.execution_engine import (
     create_execution_engine,
     execute_single_optimization
 )
+from utils.schedule_queue import ScheduleQueue
 
 
 class TestOptimizationExecutionEngine(unittest.TestCase):
@@ -212,7 +215,7 @@ class TestOptimizationExecutionEngine(unittest.TestCase):
         self.assertEqual(len(self.engine.execution_queue), 1)
         
         # Verify scheduled item
-        scheduled_item = self.engine.execution_queue[0]
+        scheduled_item = self.engine.execution_queue.peek()
         self.assertEqual(scheduled_item['priority'], ExecutionPriority.HIGH.value)
         self.assertEqual(scheduled_item['resource_id'], 'i-1234567890abcdef0')
     
@@ -252,6 +255,39 @@ class TestOptimizationExecutionEngine(unittest.TestCase):
         self.assertEqual(cancel_result['schedule_id'], schedule_id)
         self.assertEqual(len(self.engine.execution_queue), 0)
     
+    def test_schedule_heap_order_and_persistence(self):
+        """Test due items pop in time/priority order and the queue survives restarts."""
+        with tempfile.TemporaryDirectory() as state_dir:
+            state_path = os.path.join(state_dir, 'schedule.db')
+            engine = OptimizationExecutionEngine(dry_run=True, schedule_state_path=state_path)
+            now = datetime.utcnow()
+            
+            later = engine.schedule_optimization(self.sample_optimization, now + timedelta(hours=3))
+            low = engine.schedule_optimization(self.sample_optimization, now - timedelta(minutes=5),
+                                               ExecutionPriority.LOW)
+            critical = engine.schedule_optimization(self.sample_optimization, now - timedelta(minutes=5),
+                                                    ExecutionPriority.CRITICAL)
+            cancelled = engine.schedule_optimization(self.sample_optimization, now + timedelta(hours=1))
+            self.assertTrue(engine.cancel_scheduled_optimization(cancelled['schedule_id'])['success'])
+            self.assertFalse(engine.cancel_scheduled_optimization(cancelled['schedule_id'])['success'])
+            
+            # A restarted engine sees the same queue
+            restarted = OptimizationExecutionEngine(dry_run=True, schedule_state_path=state_path)
+            self.assertEqual(len(restarted.execution_queue), 3)
+            
+            result = restarted.process_scheduled_optimizations()
+            self.assertEqual([r['schedule_id'] for r in result['execution_results']],
+                             [critical['schedule_id'], low['schedule_id']])
+            self.assertEqual(result['next_scheduled'], later['scheduled_time'])
+            
+            wake_time = restarted.get_next_wake_time()
+            self.assertAlmostEqual(
+                wake_time.timestamp(),
+                datetime.fromisoformat(later['scheduled_time']).replace(tzinfo=timezone.utc).timestamp()
+            )
+            self.assertEqual(len(OptimizationExecutionEngine(
+                dry_run=True, schedule_state_path=state_path).execution_queue), 1)
+    
     def test_execution_status_retrieval(self):
         """Test retrieval of execution status."""
         result = self.engine.execute_optimization(self.sample_optimization)
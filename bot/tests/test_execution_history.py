@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the execution history store.
+
+Tests indexed queries, incrementally maintained aggregates, retention
+cleanup, persistence and the execution engine's use of the store.
+"""
+
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+import unittest
+from datetime import datetime, timedelta
+
+# Add the project root to the path
+_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _root not in sys.path:
+    sys.path.insert(0, _root)
+
+from utils.execution_history import ExecutionHistoryStore
+from core.execution_engine import OptimizationExecutionEngine, ExecutionStatus
+
+
+def _record(index, resource_id, status='COMPLETED', savings=10.0, seconds=2.0, minutes_ago=0):
+    completed_at = (datetime(2026, 1, 1) - timedelta(minutes=minutes_ago)).isoformat()
+    return {
+        'execution_id': f'exec-{index}',
+        'optimization_id': f'opt-{index}',
+        'resource_id': resource_id,
+        'status': status,
+        'started_at': completed_at,
+        'completed_at': completed_at,
+        'execution_time_seconds': seconds,
+        'actual_savings': savings if status == 'COMPLETED' else None,
+        'estimated_savings': savings
+    }
+
+
+class TestExecutionHistoryStore(unittest.TestCase):
+    """Test cases for ExecutionHistoryStore."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.store = ExecutionHistoryStore()
+        self.store.add(_record(1, 'i-aaa', minutes_ago=30))
+        self.store.add(_record(2, 'i-bbb', 'FAILED', minutes_ago=20))
+        self.store.add(_record(3, 'i-aaa', minutes_ago=10))
+        self.store.add(_record(4, 'db-1', 'ROLLED_BACK', minutes_ago=5))
+
+    def test_filtered_queries_newest_first(self):
+        """Test status, exact, prefix and substring resource filters return newest records first."""
+        self.assertEqual([r['execution_id'] for r in self.store.query()], ['exec-4', 'exec-3', 'exec-2', 'exec-1'])
+        self.assertEqual([r['execution_id'] for r in self.store.query(resource_id='i-aaa')], ['exec-3', 'exec-1'])
+        self.assertEqual(len(self.store.query(resource_id='i-', resource_match='prefix')), 3)
+        self.assertEqual(len(self.store.query(resource_id='-a', resource_match='prefix')), 0)
+        self.assertEqual([r['execution_id'] for r in self.store.query(resource_id='aa', resource_match='substring')],
+                         ['exec-3', 'exec-1'])
+        self.assertEqual([r['execution_id'] for r in self.store.query(status='FAILED')], ['exec-2'])
+        self.assertEqual(len(self.store.query(limit=2)), 2)
+        self.assertEqual(self.store.get('exec-2')['resource_id'], 'i-bbb')
+
+    def test_aggregates_follow_inserts_replacements_and_deletes(self):
+        """Test aggregates are adjusted incrementally rather than recomputed."""
+        aggregates = self.store.get_aggregates()
+        self.assertEqual(aggregates['total_records'], 4)
+        self.assertEqual(aggregates['status_counts'], {'COMPLETED': 2, 'FAILED': 1, 'ROLLED_BACK': 1})
+        self.assertAlmostEqual(aggregates['total_actual_savings'], 20.0)
+        self.assertAlmostEqual(aggregates['average_execution_time'], 2.0)
+
+        self.store.add(_record(2, 'i-bbb', 'COMPLETED', savings=5.0, seconds=6.0, minutes_ago=20))
+        aggregates = self.store.get_aggregates()
+        self.assertEqual(aggregates['status_counts'], {'COMPLETED': 3, 'ROLLED_BACK': 1})
+        self.assertAlmostEqual(aggregates['total_actual_savings'], 25.0)
+        self.assertAlmostEqual(aggregates['average_execution_time'], 3.0)
+
+        cutoff = (datetime(2026, 1, 1) - timedelta(minutes=15)).isoformat()
+        self.assertEqual(self.store.delete_completed_before(cutoff), 2)
+        self.assertEqual(len(self.store), 2)
+        self.assertEqual(self.store.get_aggregates()['status_counts'], {'COMPLETED': 1, 'ROLLED_BACK': 1})
+
+    def test_failed_write_leaves_aggregates_unchanged(self):
+        """Test a rolled back transaction does not change the cached or stored aggregates."""
+        before = self.store.get_aggregates()
+        self.store._connection.execute(
+            "CREATE TRIGGER reject_write BEFORE INSERT ON execution_history "
+            "WHEN NEW.execution_id = 'exec-2' BEGIN SELECT RAISE(ABORT, 'rejected'); END"
+        )
+
+        with self.assertRaises(sqlite3.IntegrityError):
+            self.store.add(_record(2, 'i-bbb', 'COMPLETED', savings=5.0, minutes_ago=20))
+
+        self.assertEqual(self.store.get_aggregates(), before)
+        self.assertEqual(self.store.get('exec-2')['status'], 'FAILED')
+        stored = dict(self.store._connection.execute('SELECT status, count FROM execution_aggregates'))
+        self.assertEqual(stored, before['status_counts'])
+
+    def test_record_cap_drops_oldest(self):
+        """Test the record cap keeps the most recently completed executions and their aggregates."""
+        store = ExecutionHistoryStore(max_records=3)
+        unbounded = ExecutionHistoryStore(max_records=None)
+        for index, minutes_ago in enumerate([50, 40, 30, 20, 10]):
+            record = _record(index, f'i-{index}', 'FAILED' if index == 0 else 'COMPLETED', minutes_ago=minutes_ago)
+            store.add(record)
+            unbounded.add(record)
+
+        self.assertEqual(len(store), 3)
+        self.assertEqual([r['execution_id'] for r in store.query()], ['exec-4', 'exec-3', 'exec-2'])
+        self.assertEqual(store.get_aggregates()['status_counts'], {'COMPLETED': 3})
+        self.assertEqual(len(unbounded), 5)
+
+    def test_persistence_and_indexed_plans(self):
+        """Test history and aggregates survive a reopen and queries use the indexes."""
+        with tempfile.TemporaryDirectory() as state_dir:
+            db_path = os.path.join(state_dir, 'history', 'executions.db')
+            store = ExecutionHistoryStore(db_path)
+            for index in range(20000):
+                store.add(_record(index, f'i-{index % 500}', 'FAILED' if index % 10 == 0 else 'COMPLETED',
+                                  minutes_ago=index))
+            store.close()
+
+            reopened = ExecutionHistoryStore(db_path)
+            self.assertEqual(len(reopened), 20000)
+            self.assertEqual(reopened.get_aggregates()['status_counts']['FAILED'], 2000)
+
+            started = time.time()
+            for _ in range(100):
+                latest = reopened.query(limit=5, resource_id='i-42')
+                failed = reopened.query(limit=5, status='FAILED')
+            self.assertLess(time.time() - started, 2)
+            self.assertEqual([r['execution_id'] for r in latest], [f'exec-{i}' for i in (42, 542, 1042, 1542, 2042)])
+            self.assertEqual(failed[0]['execution_id'], 'exec-0')
+
+            plans = {
+                ' '.join(str(row[-1]) for row in reopened._connection.execute(
+                    f'EXPLAIN QUERY PLAN SELECT record FROM execution_history WHERE {condition} '
+                    'ORDER BY completed_at DESC LIMIT 5', parameters
+                ))
+                for condition, parameters in (('resource_id = ?', ('i-42',)), ('status = ?', ('FAILED',)),
+                                              ('1 = 1', ()))
+            }
+            self.assertTrue(all('USING INDEX' in plan and 'TEMP B-TREE' not in plan for plan in plans))
+            reopened.close()
+
+
+class TestEngineHistory(unittest.TestCase):
+    """Test the execution engine reads history through the store."""
+
+    def test_history_and_status_served_from_store(self):
+        """Test filtered history, metrics and status lookups for records no longer in memory."""
+        engine = OptimizationExecutionEngine(dry_run=True)
+        for index, resource_id in enumerate(['i-1', 'i-2', 'i-1']):
+            engine.execution_history.add(_record(index, resource_id, minutes_ago=index))
+
+        self.assertEqual(len(engine.get_execution_history(resource_filter='i-1')), 2)
+        self.assertEqual(len(engine.get_execution_history(status_filter=ExecutionStatus.FAILED)), 0)
+        self.assertEqual(engine.get_performance_metrics()['history_summary']['total_records'], 3)
+
+        status = engine.get_execution_status('exec-1')
+        self.assertTrue(status['success'])
+        self.assertFalse(status['is_active'])
+        self.assertEqual(status['execution']['resource_id'], 'i-2')
+
+        cleanup = engine.cleanup_completed_executions(retention_days=1)
+        self.assertEqual(cleanup['cleaned_up_count'], 3)
+        self.assertEqual(len(engine.execution_history), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
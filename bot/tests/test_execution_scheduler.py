@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the execution scheduler.
+
+Tests rate-derived service budgets, the global worker cap, per-resource
+exclusivity and the execution engine's resource lock index.
+"""
+
+import os
+import sys
+import threading
+import time
+import unittest
+from collections import Counter
+
+# Add the project root to the path
+_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _root not in sys.path:
+    sys.path.insert(0, _root)
+
+from utils.aws_config import RateLimiter
+from utils.execution_scheduler import ExecutionScheduler, ResourceLockIndex, execution_lane
+from core.execution_engine import OptimizationExecutionEngine
+
+
+class _ConcurrencyProbe:
+    """Worker recording peak concurrency overall, per service, per lane and per resource."""
+
+    def __init__(self, delay: float = 0.02):
+        self.delay = delay
+        self.lock = threading.Lock()
+        self.running = Counter()
+        self.peaks = Counter()
+
+    def __call__(self, item):
+        resource_id, service, region = execution_lane(item)
+        keys = ('total', f'service:{service}', f'{service}:{region}', f'resource:{resource_id}')
+        with self.lock:
+            for key in keys:
+                self.running[key] += 1
+                self.peaks[key] = max(self.peaks[key], self.running[key])
+        time.sleep(self.delay)
+        with self.lock:
+            for key in keys:
+                self.running[key] -= 1
+        if item.get('fail'):
+            raise RuntimeError(f"failed {resource_id}")
+        return item['resourceId']
+
+
+def _optimization(resource_id, resource_type='ec2', region='us-east-1', **extra):
+    return dict({'resourceId': resource_id, 'resourceType': resource_type,
+                 'resourceData': {'region': region}}, **extra)
+
+
+class TestExecutionScheduler(unittest.TestCase):
+    """Test cases for ExecutionScheduler."""
+
+    def test_service_budget_follows_rate_limits(self):
+        """Test budgets come from service rate limits and shrink while throttled."""
+        rate_limiter = RateLimiter()
+        scheduler = ExecutionScheduler(max_workers=16, rate_limiter=rate_limiter, calls_per_execution=5)
+
+        self.assertEqual(scheduler.service_budget('ec2'), 16)
+        self.assertEqual(scheduler.service_budget('rds'), 10)
+        self.assertEqual(scheduler.service_budget('budgets'), 2)
+
+        rate_limiter.handle_throttle('rds')
+        rate_limiter.handle_throttle('rds')
+        self.assertEqual(scheduler.service_budget('rds'), 2)
+        rate_limiter.reset_throttle('rds')
+        self.assertEqual(scheduler.service_budget('rds'), 10)
+
+    def test_caps_and_resource_exclusivity(self):
+        """Test the worker cap, service budgets and one execution per resource hold together."""
+        items = [_optimization(f'i-{index % 3}') for index in range(40)]
+        items += [_optimization(f'db-{index}', 'rds', 'eu-west-1') for index in range(20)]
+        probe = _ConcurrencyProbe()
+        scheduler = ExecutionScheduler(max_workers=8, calls_per_execution=25)
+
+        results = scheduler.run(items, probe, execution_lane)
+
+        self.assertEqual(results, [item['resourceId'] for item in items])
+        self.assertLessEqual(probe.peaks['total'], 8)
+        self.assertLessEqual(probe.peaks['ec2:us-east-1'], 4)
+        self.assertLessEqual(probe.peaks['rds:eu-west-1'], 2)
+        self.assertTrue(all(peak == 1 for key, peak in probe.peaks.items() if key.startswith('resource:')))
+
+        statistics = scheduler.get_statistics()
+        self.assertEqual(statistics['dispatched'], 60)
+        self.assertGreater(statistics['resourceWaits'], 0)
+        self.assertEqual(statistics['serviceBudgets'], {'ec2': 4, 'rds': 2})
+
+    def test_regions_share_service_budget(self):
+        """Test lanes of one service in several regions stay within the single service budget."""
+        regions = ('us-east-1', 'eu-west-1', 'ap-southeast-2')
+        items = [_optimization(f'i-{index}', region=regions[index % 3]) for index in range(30)]
+        probe = _ConcurrencyProbe()
+        scheduler = ExecutionScheduler(max_workers=16, calls_per_execution=25)
+
+        scheduler.run(items, probe, execution_lane)
+
+        self.assertLessEqual(probe.peaks['service:ec2'], 4)
+        self.assertTrue(all(probe.peaks[f'ec2:{region}'] >= 1 for region in regions))
+
+    def test_errors_use_error_handler(self):
+        """Test worker exceptions become results through the error handler."""
+        items = [_optimization('i-1'), _optimization('i-2', fail=True)]
+        results = ExecutionScheduler(max_workers=2).run(
+            items, _ConcurrencyProbe(0), execution_lane,
+            error_handler=lambda item, error: {'error': str(error)}
+        )
+        self.assertEqual(results, ['i-1', {'error': 'failed i-2'}])
+
+
+class TestResourceLocks(unittest.TestCase):
+    """Test the resource lock index and its use by the execution engine."""
+
+    def test_lock_index(self):
+        """Test a resource has one holder until that holder releases it."""
+        locks = ResourceLockIndex()
+        self.assertTrue(locks.acquire('i-1', 'exec-a'))
+        self.assertFalse(locks.acquire('i-1', 'exec-b'))
+        self.assertFalse(locks.release('i-1', 'exec-b'))
+        self.assertEqual(locks.holder('i-1'), 'exec-a')
+        self.assertTrue(locks.release('i-1', 'exec-a'))
+        self.assertTrue(locks.acquire('i-1', 'exec-b'))
+
+    def test_engine_conflict_check_uses_lock_index(self):
+        """Test the engine reports conflicts from the lock index."""
+        engine = OptimizationExecutionEngine(dry_run=True)
+        self.assertTrue(engine._check_conflicting_operations('i-1')['passed'])
+
+        engine.resource_locks.acquire('i-1', 'exec-a')
+        conflict_check = engine._check_conflicting_operations('i-1')
+        self.assertFalse(conflict_check['passed'])
+        self.assertIn('exec-a', conflict_check['message'])
+
+
+if __name__ == '__main__':
+    unittest.main()
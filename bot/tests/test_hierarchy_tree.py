@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the shared hierarchy tree.
+
+Tests ancestor paths, single-pass rollups, incremental updates and the
+cost allocation and budget manager rollups built on the tree.
+"""
+
+import os
+import sys
+import time
+import unittest
+
+# Add the project root to the path
+_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _root not in sys.path:
+    sys.path.insert(0, _root)
+
+from utils.hierarchy_tree import HierarchyTree, build_hierarchy_tree
+from core.budget_manager import BudgetManager, BudgetType
+from core.cost_allocation import CostAllocationEngine
+
+
+class TestHierarchyTree(unittest.TestCase):
+    """Test cases for HierarchyTree."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.tree = HierarchyTree.from_nested({
+            'acme': {
+                'engineering': {'web-team': ['storefront', 'checkout'], 'mobile-team': ['ios']},
+                'data': ['analytics-team']
+            }
+        })
+
+    def test_levels_and_paths(self):
+        """Test levels come from depth and paths run root to node."""
+        self.assertEqual(self.tree.level('acme'), 'organization')
+        self.assertEqual(self.tree.level('data'), 'business_unit')
+        self.assertEqual(self.tree.level('web-team'), 'team')
+        self.assertEqual(self.tree.level('checkout'), 'project')
+        self.assertEqual(self.tree.path('checkout'), ['acme', 'acme/engineering', 'acme/engineering/web-team',
+                                                      'acme/engineering/web-team/checkout'])
+        self.assertEqual(self.tree.name_path('checkout'), ['acme', 'engineering', 'web-team', 'checkout'])
+        self.assertEqual(self.tree.children('engineering'), ['acme/engineering/web-team', 'acme/engineering/mobile-team'])
+        self.assertEqual([self.tree.name(node) for node in self.tree.nodes('project')], ['storefront', 'checkout', 'ios'])
+
+    def test_rollup_and_incremental_update(self):
+        """Test totals roll up in one pass and a leaf change only moves its ancestors."""
+        unknown = self.tree.set_values({'storefront': 10.0, 'checkout': 5.0, 'ios': 2.0,
+                                        'analytics-team': 7.0, 'engineering': 1.0, 'other': 3.0})
+        self.assertEqual(unknown, ['other'])
+        self.assertEqual(self.tree.total('web-team'), 15.0)
+        self.assertEqual(self.tree.total('engineering'), 18.0)
+        self.assertEqual(self.tree.total('acme'), 25.0)
+
+        self.tree.set_value('checkout', 9.0)
+        self.assertEqual(self.tree.total('web-team'), 19.0)
+        self.assertEqual(self.tree.total('acme'), 29.0)
+        self.assertEqual(self.tree.total('data'), 7.0)
+        self.assertEqual(self.tree.rollup(level='team'),
+                         {'acme/engineering/web-team': 19.0, 'acme/engineering/mobile-team': 2.0,
+                          'acme/data/analytics-team': 7.0})
+
+    def test_invalid_nodes(self):
+        """Test duplicate nodes and unknown parents are rejected."""
+        with self.assertRaises(ValueError):
+            self.tree.add_node('acme/engineering/mobile-team/ios', 'mobile-team')
+        with self.assertRaises(ValueError):
+            self.tree.add_node('android', 'missing-team')
+
+    def test_move_and_remove_nodes(self):
+        """Test moved subtrees take their values and levels along and removed nodes hand children up."""
+        self.tree.set_values({'storefront': 10.0, 'checkout': 5.0, 'ios': 2.0, 'analytics-team': 7.0})
+        self.assertEqual(self.tree.total('engineering'), 17.0)
+
+        self.tree.move_node('web-team', 'data')
+        self.assertEqual(self.tree.parent('web-team'), 'acme/data')
+        self.assertEqual(self.tree.total('engineering'), 2.0)
+        self.assertEqual(self.tree.total('data'), 22.0)
+        self.assertEqual(self.tree.total('acme'), 24.0)
+
+        # A node added later becomes the parent of an earlier one
+        self.tree.add_node('platform', None, name='platform')
+        self.tree.move_node('acme', 'platform')
+        self.assertEqual(self.tree.level('acme'), 'business_unit')
+        self.assertEqual(self.tree.level('checkout'), 'level_4')
+        self.assertEqual(self.tree.total('platform'), 24.0)
+        with self.assertRaises(ValueError):
+            self.tree.move_node('platform', 'checkout')
+
+        self.tree.remove_node('data')
+        self.assertEqual(self.tree.parent('web-team'), 'acme')
+        self.assertNotIn('acme/data', self.tree)
+        self.assertEqual(self.tree.total('acme'), 24.0)
+        self.tree.add_value('ios', 1.0)
+        self.assertEqual(self.tree.total('platform'), 25.0)
+
+    def test_duplicate_names_keyed_by_path(self):
+        """Test the same name under different parents, or matching the root, gives distinct nodes."""
+        tree = build_hierarchy_tree({
+            'organization': 'acme',
+            'business_units': {'eng': ['platform'], 'ops': ['platform'], 'acme': ['core']}
+        })
+        self.assertEqual(tree.find('platform'), ['acme/eng/platform', 'acme/ops/platform'])
+        self.assertEqual(tree.level('acme/acme'), 'business_unit')
+        self.assertEqual(tree.name('acme/ops/platform'), 'platform')
+
+        unknown = tree.set_values({'acme/eng/platform': 4.0, 'acme/ops/platform': 6.0, 'platform': 1.0, 'core': 2.0})
+        self.assertEqual(unknown, ['platform'])
+        self.assertEqual(tree.total('eng'), 4.0)
+        self.assertEqual(tree.total('acme/acme'), 2.0)
+        self.assertEqual(tree.total('acme'), 12.0)
+        with self.assertRaises(ValueError):
+            tree.total('platform')
+
+    def test_large_tree_rollup(self):
+        """Test 100,000 nodes roll up in one pass and update in O(depth)."""
+        tree = build_hierarchy_tree({
+            'organization': 'acme',
+            'business_units': {
+                f'bu-{unit}': {f'team-{unit}-{team}': [f'project-{unit}-{team}-{project}' for project in range(99)]
+                               for team in range(10)}
+                for unit in range(100)
+            }
+        })
+        self.assertEqual(len(tree), 1 + 100 + 1000 + 99000)
+
+        started = time.time()
+        tree.set_values({node_id: 1.0 for node_id in tree.nodes('project')})
+        self.assertLess(time.time() - started, 5)
+        self.assertEqual(tree.total('acme'), 99000.0)
+
+        tree.add_value('acme/bu-3/team-3-4/project-3-4-5', 2.0)
+        self.assertEqual(tree.total('team-3-4'), 101.0)
+        self.assertEqual(tree.total('acme'), 99002.0)
+
+
+class TestHierarchyRollups(unittest.TestCase):
+    """Test cost allocation and budget rollups built on the tree."""
+
+    def test_cost_allocation_rollup_follows_tree(self):
+        """Test team and project allocations roll up to business units and the organization."""
+        engine = CostAllocationEngine(dry_run=True)
+        engine.setup_hierarchical_structure({
+            'organization': 'acme',
+            'levels': ['organization', 'business_unit', 'team', 'project'],
+            'business_units': {'engineering': {'web-team': ['storefront']}, 'data': ['analytics-team']}
+        })
+
+        rollup = engine._generate_hierarchical_rollup({
+            'team': {'web-team': 40.0, 'analytics-team': 25.0},
+            'project': {'storefront': 10.0}
+        })
+        tree_rollup = rollup['hierarchy_rollup']
+        self.assertEqual(rollup['team']['total'], 65.0)
+        self.assertEqual(tree_rollup['acme/engineering/web-team']['total'], 50.0)
+        self.assertEqual(tree_rollup['acme/engineering']['total'], 50.0)
+        self.assertEqual(tree_rollup['acme']['total'], 75.0)
+        self.assertEqual(tree_rollup['acme/engineering/web-team/storefront']['rollup_path'],
+                         ['acme', 'engineering', 'web-team', 'storefront'])
+        self.assertEqual(engine._get_rollup_path('web-team'), ['acme', 'engineering', 'web-team'])
+
+    def test_cost_allocation_duplicate_team_names(self):
+        """Test teams sharing a name across business units roll up separately by path."""
+        engine = CostAllocationEngine(dry_run=True)
+        result = engine.setup_hierarchical_structure({
+            'organization': 'acme',
+            'levels': ['organization', 'business_unit', 'team'],
+            'business_units': {'eng': ['platform'], 'ops': ['platform'], 'acme': ['web']}
+        })
+        self.assertTrue(result['validation']['is_valid'])
+        self.assertEqual(result['tree_nodes'], 7)
+
+        rollup = engine._generate_hierarchical_rollup({
+            'team': {'acme/eng/platform': 30.0, 'acme/ops/platform': 20.0, 'web': 5.0, 'platform': 1.0}
+        })
+        tree_rollup = rollup['hierarchy_rollup']
+        self.assertEqual(tree_rollup['acme/eng']['total'], 30.0)
+        self.assertEqual(tree_rollup['acme/ops/platform']['name'], 'platform')
+        self.assertEqual(tree_rollup['acme/acme']['total'], 5.0)
+        self.assertEqual(tree_rollup['acme']['total'], 55.0)
+        self.assertEqual(rollup['ambiguous_targets'], {'platform': ['acme/eng/platform', 'acme/ops/platform']})
+
+        other_period = engine._generate_hierarchical_rollup({'team': {'web': 5.0}})
+        merged = engine._merge_hierarchical_rollups([rollup, other_period, rollup])
+        self.assertEqual(merged['ambiguous_targets'], {'platform': ['acme/eng/platform', 'acme/ops/platform']})
+        self.assertEqual(merged['hierarchy_rollup']['acme/acme']['total'], 15.0)
+
+    def test_budget_spend_rolls_up(self):
+        """Test tracked spend rolls up to parent budgets and updates incrementally."""
+        manager = BudgetManager(dry_run=True)
+        manager.create_hierarchical_budget('org', BudgetType.ORGANIZATION, None, 1000.0)
+        manager.create_hierarchical_budget('team-a', BudgetType.TEAM, 'org', 600.0)
+        manager.create_hierarchical_budget('project-x', BudgetType.PROJECT, 'team-a', 700.0)
+
+        manager.track_budget_performance('project-x', [{'amount': 100.0}])
+        manager.track_budget_performance('team-a', [{'amount': 50.0}])
+        rollup = manager.get_hierarchy_rollup()
+        self.assertEqual(rollup['org']['rolled_up_spend'], 150.0)
+        self.assertEqual(rollup['team-a']['rolled_up_spend'], 150.0)
+        self.assertTrue(rollup['team-a']['over_allocated'])
+        self.assertEqual(rollup['project-x']['budget_type'], 'project')
+
+        manager.track_budget_performance('project-x', [{'amount': 300.0}])
+        rollup = manager.get_hierarchy_rollup('team-a')
+        self.assertEqual(set(rollup), {'team-a', 'project-x'})
+        self.assertEqual(rollup['team-a']['rolled_up_spend'], 350.0)
+        self.assertEqual(manager.get_hierarchy_rollup()['org']['rolled_up_spend'], 350.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
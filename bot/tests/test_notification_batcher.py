@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+Unit tests for digest notifications.
+
+Tests per-recipient coalescing within a window, digest rendering, the
+bounded background sender and the approval workflow system's batched
+stakeholder notifications.
+"""
+
+import os
+import sys
+import threading
+import time
+import unittest
+from collections import defaultdict
+
+# Add the project root to the path
+_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _root not in sys.path:
+    sys.path.insert(0, _root)
+
+from utils.notification_batcher import NotificationBatcher, render_digest
+from core.approval_workflow import ApprovalWorkflow, create_approval_workflow
+
+
+class _Outbox:
+    """Records sent messages per recipient."""
+
+    def __init__(self, fail_for=()):
+        self.lock = threading.Lock()
+        self.sent = defaultdict(list)
+        self.fail_for = set(fail_for)
+
+    def __call__(self, recipient, subject, body):
+        if recipient in self.fail_for:
+            raise RuntimeError('mail server unavailable')
+        with self.lock:
+            self.sent[recipient].append({'subject': subject, 'body': body})
+
+
+def _event(index):
+    return {'subject': f'Subject {index}', 'body': f'Body {index}'}
+
+
+class TestNotificationBatcher(unittest.TestCase):
+    """Test cases for NotificationBatcher."""
+
+    def test_one_digest_per_recipient_per_window(self):
+        """Test events within a window are coalesced and later events open a new window."""
+        outbox = _Outbox()
+        batcher = NotificationBatcher(outbox, window_seconds=0.2)
+        for index in range(5):
+            batcher.add('team@company.com', _event(index))
+        batcher.add('cfo@company.com', _event(9))
+
+        time.sleep(0.05)
+        self.assertEqual(len(outbox.sent), 0)
+        self.assertTrue(batcher.flush(timeout=5))
+
+        self.assertEqual(len(outbox.sent['team@company.com']), 1)
+        digest = outbox.sent['team@company.com'][0]
+        self.assertEqual(digest['subject'], 'FinOps Notification Digest: 5 workflow updates')
+        self.assertTrue(all(f'Subject {i}\nBody {i}' in digest['body'] for i in range(5)))
+        self.assertEqual(outbox.sent['cfo@company.com'], [_event(9)])
+
+        batcher.add('team@company.com', _event(10))
+        deadline = time.time() + 5
+        while len(outbox.sent['team@company.com']) < 2 and time.time() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(outbox.sent['team@company.com'][1], _event(10))
+
+        statistics = batcher.get_statistics()
+        self.assertEqual(statistics['eventsQueued'], 7)
+        self.assertEqual(statistics['digestsSent'], 3)
+        batcher.close(timeout=5)
+
+    def test_send_failures_are_counted(self):
+        """Test a failing recipient does not block delivery to the others."""
+        outbox = _Outbox(fail_for={'down@company.com'})
+        batcher = NotificationBatcher(outbox, window_seconds=10, max_pending_digests=1, workers=2)
+        for recipient in ('down@company.com', 'a@company.com', 'b@company.com'):
+            batcher.add(recipient, _event(1))
+
+        self.assertTrue(batcher.flush(timeout=5))
+        self.assertEqual(sorted(outbox.sent), ['a@company.com', 'b@company.com'])
+        self.assertEqual(batcher.get_statistics()['sendFailures'], 1)
+        batcher.close(timeout=5)
+
+    def test_single_event_digest_is_unchanged(self):
+        """Test a window with one event sends that event's message as rendered."""
+        self.assertEqual(render_digest([_event(1)]), _event(1))
+
+
+class TestApprovalWorkflowDigests(unittest.TestCase):
+    """Test batched stakeholder notifications in the approval workflow system."""
+
+    def test_bulk_escalation_sends_one_digest_per_stakeholder(self):
+        """Test workflows escalated together notify each stakeholder once with every event's content."""
+        workflow_system = ApprovalWorkflow(dry_run=False, notification_window_seconds=30)
+        outbox = _Outbox()
+        workflow_system.notification_batcher.send_func = outbox
+
+        workflows = []
+        for index in range(10):
+            optimization = {
+                'optimizationId': f'opt-{index}',
+                'resourceId': f'i-{index:04d}',
+                'resourceType': 'ec2',
+                'optimizationType': 'rightsizing',
+                'estimatedSavings': 12000.0,
+                'riskLevel': 'MEDIUM',
+                'resourceData': {'tags': {'Environment': 'development'}}
+            }
+            workflow = workflow_system.create_workflow(optimization, requester='engineer@company.com')
+            workflow_system.escalate_workflow(workflow['workflow_id'], 'Quarter-end review', 'manager@company.com')
+            workflows.append(workflow)
+
+        self.assertEqual(workflows[0]['notifications'][-1]['sent_count'], 0)
+        self.assertTrue(workflows[0]['notifications'][-1]['batched'])
+        self.assertEqual(len(outbox.sent), 0)
+
+        self.assertTrue(workflow_system.flush_notifications(timeout=5)['success'])
+        recipients = workflow_system._get_notification_recipients(workflows[0], 'escalated')
+        self.assertEqual(sorted(outbox.sent), sorted(recipients))
+        for recipient in recipients:
+            self.assertEqual(len(outbox.sent[recipient]), 1)
+
+        expected = workflow_system._generate_notification_content(workflows[3], 'escalated')
+        digest = outbox.sent['engineer@company.com'][0]
+        self.assertIn(expected['subject'], digest['body'])
+        self.assertIn(expected['body'], digest['body'])
+        workflow_system.notification_batcher.close(timeout=5)
+
+    def test_close_delivers_pending_digests(self):
+        """Test closing a factory-built workflow system sends digests still inside their window."""
+        workflow_system = create_approval_workflow(dry_run=False, notification_window_seconds=300)
+        batcher = workflow_system.notification_batcher
+        outbox = _Outbox()
+        batcher.send_func = outbox
+
+        optimization = {
+            'optimizationId': 'opt-close',
+            'resourceId': 'i-close',
+            'resourceType': 'ec2',
+            'optimizationType': 'rightsizing',
+            'estimatedSavings': 12000.0,
+            'riskLevel': 'MEDIUM',
+            'resourceData': {'tags': {'Environment': 'development'}}
+        }
+        workflow = workflow_system.create_workflow(optimization, requester='engineer@company.com')
+        workflow_system.escalate_workflow(workflow['workflow_id'], 'Quarter-end review', 'manager@company.com')
+        self.assertEqual(len(outbox.sent), 0)
+
+        workflow_system.close(timeout=5)
+        self.assertIn('engineer@company.com', outbox.sent)
+        self.assertIsNone(workflow_system.notification_batcher)
+        self.assertFalse(any(worker.is_alive() for worker in batcher._workers))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the offline AWS Price Catalog.
+
+Tests ingestion of bulk Price List offer files, indexed rate lookups,
+incremental offer version refreshes and scanner integration.
+"""
+
+import csv
+import gzip
+import json
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from unittest.mock import Mock
+
+# Add the project root to the path
+_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _root not in sys.path:
+    sys.path.insert(0, _root)
+
+from aws.price_catalog import PriceCatalog
+from aws.pricing_client import PricingClient, PricingModel
+from utils.pricing_cache import PricingCache
+from aws.scan_ec2 import EC2Scanner
+from aws.scan_ebs import EBSScanner
+from aws.scan_rds import RDSScanner
+
+
+CSV_HEADER = [
+    'SKU', 'OfferTermCode', 'RateCode', 'TermType', 'PriceDescription', 'Unit', 'PricePerUnit',
+    'Currency', 'LeaseContractLength', 'PurchaseOption', 'OfferingClass', 'serviceCode',
+    'Location', 'Instance Type', 'Tenancy', 'Operating System', 'CapacityStatus',
+    'Pre Installed S/W', 'Region Code', 'Volume API Name'
+]
+
+
+def _csv_rows(m5_price='0.096'):
+    """Build bulk CSV rows for a small EC2 offer."""
+    return [
+        ['SKU1', 'JRTCKXETXF', 'SKU1.JRTCKXETXF.6YS6EN2CT7', 'OnDemand', 'm5.large', 'Hrs', m5_price,
+         'USD', '', '', '', 'AmazonEC2', 'US East (N. Virginia)', 'm5.large', 'Shared', 'Linux',
+         'Used', 'NA', 'us-east-1', ''],
+        ['SKU1', '4NA7Y494T4', 'SKU1.4NA7Y494T4.6YS6EN2CT7', 'Reserved', 'm5.large 1yr', 'Hrs', '0.060',
+         'USD', '1yr', 'No Upfront', 'standard', 'AmazonEC2', 'US East (N. Virginia)', 'm5.large',
+         'Shared', 'Linux', 'Used', 'NA', 'us-east-1', ''],
+        ['SKU2', 'JRTCKXETXF', 'SKU2.JRTCKXETXF.6YS6EN2CT7', 'OnDemand', 'm5.large', 'Hrs', '0.0',
+         'USD', '', '', '', 'AmazonEC2', 'US East (N. Virginia)', 'm5.large', 'Shared', 'Linux',
+         'UnusedCapacityReservation', 'NA', 'us-east-1', ''],
+        ['SKU3', 'JRTCKXETXF', 'SKU3.JRTCKXETXF.6YS6EN2CT7', 'OnDemand', 'm5.large', 'Hrs', '0.100',
+         'USD', '', '', '', 'AmazonEC2', 'US West (Oregon)', 'm5.large', 'Shared', 'Linux',
+         'Used', 'NA', '', ''],
+        ['SKU4', 'JRTCKXETXF', 'SKU4.JRTCKXETXF.6YS6EN2CT7', 'OnDemand', 'gp3 storage', 'GB-Mo', '0.09',
+         'USD', '', '', '', 'AmazonEC2', 'US East (N. Virginia)', '', '', '', '', '', 'us-east-1', 'gp3'],
+    ]
+
+
+class TestPriceCatalog(unittest.TestCase):
+    """Test cases for PriceCatalog ingestion and lookups."""
+
+    def setUp(self):
+        """Set up a temporary catalog directory."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.catalog = PriceCatalog(os.path.join(self.temp_dir, 'catalog.db'))
+
+    def tearDown(self):
+        """Clean up test fixtures."""
+        self.catalog.close()
+        shutil.rmtree(self.temp_dir)
+
+    def _write_csv_offer(self, name, version, rows, compress=False):
+        path = os.path.join(self.temp_dir, name)
+        opener = gzip.open if compress else open
+        with opener(path, 'wt', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f, quoting=csv.QUOTE_ALL)
+            writer.writerow(['FormatVersion', 'v1.0'])
+            writer.writerow(['Disclaimer', 'For informational purposes only'])
+            writer.writerow(['Publication Date', '2024-01-01T00:00:00Z'])
+            writer.writerow(['Version', version])
+            writer.writerow(['OfferCode', 'AmazonEC2'])
+            writer.writerow(CSV_HEADER)
+            writer.writerows(rows)
+        return path
+
+    def test_ingest_csv_offer_and_lookup_rates(self):
+        """Test CSV ingestion and compute, reserved and storage lookups."""
+        path = self._write_csv_offer('ec2.csv', '20240101000000', _csv_rows())
+        summary = self.catalog.ingest_offer_file(path)
+
+        self.assertEqual(summary['serviceCode'], 'AmazonEC2')
+        self.assertEqual(summary['inserted'], 4)  # Unused capacity reservation row is dropped
+        self.assertAlmostEqual(self.catalog.get_rate('AmazonEC2', 'us-east-1', 'm5.large'), 0.096)
+        self.assertAlmostEqual(
+            self.catalog.get_rate('AmazonEC2', 'us-east-1', 'm5.large', term_type='Reserved',
+                                  lease_contract_length='1yr', purchase_option='No Upfront',
+                                  offering_class='standard'),
+            0.060
+        )
+        # Region resolved from the location name when the region code is missing
+        self.assertAlmostEqual(self.catalog.get_rate('AmazonEC2', 'us-west-2', 'm5.large'), 0.100)
+        self.assertAlmostEqual(self.catalog.get_storage_rate('us-east-1', 'gp3'), 0.09)
+        self.assertIsNone(self.catalog.get_rate('AmazonEC2', 'us-east-1', 'c5.large'))
+
+    def test_refresh_is_incremental_diff_of_offer_version(self):
+        """Test same-version skip and changed/removed rate accounting."""
+        path = self._write_csv_offer('ec2.csv', '20240101000000', _csv_rows())
+        self.catalog.ingest_offer_file(path)
+
+        skipped = self.catalog.ingest_offer_file(path)
+        self.assertTrue(skipped['skipped'])
+
+        new_rows = [row for row in _csv_rows(m5_price='0.090') if row[0] != 'SKU3']
+        new_path = self._write_csv_offer('ec2-new.csv.gz', '20240201000000', new_rows, compress=True)
+        summary = self.catalog.ingest_offer_file(new_path)
+
+        self.assertEqual(summary['previousVersion'], '20240101000000')
+        self.assertEqual(summary['updated'], 1)
+        self.assertEqual(summary['unchanged'], 2)
+        self.assertEqual(summary['removed'], 1)
+        self.assertAlmostEqual(self.catalog.get_rate('AmazonEC2', 'us-east-1', 'm5.large'), 0.090)
+        self.assertIsNone(self.catalog.get_rate('AmazonEC2', 'us-west-2', 'm5.large'))
+
+    def test_ingest_json_offer(self):
+        """Test JSON offer ingestion for RDS rates."""
+        offer = {
+            'offerCode': 'AmazonRDS',
+            'version': '20240101000000',
+            'products': {
+                'DB1': {'sku': 'DB1', 'attributes': {
+                    'servicecode': 'AmazonRDS', 'location': 'US East (N. Virginia)',
+                    'regionCode': 'us-east-1', 'instanceType': 'db.m5.large',
+                    'databaseEngine': 'MySQL', 'deploymentOption': 'Single-AZ'
+                }}
+            },
+            'terms': {'OnDemand': {'DB1': {'DB1.JRTCKXETXF': {
+                'termAttributes': {},
+                'priceDimensions': {'DB1.JRTCKXETXF.6YS6EN2CT7': {
+                    'rateCode': 'DB1.JRTCKXETXF.6YS6EN2CT7', 'unit': 'Hrs',
+                    'pricePerUnit': {'USD': '0.171'}
+                }}
+            }}}}
+        }
+        path = os.path.join(self.temp_dir, 'rds.json')
+        with open(path, 'w') as f:
+            json.dump(offer, f)
+
+        summary = self.catalog.ingest_offer_file(path)
+
+        self.assertEqual(summary['inserted'], 1)
+        self.assertAlmostEqual(self.catalog.get_database_rate('us-east-1', 'db.m5.large', 'MySQL'), 0.171)
+        self.assertEqual(self.catalog.get_catalog_statistics()['ratesByService'], {'AmazonRDS': 1})
+
+    def test_clients_and_scanners_use_catalog(self):
+        """Test pricing client and scanner lookups are served from the catalog."""
+        self.catalog.ingest_offer_file(self._write_csv_offer('ec2.csv', '20240101000000', _csv_rows()))
+
+        aws_config = Mock()
+        pricing_client = PricingClient(aws_config, price_catalog=self.catalog, pricing_cache=PricingCache())
+        filters = [{'Type': 'TERM_MATCH', 'Field': 'instanceType', 'Value': 'm5.large'}]
+        pricing = pricing_client.get_service_pricing('AmazonEC2', 'us-east-1', filters, PricingModel.ON_DEMAND)
+
+        self.assertAlmostEqual(pricing['hourlyPrice'], 0.096)
+        self.assertEqual(pricing['source'], 'price_catalog')
+        aws_config.execute_with_retry.assert_not_called()
+
+        ec2_scanner = EC2Scanner(aws_config, region='us-east-1', price_catalog=self.catalog,
+                                 pricing_cache=PricingCache())
+        self.assertEqual(ec2_scanner._estimate_instance_cost('m5.large'), round(0.096 * 730, 2))
+        # Types missing from the catalog fall back to the built-in table
+        self.assertEqual(ec2_scanner._estimate_instance_cost('c5.large'), 78.84)
+
+        ebs_scanner = EBSScanner(aws_config, region='us-east-1', price_catalog=self.catalog)
+        self.assertAlmostEqual(ebs_scanner._estimate_volume_cost('gp3', 100), 9.0)
+
+    def test_rds_scanner_prices_multi_az_from_catalog(self):
+        """Test the Multi-AZ catalog rate is used as-is and only storage is doubled."""
+        products = {}
+        on_demand = {}
+        for sku, deployment_option, price in (('DB1', 'Single-AZ', '0.171'), ('DB2', 'Multi-AZ', '0.342')):
+            products[sku] = {'sku': sku, 'attributes': {
+                'servicecode': 'AmazonRDS', 'location': 'US East (N. Virginia)',
+                'regionCode': 'us-east-1', 'instanceType': 'db.m5.large',
+                'databaseEngine': 'MySQL', 'deploymentOption': deployment_option
+            }}
+            on_demand[sku] = {f'{sku}.JRTCKXETXF': {
+                'termAttributes': {},
+                'priceDimensions': {f'{sku}.JRTCKXETXF.6YS6EN2CT7': {
+                    'rateCode': f'{sku}.JRTCKXETXF.6YS6EN2CT7', 'unit': 'Hrs',
+                    'pricePerUnit': {'USD': price}
+                }}
+            }}
+        path = os.path.join(self.temp_dir, 'rds.json')
+        with open(path, 'w') as f:
+            json.dump({'offerCode': 'AmazonRDS', 'version': '20240101000000',
+                       'products': products, 'terms': {'OnDemand': on_demand}}, f)
+        self.catalog.ingest_offer_file(path)
+
+        rds_scanner = RDSScanner(Mock(), region='us-east-1', price_catalog=self.catalog)
+        storage_cost = 100 * 0.115 * 24 * 30 / 1000
+        single_az = rds_scanner._estimate_database_cost('db.m5.large', 'mysql', 100, 'gp2', False)
+        multi_az = rds_scanner._estimate_database_cost('db.m5.large', 'mysql', 100, 'gp2', True)
+
+        self.assertAlmostEqual(single_az, 0.171 * 730 + storage_cost)
+        self.assertAlmostEqual(multi_az, 0.342 * 730 + 2 * storage_cost)
+
+
+if __name__ == '__main__':
+    unittest.main()
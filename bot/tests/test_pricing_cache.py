@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the shared pricing cache.
+
+Tests stable keys, TTL and LRU eviction, byte limits, the shared on-disk
+backend and client integration.
+"""
+
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import unittest
+from unittest.mock import Mock
+
+# Add the project root to the path
+_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _root not in sys.path:
+    sys.path.insert(0, _root)
+
+from utils.pricing_cache import PricingCache
+from aws.pricing_client import PricingClient, PricingModel
+
+
+class TestPricingCache(unittest.TestCase):
+    """Test cases for PricingCache."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        """Clean up test fixtures."""
+        shutil.rmtree(self.temp_dir)
+
+    def test_keys_are_stable_across_processes(self):
+        """Test keys do not depend on the interpreter hash seed."""
+        filters = [{'Type': 'TERM_MATCH', 'Field': 'instanceType', 'Value': 'm5.large'}]
+        key = PricingCache.make_key('pricing', 'AmazonEC2', 'us-east-1', filters)
+
+        script = (
+            "import sys; sys.path.insert(0, %r); from utils.pricing_cache import PricingCache; "
+            "print(PricingCache.make_key('pricing', 'AmazonEC2', 'us-east-1', "
+            "[{'Value': 'm5.large', 'Field': 'instanceType', 'Type': 'TERM_MATCH'}]))" % _root
+        )
+        output = subprocess.run([sys.executable, '-c', script], capture_output=True, text=True,
+                                env={**os.environ, 'PYTHONHASHSEED': '123'})
+        self.assertEqual(output.stdout.strip(), key)
+
+    def test_ttl_expiry_and_hit_rate(self):
+        """Test expired entries miss and metrics track the hit rate."""
+        cache = PricingCache(default_ttl=60)
+        cache.set('pricing:a', {'hourlyPrice': 0.1})
+        cache.set('pricing:b', {'hourlyPrice': 0.2}, ttl=0.01)
+        time.sleep(0.02)
+
+        self.assertEqual(cache.get('pricing:a'), {'hourlyPrice': 0.1})
+        self.assertIsNone(cache.get('pricing:b'))
+
+        metrics = cache.get_metrics()
+        self.assertEqual(metrics['hits'], 1)
+        self.assertEqual(metrics['misses'], 1)
+        self.assertEqual(metrics['expirations'], 1)
+        self.assertAlmostEqual(metrics['hitRate'], 0.5)
+
+    def test_lru_eviction_by_entries_and_bytes(self):
+        """Test least recently used entries are evicted first."""
+        cache = PricingCache(max_entries=2)
+        cache.set('a', 1)
+        cache.set('b', 2)
+        cache.get('a')
+        cache.set('c', 3)
+
+        self.assertIn('a', cache)
+        self.assertNotIn('b', cache)
+        self.assertIn('c', cache)
+
+        small_cache = PricingCache(max_bytes=100)
+        small_cache.set('x', 'x' * 60)
+        small_cache.set('y', 'y' * 60)
+        self.assertNotIn('x', small_cache)
+        self.assertLessEqual(small_cache.get_metrics()['bytes'], 100)
+
+    def test_disk_backend_is_shared_between_instances(self):
+        """Test a second cache reads entries persisted by the first."""
+        disk_path = os.path.join(self.temp_dir, 'cache', 'pricing_cache.db')
+        writer = PricingCache(disk_path=disk_path)
+        writer.set(PricingCache.make_key('billing_summary', '2024-01-01'), {'totalCost': 42.0})
+
+        reader = PricingCache(disk_path=disk_path)
+        self.assertEqual(reader.get(PricingCache.make_key('billing_summary', '2024-01-01')), {'totalCost': 42.0})
+        self.assertEqual(reader.get_metrics()['diskHits'], 1)
+
+        reader.clear('billing_summary')
+        self.assertIsNone(PricingCache(disk_path=disk_path).get(PricingCache.make_key('billing_summary', '2024-01-01')))
+
+    def test_pricing_client_uses_cache(self):
+        """Test repeated pricing lookups are served from the cache."""
+        aws_config = Mock()
+        aws_config.execute_with_retry.return_value = {'PriceList': []}
+        cache = PricingCache()
+        client = PricingClient(aws_config, pricing_cache=cache)
+
+        client.get_service_pricing('AmazonEC2', 'us-east-1', None, PricingModel.ON_DEMAND)
+        client.get_service_pricing('AmazonEC2', 'us-east-1', None, PricingModel.ON_DEMAND)
+
+        self.assertEqual(aws_config.execute_with_retry.call_count, 1)
+        self.assertEqual(cache.get_metrics()['hits'], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
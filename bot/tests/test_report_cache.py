@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Unit tests for report_cache.py
+
+Tests section-level report memoization including:
+- Reuse of sections whose inputs are unchanged
+- Recomputation of only the sections whose inputs changed
+- Template configuration in the cache key
+- On-disk cache shared across engine instances
+- Configured engines caching on disk by default
+- Concurrent report generation on one engine
+"""
+
+import os
+import sys
+import tempfile
+import threading
+import unittest
+from unittest.mock import patch
+
+# Add project root to path (for standalone run)
+_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _root not in sys.path:
+    sys.path.insert(0, _root)
+
+from utils.report_cache import ReportSectionCache, fingerprint
+from core.reporting_engine import ReportingEngine, ReportType, create_reporting_engine
+
+
+class TestReportSectionCache(unittest.TestCase):
+    """Test cases for cached report sections."""
+
+    def setUp(self):
+        self.cost_data = [
+            {"service": "EC2", "region": "us-east-1", "cost": 150.5, "date": "2024-01-15"},
+            {"service": "RDS", "region": "us-west-2", "cost": 89.25, "date": "2024-01-15"},
+            {"service": "EC2", "region": "us-east-1", "cost": 160.0, "date": "2024-01-16"}
+        ]
+        self.budget_data = {"budget_amount": 1000.0, "forecast_amount": 900.0}
+
+    def _generate(self, engine, report_type, **kwargs):
+        kwargs.setdefault("cost_data", self.cost_data)
+        return engine.generate_comprehensive_report(
+            report_type=report_type,
+            period_start="2024-01-15T00:00:00Z",
+            period_end="2024-01-16T23:59:59Z",
+            **kwargs
+        )
+
+    def test_fingerprint_ignores_key_order(self):
+        """Test fingerprints depend on content only."""
+        self.assertEqual(fingerprint([{"a": 1, "b": 2}]), fingerprint([{"b": 2, "a": 1}]))
+        self.assertNotEqual(fingerprint([{"a": 1}]), fingerprint([{"a": 2}]))
+
+    def test_unchanged_report_is_served_from_cache(self):
+        """Test regenerating a report reuses every section with identical results."""
+        engine = ReportingEngine(dry_run=True)
+        first = self._generate(engine, ReportType.VARIANCE_ANALYSIS, budget_data=self.budget_data)
+        self.assertEqual(first["section_cache"]["hits"], 0)
+
+        with patch.object(ReportingEngine, "_analyze_costs_by_dimension") as analyze:
+            second = self._generate(engine, ReportType.VARIANCE_ANALYSIS,
+                                    cost_data=[dict(item) for item in self.cost_data],
+                                    budget_data=dict(self.budget_data))
+        analyze.assert_not_called()
+        self.assertEqual(second["section_cache"], {"hits": 1, "misses": 0})
+        self.assertEqual(second["variance_analysis"], first["variance_analysis"])
+
+        uncached = self._generate(ReportingEngine(dry_run=True, enable_section_cache=False),
+                                  ReportType.VARIANCE_ANALYSIS, budget_data=self.budget_data)
+        self.assertNotIn("section_cache", uncached)
+        self.assertEqual(uncached["variance_analysis"], first["variance_analysis"])
+
+    def test_only_changed_sections_are_recomputed(self):
+        """Test a budget change leaves cost-only sections cached."""
+        engine = ReportingEngine(dry_run=True)
+        self._generate(engine, ReportType.EXECUTIVE_SUMMARY, budget_data=self.budget_data)
+
+        report = self._generate(engine, ReportType.EXECUTIVE_SUMMARY,
+                                budget_data={"budget_amount": 500.0})
+        self.assertEqual(report["section_cache"]["misses"], 0)
+        self.assertGreater(report["section_cache"]["hits"], 0)
+
+        changed = self.cost_data + [{"service": "S3", "region": "us-east-1", "cost": 5.0, "date": "2024-01-16"}]
+        report = self._generate(engine, ReportType.EXECUTIVE_SUMMARY, cost_data=changed)
+        self.assertEqual(report["section_cache"]["hits"], 0)
+        self.assertIn("S3", report["executive_summary"]["cost_overview"]["cost_distribution"]["by_service"])
+
+        sections = engine.get_report_summary()["section_cache"]["sections"]
+        self.assertEqual(sections["cost_distribution"], {"hits": 1, "misses": 2})
+
+    def test_template_change_invalidates_sections(self):
+        """Test changing the template configuration recomputes its sections."""
+        engine = ReportingEngine(dry_run=True)
+        engine.create_custom_template("weekly", {"sections": ["cost_overview"], "metrics": ["total_spend"]})
+        self._generate(engine, ReportType.CUSTOM_REPORT, template_name="weekly")
+        self.assertEqual(self._generate(engine, ReportType.CUSTOM_REPORT,
+                                        template_name="weekly")["section_cache"]["hits"], 1)
+
+        engine.create_custom_template("weekly", {"sections": ["cost_overview", "time_series_analysis"],
+                                                 "metrics": ["total_spend"]})
+        report = self._generate(engine, ReportType.CUSTOM_REPORT, template_name="weekly")
+        self.assertEqual(report["section_cache"], {"hits": 0, "misses": 2})
+
+    def test_disk_cache_shared_across_engines(self):
+        """Test sections cached on disk are reused by a new engine."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, "sections.db")
+            first = self._generate(ReportingEngine(dry_run=True, section_cache_path=path),
+                                   ReportType.COST_BREAKDOWN)
+
+            engine = ReportingEngine(dry_run=True, section_cache=ReportSectionCache(disk_path=path))
+            second = self._generate(engine, ReportType.COST_BREAKDOWN)
+            self.assertEqual(second["section_cache"], {"hits": 1, "misses": 0})
+            self.assertEqual(engine.section_cache.get_metrics()["diskHits"], 1)
+            self.assertEqual(second["cost_breakdown"]["time_series_analysis"],
+                             first["cost_breakdown"]["time_series_analysis"])
+
+    def test_configured_engine_caches_on_disk_by_default(self):
+        """Test the factory puts sections in the default disk cache unless disabled."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, "cache", "sections.db")
+            with patch("core.reporting_engine.DEFAULT_SECTION_CACHE_PATH", path):
+                self._generate(create_reporting_engine(), ReportType.COST_BREAKDOWN)
+                second = self._generate(create_reporting_engine(), ReportType.COST_BREAKDOWN)
+            self.assertTrue(os.path.exists(path))
+            self.assertEqual(second["section_cache"], {"hits": 1, "misses": 0})
+
+            disabled = create_reporting_engine(section_cache_config={"enabled": False})
+            self.assertIsNone(disabled.section_cache)
+
+    def test_concurrent_reports_keep_their_own_run(self):
+        """Test reports generated at once on one engine each get their own section run."""
+        engine = ReportingEngine(dry_run=True)
+        barrier = threading.Barrier(8)
+        reports = []
+
+        def generate(index):
+            cost_data = [dict(item, cost=item["cost"] + index) for item in self.cost_data]
+            barrier.wait()
+            for _ in range(5):
+                reports.append((index, self._generate(engine, ReportType.COST_BREAKDOWN, cost_data=cost_data)))
+
+        threads = [threading.Thread(target=generate, args=(index,)) for index in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(reports), 40)
+        for index, report in reports:
+            self.assertEqual(report["section_cache"]["hits"] + report["section_cache"]["misses"], 1)
+            expected = sum(item["cost"] + index for item in self.cost_data)
+            breakdown = report["cost_breakdown"]
+            self.assertAlmostEqual(breakdown["service_breakdown"]["total_cost"], expected)
+            self.assertAlmostEqual(sum(breakdown["time_series_analysis"]["daily_costs"].values()), expected)
+
+
+if __name__ == "__main__":
+    unittest.main()
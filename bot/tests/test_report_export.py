@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Unit tests for report_export.py
+
+Tests streamed report exports including:
+- JSON fragments matching json.dumps, with generators written as arrays
+- Row-by-row CSV output from generators
+- Gzip output with file sizes counted while writing
+- Dry-run exports that count bytes without rendering the whole report
+"""
+
+import csv
+import gzip
+import io
+import json
+import os
+import sys
+import tempfile
+import unittest
+
+# Add project root to path (for standalone run)
+_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _root not in sys.path:
+    sys.path.insert(0, _root)
+
+from utils.report_export import ExportStream, iter_json, write_csv, write_json
+from core.reporting_engine import ReportingEngine, ReportType, ReportFormat
+
+
+def _cost_rows(count):
+    for index in range(count):
+        yield {"service": f"svc-{index % 7}", "region": "us-east-1", "cost": index * 0.5}
+
+
+class TestReportExport(unittest.TestCase):
+    """Test cases for the export streams."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_json_fragments_match_json_dumps(self):
+        """Test streamed JSON is identical to json.dumps output."""
+        report = {
+            "report_id": "r-1",
+            "period": {"start_date": "2024-01-01", "days": 31},
+            "values": [1, 2.5, None, True, "x"],
+            "empty_list": [],
+            "empty_dict": {},
+            "nested": [{"a": {"b": []}}, (1, 2)],
+            1: "int key",
+            "when": ReportType.COST_BREAKDOWN
+        }
+        for indent in (2, None):
+            self.assertEqual(
+                "".join(iter_json(report, indent=indent)),
+                json.dumps(report, indent=indent, default=str)
+            )
+
+        streamed = "".join(iter_json({"rows": (row for row in [{"a": 1}, {"a": 2}])}))
+        self.assertEqual(json.loads(streamed), {"rows": [{"a": 1}, {"a": 2}]})
+
+    def test_gzip_csv_size_counted_while_writing(self):
+        """Test gzip CSV output and that reported sizes match the file."""
+        path = os.path.join(self.temp_dir.name, "costs.csv.gz")
+        with ExportStream(path, compress=True) as stream:
+            rows = write_csv(stream, _cost_rows(50000))
+
+        self.assertEqual(rows, 50000)
+        self.assertEqual(stream.file_size, os.path.getsize(path))
+        with gzip.open(path, "rt", newline="") as f:
+            content = f.read()
+        self.assertEqual(stream.uncompressed_size, len(content.encode("utf-8")))
+        parsed = list(csv.DictReader(io.StringIO(content)))
+        self.assertEqual(len(parsed), 50000)
+        self.assertEqual(parsed[3], {"service": "svc-3", "region": "us-east-1", "cost": "1.5"})
+
+    def test_dry_run_stream_counts_bytes_and_keeps_preview(self):
+        """Test a stream without an output file counts bytes and keeps a bounded preview."""
+        report = {"rows": list(_cost_rows(1000))}
+        with ExportStream(None) as stream:
+            write_json(stream, report)
+
+        expected = json.dumps(report, indent=2, default=str)
+        self.assertEqual(stream.file_size, len(expected.encode("utf-8")))
+        self.assertEqual(stream.preview, expected[:500] + "...")
+
+
+class TestReportingEngineStreamingExport(unittest.TestCase):
+    """Test streamed exports through the Reporting Engine."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.cost_data = [
+            {"service": "EC2", "region": "us-east-1", "cost": 150.5, "date": "2024-01-15"},
+            {"service": "RDS", "region": "us-west-2", "cost": 89.25, "date": "2024-01-16"}
+        ]
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def _report(self, engine, report_type):
+        return engine.generate_comprehensive_report(
+            report_type=report_type,
+            period_start="2024-01-15T00:00:00Z",
+            period_end="2024-01-16T23:59:59Z",
+            cost_data=self.cost_data
+        )
+
+    def test_export_json_and_csv_files(self):
+        """Test JSON and gzip CSV report exports on disk."""
+        engine = ReportingEngine(dry_run=False)
+        report = self._report(engine, ReportType.COST_BREAKDOWN)
+
+        json_path = os.path.join(self.temp_dir.name, "report.json")
+        result = engine.export_report(report["report_id"], ReportFormat.JSON, output_path=json_path)
+        self.assertTrue(result["export_success"])
+        self.assertEqual(result["file_size"], os.path.getsize(json_path))
+        with open(json_path, encoding="utf-8") as f:
+            self.assertEqual(json.load(f)["report_id"], report["report_id"])
+
+        csv_path = os.path.join(self.temp_dir.name, "report.csv.gz")
+        result = engine.export_report(report["report_id"], ReportFormat.CSV, output_path=csv_path)
+        self.assertTrue(result["compressed"])
+        self.assertEqual(result["file_size"], os.path.getsize(csv_path))
+        with gzip.open(csv_path, "rt", newline="") as f:
+            rows = list(csv.DictReader(f))
+        self.assertEqual(result["rows_exported"], 2)
+        self.assertEqual(sorted(row["dimension"] for row in rows), ["EC2", "RDS"])
+
+    def test_dry_run_export_matches_rendered_size(self):
+        """Test dry-run JSON exports report the size of the rendered report without a file."""
+        engine = ReportingEngine(dry_run=True)
+        report = self._report(engine, ReportType.EXECUTIVE_SUMMARY)
+        path = os.path.join(self.temp_dir.name, "dry.json")
+
+        result = engine.export_report(report["report_id"], ReportFormat.JSON, output_path=path)
+        rendered = json.dumps(report, indent=2, default=str)
+        self.assertEqual(result["file_size"], len(rendered.encode("utf-8")))
+        self.assertEqual(result["content_preview"], rendered[:500] + "...")
+        self.assertFalse(os.path.exists(path))
+
+    def test_export_rows_from_generator(self):
+        """Test a cost row generator is streamed to CSV and counted."""
+        engine = ReportingEngine(dry_run=False)
+        path = os.path.join(self.temp_dir.name, "breakdown.csv")
+
+        result = engine.export_rows(_cost_rows(20000), path)
+        self.assertTrue(result["export_success"])
+        self.assertEqual(result["rows_exported"], 20000)
+        self.assertEqual(result["file_size"], os.path.getsize(path))
+
+        json_result = engine.export_rows(_cost_rows(3), path + ".json", ReportFormat.JSON)
+        self.assertEqual(json_result["rows_exported"], 3)
+        with open(path + ".json", encoding="utf-8") as f:
+            self.assertEqual(json.load(f), list(_cost_rows(3)))
+
+
+if __name__ == "__main__":
+    unittest.main()
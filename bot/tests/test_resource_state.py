@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+Unit tests for bulk resource state lookups.
+
+Tests grouped bulk describe calls, missing-ID isolation, coalesced
+post-change polling and the execution engine's shared batch snapshot.
+"""
+
+import os
+import sys
+import threading
+import unittest
+from unittest.mock import Mock
+
+# Add the project root to the path
+_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _root not in sys.path:
+    sys.path.insert(0, _root)
+
+from utils.resource_state import ResourceStateDescriber, ResourceStatePoller
+from core.execution_engine import OptimizationExecutionEngine
+
+
+class _FakeEC2:
+    """EC2 client that fails whole calls naming unknown IDs, like the real API."""
+
+    def __init__(self, instances=None, volumes=None):
+        self.instances = dict(instances or {})
+        self.volumes = dict(volumes or {})
+        self.calls = []
+        self.lock = threading.Lock()
+
+    def describe_instances(self, InstanceIds):
+        with self.lock:
+            self.calls.append(('describe_instances', len(InstanceIds)))
+            states = dict(self.instances)
+        missing = [instance_id for instance_id in InstanceIds if instance_id not in states]
+        if missing:
+            raise Exception(f"AWS API error [InvalidInstanceID.NotFound]: The instance ID '{missing[0]}' does not exist")
+        return {'Reservations': [{'Instances': [
+            {'InstanceId': instance_id, 'State': {'Name': states[instance_id]}, 'InstanceType': 't3.large',
+             'Tags': [{'Key': 'Team', 'Value': 'web'}]}
+            for instance_id in InstanceIds
+        ]}]}
+
+    def describe_volumes(self, VolumeIds):
+        self.calls.append(('describe_volumes', len(VolumeIds)))
+        return {'Volumes': [
+            {'VolumeId': volume_id, 'State': self.volumes[volume_id], 'VolumeType': 'gp2', 'Size': 100}
+            for volume_id in VolumeIds if volume_id in self.volumes
+        ]}
+
+
+class _FakeRDS:
+    """RDS client filtering by db-instance-id."""
+
+    def __init__(self, databases):
+        self.databases = databases
+        self.calls = []
+
+    def describe_db_instances(self, Filters):
+        identifiers = Filters[0]['Values']
+        self.calls.append(('describe_db_instances', len(identifiers)))
+        return {'DBInstances': [
+            {'DBInstanceIdentifier': identifier, 'DBInstanceStatus': self.databases[identifier],
+             'DBInstanceClass': 'db.m5.large', 'TagList': []}
+            for identifier in identifiers if identifier in self.databases
+        ]}
+
+
+def _aws_config(clients):
+    aws_config = Mock()
+    aws_config.region = 'us-east-1'
+    aws_config.get_client.side_effect = lambda service, region=None: clients[(service, region)]
+    aws_config.execute_with_retry.side_effect = lambda operation, service, **kwargs: operation(**kwargs)
+    return aws_config
+
+
+class TestResourceStateDescriber(unittest.TestCase):
+    """Test cases for ResourceStateDescriber."""
+
+    def test_bulk_describe_grouped_by_service_and_region(self):
+        """Test one call per chunk per kind and region, with missing IDs isolated."""
+        east = _FakeEC2({f'i-{index}': 'running' for index in range(1500)}, {'vol-1': 'available'})
+        west = _FakeEC2({'i-west': 'stopped'})
+        rds = _FakeRDS({'orders-db': 'available'})
+        describer = ResourceStateDescriber(_aws_config({
+            ('ec2', 'us-east-1'): east, ('ec2', 'us-west-2'): west, ('rds', 'us-east-1'): rds
+        }))
+
+        resources = [('ec2', f'i-{index}', 'us-east-1') for index in range(1500)]
+        resources += [('ec2', 'i-gone', 'us-east-1'), ('ec2', 'i-west', 'us-west-2'),
+                      ('ebs', 'vol-1', 'us-east-1'), ('rds', 'orders-db', 'us-east-1'),
+                      ('rds', 'old-db', 'us-east-1'), ('s3', 'bucket', 'us-east-1')]
+        states = describer.describe(resources)
+
+        self.assertEqual(states['i-1499']['state'], 'running')
+        self.assertEqual(states['i-1499']['tags'], {'Team': 'web'})
+        self.assertEqual(states['i-west']['region'], 'us-west-2')
+        self.assertEqual(states['vol-1']['volumeType'], 'gp2')
+        self.assertEqual(states['orders-db']['dbInstanceClass'], 'db.m5.large')
+        self.assertIsNone(states['i-gone'])
+        self.assertIsNone(states['old-db'])
+        self.assertNotIn('bucket', states)
+
+        # Two full chunks, plus a log2 search for the one missing instance in the second
+        instance_calls = [size for operation, size in east.calls if operation == 'describe_instances']
+        self.assertEqual(instance_calls[0], 1000)
+        self.assertLess(len(instance_calls), 25)
+        self.assertEqual(west.calls, [('describe_instances', 1)])
+        self.assertEqual(rds.calls, [('describe_db_instances', 2)])
+
+    def test_poller_coalesces_concurrent_waits(self):
+        """Test concurrent waiters share bulk rounds until their resources settle."""
+        ec2 = _FakeEC2({f'i-{index}': 'pending' for index in range(6)})
+        describer = ResourceStateDescriber(_aws_config({('ec2', 'us-east-1'): ec2}))
+        poller = ResourceStatePoller(describer, initial_delay=0.01, max_delay=0.05)
+
+        original = ec2.describe_instances
+
+        def settle_after_two_rounds(InstanceIds):
+            if len(ec2.calls) >= 2:
+                with ec2.lock:
+                    ec2.instances.update({instance_id: 'stopped' for instance_id in ec2.instances})
+            return original(InstanceIds)
+
+        ec2.describe_instances = settle_after_two_rounds
+        outcomes = {}
+
+        def wait(index):
+            outcomes[index] = poller.wait_for_state(('ec2', f'i-{index}', 'us-east-1'), {'stopped'},
+                                                    timeout_seconds=5)
+
+        threads = [threading.Thread(target=wait, args=(index,)) for index in range(6)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertTrue(all(outcome['reached'] for outcome in outcomes.values()))
+        self.assertTrue(all(outcome['state'] == 'stopped' for outcome in outcomes.values()))
+        self.assertLess(poller.get_poll_rounds(), 6 * 3)
+        self.assertLessEqual(len(ec2.calls), poller.get_poll_rounds())
+
+        timed_out = poller.wait_for_state(('ec2', 'i-0', 'us-east-1'), {'terminated'}, timeout_seconds=0.05)
+        self.assertFalse(timed_out['reached'])
+        self.assertEqual(timed_out['state'], 'stopped')
+
+
+class TestEngineBatchValidation(unittest.TestCase):
+    """Test the execution engine's batch snapshot."""
+
+    def test_pre_execution_checks_share_prefetched_states(self):
+        """Test pre-execution validation reads the batch snapshot instead of describing each resource."""
+        ec2 = _FakeEC2({'i-1': 'running', 'i-2': 'pending'})
+        engine = OptimizationExecutionEngine(aws_config=_aws_config({('ec2', 'us-east-1'): ec2}), dry_run=False)
+        optimizations = [
+            {'resourceId': resource_id, 'resourceType': 'ec2', 'optimizationType': 'rightsizing',
+             'estimatedSavings': 10.0, 'currentCost': 100.0,
+             'resourceData': {'region': 'us-east-1', 'state': 'running', 'tags': {}}}
+            for resource_id in ('i-1', 'i-2', 'i-3')
+        ]
+
+        engine.prefetch_resource_states(optimizations)
+        calls_after_prefetch = len(ec2.calls)
+        results = {opt['resourceId']: engine._validate_pre_execution(opt) for opt in optimizations}
+
+        self.assertEqual(len(ec2.calls), calls_after_prefetch)
+        self.assertTrue(results['i-1']['valid'])
+        self.assertFalse(results['i-2']['valid'])
+        self.assertIn('current state: pending', results['i-2']['message'])
+        self.assertFalse(results['i-3']['valid'])
+        self.assertIn('i-3 was not found', results['i-3']['message'])
+
+    def test_post_execution_state_polled_only_after_aws_action(self):
+        """Test live executions without an AWS action pass unverified instead of polling until timeout."""
+        ec2 = _FakeEC2({'i-1': 'running'})
+        engine = OptimizationExecutionEngine(aws_config=_aws_config({('ec2', 'us-east-1'): ec2}), dry_run=False)
+        optimization = {'resourceId': 'i-1', 'resourceType': 'ec2', 'optimizationType': 'rightsizing',
+                        'resourceData': {'region': 'us-east-1'}}
+
+        unverified = engine._validate_post_execution(optimization, {'success': True, 'aws_action_issued': False})
+        self.assertTrue(unverified['valid'])
+        self.assertFalse(unverified['validation_checks'][0]['verified'])
+        self.assertEqual(ec2.calls, [])
+
+        verified = engine._verify_post_execution_state(optimization, {'success': True, 'aws_action_issued': True})
+        self.assertTrue(verified['verified'])
+        self.assertIn('reached state running', verified['message'])
+        self.assertEqual(len(ec2.calls), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the Savings Plan simulator.
+
+Tests hourly coverage and waste, discount ordering across compute types,
+broadcast evaluation of many commitments and forecast/report integration.
+"""
+
+import os
+import sys
+import time
+import unittest
+
+import numpy as np
+
+# Add the project root to the path
+_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _root not in sys.path:
+    sys.path.insert(0, _root)
+
+from utils.savings_plan_simulator import SavingsPlanSimulator
+from core.budget_manager import BudgetManager, BudgetType
+from core.reporting_engine import ReportingEngine, ReportType
+
+
+class TestSavingsPlanSimulator(unittest.TestCase):
+    """Test cases for SavingsPlanSimulator."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.simulator = SavingsPlanSimulator(term_years=1)
+
+    def test_coverage_utilization_and_waste(self):
+        """Test a commitment below, at and above steady discounted spend."""
+        hourly_spend = {'EC2Instance': [10.0] * 100}
+        results = self.simulator.simulate(hourly_spend, [4.15, 8.3, 10.0])['commitments']
+
+        half, exact, over = results
+        self.assertAlmostEqual(half['coveragePercentage'], 50.0)
+        self.assertAlmostEqual(half['utilizationPercentage'], 100.0)
+        self.assertAlmostEqual(exact['coveragePercentage'], 100.0)
+        self.assertAlmostEqual(exact['netSavings'], 170.0)
+        self.assertAlmostEqual(over['wastedCommitment'], 170.0)
+        self.assertAlmostEqual(over['utilizationPercentage'], 83.0)
+        self.assertEqual(over['fullyUtilizedHours'], 0)
+
+    def test_deepest_discount_is_covered_first(self):
+        """Test Fargate (deeper discount) is covered before EC2."""
+        hourly_spend = {'EC2Instance': [10.0] * 10, 'Fargate': [10.0] * 10}
+        result = self.simulator.simulate(hourly_spend, [8.0])['commitments'][0]
+
+        self.assertAlmostEqual(result['coverageByComputeType']['Fargate'], 100.0)
+        self.assertAlmostEqual(result['coverageByComputeType']['EC2Instance'], 0.0)
+
+    def test_broadcast_matches_hourly_profile(self):
+        """Test the batched simulation matches single-commitment hourly replays."""
+        rng = np.random.default_rng(3)
+        hourly_spend = {
+            'EC2Instance': rng.uniform(5, 15, 8760),
+            'Lambda': rng.uniform(0, 3, 8760)
+        }
+        commitments = np.linspace(0, 14, 15)
+        simulation = self.simulator.simulate(hourly_spend, commitments)
+
+        for commitment, result in zip(commitments, simulation['commitments']):
+            profile = self.simulator.hourly_profile(hourly_spend, commitment)
+            self.assertAlmostEqual(result['onDemandCostCovered'], profile['coveredSpend'].sum(), places=4)
+            self.assertAlmostEqual(result['wastedCommitment'], profile['wastedCommitment'].sum(), places=4)
+
+        net_savings = [result['netSavings'] for result in simulation['commitments']]
+        self.assertEqual(simulation['optimalCommitment']['netSavings'], max(net_savings))
+        self.assertGreaterEqual(simulation['breakEvenCommitment']['hourlyCommitment'],
+                                simulation['optimalCommitment']['hourlyCommitment'])
+
+    def test_year_of_hours_for_many_commitments(self):
+        """Test a year of spend for three compute types and 200 commitments runs quickly."""
+        rng = np.random.default_rng(5)
+        hourly_spend = {name: rng.uniform(0, 20, 8760) for name in ('EC2Instance', 'Fargate', 'Lambda')}
+
+        started = time.time()
+        simulation = self.simulator.simulate(hourly_spend, points=200)
+
+        self.assertLess(time.time() - started, 10)
+        self.assertEqual(len(simulation['commitments']), 200)
+
+    def test_forecast_and_report_integration(self):
+        """Test simulated savings feed budget forecasts and the reporting engine."""
+        hourly_spend = {'EC2Instance': [10.0] * 730}
+
+        budget_manager = BudgetManager(dry_run=True)
+        budget_manager.create_hierarchical_budget(
+            budget_id="compute", budget_type=BudgetType.TEAM, parent_budget_id=None,
+            budget_amount=10000.0, period_months=12
+        )
+        forecast = budget_manager.generate_cost_forecast(
+            "compute", forecast_months=3,
+            savings_plan={"hourly_spend": hourly_spend, "commitment": 8.3}
+        )
+        self.assertAlmostEqual(forecast["savings_plan_simulation"]["monthly_net_savings"], 1241.0)
+        self.assertAlmostEqual(forecast["savings_plan_simulation"]["coverage_percentage"], 100.0)
+        self.assertEqual(len(forecast["savings_plan_adjusted_forecast"]), 3)
+
+        report = ReportingEngine(dry_run=True).generate_comprehensive_report(
+            ReportType.SAVINGS_PLAN_ANALYSIS, "2024-01-01", "2024-01-31", [],
+            optimization_data={"hourly_compute_spend": hourly_spend}
+        )
+        analysis = report["savings_plan_analysis"]
+        self.assertAlmostEqual(analysis["recommended_commitment"]["hourly_commitment"], 8.3)
+        self.assertEqual(len(analysis["commitment_curve"]), 25)
+
+
+if __name__ == '__main__':
+    unittest.main()
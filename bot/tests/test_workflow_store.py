@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the approval workflow store.
+
+Tests the (state, authority) index, the timeout heap, persistence and
+the approval workflow system's use of the store.
+"""
+
+import os
+import sys
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+
+# Add the project root to the path
+_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _root not in sys.path:
+    sys.path.insert(0, _root)
+
+from utils.workflow_store import WorkflowStore
+from core.approval_workflow import ApprovalWorkflow, ApprovalAuthority, WorkflowState
+from core.execution_engine import OptimizationExecutionEngine
+
+PENDING_STATES = ['CREATED', 'UNDER_REVIEW', 'AWAITING_APPROVAL']
+
+
+def _workflow(index, authority='ENGINEER', state='CREATED', hours=24):
+    now = datetime(2026, 1, 1)
+    return {
+        'workflow_id': f'wf-{index}',
+        'created_at': (now + timedelta(seconds=index)).isoformat(),
+        'state': state,
+        'approval_requirements': {'authority_required': authority},
+        'timeout_at': (now + timedelta(hours=hours)).isoformat()
+    }
+
+
+class TestWorkflowStore(unittest.TestCase):
+    """Test cases for WorkflowStore."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.store = WorkflowStore()
+        self.store.add(_workflow(1, 'ENGINEER', hours=2))
+        self.store.add(_workflow(2, 'MANAGER', hours=1))
+        self.store.add(_workflow(3, 'ENGINEER', 'APPROVED', hours=3))
+        self.store.add(_workflow(4, 'ENGINEER', 'AWAITING_APPROVAL', hours=48))
+
+    def test_index_follows_field_changes(self):
+        """Test pending lookups by authority track state, authority and completion changes."""
+        self.assertEqual([w['workflow_id'] for w in self.store.find(PENDING_STATES)], ['wf-1', 'wf-2', 'wf-4'])
+        self.assertEqual([w['workflow_id'] for w in self.store.find(PENDING_STATES, 'ENGINEER')], ['wf-1', 'wf-4'])
+
+        self.store.get('wf-1')['state'] = 'APPROVED'
+        self.store.get('wf-4')['approval_requirements']['authority_required'] = 'MANAGER'
+        self.store.reindex('wf-4')
+        self.store.complete('wf-2')
+
+        self.assertEqual([w['workflow_id'] for w in self.store.find(PENDING_STATES, 'MANAGER')], ['wf-4'])
+        self.assertEqual(self.store.find(PENDING_STATES, 'ENGINEER'), [])
+        self.assertEqual(self.store.state_counts(), {'APPROVED': 2, 'AWAITING_APPROVAL': 1})
+        self.assertIn('wf-2', self.store.completed)
+        self.assertNotIn('wf-2', self.store.active)
+
+    def test_timeout_heap(self):
+        """Test expired lookups visit only due entries and follow timeout changes."""
+        now = datetime(2026, 1, 1, 2, 30)
+        self.assertEqual([w['workflow_id'] for w in self.store.expired(now)], ['wf-2', 'wf-1'])
+        self.assertTrue(self.store.is_expired('wf-2', now))
+        self.assertFalse(self.store.is_expired('wf-3', now))
+
+        self.store.get('wf-2')['timeout_at'] = datetime(2026, 1, 2).isoformat()
+        self.store.get('wf-4')['timeout_at'] = datetime(2025, 12, 31).isoformat()
+        self.store.complete('wf-1')
+
+        self.assertEqual([w['workflow_id'] for w in self.store.expired(now)], ['wf-4'])
+        self.assertEqual(self.store.next_timeout().isoformat(), '2025-12-31T00:00:00+00:00')
+
+        for index in range(5, 1005):
+            self.store.add(_workflow(index, hours=index))
+            self.store.complete(f'wf-{index}')
+        self.assertLessEqual(len(self.store._heap), 2 * len(self.store.active) + 1)
+
+    def test_persistence(self):
+        """Test active and completed workflows and their indexes survive a reopen."""
+        with tempfile.TemporaryDirectory() as state_dir:
+            db_path = os.path.join(state_dir, 'approvals', 'workflows.db')
+            store = WorkflowStore(db_path)
+            for index in range(3):
+                store.add(_workflow(index, hours=index + 1))
+                store.save(f'wf-{index}')
+            store.get('wf-0')['state'] = 'REJECTED'
+            store.complete('wf-0')
+            store.save('wf-0')
+            store.close()
+
+            reopened = WorkflowStore(db_path)
+            self.assertEqual(list(reopened.active), ['wf-1', 'wf-2'])
+            self.assertEqual(reopened.completed['wf-0']['state'], 'REJECTED')
+            self.assertEqual(len(reopened.find(PENDING_STATES, 'ENGINEER')), 2)
+            self.assertEqual(reopened.next_timeout().isoformat(), '2026-01-01T02:00:00+00:00')
+            reopened.close()
+
+
+class TestApprovalWorkflowStore(unittest.TestCase):
+    """Test the approval workflow system reads through the store."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.optimization = {
+            'optimizationId': 'opt-1',
+            'resourceId': 'i-1234567890abcdef0',
+            'resourceType': 'ec2',
+            'optimizationType': 'rightsizing',
+            'estimatedSavings': 200.0,
+            'riskLevel': 'MEDIUM',
+            'resourceData': {'tags': {'Environment': 'development'}}
+        }
+
+    def test_workflows_survive_restart(self):
+        """Test pending approvals and timeouts are served from a reopened store."""
+        with tempfile.TemporaryDirectory() as state_dir:
+            db_path = os.path.join(state_dir, 'workflows.db')
+            workflow_system = ApprovalWorkflow(dry_run=True, store_path=db_path)
+            workflow_ids = [
+                workflow_system.create_workflow(self.optimization, requester='engineer@company.com')['workflow_id']
+                for _ in range(3)
+            ]
+            authority = workflow_system.active_workflows[workflow_ids[0]]['approval_requirements']['authority_required']
+            workflow_system.active_workflows[workflow_ids[0]]['timeout_at'] = (
+                datetime.utcnow() - timedelta(hours=1)
+            ).isoformat()
+            workflow_system.workflow_store.save(workflow_ids[0])
+            workflow_system.workflow_store.close()
+
+            restarted = ApprovalWorkflow(dry_run=True, store_path=db_path)
+            pending = restarted.get_pending_approvals(ApprovalAuthority(authority))
+            self.assertEqual([w['workflow_id'] for w in pending], workflow_ids[1:])
+            self.assertEqual(restarted.get_pending_approvals(ApprovalAuthority.EXECUTIVE), [])
+
+            cleanup = restarted.cleanup_expired_workflows()
+            self.assertEqual(cleanup['expired_workflows'], [workflow_ids[0]])
+            self.assertEqual(restarted.completed_workflows[workflow_ids[0]]['state'], WorkflowState.EXPIRED.value)
+            self.assertEqual(restarted.check_workflow_timeouts()['expired_count'], 0)
+            restarted.workflow_store.close()
+
+    def test_engine_workflows_survive_restart(self):
+        """Test approval workflows created by the execution engine are persisted."""
+        with tempfile.TemporaryDirectory() as state_dir:
+            db_path = os.path.join(state_dir, 'workflows.db')
+            engine = OptimizationExecutionEngine(dry_run=True, approval_store_path=db_path)
+            result = engine.execute_optimization(dict(self.optimization, estimatedSavings=2000.0))
+            self.assertEqual(result['status'], 'CANCELLED')
+            workflow_ids = list(engine.approval_workflow.active_workflows)
+            self.assertEqual(len(workflow_ids), 1)
+            engine.approval_workflow.workflow_store.close()
+
+            restarted = OptimizationExecutionEngine(dry_run=True, approval_store_path=db_path)
+            self.assertEqual(list(restarted.approval_workflow.active_workflows), workflow_ids)
+            restarted.approval_workflow.workflow_store.close()
+
+            shared = ApprovalWorkflow(dry_run=True)
+            self.assertIs(OptimizationExecutionEngine(dry_run=True, approval_workflow=shared).approval_workflow, shared)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,505 @@
+#!/usr/bin/env python3
+"""
+Audit Journal for Advanced FinOps Platform
+
+Durable, append-only audit trail for safety controls:
+- Entries appended as JSON lines to segment files, rotated by size
+- Optional gzip compression of closed segments
+- SQLite index of the latest entry per (kind, key), e.g. per operation_id,
+  and of each segment's time range
+- Streaming reads of the latest entries and of time ranges, one segment at
+  a time, so exports never hold the whole trail in memory
+- Bounded in-memory mapping for rollback plans backed by the journal
+
+Requirements: 8.2, 8.4 - Audit logging and rollback capabilities
+"""
+
+import gzip
+import json
+import logging
+import os
+import shutil
+import sqlite3
+import threading
+from collections import OrderedDict
+from collections.abc import MutableMapping
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Any, Optional, Iterator, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Default segment size before rotation
+DEFAULT_SEGMENT_BYTES = 16 * 1024 * 1024
+
+# Index rows read per query while streaming
+_INDEX_BATCH = 1000
+
+# Bytes read from the end of a reopened segment to check its last record
+_TAIL_BYTES = 64 * 1024
+
+
+class AuditJournal:
+    """
+    Append-only JSONL journal with an index by key and time.
+
+    Every append gets a sequence number and is written as one line to the
+    open segment; an update to an existing key appends a new version and
+    moves the index entry to it, so earlier versions remain in the trail.
+    Segments are named after their first sequence number and hold
+    consecutive sequence ranges, which lets latest-version reads stream the
+    index and the segments side by side in sequence order.
+    """
+
+    def __init__(self,
+                 directory: str,
+                 max_segment_bytes: int = DEFAULT_SEGMENT_BYTES,
+                 compress: bool = False):
+        """
+        Initialize audit journal.
+
+        Args:
+            directory: Directory holding the segments and the index database
+            max_segment_bytes: Segment size that triggers rotation
+            compress: Gzip segments once they are rotated out
+        """
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_segment_bytes = max(1, max_segment_bytes)
+        self.compress = compress
+
+        self._lock = threading.RLock()
+        self._connection = sqlite3.connect(
+            str(self.directory / 'audit_index.db'), timeout=30, check_same_thread=False
+        )
+        self._connection.execute('PRAGMA journal_mode=WAL')
+        with self._connection:
+            self._connection.execute('''
+                CREATE TABLE IF NOT EXISTS audit_index (
+                    kind TEXT NOT NULL,
+                    key TEXT NOT NULL,
+                    seq INTEGER NOT NULL,
+                    timestamp TEXT NOT NULL,
+                    segment TEXT NOT NULL,
+                    PRIMARY KEY (kind, key)
+                )
+            ''')
+            self._connection.execute('CREATE INDEX IF NOT EXISTS idx_audit_seq ON audit_index (kind, seq)')
+            self._connection.execute('CREATE INDEX IF NOT EXISTS idx_audit_time ON audit_index (timestamp)')
+            self._connection.execute('''
+                CREATE TABLE IF NOT EXISTS audit_segments (
+                    segment TEXT PRIMARY KEY,
+                    first_seq INTEGER NOT NULL,
+                    last_seq INTEGER NOT NULL,
+                    first_timestamp TEXT NOT NULL,
+                    last_timestamp TEXT NOT NULL,
+                    entries INTEGER NOT NULL,
+                    closed INTEGER NOT NULL DEFAULT 0
+                )
+            ''')
+            self._connection.execute('''
+                CREATE TABLE IF NOT EXISTS audit_state (
+                    name TEXT PRIMARY KEY,
+                    value TEXT NOT NULL
+                )
+            ''')
+
+        row = self._connection.execute('SELECT MAX(last_seq) FROM audit_segments').fetchone()
+        self._seq = row[0] or 0
+        self._counts: Dict[str, int] = dict(
+            self._connection.execute('SELECT kind, COUNT(*) FROM audit_index GROUP BY kind').fetchall()
+        )
+
+        # Reopen the last segment unless it was rotated out
+        self._segment: Optional[str] = None
+        self._file = None
+        row = self._connection.execute(
+            'SELECT segment FROM audit_segments WHERE closed = 0 ORDER BY first_seq DESC LIMIT 1'
+        ).fetchone()
+        if row and (self.directory / row[0]).exists():
+            self._segment = row[0]
+            self._recover_segment_tail(self.directory / self._segment)
+            self._file = open(self.directory / self._segment, 'a', encoding='utf-8')
+
+    def append(self,
+               kind: str,
+               key: str,
+               record: Dict[str, Any],
+               timestamp: Optional[str] = None,
+               state: Optional[Dict[str, Any]] = None) -> int:
+        """
+        Append a version of an entry.
+
+        Args:
+            kind: Entry kind, e.g. 'operation' or 'rollback_plan'
+            key: Entry key within its kind, e.g. the operation ID
+            record: Entry content
+            timestamp: ISO 8601 time of the entry (defaults to now)
+            state: Named values stored in the same transaction as the index update
+
+        Returns:
+            Sequence number of the appended entry
+        """
+        timestamp = timestamp or datetime.now(timezone.utc).isoformat()
+        with self._lock:
+            seq = self._seq + 1
+            line = json.dumps({'seq': seq, 'kind': kind, 'key': key, 'timestamp': timestamp, 'record': record},
+                              default=str) + '\n'
+
+            if self._file is None or (self._file.tell() > 0 and
+                                      self._file.tell() + len(line) > self.max_segment_bytes):
+                self._rotate(seq, timestamp)
+
+            self._file.write(line)
+            self._file.flush()
+            self._seq = seq
+
+            with self._connection:
+                existing = self._connection.execute(
+                    'SELECT 1 FROM audit_index WHERE kind = ? AND key = ?', (kind, key)
+                ).fetchone()
+                self._connection.execute(
+                    'INSERT OR REPLACE INTO audit_index (kind, key, seq, timestamp, segment) VALUES (?, ?, ?, ?, ?)',
+                    (kind, key, seq, timestamp, self._segment)
+                )
+                self._connection.execute(
+                    'UPDATE audit_segments SET last_seq = ?, last_timestamp = MAX(last_timestamp, ?), '
+                    'first_timestamp = MIN(first_timestamp, ?), entries = entries + 1 WHERE segment = ?',
+                    (seq, timestamp, timestamp, self._segment)
+                )
+                for name, value in (state or {}).items():
+                    self._connection.execute(
+                        'INSERT OR REPLACE INTO audit_state (name, value) VALUES (?, ?)',
+                        (name, json.dumps(value, default=str))
+                    )
+            if not existing:
+                self._counts[kind] = self._counts.get(kind, 0) + 1
+            return seq
+
+    def get(self, kind: str, key: str) -> Optional[Dict[str, Any]]:
+        """Latest version of an entry, None when unknown (reads one segment)."""
+        with self._lock:
+            row = self._connection.execute(
+                'SELECT seq, segment FROM audit_index WHERE kind = ? AND key = ?', (kind, key)
+            ).fetchone()
+            if not row:
+                return None
+            if self._file:
+                self._file.flush()
+            for entry in self._read_segment(row[1], {row[0]}):
+                return entry['record']
+            return None
+
+    def contains(self, kind: str, key: str) -> bool:
+        """Whether an entry exists."""
+        with self._lock:
+            return self._connection.execute(
+                'SELECT 1 FROM audit_index WHERE kind = ? AND key = ?', (kind, key)
+            ).fetchone() is not None
+
+    def count(self, kind: str) -> int:
+        """Number of distinct entries of a kind."""
+        with self._lock:
+            return self._counts.get(kind, 0)
+
+    def remove(self, kind: str, key: str) -> bool:
+        """Drop an entry from the index; its lines stay in the trail."""
+        with self._lock, self._connection:
+            removed = self._connection.execute(
+                'DELETE FROM audit_index WHERE kind = ? AND key = ?', (kind, key)
+            ).rowcount
+            if removed:
+                self._counts[kind] -= 1
+            return bool(removed)
+
+    def iter_latest(self, kind: str) -> Iterator[Dict[str, Any]]:
+        """
+        Stream the latest version of every entry of a kind, oldest first.
+
+        Index rows are read in batches and segments one at a time, both in
+        sequence order; only the wanted sequence numbers of one segment are
+        held at a time.
+
+        Returns:
+            Iterator of {'seq', 'kind', 'key', 'timestamp', 'record'} entries
+        """
+        last_seq = 0
+        segment, wanted = None, set()
+        while True:
+            with self._lock:
+                if self._file:
+                    self._file.flush()
+                rows = self._connection.execute(
+                    'SELECT seq, segment FROM audit_index WHERE kind = ? AND seq > ? ORDER BY seq LIMIT ?',
+                    (kind, last_seq, _INDEX_BATCH)
+                ).fetchall()
+            if not rows:
+                break
+            for seq, row_segment in rows:
+                if row_segment != segment and wanted:
+                    yield from self._read_segment(segment, wanted)
+                    wanted = set()
+                segment = row_segment
+                wanted.add(seq)
+            last_seq = rows[-1][0]
+        if wanted:
+            yield from self._read_segment(segment, wanted)
+
+    def tail(self, kind: str, limit: int) -> List[Dict[str, Any]]:
+        """
+        Latest versions of the most recently appended entries of a kind.
+
+        Args:
+            kind: Entry kind
+            limit: Maximum number of entries
+
+        Returns:
+            Entries oldest first, read only from the segments that hold them
+        """
+        with self._lock:
+            if self._file:
+                self._file.flush()
+            rows = self._connection.execute(
+                'SELECT seq, segment FROM audit_index WHERE kind = ? ORDER BY seq DESC LIMIT ?', (kind, int(limit))
+            ).fetchall()
+        by_segment: Dict[str, set] = {}
+        for seq, segment in rows:
+            by_segment.setdefault(segment, set()).add(seq)
+        entries = []
+        for segment, wanted in by_segment.items():
+            entries.extend(self._read_segment(segment, wanted))
+        entries.sort(key=lambda entry: entry['seq'])
+        return entries
+
+    def iter_entries(self,
+                     since: Optional[str] = None,
+                     until: Optional[str] = None,
+                     kind: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Stream every appended version in a time range, in append order.
+
+        Segments whose time range lies outside [since, until] are skipped.
+
+        Args:
+            since: Earliest ISO 8601 timestamp to include
+            until: Latest ISO 8601 timestamp to include
+            kind: Only entries of this kind
+
+        Returns:
+            Iterator of {'seq', 'kind', 'key', 'timestamp', 'record'} entries
+        """
+        with self._lock:
+            if self._file:
+                self._file.flush()
+            segments = [
+                segment for segment, first_timestamp, last_timestamp in self._connection.execute(
+                    'SELECT segment, first_timestamp, last_timestamp FROM audit_segments ORDER BY first_seq'
+                )
+                if (since is None or last_timestamp >= since) and (until is None or first_timestamp <= until)
+            ]
+        for segment in segments:
+            for entry in self._read_segment(segment):
+                if ((since is None or entry['timestamp'] >= since) and
+                        (until is None or entry['timestamp'] <= until) and
+                        (kind is None or entry['kind'] == kind)):
+                    yield entry
+
+    def get_state(self, name: str, default: Any = None) -> Any:
+        """Named value stored with an append."""
+        with self._lock:
+            row = self._connection.execute('SELECT value FROM audit_state WHERE name = ?', (name,)).fetchone()
+        return json.loads(row[0]) if row else default
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """Segment, entry and size totals."""
+        with self._lock:
+            segments, entries = self._connection.execute(
+                'SELECT COUNT(*), COALESCE(SUM(entries), 0) FROM audit_segments'
+            ).fetchone()
+            size = sum(
+                (self.directory / segment).stat().st_size
+                for (segment,) in self._connection.execute('SELECT segment FROM audit_segments')
+                if (self.directory / segment).exists()
+            )
+        return {
+            'directory': str(self.directory),
+            'segments': segments,
+            'entries': entries,
+            'bytes': size,
+            'counts': dict(self._counts),
+            'compressed': self.compress
+        }
+
+    def close(self) -> None:
+        """Close the open segment and the index database."""
+        with self._lock:
+            if self._file:
+                self._file.close()
+                self._file = None
+            self._connection.close()
+
+    # Private helper methods
+
+    def _rotate(self, first_seq: int, timestamp: str) -> None:
+        """Close the open segment (compressing it if enabled) and start a new one."""
+        if self._file is not None:
+            self._file.close()
+            closed_segment = self._segment
+            with self._connection:
+                self._connection.execute('UPDATE audit_segments SET closed = 1 WHERE segment = ?', (closed_segment,))
+            if self.compress:
+                self._compress_segment(closed_segment)
+
+        self._segment = f'audit-{first_seq:012d}.jsonl'
+        self._file = open(self.directory / self._segment, 'a', encoding='utf-8')
+        with self._connection:
+            self._connection.execute(
+                'INSERT OR REPLACE INTO audit_segments '
+                '(segment, first_seq, last_seq, first_timestamp, last_timestamp, entries, closed) '
+                'VALUES (?, ?, ?, ?, ?, 0, 0)',
+                (self._segment, first_seq, first_seq - 1, timestamp, timestamp)
+            )
+
+    def _compress_segment(self, segment: str) -> None:
+        """Gzip a closed segment and point the index at the compressed file."""
+        source = self.directory / segment
+        target_name = segment + '.gz'
+        try:
+            with open(source, 'rb') as f_in, gzip.open(self.directory / target_name, 'wb') as f_out:
+                shutil.copyfileobj(f_in, f_out)
+            with self._connection:
+                self._connection.execute(
+                    'UPDATE audit_index SET segment = ? WHERE segment = ?', (target_name, segment)
+                )
+                self._connection.execute(
+                    'UPDATE audit_segments SET segment = ? WHERE segment = ?', (target_name, segment)
+                )
+            os.remove(source)
+        except Exception as e:
+            logger.error(f"Failed to compress audit segment {segment}: {e}")
+
+    def _recover_segment_tail(self, path: Path) -> None:
+        """
+        Make a reopened segment safe to append to after a crash.
+
+        A record torn by a crash mid-write is closed off with a newline so the
+        next entry starts on its own line. A complete record written before
+        its index update was committed keeps its sequence number, so later
+        appends continue after it instead of reusing it.
+        """
+        size = path.stat().st_size
+        if size == 0:
+            return
+        with open(path, 'rb+') as f:
+            f.seek(max(0, size - _TAIL_BYTES))
+            tail = f.read()
+            if not tail.endswith(b'\n'):
+                logger.warning(f"Audit segment {path.name} ends with a partial record; skipping it")
+                f.write(b'\n')
+                tail = tail[:tail.rfind(b'\n') + 1]
+
+        lines = tail.splitlines()
+        if lines and lines[-1].startswith(b'{"seq": '):
+            try:
+                self._seq = max(self._seq, json.loads(lines[-1])['seq'])
+            except (ValueError, KeyError):
+                pass
+
+    def _read_segment(self, segment: str, wanted: Optional[set] = None) -> Iterator[Dict[str, Any]]:
+        """Entries of one segment, optionally only the given sequence numbers."""
+        path = self.directory / segment
+        opener = gzip.open if segment.endswith('.gz') else open
+        remaining = set(wanted) if wanted is not None else None
+        with opener(path, 'rt', encoding='utf-8', errors='replace') as f:
+            for line in f:
+                try:
+                    if remaining is not None:
+                        # Lines start with {"seq": N, so most can be skipped unparsed
+                        seq = int(line[8:line.index(',')])
+                        if seq not in remaining:
+                            continue
+                    entry = json.loads(line)
+                except ValueError:
+                    # Partial record left by a crash mid-write
+                    if line.strip():
+                        logger.warning(f"Skipping undecodable line in audit segment {segment}")
+                    continue
+                if remaining is not None:
+                    remaining.discard(seq)
+                yield entry
+                if remaining is not None and not remaining:
+                    return
+
+
+class RollbackPlanStore(MutableMapping):
+    """
+    Rollback plans by operation ID with a bounded in-memory window.
+
+    The most recently stored plans are kept in memory; older ones are
+    evicted and, when a journal is attached, read back from it on demand.
+    Iteration and len() cover the in-memory plans; total_count() covers
+    every plan in the journal.
+    """
+
+    def __init__(self, journal: Optional[AuditJournal] = None, max_items: int = 10000):
+        """
+        Initialize rollback plan store.
+
+        Args:
+            journal: Optional journal plans are appended to
+            max_items: Maximum plans kept in memory
+        """
+        self.journal = journal
+        self.max_items = max(1, max_items)
+        self._plans: 'OrderedDict[str, Dict[str, Any]]' = OrderedDict()
+
+    def __getitem__(self, operation_id: str) -> Dict[str, Any]:
+        plan = self._plans.get(operation_id)
+        if plan is None and self.journal is not None:
+            plan = self.journal.get('rollback_plan', operation_id)
+        if plan is None:
+            raise KeyError(operation_id)
+        return plan
+
+    def __setitem__(self, operation_id: str, plan: Dict[str, Any]) -> None:
+        self._plans[operation_id] = plan
+        self._plans.move_to_end(operation_id)
+        if self.journal is not None:
+            self.journal.append('rollback_plan', operation_id, plan, plan.get('created_at'))
+        while len(self._plans) > self.max_items:
+            self._plans.popitem(last=False)
+
+    def __delitem__(self, operation_id: str) -> None:
+        in_memory = self._plans.pop(operation_id, None) is not None
+        in_journal = self.journal is not None and self.journal.remove('rollback_plan', operation_id)
+        if not (in_memory or in_journal):
+            raise KeyError(operation_id)
+
+    def __contains__(self, operation_id: object) -> bool:
+        if operation_id in self._plans:
+            return True
+        return self.journal is not None and self.journal.contains('rollback_plan', str(operation_id))
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(list(self._plans))
+
+    def __len__(self) -> int:
+        return len(self._plans)
+
+    def copy(self) -> Dict[str, Dict[str, Any]]:
+        """In-memory plans as a plain dictionary."""
+        return dict(self._plans)
+
+    def total_count(self) -> int:
+        """Number of plans including those only in the journal."""
+        if self.journal is not None:
+            return self.journal.count('rollback_plan')
+        return len(self._plans)
+
+    def iter_all(self) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """Stream (operation_id, plan) pairs for every plan, from the journal when attached."""
+        if self.journal is None:
+            yield from list(self._plans.items())
+            return
+        for entry in self.journal.iter_latest('rollback_plan'):
+            yield entry['key'], entry['record']
@@ -121,6 +121,16 @@ class RateLimiter:
         with self._lock:
             if service_name in self._backoff_state:
                 self._backoff_state[service_name]['consecutive_throttles'] = 0
+    
+    def get_limit(self, service_name: str) -> int:
+        """Calls per second allowed for the service."""
+        return self._default_limits.get(service_name, 50)
+    
+    def get_throttle_count(self, service_name: str) -> int:
+        """Consecutive throttling responses seen for the service."""
+        with self._lock:
+            backoff_state = self._backoff_state.get(service_name)
+            return backoff_state['consecutive_throttles'] if backoff_state else 0
 
 
 class AWSConfig:
@@ -595,6 +605,10 @@ class AWSConfig:
         """
         return self.get_multi_region_clients('cloudwatch', regions)
     
+    def get_rate_limiter(self) -> RateLimiter:
+        """Per-service rate limiter shared by every call made through this configuration."""
+        return self._rate_limiter
+    
     def execute_with_retry(self, operation, service_name: str = 'unknown', *args, **kwargs) -> Any:
         """
         Execute AWS API operation with advanced retry logic and rate limiting.
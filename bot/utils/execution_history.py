@@ -0,0 +1,296 @@
+#!/usr/bin/env python3
+"""
+Execution History Store for Advanced FinOps Platform
+
+SQLite-backed history of optimization executions for the long-running
+execution engine:
+- Indexes on resource ID, status and completion time, so filtered and
+  most-recent-first queries read only the rows they return
+- Count, savings and execution time aggregates per status maintained on
+  every insert and delete instead of recomputed from the full history
+- Retention cleanup as one indexed range delete, and a record cap that
+  drops the oldest executions so the default in-memory store stays bounded
+- Optional on-disk file so history survives restarts and stays out of memory
+
+Requirements: 8.5 - Result validation, savings calculation and performance monitoring
+"""
+
+import json
+import logging
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Dict, List, Any, Optional
+
+logger = logging.getLogger(__name__)
+
+# Upper bound for prefix range scans on resource IDs
+_PREFIX_END = '\U0010ffff'
+
+# Records kept by default; the oldest completed executions are dropped beyond it
+DEFAULT_MAX_RECORDS = 50000
+
+
+class ExecutionHistoryStore:
+    """
+    Indexed execution history with incrementally maintained aggregates.
+
+    Records are execution result dictionaries (ExecutionResult.to_dict()).
+    Each is stored as JSON next to the indexed execution_id, resource_id,
+    status and completion time columns. Aggregates live in a small table
+    updated in the same transaction as the record and are cached in memory,
+    so counts and averages never scan the history.
+    """
+
+    def __init__(self, db_path: Optional[str] = None, max_records: Optional[int] = DEFAULT_MAX_RECORDS):
+        """
+        Initialize execution history store.
+
+        Args:
+            db_path: SQLite file for persistent history (None keeps it in an in-memory database)
+            max_records: Records kept before the oldest are deleted (None keeps every record)
+        """
+        self.db_path = db_path or ':memory:'
+        self.max_records = max_records
+        if db_path:
+            Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+
+        self._lock = threading.RLock()
+        self._connection = sqlite3.connect(self.db_path, timeout=30, check_same_thread=False)
+        if db_path:
+            self._connection.execute('PRAGMA journal_mode=WAL')
+        with self._connection:
+            self._connection.execute('''
+                CREATE TABLE IF NOT EXISTS execution_history (
+                    execution_id TEXT PRIMARY KEY,
+                    resource_id TEXT NOT NULL,
+                    status TEXT NOT NULL,
+                    completed_at TEXT NOT NULL,
+                    actual_savings REAL NOT NULL,
+                    execution_time REAL NOT NULL,
+                    record TEXT NOT NULL
+                )
+            ''')
+            self._connection.execute(
+                'CREATE INDEX IF NOT EXISTS idx_history_resource ON execution_history (resource_id, completed_at)'
+            )
+            self._connection.execute(
+                'CREATE INDEX IF NOT EXISTS idx_history_status ON execution_history (status, completed_at)'
+            )
+            self._connection.execute(
+                'CREATE INDEX IF NOT EXISTS idx_history_completed ON execution_history (completed_at)'
+            )
+            self._connection.execute('''
+                CREATE TABLE IF NOT EXISTS execution_aggregates (
+                    status TEXT PRIMARY KEY,
+                    count INTEGER NOT NULL,
+                    actual_savings REAL NOT NULL,
+                    execution_time REAL NOT NULL
+                )
+            ''')
+
+        self._aggregates: Dict[str, Dict[str, float]] = {
+            status: {'count': count, 'actual_savings': savings, 'execution_time': execution_time}
+            for status, count, savings, execution_time in self._connection.execute(
+                'SELECT status, count, actual_savings, execution_time FROM execution_aggregates'
+            )
+        }
+
+    def __len__(self) -> int:
+        with self._lock:
+            return int(sum(aggregate['count'] for aggregate in self._aggregates.values()))
+
+    def add(self, record: Dict[str, Any]) -> None:
+        """
+        Add an execution record, replacing any earlier record with the same execution ID.
+
+        Args:
+            record: Execution result dictionary
+        """
+        row = (
+            record['execution_id'],
+            record.get('resource_id') or '',
+            record.get('status') or '',
+            record.get('completed_at') or record.get('started_at') or '',
+            float(record.get('actual_savings') or 0.0),
+            float(record.get('execution_time_seconds') or 0.0),
+            json.dumps(record, default=str)
+        )
+
+        with self._lock:
+            deltas: Dict[str, List[float]] = {}
+            with self._connection:
+                previous = self._connection.execute(
+                    'SELECT status, actual_savings, execution_time FROM execution_history WHERE execution_id = ?',
+                    (row[0],)
+                ).fetchone()
+                if previous:
+                    self._stage_aggregate(deltas, previous[0], -1, -previous[1], -previous[2])
+
+                self._connection.execute(
+                    'INSERT OR REPLACE INTO execution_history '
+                    '(execution_id, resource_id, status, completed_at, actual_savings, execution_time, record) '
+                    'VALUES (?, ?, ?, ?, ?, ?, ?)',
+                    row
+                )
+                self._stage_aggregate(deltas, row[2], 1, row[4], row[5])
+
+                if self.max_records is not None:
+                    excess = len(self) + sum(delta[0] for delta in deltas.values()) - self.max_records
+                    if excess > 0:
+                        self._delete_oldest(excess, deltas)
+                self._write_aggregates(deltas)
+            self._merge_aggregates(deltas)
+
+    def get(self, execution_id: str) -> Optional[Dict[str, Any]]:
+        """Execution record by ID, None when unknown."""
+        with self._lock:
+            row = self._connection.execute(
+                'SELECT record FROM execution_history WHERE execution_id = ?', (execution_id,)
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def query(self,
+              limit: int = 100,
+              status: Optional[str] = None,
+              resource_id: Optional[str] = None,
+              resource_match: str = 'exact') -> List[Dict[str, Any]]:
+        """
+        Most recent execution records first, read through the matching index.
+
+        Args:
+            limit: Maximum number of records to return
+            status: Only records with this status
+            resource_id: Only records for this resource ID
+            resource_match: How resource_id matches: 'exact', 'prefix' (uses the
+                resource index) or 'substring' (IDs containing the value)
+
+        Returns:
+            Execution records ordered by completion time, newest first
+        """
+        conditions = []
+        parameters: List[Any] = []
+        if status:
+            conditions.append('status = ?')
+            parameters.append(status)
+        if resource_id:
+            if resource_match == 'prefix':
+                conditions.append('resource_id >= ? AND resource_id < ?')
+                parameters.extend([resource_id, resource_id + _PREFIX_END])
+            elif resource_match == 'substring':
+                conditions.append('instr(resource_id, ?) > 0')
+                parameters.append(resource_id)
+            else:
+                conditions.append('resource_id = ?')
+                parameters.append(resource_id)
+
+        sql = 'SELECT record FROM execution_history'
+        if conditions:
+            sql += ' WHERE ' + ' AND '.join(conditions)
+        sql += ' ORDER BY completed_at DESC LIMIT ?'
+        parameters.append(int(limit))
+
+        with self._lock:
+            rows = self._connection.execute(sql, parameters).fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+    def delete_completed_before(self, cutoff: str) -> int:
+        """
+        Delete records completed before a cutoff.
+
+        Args:
+            cutoff: ISO 8601 completion time; older records are removed
+
+        Returns:
+            Number of records deleted
+        """
+        with self._lock:
+            deltas: Dict[str, List[float]] = {}
+            with self._connection:
+                removed = self._connection.execute(
+                    'SELECT status, COUNT(*), SUM(actual_savings), SUM(execution_time) '
+                    'FROM execution_history WHERE completed_at < ? GROUP BY status',
+                    (cutoff,)
+                ).fetchall()
+                self._connection.execute('DELETE FROM execution_history WHERE completed_at < ?', (cutoff,))
+                for status, count, savings, execution_time in removed:
+                    self._stage_aggregate(deltas, status, -count, -(savings or 0.0), -(execution_time or 0.0))
+                self._write_aggregates(deltas)
+            self._merge_aggregates(deltas)
+        return int(sum(row[1] for row in removed))
+
+    def get_aggregates(self) -> Dict[str, Any]:
+        """
+        Totals across the stored history without scanning it.
+
+        Returns:
+            Record count, counts by status, total actual savings and average execution time
+        """
+        with self._lock:
+            total = sum(aggregate['count'] for aggregate in self._aggregates.values())
+            execution_time = sum(aggregate['execution_time'] for aggregate in self._aggregates.values())
+            return {
+                'total_records': int(total),
+                'status_counts': {
+                    status: int(aggregate['count']) for status, aggregate in self._aggregates.items()
+                    if aggregate['count']
+                },
+                'total_actual_savings': sum(aggregate['actual_savings'] for aggregate in self._aggregates.values()),
+                'total_execution_time': execution_time,
+                'average_execution_time': execution_time / total if total else 0.0
+            }
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._connection.close()
+
+    # Private helper methods
+
+    def _delete_oldest(self, count: int, deltas: Dict[str, List[float]]) -> None:
+        """Delete the oldest completed records in the open transaction, through the completion time index."""
+        oldest = self._connection.execute(
+            'SELECT execution_id, status, actual_savings, execution_time FROM execution_history '
+            'ORDER BY completed_at LIMIT ?',
+            (count,)
+        ).fetchall()
+        self._connection.executemany(
+            'DELETE FROM execution_history WHERE execution_id = ?', [(row[0],) for row in oldest]
+        )
+        for _, status, savings, execution_time in oldest:
+            self._stage_aggregate(deltas, status, -1, -savings, -execution_time)
+
+    @staticmethod
+    def _stage_aggregate(deltas: Dict[str, List[float]], status: str,
+                         count: int, savings: float, execution_time: float) -> None:
+        """Accumulate one status's aggregate change for the open transaction."""
+        delta = deltas.setdefault(status, [0, 0.0, 0.0])
+        delta[0] += count
+        delta[1] += savings
+        delta[2] += execution_time
+
+    def _aggregate_after(self, status: str, delta: List[float]) -> Dict[str, float]:
+        """One status's aggregates once a staged change is applied, leaving the cache untouched."""
+        aggregate = self._aggregates.get(status, {'count': 0, 'actual_savings': 0.0, 'execution_time': 0.0})
+        return {
+            'count': aggregate['count'] + delta[0],
+            'actual_savings': aggregate['actual_savings'] + delta[1],
+            'execution_time': aggregate['execution_time'] + delta[2]
+        }
+
+    def _write_aggregates(self, deltas: Dict[str, List[float]]) -> None:
+        """Write staged aggregate changes to the aggregates table in the open transaction."""
+        rows = []
+        for status, delta in deltas.items():
+            aggregate = self._aggregate_after(status, delta)
+            rows.append((status, aggregate['count'], aggregate['actual_savings'], aggregate['execution_time']))
+        self._connection.executemany(
+            'INSERT OR REPLACE INTO execution_aggregates (status, count, actual_savings, execution_time) '
+            'VALUES (?, ?, ?, ?)',
+            rows
+        )
+
+    def _merge_aggregates(self, deltas: Dict[str, List[float]]) -> None:
+        """Apply staged aggregate changes to the in-memory cache once their transaction has committed."""
+        for status, delta in deltas.items():
+            self._aggregates[status] = self._aggregate_after(status, delta)
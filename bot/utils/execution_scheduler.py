@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+"""
+Execution Scheduler for Advanced FinOps Platform
+
+Runs large remediation batches at the highest throughput AWS will accept:
+- Global worker cap shared by every execution in a batch
+- Concurrency budget per service derived from the AWSConfig rate limiter,
+  shared by the service's (service, region) lanes and shrinking while the
+  service is being throttled
+- Exclusive per-resource locks kept in an index, so two executions never
+  touch the same resource at the same time
+- Items waiting on a busy resource are parked behind it instead of rescanned
+
+Requirements: 8.2 - Execution scheduling and batch processing
+"""
+
+import concurrent.futures
+import logging
+import threading
+from collections import OrderedDict, deque
+from typing import Dict, List, Any, Optional, Callable, Iterable, Tuple
+
+from .aws_config import RateLimiter
+
+logger = logging.getLogger(__name__)
+
+# Approximate AWS API calls one execution makes (describe, modify, state polls)
+API_CALLS_PER_EXECUTION = 5
+
+# Service whose API rate limit applies to each resource type
+RESOURCE_TYPE_SERVICES = {
+    'ec2': 'ec2',
+    'ebs': 'ec2',
+    'eip': 'ec2',
+    'elastic_ip': 'ec2',
+    'rds': 'rds',
+    'lambda': 'lambda',
+    's3': 's3'
+}
+
+# Maximum halvings of a lane budget while its service is throttled
+_MAX_THROTTLE_HALVINGS = 4
+
+
+class ResourceLockIndex:
+    """
+    Thread-safe index of resources held by running executions.
+
+    Acquiring is non-blocking: the caller learns immediately whether another
+    execution holds the resource, in O(1) rather than by scanning executions.
+    """
+
+    def __init__(self):
+        """Initialize resource lock index."""
+        self._lock = threading.Lock()
+        self._holders: Dict[str, str] = {}
+
+    def __len__(self) -> int:
+        return len(self._holders)
+
+    def acquire(self, resource_id: str, owner_id: str) -> bool:
+        """
+        Lock a resource for an owner.
+
+        Returns:
+            True if the owner now holds the resource (or already did)
+        """
+        with self._lock:
+            holder = self._holders.setdefault(resource_id, owner_id)
+            return holder == owner_id
+
+    def release(self, resource_id: str, owner_id: str) -> bool:
+        """
+        Release a resource held by an owner.
+
+        Returns:
+            True if the owner held the resource
+        """
+        with self._lock:
+            if self._holders.get(resource_id) != owner_id:
+                return False
+            del self._holders[resource_id]
+            return True
+
+    def holder(self, resource_id: str) -> Optional[str]:
+        """Owner currently holding a resource, None when it is free."""
+        with self._lock:
+            return self._holders.get(resource_id)
+
+
+class ExecutionScheduler:
+    """
+    Bounded, rate-aware and resource-exclusive dispatcher for batch executions.
+
+    Pending items are queued per (service, region) lane. The rate limiter
+    counts calls per service, so every lane of a service draws on one
+    service budget. The dispatcher starts items round-robin across lanes
+    whose service is under its budget while the worker pool has room; an
+    item whose resource is busy is parked behind that resource and returns
+    to the front of its lane when the resource is released. Each dispatch
+    decision therefore looks at the lanes, not at every pending item.
+    """
+
+    def __init__(self,
+                 max_workers: int = 5,
+                 rate_limiter: Optional[RateLimiter] = None,
+                 calls_per_execution: int = API_CALLS_PER_EXECUTION):
+        """
+        Initialize execution scheduler.
+
+        Args:
+            max_workers: Global cap on concurrent executions
+            rate_limiter: Rate limiter whose per-service limits size the service budgets
+            calls_per_execution: Approximate AWS API calls made by one execution
+        """
+        self.max_workers = max(1, max_workers)
+        self.rate_limiter = rate_limiter or RateLimiter()
+        self.calls_per_execution = max(1, calls_per_execution)
+        self._statistics = {
+            'dispatched': 0,
+            'peakConcurrency': 0,
+            'resourceWaits': 0,
+            'serviceBudgets': {}
+        }
+
+    def service_budget(self, service: str) -> int:
+        """
+        Concurrent executions allowed across all regions of a service.
+
+        The service's calls-per-second limit divided by the calls one
+        execution makes, capped by the worker pool and halved for each
+        consecutive throttling response the rate limiter has seen.
+        """
+        budget = int(self.rate_limiter.get_limit(service) // self.calls_per_execution)
+        budget = max(1, min(self.max_workers, budget))
+        throttles = min(self.rate_limiter.get_throttle_count(service), _MAX_THROTTLE_HALVINGS)
+        return max(1, budget >> throttles)
+
+    def run(self,
+            items: Iterable[Dict[str, Any]],
+            worker: Callable[[Dict[str, Any]], Any],
+            key_func: Callable[[Dict[str, Any]], Tuple[str, str, str]],
+            error_handler: Optional[Callable[[Dict[str, Any], Exception], Any]] = None) -> List[Any]:
+        """
+        Run worker on every item under the worker, service and resource limits.
+
+        Args:
+            items: Items to execute
+            worker: Callable executing one item
+            key_func: Returns (resource_id, service, region) for an item
+            error_handler: Builds a result from an item and the exception it raised
+                (exceptions propagate when not given)
+
+        Returns:
+            Worker results in input order
+        """
+        items = list(items)
+        results: List[Any] = [None] * len(items)
+        lanes: Dict[Tuple[str, str], deque] = OrderedDict()
+        for position, item in enumerate(items):
+            resource_id, service, region = key_func(item)
+            lanes.setdefault((service, region), deque()).append((position, resource_id))
+
+        services = {service for service, _ in lanes}
+        running: Dict[str, int] = {service: 0 for service in services}
+        budgets = {service: self.service_budget(service) for service in services}
+        busy_resources = set()
+        parked: Dict[str, deque] = {}
+        in_flight: Dict[concurrent.futures.Future, Tuple[int, str, Tuple[str, str]]] = {}
+
+        self._statistics['serviceBudgets'].update(budgets)
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            while True:
+                # Start work round-robin across lanes whose service has spare
+                # budget while workers are free, so no region starves another
+                progress = True
+                while progress and len(in_flight) < self.max_workers:
+                    progress = False
+                    for lane, queue in lanes.items():
+                        service = lane[0]
+                        if not queue or running[service] >= budgets[service] or len(in_flight) >= self.max_workers:
+                            continue
+                        progress = True
+                        position, resource_id = queue.popleft()
+                        if resource_id in busy_resources:
+                            parked.setdefault(resource_id, deque()).append((position, lane))
+                            self._statistics['resourceWaits'] += 1
+                            continue
+                        busy_resources.add(resource_id)
+                        running[service] += 1
+                        in_flight[executor.submit(worker, items[position])] = (position, resource_id, lane)
+                        self._statistics['dispatched'] += 1
+
+                if not in_flight:
+                    break
+                self._statistics['peakConcurrency'] = max(self._statistics['peakConcurrency'], len(in_flight))
+
+                done, _ = concurrent.futures.wait(in_flight, return_when=concurrent.futures.FIRST_COMPLETED)
+                for future in done:
+                    position, resource_id, lane = in_flight.pop(future)
+                    try:
+                        results[position] = future.result()
+                    except Exception as e:
+                        if error_handler is None:
+                            raise
+                        logger.error(f"Scheduled execution for {resource_id} failed: {str(e)}")
+                        results[position] = error_handler(items[position], e)
+
+                    running[lane[0]] -= 1
+                    budgets[lane[0]] = self.service_budget(lane[0])
+                    busy_resources.discard(resource_id)
+
+                    # Hand the resource to the next item parked behind it
+                    waiting = parked.get(resource_id)
+                    if waiting:
+                        next_position, next_lane = waiting.popleft()
+                        if not waiting:
+                            del parked[resource_id]
+                        lanes[next_lane].appendleft((next_position, resource_id))
+
+        logger.info(
+            f"Scheduled {len(items)} executions across {len(lanes)} service/region lanes "
+            f"(peak concurrency {self._statistics['peakConcurrency']})"
+        )
+        return results
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """Dispatch counts, peak concurrency, resource waits and service budgets."""
+        statistics = dict(self._statistics)
+        statistics['serviceBudgets'] = dict(self._statistics['serviceBudgets'])
+        return statistics
+
+
+def execution_lane(optimization_data: Dict[str, Any]) -> Tuple[str, str, str]:
+    """(resource_id, service, region) of an optimization recommendation."""
+    resource_type = str(optimization_data.get('resourceType', 'unknown')).lower()
+    resource_data = optimization_data.get('resourceData') or {}
+    return (
+        optimization_data.get('resourceId', 'unknown'),
+        RESOURCE_TYPE_SERVICES.get(resource_type, resource_type),
+        resource_data.get('region', 'unknown')
+    )
@@ -0,0 +1,435 @@
+#!/usr/bin/env python3
+"""
+Hierarchy Tree for Advanced FinOps Platform
+
+Shared organization -> business unit -> team -> project structure used by
+cost allocation and budget management:
+- Nodes stored in arrays with precomputed root-to-node ancestor paths
+- Bottom-up aggregation of any number of measures in a single pass
+- Incremental updates that only touch the changed node's ancestors
+- Nodes moved to another parent or removed, keeping their own values
+- Level views (all teams, all projects) without walking flat dictionaries
+- Nodes built from nested definitions keyed by their path, so the same
+  name may appear under different parents
+
+Requirements: 6.1, 6.2 - Hierarchical budgets and cost rollup
+"""
+
+import logging
+from collections import deque
+from typing import Dict, List, Any, Optional, Iterable, Sequence, Union
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Default level names by depth
+HIERARCHY_LEVELS = ('organization', 'business_unit', 'team', 'project')
+
+# Joins node names into path identifiers in from_nested
+PATH_SEPARATOR = '/'
+
+
+class HierarchyTree:
+    """
+    Array-backed hierarchy with precomputed ancestors and cached rollups.
+
+    A parent is always added before its children, so node indices are a
+    topological order: summing children into parents one depth at a time,
+    deepest first, rolls a measure up in O(nodes). Rolled-up totals are
+    cached per measure, and changing one node's value adds the delta along
+    its ancestor array in O(depth).
+
+    Nodes may carry a display name different from their identifier. Methods
+    taking a node identifier also accept a display name that belongs to
+    exactly one node.
+    """
+
+    def __init__(self, levels: Sequence[str] = HIERARCHY_LEVELS):
+        """
+        Initialize hierarchy tree.
+
+        Args:
+            levels: Level names by depth, used when a node is added without a level
+        """
+        self.levels = tuple(levels)
+        self._ids: List[str] = []
+        self._index: Dict[str, int] = {}
+        self._parents: List[int] = []
+        self._node_levels: List[str] = []
+        self._ancestors: List[np.ndarray] = []
+        self._children: List[List[int]] = []
+        self._attributes: List[Dict[str, Any]] = []
+        self._names: Dict[str, List[int]] = {}
+        self._values: Dict[str, List[float]] = {}
+        self._totals: Dict[str, np.ndarray] = {}
+        self._depth_groups: Optional[List[np.ndarray]] = None
+
+    @classmethod
+    def from_nested(cls, nested: Dict[str, Any], levels: Sequence[str] = HIERARCHY_LEVELS) -> 'HierarchyTree':
+        """
+        Build a tree from nested mappings.
+
+        Each node is identified by its path from the root joined with
+        PATH_SEPARATOR (e.g. "acme/eng/platform") and keeps its own name as
+        the name attribute, so sibling subtrees may reuse names.
+
+        Args:
+            nested: {root: {child: {...}}}; a list or a string at any depth holds leaf nodes
+            levels: Level names by depth
+
+        Returns:
+            Populated hierarchy tree
+        """
+        tree = cls(levels)
+        pending = deque([(None, nested)])
+        while pending:
+            parent_id, children = pending.popleft()
+            if isinstance(children, dict):
+                items = children.items()
+            elif isinstance(children, (list, tuple, set)):
+                items = ((child, None) for child in children)
+            elif children is not None:
+                items = [(children, None)]
+            else:
+                items = []
+
+            for name, grandchildren in items:
+                name = str(name)
+                node_id = f"{parent_id}{PATH_SEPARATOR}{name}" if parent_id is not None else name
+                tree.add_node(node_id, parent_id, name=name)
+                if grandchildren:
+                    pending.append((node_id, grandchildren))
+        return tree
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __contains__(self, node_id: str) -> bool:
+        return self.resolve(node_id) is not None
+
+    def add_node(self, node_id: str, parent_id: Optional[str] = None,
+                 level: Optional[str] = None, **attributes) -> None:
+        """
+        Add a node under an existing parent (or as a root).
+
+        Args:
+            node_id: Unique node identifier
+            parent_id: Parent node identifier or unique name, None for a root
+            level: Level name (defaults to the level name for the node's depth)
+            **attributes: Arbitrary node attributes (name sets the display name)
+        """
+        if node_id in self._index:
+            raise ValueError(f"Node {node_id} already exists")
+        parent = self._resolve_index(parent_id) if parent_id is not None else -1
+        if parent is None:
+            raise ValueError(f"Parent node {parent_id} does not exist")
+
+        index = len(self._ids)
+        ancestors = np.append(self._ancestors[parent], index) if parent >= 0 else np.array([index])
+        depth = len(ancestors) - 1
+
+        self._ids.append(node_id)
+        self._index[node_id] = index
+        self._parents.append(parent)
+        self._node_levels.append(level or self._default_level(depth))
+        self._ancestors.append(ancestors)
+        self._children.append([])
+        self._attributes.append(attributes)
+        self._names.setdefault(str(attributes.get('name', node_id)), []).append(index)
+        if parent >= 0:
+            self._children[parent].append(index)
+
+        for values in self._values.values():
+            values.append(0.0)
+        for measure, totals in self._totals.items():
+            self._totals[measure] = np.append(totals, 0.0)
+        self._depth_groups = None
+
+    def move_node(self, node_id: str, parent_id: Optional[str] = None) -> None:
+        """
+        Move a node and its subtree under another parent (or make it a root).
+
+        Levels that were defaulted from the depth follow the new depth; own
+        values are kept and cached rollups are recomputed on next use.
+
+        Args:
+            node_id: Node identifier or unique name
+            parent_id: New parent identifier or unique name, None for a root
+        """
+        index = self._node(node_id)
+        parent = self._resolve_index(parent_id) if parent_id is not None else -1
+        if parent is None:
+            raise ValueError(f"Parent node {parent_id} does not exist")
+        if parent >= 0 and index in self._ancestors[parent]:
+            raise ValueError(f"Node {node_id} cannot move under itself or its descendant {parent_id}")
+        if parent == self._parents[index]:
+            return
+
+        parents = list(self._parents)
+        parents[index] = parent
+        self._relayout(range(len(self._ids)), parents)
+
+    def remove_node(self, node_id: str) -> None:
+        """
+        Remove a node; its children move up to its parent (or become roots).
+
+        Args:
+            node_id: Node identifier or unique name
+        """
+        index = self._node(node_id)
+        removed_parent = self._parents[index]
+        parents = [removed_parent if parent == index else parent for parent in self._parents]
+        self._relayout((kept for kept in range(len(self._ids)) if kept != index), parents)
+
+    def parent(self, node_id: str) -> Optional[str]:
+        """Parent node identifier, None for a root."""
+        parent = self._parents[self._node(node_id)]
+        return self._ids[parent] if parent >= 0 else None
+
+    def children(self, node_id: str) -> List[str]:
+        """Direct child node identifiers."""
+        return [self._ids[child] for child in self._children[self._node(node_id)]]
+
+    def path(self, node_id: str) -> List[str]:
+        """Node identifiers from the root down to the node."""
+        return [self._ids[ancestor] for ancestor in self._ancestors[self._node(node_id)]]
+
+    def name(self, node_id: str) -> str:
+        """Display name of a node (its identifier unless added with a name)."""
+        index = self._node(node_id)
+        return str(self._attributes[index].get('name', self._ids[index]))
+
+    def name_path(self, node_id: str) -> List[str]:
+        """Display names from the root down to the node."""
+        return [self.name(self._ids[ancestor]) for ancestor in self._ancestors[self._node(node_id)]]
+
+    def find(self, name: str) -> List[str]:
+        """Identifiers of every node with the given display name."""
+        return [self._ids[index] for index in self._names.get(name, [])]
+
+    def resolve(self, key: str) -> Optional[str]:
+        """
+        Node identifier for an identifier or a display name.
+
+        Returns:
+            The identifier, or None when the key is unknown or a display name
+            shared by several nodes
+        """
+        index = self._resolve_index(key)
+        return self._ids[index] if index is not None else None
+
+    def level(self, node_id: str) -> str:
+        """Level name of a node."""
+        return self._node_levels[self._node(node_id)]
+
+    def attributes(self, node_id: str) -> Dict[str, Any]:
+        """Attributes the node was added with."""
+        return self._attributes[self._node(node_id)]
+
+    def nodes(self, level: Optional[str] = None) -> List[str]:
+        """Node identifiers in insertion order, optionally restricted to one level."""
+        if level is None:
+            return list(self._ids)
+        return [node_id for node_id, node_level in zip(self._ids, self._node_levels) if node_level == level]
+
+    def value(self, node_id: str, measure: str = 'cost') -> float:
+        """Value recorded directly on a node."""
+        values = self._values.get(measure)
+        return values[self._node(node_id)] if values is not None else 0.0
+
+    def set_value(self, node_id: str, value: float, measure: str = 'cost') -> None:
+        """Set a node's own value and update cached rollups along its ancestors."""
+        index = self._node(node_id)
+        values = self._measure_values(measure)
+        delta = float(value) - values[index]
+        values[index] = float(value)
+        totals = self._totals.get(measure)
+        if totals is not None and delta:
+            totals[self._ancestors[index]] += delta
+
+    def add_value(self, node_id: str, amount: float, measure: str = 'cost') -> None:
+        """Add to a node's own value and update cached rollups along its ancestors."""
+        self.set_value(node_id, self.value(node_id, measure) + amount, measure)
+
+    def set_values(self, values: Dict[str, float], measure: str = 'cost') -> List[str]:
+        """
+        Replace every node's own value for a measure and roll it up once.
+
+        Args:
+            values: Own values by node identifier or unique display name
+                (missing nodes are set to zero)
+            measure: Measure name
+
+        Returns:
+            Keys in values that are not nodes of the tree or are ambiguous names
+        """
+        own = [0.0] * len(self._ids)
+        unknown = []
+        for node_id, value in values.items():
+            index = self._resolve_index(node_id)
+            if index is None:
+                unknown.append(node_id)
+            else:
+                own[index] += float(value)
+        self._values[measure] = own
+        self._totals.pop(measure, None)
+        self._rolled_up(measure)
+        return unknown
+
+    def total(self, node_id: str, measure: str = 'cost') -> float:
+        """Node value plus the values of all its descendants."""
+        return float(self._rolled_up(measure)[self._node(node_id)])
+
+    def rollup(self, measure: str = 'cost', level: Optional[str] = None) -> Dict[str, float]:
+        """
+        Rolled-up totals by node.
+
+        Args:
+            measure: Measure name
+            level: Optional level name to restrict the result to
+
+        Returns:
+            Dict mapping node identifier to its subtree total
+        """
+        totals = self._rolled_up(measure).tolist()
+        return {
+            node_id: totals[index] for index, node_id in enumerate(self._ids)
+            if level is None or self._node_levels[index] == level
+        }
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Nodes with name, parent, level and path, for reports and persistence."""
+        return {
+            node_id: {
+                'name': str(self._attributes[index].get('name', node_id)),
+                'parent': self._ids[self._parents[index]] if self._parents[index] >= 0 else None,
+                'level': self._node_levels[index],
+                'path': [self._ids[ancestor] for ancestor in self._ancestors[index]]
+            }
+            for index, node_id in enumerate(self._ids)
+        }
+
+    # Private helper methods
+
+    def _node(self, node_id: str) -> int:
+        """Index of a node, raising for unknown identifiers and ambiguous names."""
+        index = self._resolve_index(node_id)
+        if index is None:
+            if len(self._names.get(node_id, [])) > 1:
+                raise ValueError(f"Node name {node_id} is ambiguous, use one of {self.find(node_id)}")
+            raise ValueError(f"Node {node_id} does not exist")
+        return index
+
+    def _resolve_index(self, key: str) -> Optional[int]:
+        """Index of the node with the given identifier or unique display name."""
+        index = self._index.get(key)
+        if index is None:
+            matches = self._names.get(key, [])
+            if len(matches) == 1:
+                index = matches[0]
+        return index
+
+    def _default_level(self, depth: int) -> str:
+        """Level name for a node added at a depth without an explicit level."""
+        return self.levels[depth] if depth < len(self.levels) else f"level_{depth}"
+
+    def _relayout(self, kept: Iterable[int], parents: List[int]) -> None:
+        """
+        Rebuild the node arrays for kept node indices under new parent indices.
+
+        Nodes keep their relative insertion order except that a parent is
+        placed before its children, which restores the topological order the
+        rollup relies on.
+        """
+        order: List[int] = []
+        placed = set()
+        for index in kept:
+            chain = []
+            while index >= 0 and index not in placed:
+                chain.append(index)
+                index = parents[index]
+            for node in reversed(chain):
+                placed.add(node)
+                order.append(node)
+
+        ids, node_levels, attributes = self._ids, self._node_levels, self._attributes
+        old_depths = [len(ancestors) - 1 for ancestors in self._ancestors]
+        position = {old: new for new, old in enumerate(order)}
+
+        self._ids = [ids[old] for old in order]
+        self._index = {node_id: new for new, node_id in enumerate(self._ids)}
+        self._parents = [position[parents[old]] if parents[old] >= 0 else -1 for old in order]
+        self._attributes = [attributes[old] for old in order]
+        self._ancestors = []
+        self._node_levels = []
+        self._children = [[] for _ in order]
+        self._names = {}
+        for new, old in enumerate(order):
+            parent = self._parents[new]
+            ancestors = np.append(self._ancestors[parent], new) if parent >= 0 else np.array([new])
+            self._ancestors.append(ancestors)
+            depth = len(ancestors) - 1
+            level = node_levels[old]
+            if level == self._default_level(old_depths[old]):
+                level = self._default_level(depth)
+            self._node_levels.append(level)
+            self._names.setdefault(str(self._attributes[new].get('name', self._ids[new])), []).append(new)
+            if parent >= 0:
+                self._children[parent].append(new)
+
+        self._values = {measure: [values[old] for old in order] for measure, values in self._values.items()}
+        self._totals = {}
+        self._depth_groups = None
+
+    def _measure_values(self, measure: str) -> List[float]:
+        """Own values for a measure, created as zeros on first use."""
+        if measure not in self._values:
+            self._values[measure] = [0.0] * len(self._ids)
+        return self._values[measure]
+
+    def _rolled_up(self, measure: str) -> np.ndarray:
+        """Cached subtree totals for a measure, computed in one bottom-up pass."""
+        totals = self._totals.get(measure)
+        if totals is not None:
+            return totals
+
+        totals = np.array(self._measure_values(measure), dtype=float)
+        parents = np.asarray(self._parents, dtype=np.int64)
+        for group in reversed(self._depth_index()[1:]):
+            np.add.at(totals, parents[group], totals[group])
+        self._totals[measure] = totals
+        return totals
+
+    def _depth_index(self) -> List[np.ndarray]:
+        """Node indices grouped by depth."""
+        if self._depth_groups is None:
+            depths = np.fromiter((len(ancestors) - 1 for ancestors in self._ancestors),
+                                 dtype=np.int64, count=len(self._ancestors))
+            order = np.argsort(depths, kind='stable')
+            boundaries = np.searchsorted(depths[order], np.arange(1, depths.max() + 1)) if len(depths) else []
+            self._depth_groups = np.split(order, boundaries) if len(depths) else []
+        return self._depth_groups
+
+
+def build_hierarchy_tree(structure: Dict[str, Any],
+                         levels: Optional[Sequence[str]] = None) -> HierarchyTree:
+    """
+    Build a tree from an organizational hierarchy definition.
+
+    Accepts the definition used by cost allocation: {"organization": name,
+    "levels": [...], "business_units": {unit: teams}} where teams is a list of
+    team names or a mapping of team to projects. Nodes are keyed by path, see
+    HierarchyTree.from_nested.
+
+    Args:
+        structure: Organizational hierarchy definition
+        levels: Level names by depth (defaults to structure["levels"])
+
+    Returns:
+        Hierarchy tree rooted at the organization
+    """
+    levels = levels or structure.get('levels') or HIERARCHY_LEVELS
+    organization = str(structure.get('organization', 'organization'))
+    units: Union[Dict[str, Any], List[Any], None] = structure.get('business_units')
+    return HierarchyTree.from_nested({organization: units}, levels)
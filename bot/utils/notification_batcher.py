@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""
+Notification Batcher for Advanced FinOps Platform
+
+Digest delivery for stakeholder notifications:
+- Events coalesced per recipient within a configurable window
+- One digest per recipient per window, built from the unchanged per-event
+  subjects and bodies
+- Digests sent asynchronously by worker threads reading a bounded queue,
+  so a slow mail service applies backpressure instead of growing memory
+- Delivery statistics for monitoring
+
+Requirements: 8.3 - Stakeholder notification for approval workflows
+"""
+
+import logging
+import queue
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List, Any, Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+def render_digest(events: List[Dict[str, Any]]) -> Dict[str, str]:
+    """
+    Combine the notifications for one recipient into one message.
+
+    A single event is sent exactly as rendered; several events are sent
+    under a digest subject with each event's subject and body in order.
+
+    Args:
+        events: Events with 'subject' and 'body' keys, oldest first
+
+    Returns:
+        Dictionary with 'subject' and 'body' keys
+    """
+    if len(events) == 1:
+        return {'subject': events[0]['subject'], 'body': events[0]['body']}
+
+    sections = [f"{event['subject']}\n{event['body']}" for event in events]
+    return {
+        'subject': f'FinOps Notification Digest: {len(events)} workflow updates',
+        'body': ('\n' + '-' * 60 + '\n').join(sections)
+    }
+
+
+class NotificationBatcher:
+    """
+    Coalesces notifications per recipient and sends them as digests.
+
+    The first event for a recipient opens its window; when the window closes
+    the dispatcher thread renders the recipient's events into one digest and
+    hands it to the bounded send queue. Windows open in event order and all
+    have the same length, so recipients are kept in an ordered dictionary
+    and only the oldest one's deadline is ever checked.
+    """
+
+    def __init__(self,
+                 send_func: Callable[[str, str, str], None],
+                 window_seconds: float = 60.0,
+                 max_pending_digests: int = 100,
+                 workers: int = 1):
+        """
+        Initialize notification batcher.
+
+        Args:
+            send_func: Called as send_func(recipient, subject, body) for each digest
+            window_seconds: How long events for a recipient are collected before sending
+            max_pending_digests: Maximum digests waiting to be sent before dispatch blocks
+            workers: Number of sender threads
+        """
+        self.send_func = send_func
+        self.window_seconds = max(0.0, window_seconds)
+        self._condition = threading.Condition()
+        self._buffers: 'OrderedDict[str, Dict[str, Any]]' = OrderedDict()
+        self._send_queue: queue.Queue = queue.Queue(maxsize=max(1, max_pending_digests))
+        self._closed = False
+        self._statistics = {
+            'eventsQueued': 0,
+            'digestsQueued': 0,
+            'digestsSent': 0,
+            'sendFailures': 0
+        }
+
+        self._dispatcher = threading.Thread(target=self._dispatch_loop, name='notification-dispatcher', daemon=True)
+        self._dispatcher.start()
+        self._workers = [
+            threading.Thread(target=self._send_loop, name=f'notification-sender-{index}', daemon=True)
+            for index in range(max(1, workers))
+        ]
+        for worker in self._workers:
+            worker.start()
+
+    def add(self, recipient: str, event: Dict[str, Any]) -> None:
+        """
+        Queue an event for a recipient's next digest.
+
+        Args:
+            recipient: Email address
+            event: Rendered notification with 'subject' and 'body' keys
+        """
+        with self._condition:
+            if self._closed:
+                raise RuntimeError("Notification batcher is closed")
+            buffer = self._buffers.get(recipient)
+            if buffer is None:
+                buffer = {'deadline': time.monotonic() + self.window_seconds, 'events': []}
+                self._buffers[recipient] = buffer
+                self._condition.notify()
+            buffer['events'].append(event)
+            self._statistics['eventsQueued'] += 1
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Send every buffered event now and wait until the digests are delivered.
+
+        Args:
+            timeout: Maximum seconds to wait for delivery (None waits indefinitely)
+
+        Returns:
+            True when all queued digests were delivered
+        """
+        with self._condition:
+            for buffer in self._buffers.values():
+                buffer['deadline'] = 0.0
+            self._condition.notify()
+
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self._condition:
+                delivered = self._statistics['digestsSent'] + self._statistics['sendFailures']
+                idle = not self._buffers and delivered == self._statistics['digestsQueued']
+            if idle:
+                return True
+            if deadline is not None and time.monotonic() >= deadline:
+                return False
+            time.sleep(0.01)
+
+    def close(self, timeout: Optional[float] = None) -> None:
+        """Flush pending digests and stop the background threads."""
+        self.flush(timeout)
+        with self._condition:
+            self._closed = True
+            self._condition.notify()
+        for _ in self._workers:
+            self._send_queue.put(None)
+        self._dispatcher.join(timeout)
+        for worker in self._workers:
+            worker.join(timeout)
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """Events, digests and failures so far, plus recipients with open windows."""
+        with self._condition:
+            statistics = dict(self._statistics)
+            statistics['pendingRecipients'] = len(self._buffers)
+            statistics['pendingEvents'] = sum(len(buffer['events']) for buffer in self._buffers.values())
+        return statistics
+
+    # Private helper methods
+
+    def _dispatch_loop(self) -> None:
+        """Render and queue digests as recipient windows close."""
+        while True:
+            with self._condition:
+                while not self._closed:
+                    if self._buffers:
+                        wait = next(iter(self._buffers.values()))['deadline'] - time.monotonic()
+                        if wait <= 0:
+                            break
+                        self._condition.wait(wait)
+                    else:
+                        self._condition.wait()
+                if self._closed and not self._buffers:
+                    return
+
+                # Deadlines increase in insertion order, so stop at the first open window
+                now = float('inf') if self._closed else time.monotonic()
+                due = []
+                for recipient, buffer in self._buffers.items():
+                    if buffer['deadline'] > now:
+                        break
+                    due.append(recipient)
+                digests = [(recipient, self._buffers.pop(recipient)['events']) for recipient in due]
+                self._statistics['digestsQueued'] += len(digests)
+
+            # Blocks when the send queue is full
+            for recipient, events in digests:
+                self._send_queue.put((recipient, events))
+
+    def _send_loop(self) -> None:
+        """Send queued digests until a stop marker is received."""
+        while True:
+            item = self._send_queue.get()
+            try:
+                if item is None:
+                    return
+                recipient, events = item
+                digest = render_digest(events)
+                try:
+                    self.send_func(recipient, digest['subject'], digest['body'])
+                    with self._condition:
+                        self._statistics['digestsSent'] += 1
+                except Exception as e:
+                    logger.error(f"Failed to send notification digest to {recipient}: {str(e)}")
+                    with self._condition:
+                        self._statistics['sendFailures'] += 1
+            finally:
+                self._send_queue.task_done()
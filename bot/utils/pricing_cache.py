@@ -0,0 +1,319 @@
+#!/usr/bin/env python3
+"""
+Shared Pricing Cache for Advanced FinOps Platform
+
+Provides one bounded cache layer for pricing and billing lookups shared by
+every client, scanner and engine in a process, with an optional on-disk
+backend shared across scheduler runs and worker processes:
+- Stable, process-independent cache keys
+- TTL expiry plus LRU eviction bounded by entry count and bytes
+- Optional SQLite backend that survives restarts
+- Hit-rate metrics published to the system monitor
+"""
+
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Any, Optional, Callable
+
+logger = logging.getLogger(__name__)
+
+_MISSING = object()
+
+
+class PricingCache:
+    """
+    Bounded TTL + LRU cache for pricing and billing data.
+
+    Entries live in an in-memory LRU tier. When a disk path is configured,
+    entries are also written through to a SQLite file so other processes and
+    later runs can read them; memory misses fall back to the disk tier.
+    Values must be JSON serializable.
+    """
+
+    def __init__(self, default_ttl: float = 3600, max_entries: int = 10000,
+                 max_bytes: int = 64 * 1024 * 1024, disk_path: Optional[str] = None,
+                 max_disk_bytes: int = 512 * 1024 * 1024):
+        """
+        Initialize pricing cache.
+
+        Args:
+            default_ttl: Default time-to-live in seconds
+            max_entries: Maximum number of in-memory entries
+            max_bytes: Maximum serialized size of in-memory entries
+            disk_path: Optional SQLite file for the shared on-disk backend
+            max_disk_bytes: Maximum serialized size of on-disk entries
+        """
+        self._lock = threading.RLock()
+        self._entries = OrderedDict()  # key -> (value, expires_at, size)
+        self._current_bytes = 0
+        self._connection = None
+        self._metrics = {
+            'hits': 0,
+            'misses': 0,
+            'diskHits': 0,
+            'sets': 0,
+            'evictions': 0,
+            'expirations': 0
+        }
+        self.configure(default_ttl, max_entries, max_bytes, disk_path, max_disk_bytes)
+
+    def configure(self, default_ttl: Optional[float] = None, max_entries: Optional[int] = None,
+                  max_bytes: Optional[int] = None, disk_path: Optional[str] = None,
+                  max_disk_bytes: Optional[int] = None) -> None:
+        """
+        Reconfigure limits and the on-disk backend.
+
+        Args:
+            default_ttl: Default time-to-live in seconds
+            max_entries: Maximum number of in-memory entries
+            max_bytes: Maximum serialized size of in-memory entries
+            disk_path: SQLite file for the on-disk backend (None leaves it unchanged)
+            max_disk_bytes: Maximum serialized size of on-disk entries
+        """
+        with self._lock:
+            if default_ttl is not None:
+                self.default_ttl = default_ttl
+            if max_entries is not None:
+                self.max_entries = max_entries
+            if max_bytes is not None:
+                self.max_bytes = max_bytes
+            if max_disk_bytes is not None:
+                self.max_disk_bytes = max_disk_bytes
+            if disk_path is not None:
+                self._open_disk_backend(disk_path)
+            self._enforce_memory_limits()
+
+    @staticmethod
+    def make_key(namespace: str, *parts: Any, **attributes: Any) -> str:
+        """
+        Build a stable cache key.
+
+        Unlike hash(), the digest does not depend on the interpreter's hash
+        seed, so keys match across processes and restarts.
+
+        Args:
+            namespace: Key namespace (e.g. 'pricing', 'billing_summary')
+            *parts: Positional key components
+            **attributes: Named key components
+
+        Returns:
+            Namespaced cache key
+        """
+        payload = json.dumps([parts, attributes], sort_keys=True, default=str, separators=(',', ':'))
+        return f"{namespace}:{hashlib.sha256(payload.encode('utf-8')).hexdigest()}"
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Get a cached value, or the default when missing or expired."""
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                value, expires_at, size = entry
+                if expires_at > now:
+                    self._entries.move_to_end(key)
+                    self._metrics['hits'] += 1
+                    return value
+                self._remove(key)
+                self._metrics['expirations'] += 1
+
+            if self._connection is not None:
+                value = self._disk_get(key, now)
+                if value is not _MISSING:
+                    self._metrics['hits'] += 1
+                    self._metrics['diskHits'] += 1
+                    return value
+
+            self._metrics['misses'] += 1
+            return default
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        """Cache a value for ttl seconds (default TTL when omitted)."""
+        ttl = self.default_ttl if ttl is None else ttl
+        serialized = json.dumps(value, default=str)
+        expires_at = time.time() + ttl
+
+        with self._lock:
+            self._store(key, value, expires_at, len(serialized))
+            self._metrics['sets'] += 1
+            if self._connection is not None:
+                self._disk_set(key, serialized, expires_at)
+
+    def get_or_compute(self, key: str, compute: Callable[[], Any], ttl: Optional[float] = None) -> Any:
+        """Get a cached value, computing and caching it on a miss."""
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            value = compute()
+            self.set(key, value, ttl)
+        return value
+
+    def __contains__(self, key: str) -> bool:
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry is not None and entry[1] > time.time()
+
+    def delete(self, key: str) -> None:
+        """Remove a key from all tiers."""
+        with self._lock:
+            self._remove(key)
+            if self._connection is not None:
+                with self._connection:
+                    self._connection.execute('DELETE FROM cache_entries WHERE key = ?', (key,))
+
+    def clear(self, namespace: Optional[str] = None) -> None:
+        """Remove all entries, or only those in a namespace."""
+        with self._lock:
+            if namespace is None:
+                self._entries.clear()
+                self._current_bytes = 0
+            else:
+                for key in [k for k in self._entries if k.startswith(f"{namespace}:")]:
+                    self._remove(key)
+
+            if self._connection is not None:
+                with self._connection:
+                    if namespace is None:
+                        self._connection.execute('DELETE FROM cache_entries')
+                    else:
+                        self._connection.execute(
+                            'DELETE FROM cache_entries WHERE key LIKE ?', (f"{namespace}:%",)
+                        )
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Get hit-rate and occupancy metrics."""
+        with self._lock:
+            lookups = self._metrics['hits'] + self._metrics['misses']
+            return {
+                **self._metrics,
+                'lookups': lookups,
+                'hitRate': self._metrics['hits'] / lookups if lookups else 0.0,
+                'entries': len(self._entries),
+                'bytes': self._current_bytes,
+                'maxEntries': self.max_entries,
+                'maxBytes': self.max_bytes,
+                'diskBackend': self._connection is not None
+            }
+
+    def publish_metrics(self) -> Dict[str, Any]:
+        """Record cache metrics with the system monitor and return them."""
+        from utils.monitoring import system_monitor, PerformanceMetric
+
+        metrics = self.get_metrics()
+        for name, unit in (('hitRate', 'ratio'), ('entries', 'count'), ('bytes', 'bytes')):
+            system_monitor.metrics_collector.record_metric(PerformanceMetric(
+                name=f"pricing_cache.{name}",
+                value=float(metrics[name]),
+                timestamp=time.time(),
+                unit=unit
+            ))
+        return metrics
+
+    # Private helper methods
+
+    def _store(self, key: str, value: Any, expires_at: float, size: int) -> None:
+        """Insert into the memory tier and evict down to the limits."""
+        self._remove(key)
+        self._entries[key] = (value, expires_at, size)
+        self._current_bytes += size
+        self._enforce_memory_limits()
+
+    def _remove(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._current_bytes -= entry[2]
+
+    def _enforce_memory_limits(self) -> None:
+        """Evict least recently used entries until within entry and byte limits."""
+        while self._entries and (len(self._entries) > self.max_entries or self._current_bytes > self.max_bytes):
+            _, (_, _, size) = self._entries.popitem(last=False)
+            self._current_bytes -= size
+            self._metrics['evictions'] += 1
+
+    def _open_disk_backend(self, disk_path: str) -> None:
+        """Open (or create) the shared SQLite backend."""
+        if self._connection is not None:
+            self._connection.close()
+
+        Path(disk_path).parent.mkdir(parents=True, exist_ok=True)
+        self._connection = sqlite3.connect(disk_path, timeout=30, check_same_thread=False)
+        self._connection.execute('PRAGMA journal_mode=WAL')
+        with self._connection:
+            self._connection.execute('''
+                CREATE TABLE IF NOT EXISTS cache_entries (
+                    key TEXT PRIMARY KEY,
+                    value TEXT NOT NULL,
+                    expires_at REAL NOT NULL,
+                    size INTEGER NOT NULL,
+                    last_access REAL NOT NULL
+                )
+            ''')
+            self._connection.execute(
+                'CREATE INDEX IF NOT EXISTS idx_cache_last_access ON cache_entries (last_access)'
+            )
+        logger.info(f"Pricing cache disk backend opened at {disk_path}")
+
+    def _disk_get(self, key: str, now: float) -> Any:
+        """Read a live entry from disk and promote it to memory."""
+        row = self._connection.execute(
+            'SELECT value, expires_at, size FROM cache_entries WHERE key = ?', (key,)
+        ).fetchone()
+        if row is None:
+            return _MISSING
+
+        serialized, expires_at, size = row
+        if expires_at <= now:
+            self._metrics['expirations'] += 1
+            return _MISSING
+
+        with self._connection:
+            self._connection.execute('UPDATE cache_entries SET last_access = ? WHERE key = ?', (now, key))
+
+        value = json.loads(serialized)
+        self._store(key, value, expires_at, size)
+        return value
+
+    def _disk_set(self, key: str, serialized: str, expires_at: float) -> None:
+        """Write through to disk and trim expired and least recently used entries."""
+        now = time.time()
+        with self._connection:
+            self._connection.execute(
+                'INSERT OR REPLACE INTO cache_entries (key, value, expires_at, size, last_access) '
+                'VALUES (?, ?, ?, ?, ?)',
+                (key, serialized, expires_at, len(serialized), now)
+            )
+
+            # Trim periodically; other processes may also be writing to the file
+            if self._metrics['sets'] % 100 != 0:
+                return
+
+            self._connection.execute('DELETE FROM cache_entries WHERE expires_at <= ?', (now,))
+            total_bytes = self._connection.execute('SELECT COALESCE(SUM(size), 0) FROM cache_entries').fetchone()[0]
+            if total_bytes > self.max_disk_bytes:
+                excess = total_bytes - self.max_disk_bytes
+                victims = []
+                for victim_key, size in self._connection.execute(
+                    'SELECT key, size FROM cache_entries ORDER BY last_access'
+                ):
+                    victims.append((victim_key,))
+                    excess -= size
+                    if excess <= 0:
+                        break
+                self._connection.executemany('DELETE FROM cache_entries WHERE key = ?', victims)
+                self._metrics['evictions'] += len(victims)
+
+
+# Global pricing cache shared by pricing and billing clients, scanners and engines
+shared_pricing_cache = PricingCache()
+
+# Cost Explorer segment file used when the configuration does not name one
+DEFAULT_COST_SEGMENT_CACHE_PATH = 'cache/cost_segments.db'
+
+# Global cache of finalized Cost Explorer segments, bounded apart from the
+# pricing cache so neither kind of entry evicts the other
+shared_cost_segment_cache = PricingCache(max_entries=20000, max_bytes=128 * 1024 * 1024,
+                                         max_disk_bytes=1024 * 1024 * 1024)
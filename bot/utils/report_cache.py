@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+Report Section Cache for Advanced FinOps Platform
+
+Memoization of report sections across report runs:
+- Content fingerprints of section inputs, computed once per input per run
+- Section results keyed by section name, input fingerprints and template
+  configuration, so only sections whose inputs changed are recomputed
+- Bounded memory tier and optional SQLite tier shared across runs
+  (the PricingCache storage layers)
+- Per-section hit and miss metrics
+
+Requirements: 6.5 - Reporting and cost analysis
+"""
+
+import copy
+import hashlib
+import json
+import threading
+from typing import Dict, Any, Callable, Optional, Sequence
+
+from .pricing_cache import PricingCache
+
+# Bump when section computations change so cached results are not reused
+SECTION_CACHE_VERSION = 1
+
+_MISSING = object()
+
+
+def fingerprint(value: Any) -> str:
+    """
+    Content digest of a section input.
+
+    Lists are hashed item by item, so large cost record lists are never
+    serialized as one string.
+
+    Args:
+        value: JSON-like value (dictionary keys are sorted)
+
+    Returns:
+        Hex SHA-256 digest
+    """
+    digest = hashlib.sha256()
+    if isinstance(value, list):
+        digest.update(b'[')
+        for item in value:
+            digest.update(_canonical(item))
+            digest.update(b',')
+    else:
+        digest.update(_canonical(value))
+    return digest.hexdigest()
+
+
+def _canonical(value: Any) -> bytes:
+    """Stable JSON encoding of a value."""
+    return json.dumps(value, sort_keys=True, default=str, separators=(',', ':')).encode('utf-8')
+
+
+class SectionRun:
+    """
+    Fingerprints and cache statistics for one report run.
+
+    Inputs are fingerprinted on first use and the digest is reused for every
+    section of the run that reads the same object. The run keeps a reference
+    to each fingerprinted object, so object IDs are not reused while it lasts.
+    """
+
+    def __init__(self, template_config: Any):
+        self.template_fingerprint = fingerprint(template_config)
+        self.hits = 0
+        self.misses = 0
+        self._fingerprints: Dict[int, Any] = {}
+
+    def fingerprint(self, value: Any) -> str:
+        """Fingerprint of a section argument, computed once per object."""
+        if not isinstance(value, (list, dict)):
+            return fingerprint(value)
+        entry = self._fingerprints.get(id(value))
+        if entry is None:
+            entry = (value, fingerprint(value))
+            self._fingerprints[id(value)] = entry
+        return entry[1]
+
+    def get_statistics(self) -> Dict[str, int]:
+        """Section hits and misses in this run."""
+        return {'hits': self.hits, 'misses': self.misses}
+
+
+class ReportSectionCache:
+    """
+    Bounded cache of computed report sections.
+
+    Results must be JSON serializable. Cached results are copied on the way
+    in and out, so callers may modify the sections they receive.
+    """
+
+    def __init__(self, max_entries: int = 256, max_bytes: int = 64 * 1024 * 1024,
+                 disk_path: Optional[str] = None, max_disk_bytes: int = 256 * 1024 * 1024,
+                 ttl_seconds: float = 14 * 24 * 3600):
+        """
+        Initialize report section cache.
+
+        Args:
+            max_entries: Maximum number of sections held in memory
+            max_bytes: Maximum serialized size of sections held in memory
+            disk_path: Optional SQLite file shared across runs and processes
+            max_disk_bytes: Maximum serialized size of sections on disk
+            ttl_seconds: How long an unused section is kept
+        """
+        self._cache = PricingCache(default_ttl=ttl_seconds, max_entries=max_entries, max_bytes=max_bytes,
+                                   disk_path=disk_path, max_disk_bytes=max_disk_bytes)
+        self._lock = threading.Lock()
+        self._sections: Dict[str, Dict[str, int]] = {}
+
+    def begin_run(self, template_config: Any) -> SectionRun:
+        """Start a report run using the given template configuration."""
+        return SectionRun(template_config)
+
+    def get_or_compute(self, run: SectionRun, section: str, args: Sequence[Any],
+                       kwargs: Dict[str, Any], compute: Callable[[], Any]) -> Any:
+        """
+        Get a cached section, computing and caching it when its inputs changed.
+
+        Args:
+            run: Current report run
+            section: Section name
+            args: Positional section inputs
+            kwargs: Named section inputs
+            compute: Computes the section on a miss
+
+        Returns:
+            Section result
+        """
+        key = PricingCache.make_key(
+            'report_section', section, SECTION_CACHE_VERSION, run.template_fingerprint,
+            [run.fingerprint(arg) for arg in args],
+            **{name: run.fingerprint(value) for name, value in kwargs.items()}
+        )
+        value = self._cache.get(key, _MISSING)
+        hit = value is not _MISSING
+        if not hit:
+            value = compute()
+            self._cache.set(key, copy.deepcopy(value))
+
+        with self._lock:
+            counts = self._sections.setdefault(section, {'hits': 0, 'misses': 0})
+            counts['hits' if hit else 'misses'] += 1
+            if hit:
+                run.hits += 1
+            else:
+                run.misses += 1
+        return copy.deepcopy(value) if hit else value
+
+    def clear(self) -> None:
+        """Remove every cached section."""
+        self._cache.clear('report_section')
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Cache occupancy and hit-rate metrics, with hits and misses per section."""
+        metrics = self._cache.get_metrics()
+        with self._lock:
+            metrics['sections'] = {section: dict(counts) for section, counts in self._sections.items()}
+        return metrics
@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+"""
+Report Export Streams for Advanced FinOps Platform
+
+Incremental writers for exported reports:
+- JSON rendered fragment by fragment, with lists and generators written
+  item by item instead of as one serialized string
+- CSV written row by row from any iterable of dictionaries
+- Optional gzip compression of the output
+- Byte counts and a short content preview collected while writing, so the
+  file size is known without reading the output back and dry runs never
+  hold the rendered report in memory
+
+Requirements: 6.5 - Reporting export capabilities
+"""
+
+import csv
+import gzip
+import json
+from collections.abc import Iterator
+from typing import Dict, List, Any, Callable, Iterable, Optional, Sequence
+
+# Characters kept for the content preview
+PREVIEW_CHARS = 500
+
+# Rendered text buffered before it is encoded and written
+_BUFFER_CHARS = 64 * 1024
+
+
+def iter_json(value: Any, indent: Optional[int] = 2,
+              default: Callable[[Any], Any] = str) -> Iterable[str]:
+    """
+    Render a value as JSON fragments.
+
+    The output matches json.dumps(value, indent=indent, default=default),
+    except that iterators and generators are written as JSON arrays and
+    consumed one item at a time.
+
+    Args:
+        value: Dictionaries, lists, tuples, iterators and JSON scalars
+        indent: Indentation per nesting level (None for compact output)
+        default: Converts values json cannot serialize
+
+    Yields:
+        JSON text fragments
+    """
+    item_separator = ',' if indent is not None else ', '
+    pad = ' ' * indent if indent is not None else ''
+
+    def render(node: Any, level: int) -> Iterable[str]:
+        if isinstance(node, dict):
+            items = ((_json_key(key), item) for key, item in node.items())
+            opening, closing = '{', '}'
+        elif isinstance(node, (list, tuple, Iterator)):
+            items = ((None, item) for item in node)
+            opening, closing = '[', ']'
+        else:
+            yield json.dumps(node, default=default)
+            return
+
+        inner = '\n' + pad * (level + 1) if indent is not None else ''
+        yield opening
+        first = True
+        for key, item in items:
+            yield inner if first else item_separator + inner
+            first = False
+            if key is not None:
+                yield key + ': '
+            yield from render(item, level + 1)
+        if not first and indent is not None:
+            yield '\n' + pad * level
+        yield closing
+
+    return render(value, 0)
+
+
+def _json_key(key: Any) -> str:
+    """JSON object key for a dictionary key, converted the way json.dumps does."""
+    if isinstance(key, str):
+        return json.dumps(key)
+    if key is None or isinstance(key, (bool, int, float)):
+        return json.dumps(json.dumps(key))
+    return json.dumps(str(key))
+
+
+class _ByteCounter:
+    """Binary sink that counts bytes and passes them on to an optional file."""
+
+    def __init__(self, target=None):
+        self.target = target
+        self.bytes_written = 0
+
+    def write(self, data: bytes) -> int:
+        if self.target is not None:
+            self.target.write(data)
+        self.bytes_written += len(data)
+        return len(data)
+
+    def flush(self) -> None:
+        if self.target is not None:
+            self.target.flush()
+
+
+class ExportStream:
+    """
+    Text sink for one exported file.
+
+    Text is encoded as UTF-8, optionally gzip compressed, and written to
+    output_path, or only counted when output_path is None (dry runs).
+    Writes are buffered in chunks; only the preview and the byte counts are
+    kept once a chunk is written.
+    """
+
+    def __init__(self, output_path: Optional[str] = None, compress: bool = False,
+                 preview_chars: int = PREVIEW_CHARS):
+        """
+        Initialize export stream.
+
+        Args:
+            output_path: File to write, or None to count bytes without writing
+            compress: Gzip the output
+            preview_chars: Leading characters kept for the content preview
+        """
+        self.output_path = output_path
+        self.compress = compress
+        self.preview_chars = preview_chars
+        self.uncompressed_size = 0
+        self._preview: List[str] = []
+        self._preview_length = 0
+        self._buffer: List[str] = []
+        self._buffered = 0
+
+        self._file = open(output_path, 'wb') if output_path else None
+        self._counter = _ByteCounter(self._file)
+        self._sink = gzip.GzipFile(fileobj=self._counter, mode='wb') if compress else self._counter
+        self._closed = False
+
+    def __enter__(self) -> 'ExportStream':
+        return self
+
+    def __exit__(self, exc_type, exc, traceback) -> None:
+        self.close()
+
+    @property
+    def file_size(self) -> int:
+        """Bytes written to the output, after compression (final once closed)."""
+        return self._counter.bytes_written
+
+    @property
+    def preview(self) -> str:
+        """Leading characters of the rendered text, with '...' when truncated."""
+        preview = ''.join(self._preview)
+        if len(preview) > self.preview_chars:
+            return preview[:self.preview_chars] + '...'
+        return preview
+
+    def write(self, text: str) -> int:
+        """Buffer rendered text, writing it out once a chunk has accumulated."""
+        # One character past the preview shows whether it was truncated
+        if self._preview_length <= self.preview_chars:
+            kept = text[:self.preview_chars + 1 - self._preview_length]
+            self._preview.append(kept)
+            self._preview_length += len(kept)
+
+        self._buffer.append(text)
+        self._buffered += len(text)
+        if self._buffered >= _BUFFER_CHARS:
+            self._drain()
+        return len(text)
+
+    def write_all(self, fragments: Iterable[str]) -> None:
+        """Write every fragment of an iterable."""
+        for fragment in fragments:
+            self.write(fragment)
+
+    def close(self) -> None:
+        """Write buffered text, finish compression and close the file."""
+        if self._closed:
+            return
+        self._closed = True
+        try:
+            self._drain()
+            if self.compress:
+                self._sink.close()
+        finally:
+            if self._file is not None:
+                self._file.close()
+
+    def _drain(self) -> None:
+        """Encode and write the buffered text."""
+        if self._buffer:
+            data = ''.join(self._buffer).encode('utf-8')
+            self._buffer = []
+            self._buffered = 0
+            self.uncompressed_size += len(data)
+            self._sink.write(data)
+
+
+class RowCounter(Iterator):
+    """Iterator over rows that counts the rows consumed."""
+
+    def __init__(self, rows: Iterable[Any]):
+        self._rows = iter(rows)
+        self.count = 0
+
+    def __next__(self) -> Any:
+        row = next(self._rows)
+        self.count += 1
+        return row
+
+
+def write_json(stream: ExportStream, value: Any, indent: Optional[int] = 2) -> None:
+    """
+    Write a value to an export stream as JSON.
+
+    Args:
+        stream: Destination stream
+        value: Value accepted by iter_json
+        indent: Indentation per nesting level
+    """
+    stream.write_all(iter_json(value, indent=indent))
+
+
+def write_csv(stream: ExportStream, rows: Iterable[Dict[str, Any]],
+              fieldnames: Optional[Sequence[str]] = None) -> int:
+    """
+    Write dictionaries to an export stream as CSV, one row at a time.
+
+    Args:
+        stream: Destination stream
+        rows: Row dictionaries
+        fieldnames: Column order (defaults to the first row's keys)
+
+    Returns:
+        Number of rows written, excluding the header
+    """
+    rows = iter(rows)
+    if fieldnames is None:
+        first = next(rows, None)
+        if first is None:
+            return 0
+        fieldnames = list(first.keys())
+        rows = _chain_first(first, rows)
+
+    writer = csv.DictWriter(stream, fieldnames=fieldnames, restval='')
+    writer.writeheader()
+    count = 0
+    for row in rows:
+        writer.writerow(row)
+        count += 1
+    return count
+
+
+def _chain_first(first: Dict[str, Any], rest: Iterable[Dict[str, Any]]) -> Iterable[Dict[str, Any]]:
+    """Yield a row taken from an iterator, then the rest of the iterator."""
+    yield first
+    yield from rest
@@ -0,0 +1,321 @@
+#!/usr/bin/env python3
+"""
+Resource State Lookups for Advanced FinOps Platform
+
+Bulk, shared lookups of live resource state for execution validation:
+- Resources grouped by kind and region, described with one call per chunk
+  (describe_instances up to 1000 IDs, describe_volumes, describe_db_instances
+  with a db-instance-id filter)
+- Region groups described concurrently through the AWSConfig rate limiter
+- Missing IDs isolated by splitting the failed chunk instead of one call per ID
+- Post-change state of concurrent executions polled together in bulk
+  rounds with exponential backoff
+
+Requirements: 8.2, 8.4 - Execution validation
+"""
+
+import concurrent.futures
+import logging
+import threading
+import time
+from typing import Dict, List, Any, Optional, Iterable, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Resource kind described for each optimization resource type
+RESOURCE_DESCRIBE_KINDS = {
+    'ec2': 'instance',
+    'ebs': 'volume',
+    'rds': 'db_instance'
+}
+
+# Service, API operation and IDs per call for each resource kind
+_DESCRIBE_OPERATIONS = {
+    'instance': ('ec2', 'describe_instances', 1000),
+    'volume': ('ec2', 'describe_volumes', 500),
+    'db_instance': ('rds', 'describe_db_instances', 100)
+}
+
+# Error codes returned when some of the requested IDs do not exist
+_NOT_FOUND_ERRORS = ('InvalidInstanceID.NotFound', 'InvalidInstanceID.Malformed',
+                     'InvalidVolume.NotFound', 'InvalidVolumeID.Malformed')
+
+
+class ResourceStateDescriber:
+    """
+    Describes many resources with as few API calls as possible.
+
+    describe() returns a normalized state (resourceId, resourceType, region,
+    state, tags and kind-specific details) per resource, None for resources
+    that no longer exist. Resources of kinds that cannot be described, or
+    whose lookup failed, are left out so callers can fall back to their
+    own checks.
+    """
+
+    def __init__(self, aws_config, max_workers: int = 8):
+        """
+        Initialize resource state describer.
+
+        Args:
+            aws_config: AWSConfig instance for clients, rate limiting and retries
+            max_workers: Maximum region groups described concurrently
+        """
+        self.aws_config = aws_config
+        self.max_workers = max(1, max_workers)
+        self._metrics_lock = threading.Lock()
+        self._metrics = {'apiCalls': 0, 'resourcesDescribed': 0}
+
+    def describe(self, resources: Iterable[Tuple[str, str, str]]) -> Dict[str, Optional[Dict[str, Any]]]:
+        """
+        Describe resources in bulk.
+
+        Args:
+            resources: (resource_type, resource_id, region) tuples, e.g. ('ec2', 'i-123', 'us-east-1')
+
+        Returns:
+            Normalized state by resource ID (None when the resource does not exist)
+        """
+        groups: Dict[Tuple[str, str], List[str]] = {}
+        for resource_type, resource_id, region in resources:
+            kind = RESOURCE_DESCRIBE_KINDS.get(str(resource_type).lower())
+            if kind and resource_id:
+                group = groups.setdefault((kind, region or self.aws_config.region), [])
+                if resource_id not in group:
+                    group.append(resource_id)
+
+        states: Dict[str, Optional[Dict[str, Any]]] = {}
+        if not groups:
+            return states
+
+        workers = min(len(groups), self.max_workers)
+        with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
+            future_to_group = {
+                executor.submit(self._describe_group, kind, region, resource_ids): (kind, region)
+                for (kind, region), resource_ids in groups.items()
+            }
+            for future in concurrent.futures.as_completed(future_to_group):
+                kind, region = future_to_group[future]
+                try:
+                    states.update(future.result())
+                except Exception as e:
+                    logger.error(f"Failed to describe {kind} resources in {region}: {str(e)}")
+
+        with self._metrics_lock:
+            self._metrics['resourcesDescribed'] += len(states)
+        return states
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """API calls and resources described so far."""
+        with self._metrics_lock:
+            return dict(self._metrics)
+
+    # Private helper methods
+
+    def _describe_group(self, kind: str, region: str, resource_ids: List[str]) -> Dict[str, Optional[Dict[str, Any]]]:
+        """Describe one kind of resource in one region, chunk by chunk."""
+        service, _, chunk_size = _DESCRIBE_OPERATIONS[kind]
+        client = self.aws_config.get_client(service, region)
+
+        states: Dict[str, Optional[Dict[str, Any]]] = {resource_id: None for resource_id in resource_ids}
+        for start in range(0, len(resource_ids), chunk_size):
+            for resource_id, state in self._describe_chunk(kind, client, resource_ids[start:start + chunk_size]):
+                state['region'] = region
+                states[resource_id] = state
+        return states
+
+    def _describe_chunk(self, kind: str, client: Any, resource_ids: List[str]) -> List[Tuple[str, Dict[str, Any]]]:
+        """Describe a chunk, splitting it in half when some of its IDs do not exist."""
+        try:
+            return self._call_describe(kind, client, resource_ids)
+        except Exception as e:
+            if not any(code in str(e) for code in _NOT_FOUND_ERRORS):
+                raise
+            if len(resource_ids) == 1:
+                return []
+            middle = len(resource_ids) // 2
+            return (self._describe_chunk(kind, client, resource_ids[:middle]) +
+                    self._describe_chunk(kind, client, resource_ids[middle:]))
+
+    def _call_describe(self, kind: str, client: Any, resource_ids: List[str]) -> List[Tuple[str, Dict[str, Any]]]:
+        """Issue the describe call for a chunk, following pagination."""
+        service, operation_name, _ = _DESCRIBE_OPERATIONS[kind]
+        operation = getattr(client, operation_name)
+        if kind == 'instance':
+            params = {'InstanceIds': resource_ids}
+        elif kind == 'volume':
+            params = {'VolumeIds': resource_ids}
+        else:
+            params = {'Filters': [{'Name': 'db-instance-id', 'Values': resource_ids}]}
+
+        described = []
+        while True:
+            with self._metrics_lock:
+                self._metrics['apiCalls'] += 1
+            response = self.aws_config.execute_with_retry(operation, service, **params)
+            if kind == 'instance':
+                for reservation in response.get('Reservations', []):
+                    described.extend(
+                        (instance['InstanceId'], _instance_state(instance))
+                        for instance in reservation.get('Instances', [])
+                    )
+            elif kind == 'volume':
+                described.extend((volume['VolumeId'], _volume_state(volume)) for volume in response.get('Volumes', []))
+            else:
+                described.extend(
+                    (db_instance['DBInstanceIdentifier'], _db_instance_state(db_instance))
+                    for db_instance in response.get('DBInstances', [])
+                )
+
+            next_token = response.get('NextToken') or response.get('Marker')
+            if not next_token:
+                return described
+            if kind == 'db_instance':
+                params['Marker'] = next_token
+            else:
+                params['NextToken'] = next_token
+
+
+class ResourceStatePoller:
+    """
+    Coalesces post-change state polling across concurrent executions.
+
+    Each caller registers the resource it changed and the states that confirm
+    the change, then blocks. One background thread describes every pending
+    resource together each round, releases the callers whose resources reached
+    an expected state (or whose timeout passed), and doubles its delay between
+    rounds up to max_delay. The thread exits when nothing is pending.
+    """
+
+    def __init__(self, describer: ResourceStateDescriber,
+                 initial_delay: float = 2.0, max_delay: float = 30.0):
+        """
+        Initialize resource state poller.
+
+        Args:
+            describer: Describer used for the bulk lookups
+            initial_delay: Delay before the second round in seconds
+            max_delay: Maximum delay between rounds in seconds
+        """
+        self.describer = describer
+        self.initial_delay = initial_delay
+        self.max_delay = max_delay
+        self._lock = threading.Lock()
+        self._waiting: List[Dict[str, Any]] = []
+        self._polling = False
+        self._poll_rounds = 0
+
+    def wait_for_state(self,
+                       resource: Tuple[str, str, str],
+                       expected_states: Set[Optional[str]],
+                       timeout_seconds: float = 300) -> Dict[str, Any]:
+        """
+        Block until a resource reaches one of the expected states.
+
+        Args:
+            resource: (resource_type, resource_id, region) tuple
+            expected_states: Acceptable states (None means the resource is gone)
+            timeout_seconds: Give up after this many seconds
+
+        Returns:
+            {'reached', 'state', 'rounds'} for the resource
+        """
+        waiter = {
+            'resource': resource,
+            'expected': set(expected_states),
+            'deadline': time.monotonic() + timeout_seconds,
+            'event': threading.Event(),
+            'outcome': {'reached': False, 'state': None, 'rounds': 0}
+        }
+        with self._lock:
+            self._waiting.append(waiter)
+            if not self._polling:
+                self._polling = True
+                threading.Thread(target=self._poll_loop, name='resource-state-poller', daemon=True).start()
+
+        waiter['event'].wait(timeout_seconds + self.max_delay)
+        return waiter['outcome']
+
+    def get_poll_rounds(self) -> int:
+        """Bulk polling rounds run so far."""
+        return self._poll_rounds
+
+    def _poll_loop(self) -> None:
+        """Describe every pending resource per round until none are left."""
+        delay = self.initial_delay
+        while True:
+            with self._lock:
+                waiting = list(self._waiting)
+                if not waiting:
+                    self._polling = False
+                    return
+
+            self._poll_rounds += 1
+            try:
+                states = self.describer.describe(waiter['resource'] for waiter in waiting)
+            except Exception as e:
+                logger.error(f"Resource state poll failed: {str(e)}")
+                states = {}
+
+            now = time.monotonic()
+            finished = []
+            for waiter in waiting:
+                resource_id = waiter['resource'][1]
+                outcome = waiter['outcome']
+                outcome['rounds'] += 1
+                if resource_id in states:
+                    state = states[resource_id]
+                    outcome['state'] = state['state'] if state else None
+                    outcome['reached'] = outcome['state'] in waiter['expected']
+                if outcome['reached'] or now >= waiter['deadline']:
+                    finished.append(waiter)
+
+            with self._lock:
+                for waiter in finished:
+                    self._waiting.remove(waiter)
+                    waiter['event'].set()
+                if not self._waiting:
+                    self._polling = False
+                    return
+
+            time.sleep(delay)
+            delay = min(delay * 2, self.max_delay)
+
+
+def _tags(tag_list: Optional[List[Dict[str, str]]]) -> Dict[str, str]:
+    """Key/Value tag list as a dictionary."""
+    return {tag['Key']: tag.get('Value', '') for tag in tag_list or []}
+
+
+def _instance_state(instance: Dict[str, Any]) -> Dict[str, Any]:
+    """Normalized EC2 instance state."""
+    return {
+        'resourceId': instance['InstanceId'],
+        'resourceType': 'ec2',
+        'state': instance.get('State', {}).get('Name'),
+        'instanceType': instance.get('InstanceType'),
+        'tags': _tags(instance.get('Tags'))
+    }
+
+
+def _volume_state(volume: Dict[str, Any]) -> Dict[str, Any]:
+    """Normalized EBS volume state."""
+    return {
+        'resourceId': volume['VolumeId'],
+        'resourceType': 'ebs',
+        'state': volume.get('State'),
+        'volumeType': volume.get('VolumeType'),
+        'size': volume.get('Size'),
+        'attachments': len(volume.get('Attachments', [])),
+        'tags': _tags(volume.get('Tags'))
+    }
+
+
+def _db_instance_state(db_instance: Dict[str, Any]) -> Dict[str, Any]:
+    """Normalized RDS instance state."""
+    return {
+        'resourceId': db_instance['DBInstanceIdentifier'],
+        'resourceType': 'rds',
+        'state': db_instance.get('DBInstanceStatus'),
+        'dbInstanceClass': db_instance.get('DBInstanceClass'),
+        'tags': _tags(db_instance.get('TagList'))
+    }
@@ -24,11 +24,14 @@ import logging
 import json
 import os
 import uuid
+from collections import deque
 from datetime import datetime, timedelta, timezone
-from typing import Dict, Any, List, Optional, Callable, Union
+from typing import Dict, Any, List, Optional, Callable, Union, Iterable, Iterator
 from enum import Enum
 from pathlib import Path
 
+from .audit_journal import AuditJournal, RollbackPlanStore, DEFAULT_SEGMENT_BYTES
+
 logger = logging.getLogger(__name__)
 
 
@@ -79,20 +82,42 @@ class RollbackCapability(Enum):
 class SafetyControls:
     """Manages safety controls and DRY_RUN validation for AWS operations."""
     
-    def __init__(self, dry_run: bool = True, log_file: str = "finops_operations.log"):
+    def __init__(self,
+                 dry_run: bool = True,
+                 log_file: str = "finops_operations.log",
+                 audit_dir: Optional[str] = None,
+                 history_window: int = 10000,
+                 max_segment_bytes: int = DEFAULT_SEGMENT_BYTES,
+                 compress_segments: bool = False):
         """
         Initialize safety controls.
         
         Args:
             dry_run: If True, no actual AWS operations will be performed
             log_file: File to log all operations for audit trail
+            audit_dir: Optional directory for the durable audit journal
+            history_window: Maximum operations and rollback plans kept in memory
+            max_segment_bytes: Audit journal segment size that triggers rotation
+            compress_segments: Gzip rotated audit journal segments
         """
         self.dry_run = dry_run
         self.log_file = log_file
-        self.operation_history = []
-        self.rollback_plans = {}
+        self.history_window = max(1, history_window)
         self.active_sessions = {}
         
+        # Durable audit trail; memory holds only the most recent window
+        self.audit_journal = None
+        if audit_dir:
+            self.audit_journal = AuditJournal(audit_dir, max_segment_bytes, compress_segments)
+        self.rollback_plans = RollbackPlanStore(self.audit_journal, self.history_window)
+        self._operation_history = deque()
+        self._operations_by_id: Dict[str, Dict[str, Any]] = {}
+        self._metrics = self._empty_metrics()
+        if self.audit_journal:
+            self._metrics = self.audit_journal.get_state('operation_metrics', self._metrics)
+            for entry in self.audit_journal.tail('operation', self.history_window):
+                self._remember_operation(entry['record'])
+        
         # Create logs directory if it doesn't exist
         log_dir = Path(log_file).parent
         log_dir.mkdir(exist_ok=True)
@@ -106,6 +131,21 @@ class SafetyControls:
             logger.warning("LIVE mode enabled - AWS operations will be performed")
             logger.warning("All operations will be logged and rollback plans created")
     
+    @property
+    def operation_history(self) -> deque:
+        """Most recent operation records, oldest first (at most history_window)."""
+        return self._operation_history
+    
+    @operation_history.setter
+    def operation_history(self, records: Iterable[Dict[str, Any]]) -> None:
+        """Replace the in-memory operation records and recount metrics from them."""
+        self._operation_history = deque()
+        self._operations_by_id = {}
+        self._metrics = self._empty_metrics()
+        for record in records:
+            self._count_operation(record, 1)
+            self._remember_operation(record)
+    
     def _setup_operation_logging(self) -> None:
         """Set up comprehensive logging for operations."""
         operation_logger = logging.getLogger('finops.operations')
@@ -318,7 +358,7 @@ class SafetyControls:
                     operation_logger.error(f"Failed to execute {operation_type.value} on {resource_id}: {e}")
         
         # Store operation in history
-        self.operation_history.append(operation_record)
+        self._record_operation(operation_record)
         
         # Log final operation state
         operation_logger.info(f"Operation completed: {operation_id} - Status: {operation_record['status']}")
@@ -571,14 +611,13 @@ class SafetyControls:
                 break
         
         # Update operation history
-        for op_record in self.operation_history:
-            if op_record.get('operation_id') == operation_id:
-                if all(result.get('success', False) for result in rollback_results):
-                    op_record['status'] = OperationStatus.ROLLED_BACK.value
-                else:
-                    op_record['status'] = OperationStatus.ROLLBACK_FAILED.value
-                op_record['rollback_results'] = rollback_results
-                break
+        op_record = self._find_operation(operation_id)
+        if op_record:
+            if all(result.get('success', False) for result in rollback_results):
+                status = OperationStatus.ROLLED_BACK.value
+            else:
+                status = OperationStatus.ROLLBACK_FAILED.value
+            self._update_operation(op_record, status=status, rollback_results=rollback_results)
         
         success = all(result.get('success', False) for result in rollback_results)
         
@@ -655,7 +694,7 @@ class SafetyControls:
         Returns:
             Filtered list of operation records
         """
-        filtered_history = self.operation_history.copy()
+        filtered_history = list(self.operation_history)
         
         if operation_type:
             filtered_history = [
@@ -702,11 +741,7 @@ class SafetyControls:
         operation_logger = logging.getLogger('finops.operations')
         
         # Find the operation
-        operation_record = None
-        for op in self.operation_history:
-            if op.get('operation_id') == operation_id:
-                operation_record = op
-                break
+        operation_record = self._find_operation(operation_id)
         
         if not operation_record:
             return {
@@ -721,9 +756,12 @@ class SafetyControls:
             }
         
         # Record approval
-        operation_record['approved_by'] = approver
-        operation_record['approved_at'] = datetime.now(timezone.utc).isoformat()
-        operation_record['status'] = 'APPROVED'
+        self._update_operation(
+            operation_record,
+            approved_by=approver,
+            approved_at=datetime.now(timezone.utc).isoformat(),
+            status='APPROVED'
+        )
         
         operation_logger.info(f"Operation {operation_id} approved by {approver}")
         
@@ -741,7 +779,8 @@ class SafetyControls:
         Returns:
             Safety metrics and statistics
         """
-        total_operations = len(self.operation_history)
+        # Counts are maintained as operations are recorded and updated
+        total_operations = self._metrics['total']
         
         if total_operations == 0:
             return {
@@ -753,44 +792,39 @@ class SafetyControls:
         # Count by status
         status_counts = {}
         for status in OperationStatus:
-            status_counts[status.value] = len([
-                op for op in self.operation_history 
-                if op.get('status') == status.value
-            ])
+            status_counts[status.value] = self._metrics['status'].get(status.value, 0)
         
         # Count by risk level
         risk_counts = {}
         for risk in RiskLevel:
-            risk_counts[risk.value] = len([
-                op for op in self.operation_history 
-                if op.get('risk_level') == risk.value
-            ])
+            risk_counts[risk.value] = self._metrics['risk_level'].get(risk.value, 0)
         
         # Count rollback capabilities
         rollback_counts = {}
         for capability in RollbackCapability:
-            rollback_counts[capability.value] = len([
-                op for op in self.operation_history 
-                if op.get('rollback_capability') == capability.value
-            ])
+            rollback_counts[capability.value] = self._metrics['rollback_capability'].get(capability.value, 0)
         
         # Calculate success rates
-        executed_ops = [op for op in self.operation_history if op.get('status') == OperationStatus.EXECUTED.value]
-        failed_ops = [op for op in self.operation_history if op.get('status') == OperationStatus.FAILED.value]
+        executed_count = status_counts[OperationStatus.EXECUTED.value]
+        failed_count = status_counts[OperationStatus.FAILED.value]
         
-        success_rate = len(executed_ops) / max(len(executed_ops) + len(failed_ops), 1) * 100
+        success_rate = executed_count / max(executed_count + failed_count, 1) * 100
         
-        return {
+        metrics = {
             'total_operations': total_operations,
             'dry_run_mode': self.dry_run,
             'status_distribution': status_counts,
             'risk_distribution': risk_counts,
             'rollback_capability_distribution': rollback_counts,
             'success_rate_percentage': round(success_rate, 2),
-            'total_rollback_plans': len(self.rollback_plans),
-            'operations_requiring_approval': len(self.get_operations_requiring_approval()),
+            'total_rollback_plans': self.rollback_plans.total_count(),
+            'operations_requiring_approval': self._metrics['pending_approval'],
             'log_file': self.log_file
         }
+        if self.audit_journal:
+            metrics['audit_journal'] = self.audit_journal.get_statistics()
+        
+        return metrics
     
     def export_audit_log(self, output_file: Optional[str] = None) -> str:
         """
@@ -806,25 +840,102 @@ class SafetyControls:
             timestamp = datetime.now(timezone.utc).strftime('%Y%m%d_%H%M%S')
             output_file = f"finops_audit_log_{timestamp}.json"
         
-        audit_data = {
+        header = {
             'export_timestamp': datetime.now(timezone.utc).isoformat(),
             'safety_controls_config': {
                 'dry_run_mode': self.dry_run,
                 'log_file': self.log_file
             },
-            'safety_metrics': self.get_safety_metrics(),
-            'operation_history': self.operation_history,
-            'rollback_plans': self.rollback_plans
+            'safety_metrics': self.get_safety_metrics()
         }
         
+        # Operations and plans are written one record at a time
         with open(output_file, 'w') as f:
-            json.dump(audit_data, f, indent=2, default=str)
+            f.write('{\n')
+            for key, value in header.items():
+                f.write(f'  {json.dumps(key)}: {json.dumps(value, default=str)},\n')
+            
+            f.write('  "operation_history": [')
+            for index, record in enumerate(self._iter_operations()):
+                f.write((',' if index else '') + '\n    ' + json.dumps(record, default=str))
+            
+            f.write('\n  ],\n  "rollback_plans": {')
+            for index, (operation_id, plan) in enumerate(self.rollback_plans.iter_all()):
+                f.write((',' if index else '') + f'\n    {json.dumps(operation_id)}: ' + json.dumps(plan, default=str))
+            f.write('\n  }\n}\n')
         
         operation_logger = logging.getLogger('finops.operations')
         operation_logger.info(f"Audit log exported to {output_file}")
         
         return output_file
     
+    def _empty_metrics(self) -> Dict[str, Any]:
+        """Zeroed operation counters."""
+        return {'total': 0, 'status': {}, 'risk_level': {}, 'rollback_capability': {}, 'pending_approval': 0}
+    
+    def _count_operation(self, record: Dict[str, Any], sign: int) -> None:
+        """Add (sign=1) or remove (sign=-1) a record's contribution to the counters."""
+        self._metrics['total'] += sign
+        for field in ('status', 'risk_level', 'rollback_capability'):
+            value = record.get(field)
+            if value is not None:
+                counts = self._metrics[field]
+                counts[value] = counts.get(value, 0) + sign
+        if record.get('approval_required', False) and record.get('status') == OperationStatus.PENDING.value:
+            self._metrics['pending_approval'] += sign
+    
+    def _remember_operation(self, record: Dict[str, Any]) -> None:
+        """Keep a record in the in-memory window, evicting the oldest beyond history_window."""
+        operation_id = record.get('operation_id')
+        if operation_id in self._operations_by_id:
+            return
+        self._operation_history.append(record)
+        if operation_id:
+            self._operations_by_id[operation_id] = record
+        while len(self._operation_history) > self.history_window:
+            evicted = self._operation_history.popleft()
+            self._operations_by_id.pop(evicted.get('operation_id'), None)
+    
+    def _record_operation(self, record: Dict[str, Any]) -> None:
+        """Count, remember and journal a new operation record."""
+        self._count_operation(record, 1)
+        self._remember_operation(record)
+        self._journal_operation(record)
+    
+    def _update_operation(self, record: Dict[str, Any], **changes: Any) -> None:
+        """Apply changes to an operation record, keeping counters and journal current."""
+        self._count_operation(record, -1)
+        record.update(changes)
+        self._count_operation(record, 1)
+        self._journal_operation(record)
+    
+    def _journal_operation(self, record: Dict[str, Any]) -> None:
+        """Append the current version of an operation record to the audit journal."""
+        if not self.audit_journal:
+            return
+        try:
+            self.audit_journal.append(
+                'operation', record['operation_id'], record, record.get('timestamp'),
+                state={'operation_metrics': self._metrics}
+            )
+        except Exception as e:
+            logger.error(f"Failed to journal operation {record.get('operation_id')}: {e}")
+    
+    def _find_operation(self, operation_id: str) -> Optional[Dict[str, Any]]:
+        """Operation record from the in-memory window, falling back to the audit journal."""
+        record = self._operations_by_id.get(operation_id)
+        if record is None and self.audit_journal:
+            record = self.audit_journal.get('operation', operation_id)
+        return record
+    
+    def _iter_operations(self) -> Iterator[Dict[str, Any]]:
+        """Every operation record, streamed from the audit journal when one is attached."""
+        if self.audit_journal:
+            for entry in self.audit_journal.iter_latest('operation'):
+                yield entry['record']
+        else:
+            yield from list(self.operation_history)
+    
     def create_rollback_plan(self, operations: List[Dict[str, Any]]) -> Dict[str, Any]:
         """
         Create a comprehensive rollback plan for a set of operations.
@@ -941,18 +1052,21 @@ class SafetyControls:
 
 
 # Utility functions for external use
-def create_safety_controls(dry_run: bool = True, log_file: str = "finops_operations.log") -> SafetyControls:
+def create_safety_controls(dry_run: bool = True,
+                           log_file: str = "finops_operations.log",
+                           audit_dir: Optional[str] = None) -> SafetyControls:
     """
     Factory function to create SafetyControls instance.
     
     Args:
         dry_run: Enable DRY_RUN mode
         log_file: Path to operation log file
+        audit_dir: Optional directory for the durable audit journal
         
     Returns:
         Configured SafetyControls instance
     """
-    return SafetyControls(dry_run=dry_run, log_file=log_file)
+    return SafetyControls(dry_run=dry_run, log_file=log_file, audit_dir=audit_dir)
 
 
 def validate_dry_run_mode() -> bool:
@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+"""
+Schedule Queue for Advanced FinOps Platform
+
+Due-time priority queue for scheduled optimizations:
+- Min-heap ordered by due time, then priority, then scheduling order
+- Id index for constant-time lookup and cancellation
+- Popping the k due items costs O(k log n) instead of a full scan
+- Next wake-up time so callers can sleep until the next item is due
+- Optional SQLite file so scheduled work survives restarts; each push,
+  cancellation or pop writes only the rows it changes
+
+Requirements: 8.2 - Execution scheduling and batch processing
+"""
+
+import heapq
+import itertools
+import json
+import logging
+import sqlite3
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Any, Optional, Iterator, Tuple
+
+from .timestamps import to_timestamp
+
+logger = logging.getLogger(__name__)
+
+# Heap tie-break for items due at the same time (lower runs first)
+PRIORITY_ORDER = {'CRITICAL': 0, 'HIGH': 1, 'MEDIUM': 2, 'LOW': 3}
+
+
+class ScheduleQueue:
+    """
+    Min-heap of scheduled items keyed by due time with an id index.
+
+    Items are dictionaries carrying at least schedule_id and scheduled_time
+    (ISO 8601, naive values are UTC). Cancelled items are dropped from the
+    index immediately and their heap entries are discarded lazily when they
+    reach the top; the heap is rebuilt once stale entries outnumber live ones.
+    """
+
+    def __init__(self, state_path: Optional[str] = None):
+        """
+        Initialize schedule queue.
+
+        Args:
+            state_path: Optional SQLite file the queue is loaded from and saved to
+        """
+        self.state_path = Path(state_path) if state_path else None
+        self._lock = threading.RLock()
+        self._heap: List[Tuple[float, int, int, str]] = []
+        self._items: Dict[str, Dict[str, Any]] = {}
+        self._counter = itertools.count()
+        self._stale = 0
+
+        self._connection = None
+        if self.state_path:
+            self.state_path.parent.mkdir(parents=True, exist_ok=True)
+            self._connection = sqlite3.connect(str(self.state_path), timeout=30, check_same_thread=False)
+            self._connection.execute('PRAGMA journal_mode=WAL')
+            with self._connection:
+                self._connection.execute('''
+                    CREATE TABLE IF NOT EXISTS scheduled_items (
+                        schedule_id TEXT PRIMARY KEY,
+                        record TEXT NOT NULL
+                    )
+                ''')
+            self._load_state()
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __contains__(self, schedule_id: str) -> bool:
+        return schedule_id in self._items
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        """Live items in due order."""
+        return iter(self.items())
+
+    def push(self, item: Dict[str, Any]) -> None:
+        """
+        Add a scheduled item.
+
+        Args:
+            item: Scheduled item with schedule_id, scheduled_time and optional priority
+        """
+        with self._lock:
+            schedule_id = item['schedule_id']
+            if schedule_id in self._items:
+                raise ValueError(f"Scheduled item {schedule_id} already exists")
+
+            self._items[schedule_id] = item
+            heapq.heappush(self._heap, self._entry(item))
+            self._save_items([item])
+
+    def get(self, schedule_id: str) -> Optional[Dict[str, Any]]:
+        """Scheduled item by id, None when unknown or cancelled."""
+        return self._items.get(schedule_id)
+
+    def remove(self, schedule_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Remove a scheduled item by id.
+
+        Returns:
+            The removed item, or None when it is not queued
+        """
+        with self._lock:
+            item = self._items.pop(schedule_id, None)
+            if item is None:
+                return None
+
+            self._stale += 1
+            if self._stale > len(self._items):
+                self._compact()
+            self._delete_items([schedule_id])
+            return item
+
+    def peek(self) -> Optional[Dict[str, Any]]:
+        """Next item due, without removing it."""
+        with self._lock:
+            self._discard_stale()
+            return self._items[self._heap[0][3]] if self._heap else None
+
+    def pop_due(self, now: Optional[datetime] = None) -> List[Dict[str, Any]]:
+        """
+        Remove and return every item due at or before now, in due order.
+
+        Args:
+            now: Reference time (defaults to the current UTC time)
+
+        Returns:
+            Due items
+        """
+        cutoff = to_timestamp(now or datetime.now(timezone.utc))
+        due = []
+        with self._lock:
+            while self._heap and self._heap[0][0] <= cutoff:
+                _, _, _, schedule_id = heapq.heappop(self._heap)
+                item = self._items.pop(schedule_id, None)
+                if item is None:
+                    self._stale -= 1
+                    continue
+                due.append(item)
+
+            if due:
+                self._delete_items([item['schedule_id'] for item in due])
+        return due
+
+    def next_wake_time(self) -> Optional[datetime]:
+        """UTC time the next item is due, None when the queue is empty."""
+        with self._lock:
+            self._discard_stale()
+            if not self._heap:
+                return None
+            return datetime.fromtimestamp(self._heap[0][0], tz=timezone.utc)
+
+    def seconds_until_next(self, now: Optional[datetime] = None) -> Optional[float]:
+        """Seconds to sleep until the next item is due (0 when already due)."""
+        wake_time = self.next_wake_time()
+        if wake_time is None:
+            return None
+        return max(0.0, wake_time.timestamp() - to_timestamp(now or datetime.now(timezone.utc)))
+
+    def items(self) -> List[Dict[str, Any]]:
+        """Live items in due order (O(n log n), for inspection and reports)."""
+        with self._lock:
+            return [self._items[entry[3]] for entry in sorted(self._heap) if entry[3] in self._items]
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            if self._connection:
+                self._connection.close()
+                self._connection = None
+
+    # Private helper methods
+
+    def _entry(self, item: Dict[str, Any]) -> Tuple[float, int, int, str]:
+        """Heap entry ordered by due time, priority and scheduling order."""
+        return (
+            to_timestamp(item['scheduled_time']),
+            PRIORITY_ORDER.get(item.get('priority'), len(PRIORITY_ORDER)),
+            next(self._counter),
+            item['schedule_id']
+        )
+
+    def _discard_stale(self) -> None:
+        """Drop cancelled entries from the top of the heap."""
+        while self._heap and self._heap[0][3] not in self._items:
+            heapq.heappop(self._heap)
+            self._stale -= 1
+
+    def _compact(self) -> None:
+        """Rebuild the heap from live entries only."""
+        self._heap = [entry for entry in self._heap if entry[3] in self._items]
+        heapq.heapify(self._heap)
+        self._stale = 0
+
+    def _load_state(self) -> None:
+        """Load queued items in scheduling order and rebuild the heap."""
+        try:
+            rows = self._connection.execute('SELECT record FROM scheduled_items ORDER BY rowid').fetchall()
+            saved_items = [json.loads(record) for (record,) in rows]
+            for item in saved_items:
+                self._items[item['schedule_id']] = item
+            self._heap = [self._entry(item) for item in saved_items]
+            heapq.heapify(self._heap)
+            if saved_items:
+                logger.info(f"Loaded {len(self._items)} scheduled items from {self.state_path}")
+        except Exception as e:
+            logger.error(f"Failed to load schedule queue: {e}")
+
+    def _save_items(self, items: List[Dict[str, Any]]) -> None:
+        """Write queued items (no-op without a state file)."""
+        if not self._connection:
+            return
+        try:
+            with self._connection:
+                self._connection.executemany(
+                    'INSERT OR REPLACE INTO scheduled_items (schedule_id, record) VALUES (?, ?)',
+                    [(item['schedule_id'], json.dumps(item, default=str)) for item in items]
+                )
+        except Exception as e:
+            logger.error(f"Failed to save schedule queue: {e}")
+
+    def _delete_items(self, schedule_ids: List[str]) -> None:
+        """Delete items that left the queue (no-op without a state file)."""
+        if not self._connection:
+            return
+        try:
+            with self._connection:
+                self._connection.executemany(
+                    'DELETE FROM scheduled_items WHERE schedule_id = ?',
+                    [(schedule_id,) for schedule_id in schedule_ids]
+                )
+        except Exception as e:
+            logger.error(f"Failed to save schedule queue: {e}")
@@ -0,0 +1,23 @@
+#!/usr/bin/env python3
+"""
+Timestamp helpers for Advanced FinOps Platform
+
+Shared by the due-time and timeout heaps of the schedule queue and the
+workflow store:
+- POSIX timestamps of datetimes and ISO 8601 strings, treating naive
+  values as UTC
+
+Requirements: 8.1, 8.2 - Approval workflow tracking and execution scheduling
+"""
+
+from datetime import datetime, timezone
+from typing import Any
+
+
+def to_timestamp(value: Any) -> float:
+    """POSIX timestamp of a datetime or ISO 8601 string, treating naive values as UTC."""
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.timestamp()
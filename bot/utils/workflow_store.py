@@ -0,0 +1,363 @@
+#!/usr/bin/env python3
+"""
+Workflow Store for Advanced FinOps Platform
+
+Indexed storage for approval workflows:
+- Active and completed workflows by ID, with dictionary views for callers
+  that used the plain active/completed dictionaries
+- Secondary index of active workflows by (state, required authority), so
+  pending-approval queries touch only the workflows they return
+- Min-heap of active workflow timeouts; finding the k expired workflows
+  costs O(k) and discarding their entries O(k log n)
+- Optional SQLite file so workflows survive restarts
+
+Requirements: 8.1, 8.3 - Approval workflow state management and tracking
+"""
+
+import heapq
+import itertools
+import json
+import logging
+import sqlite3
+import threading
+from collections.abc import Mapping
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Any, Optional, Iterable, Iterator, Tuple
+
+from .timestamps import to_timestamp
+
+logger = logging.getLogger(__name__)
+
+# Workflow fields that determine index and heap placement
+INDEXED_FIELDS = ('state', 'timeout_at', 'approval_requirements')
+
+
+class StoredWorkflow(dict):
+    """
+    Workflow dictionary that keeps its store's indexes current.
+
+    Assigning state, timeout_at or approval_requirements re-indexes the
+    workflow. Nested changes (for example approval_requirements'
+    authority_required) are picked up by WorkflowStore.reindex().
+    """
+
+    def __init__(self, store: 'WorkflowStore', workflow: Dict[str, Any]):
+        super().__init__(workflow)
+        self._store = store
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        super().__setitem__(key, value)
+        if key in INDEXED_FIELDS:
+            self._store.reindex(self['workflow_id'])
+
+    def update(self, *args, **kwargs) -> None:
+        changes = dict(*args, **kwargs)
+        super().update(changes)
+        if any(key in INDEXED_FIELDS for key in changes):
+            self._store.reindex(self['workflow_id'])
+
+
+class _WorkflowView(Mapping):
+    """Read-only dictionary view of the active or the completed workflows."""
+
+    def __init__(self, workflows: Dict[str, StoredWorkflow]):
+        self._workflows = workflows
+
+    def __getitem__(self, workflow_id: str) -> StoredWorkflow:
+        return self._workflows[workflow_id]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(list(self._workflows))
+
+    def __len__(self) -> int:
+        return len(self._workflows)
+
+
+class WorkflowStore:
+    """
+    Approval workflows with a (state, authority) index and a timeout heap.
+
+    Workflows are the dictionaries built by ApprovalWorkflow.create_workflow().
+    Only active workflows are indexed. Heap entries carry the timeout they
+    were pushed with; an entry is stale once its workflow is completed or
+    its timeout changed, is skipped when found, and the heap is rebuilt once
+    stale entries outnumber live ones.
+    """
+
+    def __init__(self, db_path: Optional[str] = None):
+        """
+        Initialize workflow store.
+
+        Args:
+            db_path: Optional SQLite file workflows are loaded from and saved to
+        """
+        self.db_path = db_path
+        self._lock = threading.RLock()
+        self._active: Dict[str, StoredWorkflow] = {}
+        self._completed: Dict[str, StoredWorkflow] = {}
+        self._index: Dict[Tuple[str, str], Dict[str, None]] = {}
+        self._index_keys: Dict[str, Tuple[str, str]] = {}
+        self._timeouts: Dict[str, Tuple[float, str]] = {}
+        self._heap: List[Tuple[float, int, str, str]] = []
+        self._counter = itertools.count()
+        self._order: Dict[str, int] = {}
+        self._stale = 0
+
+        self.active = _WorkflowView(self._active)
+        self.completed = _WorkflowView(self._completed)
+
+        self._connection = None
+        if db_path:
+            Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+            self._connection = sqlite3.connect(db_path, timeout=30, check_same_thread=False)
+            self._connection.execute('PRAGMA journal_mode=WAL')
+            with self._connection:
+                self._connection.execute('''
+                    CREATE TABLE IF NOT EXISTS approval_workflows (
+                        workflow_id TEXT PRIMARY KEY,
+                        active INTEGER NOT NULL,
+                        created_at TEXT NOT NULL,
+                        record TEXT NOT NULL
+                    )
+                ''')
+            self._load()
+
+    def __len__(self) -> int:
+        return len(self._active) + len(self._completed)
+
+    def __contains__(self, workflow_id: str) -> bool:
+        return workflow_id in self._active or workflow_id in self._completed
+
+    def add(self, workflow: Dict[str, Any]) -> StoredWorkflow:
+        """
+        Add a new active workflow.
+
+        Args:
+            workflow: Workflow dictionary with workflow_id, state, timeout_at and approval_requirements
+
+        Returns:
+            The stored workflow; later changes should be made to this dictionary
+        """
+        with self._lock:
+            workflow_id = workflow['workflow_id']
+            if workflow_id in self:
+                raise ValueError(f"Workflow {workflow_id} already exists")
+
+            stored = StoredWorkflow(self, workflow)
+            self._active[workflow_id] = stored
+            self._order[workflow_id] = next(self._counter)
+            self.reindex(workflow_id)
+            return stored
+
+    def get(self, workflow_id: str) -> Optional[StoredWorkflow]:
+        """Active or completed workflow by ID, None when unknown."""
+        return self._active.get(workflow_id) or self._completed.get(workflow_id)
+
+    def is_active(self, workflow_id: str) -> bool:
+        """Whether the workflow is still active."""
+        return workflow_id in self._active
+
+    def complete(self, workflow_id: str) -> Optional[StoredWorkflow]:
+        """
+        Move an active workflow to the completed workflows.
+
+        Returns:
+            The completed workflow, or None when it is not active
+        """
+        with self._lock:
+            workflow = self._active.pop(workflow_id, None)
+            if workflow is None:
+                return None
+
+            self._completed[workflow_id] = workflow
+            self._unindex(workflow_id)
+            if self._timeouts.pop(workflow_id, None) is not None:
+                self._mark_stale()
+            return workflow
+
+    def reindex(self, workflow_id: str) -> None:
+        """Refresh a workflow's index and timeout entries after its indexed fields changed."""
+        with self._lock:
+            workflow = self._active.get(workflow_id)
+            if workflow is None:
+                return
+
+            authority = (workflow.get('approval_requirements') or {}).get('authority_required')
+            key = (workflow.get('state'), authority)
+            if self._index_keys.get(workflow_id) != key:
+                self._unindex(workflow_id)
+                self._index.setdefault(key, {})[workflow_id] = None
+                self._index_keys[workflow_id] = key
+
+            timeout_at = workflow.get('timeout_at')
+            current = self._timeouts.get(workflow_id)
+            if current is not None and current[1] == timeout_at:
+                return
+            if current is not None:
+                self._timeouts.pop(workflow_id)
+                self._mark_stale()
+            if timeout_at:
+                timeout_ts = to_timestamp(timeout_at)
+                self._timeouts[workflow_id] = (timeout_ts, timeout_at)
+                heapq.heappush(self._heap, (timeout_ts, self._order[workflow_id], workflow_id, timeout_at))
+
+    def find(self, states: Iterable[str], authority: Optional[str] = None) -> List[StoredWorkflow]:
+        """
+        Active workflows in any of the given states, oldest first.
+
+        Args:
+            states: Workflow state values
+            authority: Only workflows requiring this authority value
+
+        Returns:
+            Matching workflows, read from the index
+        """
+        states = set(states)
+        with self._lock:
+            workflow_ids = [
+                workflow_id
+                for (state, required), bucket in self._index.items()
+                if state in states and (authority is None or required == authority)
+                for workflow_id in bucket
+            ]
+            workflow_ids.sort(key=self._order.__getitem__)
+            return [self._active[workflow_id] for workflow_id in workflow_ids]
+
+    def is_expired(self, workflow_id: str, now: Optional[datetime] = None) -> bool:
+        """Whether an active workflow's timeout has passed."""
+        timeout = self._timeouts.get(workflow_id)
+        return timeout is not None and timeout[0] < to_timestamp(now or datetime.utcnow())
+
+    def expired(self, now: Optional[datetime] = None) -> List[StoredWorkflow]:
+        """
+        Active workflows whose timeout has passed, earliest timeout first.
+
+        Only heap entries due before now are visited: a heap node later than
+        now has no earlier descendants.
+
+        Args:
+            now: Reference time (defaults to the current UTC time)
+
+        Returns:
+            Expired active workflows
+        """
+        cutoff = to_timestamp(now or datetime.utcnow())
+        with self._lock:
+            self._discard_stale()
+            due = []
+            pending = [0]
+            while pending:
+                position = pending.pop()
+                if position >= len(self._heap) or self._heap[position][0] >= cutoff:
+                    continue
+                timeout_ts, _, workflow_id, timeout_at = self._heap[position]
+                if self._timeouts.get(workflow_id, (None, None))[1] == timeout_at:
+                    due.append(self._heap[position])
+                pending.extend((2 * position + 1, 2 * position + 2))
+            return [self._active[entry[2]] for entry in sorted(due)]
+
+    def next_timeout(self) -> Optional[datetime]:
+        """UTC time of the earliest active workflow timeout, None when nothing is active."""
+        with self._lock:
+            self._discard_stale()
+            if not self._heap:
+                return None
+            return datetime.fromtimestamp(self._heap[0][0], tz=timezone.utc)
+
+    def state_counts(self) -> Dict[str, int]:
+        """Active workflow counts by state, from the index."""
+        with self._lock:
+            counts: Dict[str, int] = {}
+            for (state, _), bucket in self._index.items():
+                if bucket:
+                    counts[state] = counts.get(state, 0) + len(bucket)
+            return counts
+
+    def save(self, *workflow_ids: str) -> None:
+        """
+        Persist workflows after they changed.
+
+        Args:
+            workflow_ids: Workflows to write (no-op without a database file)
+        """
+        if not self._connection:
+            return
+        with self._lock:
+            rows = []
+            for workflow_id in dict.fromkeys(workflow_ids):
+                workflow = self.get(workflow_id)
+                if workflow is not None:
+                    rows.append((
+                        workflow_id,
+                        1 if workflow_id in self._active else 0,
+                        workflow.get('created_at') or '',
+                        json.dumps(workflow, default=str)
+                    ))
+            try:
+                with self._connection:
+                    self._connection.executemany(
+                        'INSERT OR REPLACE INTO approval_workflows (workflow_id, active, created_at, record) '
+                        'VALUES (?, ?, ?, ?)',
+                        rows
+                    )
+            except Exception as e:
+                logger.error(f"Failed to save approval workflows: {e}")
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            if self._connection:
+                self._connection.close()
+                self._connection = None
+
+    # Private helper methods
+
+    def _unindex(self, workflow_id: str) -> None:
+        """Remove a workflow from the (state, authority) index."""
+        key = self._index_keys.pop(workflow_id, None)
+        if key is not None:
+            bucket = self._index[key]
+            bucket.pop(workflow_id, None)
+            if not bucket:
+                del self._index[key]
+
+    def _mark_stale(self) -> None:
+        """Count a superseded heap entry, rebuilding the heap once stale entries dominate."""
+        self._stale += 1
+        if self._stale > len(self._timeouts):
+            self._heap = [
+                entry for entry in self._heap
+                if self._timeouts.get(entry[2], (None, None))[1] == entry[3]
+            ]
+            heapq.heapify(self._heap)
+            self._stale = 0
+
+    def _discard_stale(self) -> None:
+        """Drop superseded entries from the top of the heap."""
+        while self._heap and self._timeouts.get(self._heap[0][2], (None, None))[1] != self._heap[0][3]:
+            heapq.heappop(self._heap)
+            self._stale -= 1
+
+    def _load(self) -> None:
+        """Load saved workflows, oldest first, and rebuild the indexes."""
+        try:
+            rows = self._connection.execute(
+                'SELECT active, record FROM approval_workflows ORDER BY created_at, rowid'
+            ).fetchall()
+            for active, record in rows:
+                workflow = StoredWorkflow(self, json.loads(record))
+                workflow_id = workflow['workflow_id']
+                self._order[workflow_id] = next(self._counter)
+                if active:
+                    self._active[workflow_id] = workflow
+                    self.reindex(workflow_id)
+                else:
+                    self._completed[workflow_id] = workflow
+            if rows:
+                logger.info(
+                    f"Loaded {len(self._active)} active and {len(self._completed)} completed "
+                    f"approval workflows from {self.db_path}"
+                )
+        except Exception as e:
+            logger.error(f"Failed to load approval workflows: {e}")